@@ -26,6 +26,7 @@ from backend.logging_config import configure_logging
 
 from backend.provider.csv_weather_provider import CSVWeatherProvider
 from backend.provider.api_weather_provider import APIWeatherProvider
+from backend.provider.cached_weather_provider import CachedWeatherProvider
 
 
 # ============================================
@@ -60,8 +61,19 @@ def main():
     # Prüfen ob API gewählt UND ein Key vorhanden ist, sonst Fallback auf CSV
     if provider_mode in ("api", "openweather") and api_key:
         provider = APIWeatherProvider(api_key = api_key)
+
+        # Cache-Schicht vor der API (spart Quota + Latenz beim Stadtwechsel), WEATHER_CACHE_TTL=0 schaltet ab
+        cache_ttl = float(os.getenv("WEATHER_CACHE_TTL", "300"))
+
+        if cache_ttl > 0:
+            provider = CachedWeatherProvider(
+                provider,
+                ttl = cache_ttl,
+                max_entries = int(os.getenv("WEATHER_CACHE_SIZE", "128")),
+                stale_ttl = float(os.getenv("WEATHER_CACHE_STALE", "600"))
+            )
     else:
-        provider = CSVWeatherProvider("weather_sample.csv")
+        provider = CSVWeatherProvider(os.getenv("CSV_SAMPLE_FILE", "weather_sample.csv"))
 
 
 
@@ -9,17 +9,23 @@ Aufgaben:
     - Initialisierung des Flask-Servers und SocketIO
     - Routen und Websocket-Ereignisse definieren
     - Wetterdaten von einem Weather-Provider abrufen
-    - Karten mit Wetterinformationen generieren
+    - Karte (Leaflet) mit Koordinaten und Temperatur versorgen
     - Reagieren auf Frontend-Ereignisse via Websockets
 """
 
 # =============== IMPORTS ====================
+import asyncio
+import hashlib
 import logging
+import os
+import threading
+import uuid
 
 from datetime import datetime, timedelta, timezone
+from functools import partial
 
-from flask import Flask, render_template, jsonify, request, send_file
-from flask_socketio import SocketIO
+from flask import Flask, render_template, jsonify, request, send_file, make_response, session, has_request_context
+from flask_socketio import SocketIO, join_room, leave_room
 
 from geopy.geocoders import Nominatim
 
@@ -27,12 +33,22 @@ from io import BytesIO
 
 # Eigene Imports
 from backend.provider.csv_weather_provider import CSVWeatherProvider
-from backend.services import generate_map
-
-from backend.services.history.history_openmeteo import fetch_openmeteo_history_dataframe
-from backend.services.forecast.forecast_openmeteo import fetch_openmeteo_forecast_dataframe
-
-from backend.services.plotter import build_single_history_plot_png, build_single_forecast_plot_png
+from backend.provider.async_provider import as_async
+from backend.services.map_view import map_state, shell_context
+from backend.services.geocode_store import GeocodeStore, NOT_FOUND
+from backend.services.data_normalizer import city_key
+
+from backend.services.timeseries_cache import OpenMeteoTimeseriesCache
+from backend.services.observation_store import ObservationStore, DEFAULT_DIRECTORY as OBSERVATION_DIRECTORY
+from backend.services.ttl_cache import TTLCache
+from backend.services.session_state import SessionStore, ClientState
+from backend.services.weather_record import WeatherRecord, as_dict
+
+from backend.services.plotter import build_single_history_plot_png, build_single_forecast_plot_png, build_multi_panel_plot_png, PLOT_WIDTH_PX
+from backend.services.series_json import encode_series, encode_bundle, SERIES_ENCODINGS
+from backend.services.forecast.forecast_openmeteo import MAX_PAST_DAYS
+from backend.services.downsample import DOWNSAMPLE_METHODS
+from backend.services.render_pool import RenderPool, RenderPoolBusy, RenderTimeout
 
 # ============================================
 #    1) Logging -Konfiguration 
@@ -40,15 +56,39 @@ from backend.services.plotter import build_single_history_plot_png, build_single
 
 logger = logging.getLogger(__name__)
 
+
+# Fallback-Koordinaten (Berlin) für ungültige / unbekannte Städte
+DEFAULT_COORDINATES = (52.5200, 13.4050)
+
+# Open-Meteo-Vorhersage reicht höchstens 14 Tage weit
+FORECAST_MAX_DAYS = 14
+
+# Beschriftung der Zeitreihen: var -> (Titel-Präfix, Einheit)
+PLOT_LABELS = {
+    "temperature_2m": ("Temperatur", "°C"),
+    "relative_humidity_2m": ("Luftfeuchte", "%"),
+    "wind_speed_10m": ("Windgeschwindigkeit", "km/h"),
+}
+
+
+def plot_labels(kind, var, city):
+    """(Titel, Einheit) für History-/Forecast-Plots und -JSON."""
+    if var in PLOT_LABELS:
+        name, unit = PLOT_LABELS[var]
+        return f"{name} {'Vergangenheit' if kind == 'history' else 'Vorhersage'}: {city}", unit
+
+    return f"{'History' if kind == 'history' else 'Forecast'}: {city} ({var})", var
+
 # ============================================
 #    2)  BACKEND-CORE 
 # ============================================
 class WeatherDashboard:
     """Klasse für das WeatherDashboard"""
-    def __init__(self, provider = None):
+    def __init__(self, provider = None, geo_store = None):
         """KONSTRUKTOR: Initialisiert das WeatherDashboard mit Flask und SocketIO.
         Args:
             provider: Instanz eines Weather-Providers mit Methode get_weather_for_city(city) -> dict | None für Default CSV-Provider
+            geo_store: Persistenter Geocoding-Cache (GeocodeStore), Default: SQLite unter data/cache + Gazetteer
         """
         # Frontend-Ordner korrekt setzen
         self.app = Flask(
@@ -57,26 +97,80 @@ class WeatherDashboard:
             static_folder='../weather_dashboard/static'
         )
 
+        # Signierter Session-Cookie, damit jeder Browser seine eigene client_id (und damit eigene Stadt) behält
+        self.app.secret_key = os.getenv("FLASK_SECRET_KEY") or os.urandom(24).hex()
+
         self.socketio = SocketIO(self.app, cors_allowed_origins="*") # Noch alle CORS-Origins erlaubt, da es sich um Studentenprojekt handelt 
 
         # Provider auswählen: API oder Provider | Als Default CSV-Provider nutzen
         if provider is not None:
             self.provider = provider
         else:
-            self.provider = CSVWeatherProvider("weather_sample.csv")    
+            self.provider = CSVWeatherProvider(os.getenv("CSV_SAMPLE_FILE", "weather_sample.csv"))    
 
-        #Leer initialisieren, setzen in run() bzw. initialize()
-        self.city = None                    # Aktuelle Stadt
-        self.weather_data = None            # Wetterdaten für die Stadt als dict
+        #Leer initialisieren, setzen in run() bzw. initialize() -> Startzustand für NEUE Clients
+        self.city = None                    # Start-Stadt
+        self.weather_data = None            # Wetterdaten für die Start-Stadt als dict
         self.last_polled = None             # Zeitpunkt der letzten erfolgreichen Abfrage
+
+        # Zustand pro Client (Browser-Session / Socket.IO-Verbindung), begrenzt in Anzahl und Lebensdauer
+        self.sessions = SessionStore(
+            max_sessions=int(os.getenv("SESSION_MAX", "1000")),
+            idle_timeout=float(os.getenv("SESSION_IDLE_TIMEOUT", "3600"))
+        )
+
+        # Abos: city_key -> {"city": Anzeigename, "sids": {sid: client_id}} | sid -> city_key
+        # Jede Stadt ist ein Socket.IO-Raum, der Hintergrund-Poller lädt pro Raum EINMAL und sendet an alle
+        self.subscriptions = {}
+        self.sid_rooms = {}
+        self.subscriptions_lock = threading.Lock()
+
+        # Hintergrund-Poller (gestartet in run()), Intervall in Sekunden, 0 = aus
+        self.poll_interval = float(os.getenv("WEATHER_POLL_INTERVAL", "300"))
+        self.poller_running = False
              
         
-        #Geodaten für Karte cachen, damit Nominatim nicht unnötig oft die Koordinaten wandelt und die Stadt abholt für die Karte
-        self.geo_cache = {}
+        #Geodaten persistent cachen (SQLite + Gazetteer), damit Nominatim nicht unnötig oft die Koordinaten wandelt und die Stadt abholt für die Karte
+        self.geo_store = geo_store if geo_store is not None else GeocodeStore()
 
         #Geolocator Client bauen, später über Nominatim Städte zu Koordinaten auflösen
         self.geolocator = Nominatim(user_agent="weather_dashboard")
 
+        # History/Forecast-Zeitreihen einmal laden und für alle Variablen wiederverwenden
+        self.timeseries_cache = OpenMeteoTimeseriesCache()
+
+        # Eigene Historie: jedes Provider-Ergebnis wird pro Stadt angehängt (mmap-Zeitreihe) -> '*_history' in /weather
+        self.observations = ObservationStore(
+            directory=os.getenv("OBSERVATION_DIR") or OBSERVATION_DIRECTORY,
+            min_interval=float(os.getenv("OBSERVATION_MIN_INTERVAL", "60"))
+        )
+        self.history_hours = int(os.getenv("OBSERVATION_HISTORY_HOURS", "24"))
+
+        # Fertig gerenderte Plot-PNGs, Schlüssel enthält die Datenversion -> kein Ablauf nötig, nur LRU
+        self.plot_cache = TTLCache(max_entries=128, ttl=None, name="plot-png")
+
+        # Plots werden in einem eigenen Worker-Pool gerendert (nicht im Request-Thread), begrenzte Warteschlange -> 503
+        self.render_pool = RenderPool(
+            workers=int(os.getenv("RENDER_WORKERS", "0")) or None,
+            max_queue=int(os.getenv("RENDER_QUEUE")) if os.getenv("RENDER_QUEUE") else None,
+            timeout=float(os.getenv("RENDER_TIMEOUT", "20")),
+            mode=os.getenv("RENDER_MODE", "process").lower()
+        )
+
+        # Obergrenze für /weather/batch (schützt Provider / API-Quota)
+        self.batch_max_cities = int(os.getenv("BATCH_MAX_CITIES", "100"))
+
+        # Tage, die beim Stadtwechsel für History + Forecast vorgeladen werden (wie der Standard im Modal)
+        self.prefetch_days = int(os.getenv("PREFETCH_DAYS", "7"))
+
+        # Obergrenze für /history_plot.png (lange Reihen werden vor dem Plotten auf die Pixelbreite reduziert)
+        self.history_max_days = int(os.getenv("HISTORY_MAX_DAYS", "3650"))
+        self.plot_downsample = os.getenv("PLOT_DOWNSAMPLE", "minmax").lower()
+
+        if self.plot_downsample not in DOWNSAMPLE_METHODS:
+            logger.warning(f"PLOT_DOWNSAMPLE={self.plot_downsample!r} unbekannt, nutze 'minmax'")
+            self.plot_downsample = "minmax"
+
         # Aufruf der Hilfsfunktionen
         self.define_routes()
         self.define_socket_events()
@@ -95,15 +189,38 @@ class WeatherDashboard:
         # Route für die Hauptseite     
         @self.app.route('/')
         def index():
+            self.client_id()    # Session-Cookie mit client_id setzen, bevor der Socket verbindet
             return render_template('index.html')
 
+        # Route für die Karte: statische Leaflet-Seite, wird vom Browser EINMAL geladen (kein map.html mehr auf der Platte)
+        @self.app.route('/map')
+        def map_page():
+            response = make_response(render_template('map.html', **shell_context()))
+            response.add_etag()                         # gleicher Inhalt für alle -> 304 beim nächsten Laden
+            response.cache_control.no_cache = True
+            return response.make_conditional(request)
+
+        # Startzustand der Karte für DIESEN Client (danach kommen Updates über das 'update'-Event)
+        @self.app.route('/map/state')
+        def map_state_json():
+            state = self.client_state()
+
+            if not state.city:
+                return jsonify({"city": None, "error": "Keine Stadt gesetzt"}), 400
+
+            lat, lon = self.fetch_coordinates(state.city)
+            temp = state.weather_data.get("currentTemperature", "--") if state.weather_data is not None else "--"
+
+            return jsonify(map_state(state.city, lat, lon, temp))
+
         # Route für den API-Status / sichtbar im Dashboard oben rechts. Unterscheidet zwischen API und CSV und zeigt Letztten Abruf (last_polled an)
         @self.app.route('/status')
         def status():
             
             # 1) Quelle bestimmen (API/CSV)            
             
-            provider_klasse = self.provider.__class__.__name__
+            # Cache-Schicht (CachedWeatherProvider) überspringen, damit die eigentliche Quelle angezeigt wird
+            provider_klasse = getattr(self.provider, "provider", self.provider).__class__.__name__
 
             # Nimmt den Namen "openweather" oder "csv" so wie es das Frontend erwartet
             if provider_klasse == "APIWeatherProvider":
@@ -113,17 +230,28 @@ class WeatherDashboard:
             else:
                 provider_key = "unknown" 
 
-            # 2) Rückgabe
-            return jsonify({
+            # 2) Rückgabe (letzter Abruf dieses Clients, sonst der Startzustand)
+            last_polled = self.client_state().last_polled or self.last_polled
+
+            status_response = {
                 "apis": {
                     provider_key: {
-                        "status": "ok" if self.last_polled is not None else "unbekannt",
+                        "status": "ok" if last_polled is not None else "unbekannt",
                         "lastPolled": (
-                            self.last_polled.isoformat().replace("+00:00", "Z") if self.last_polled else None
+                            last_polled.isoformat().replace("+00:00", "Z") if last_polled else None
                         )
                     }
                 }
-            })
+            }
+
+            # 3) Cache-Zähler (Hits/Misses/Verdrängungen), falls der Provider gecached ist
+            if hasattr(self.provider, "stats"):
+                status_response["cache"] = self.provider.stats()
+
+            status_response["timeseriesCache"] = self.timeseries_cache.stats()
+            status_response["renderPool"] = self.render_pool.stats()
+
+            return jsonify(status_response)
 
        
 
@@ -131,7 +259,7 @@ class WeatherDashboard:
         @self.app.route('/weather')
         def weather():
             """
-            Liefert die aktuellen Wetterdaten für self.city als JSON.
+            Liefert die aktuellen Wetterdaten für die Stadt DIESES Clients als JSON.
             
             - HTTP Statuscode bei Fehlern
             - Daten werden refreshed beim Provider, wenn sie 
@@ -141,8 +269,11 @@ class WeatherDashboard:
 
             # ===== 1) FEHLER ABFANGEN / DATEN VALIDIEREN =====
 
+            # Zustand des anfragenden Clients (eigene Stadt, eigene Daten)
+            state = self.client_state()
+
             # Prüfen ob überhaupt eine Stadt gesetzt ist
-            if not self.city:
+            if not state.city:
                 logger.warning("Anfrage (Request) auf /weather ohne definierte Stadt")
 
                 return jsonify({
@@ -160,8 +291,8 @@ class WeatherDashboard:
     
             
             refresh_noetig = (
-                self.weather_data is None
-                or self.last_polled is None
+                state.weather_data is None
+                or state.last_polled is None
             )
             
            # ===== 3) REFRESH DER DATEN - DATEN ABHOLEN =====
@@ -169,20 +300,20 @@ class WeatherDashboard:
            #  Wenn Refresh nötig ist, dann das Wetter abrufen
             if refresh_noetig:
                 logger.info(
-                    f"/weather: Refresh nötig für (city='{self.city}', "
-                    f"last_polled={self.last_polled}"
+                    f"/weather: Refresh nötig für (city='{state.city}', "
+                    f"last_polled={state.last_polled}"
                 )
 
                 # --- Versuchen die Daten zu Refreshen ---
                 try:
-                    daten_fresh = self.provider.get_weather_for_city(self.city)
+                    daten_fresh = self.provider.get_weather_for_city(state.city)
 
                     # === FALL A: Provider liefert nichts (None) ===
                     if daten_fresh is None:
-                        logger.warning(f"/weather: Provider liefert keine Daten für '{self.city}'")
+                        logger.warning(f"/weather: Provider liefert keine Daten für '{state.city}'")
 
                         # Fallback 1: Cache existiert und wir können Cache-Daten zurückgeben (HTTP 200: OK)
-                        if self.weather_data is not None:
+                        if state.weather_data is not None:
                             logger.info("/weather: Cache vorhanden - verwende Cache-Daten als Fallback")
                                                       
                         # Fallback 2: Kein Cache und wir können nichts zurückliefern (HTTP 503: Service unavailable )
@@ -190,7 +321,7 @@ class WeatherDashboard:
                             logger.error("/weather: Kein Cache verfügbar, kann keine Daten liefern")
                             
                             return jsonify({
-                                "city": self.city,
+                                "city": state.city,
                                 "error": "Provider zur Zeit nicht verfügbar (Keine Daten und kein Cache vorhanden)"
                             }), 503 # 503: Service unavailable
 
@@ -198,15 +329,16 @@ class WeatherDashboard:
                     # === FALL B: Provider liefert gute Daten (dict) ===
                     else:
                         # Cache kann aktualisiert werden
-                        self.weather_data = daten_fresh
-                        self.last_polled = now
+                        state.weather_data = daten_fresh
+                        state.last_polled = now
+                        self.record_observation(state.city, daten_fresh)
                                     
                 # --- Fangen der harten Fehler die nicht im try-Block behandelt werden (Exception) ---
                 except Exception as e:                    
-                    logger.error(f"/weather: Fehler beim Abrufen für '{self.city}': {e}")
+                    logger.error(f"/weather: Fehler beim Abrufen für '{state.city}': {e}")
                     
                     # Fallback 1: Cache existiert und wir können Cache-Daten zurückgeben (HTTP 200: OK) 
-                    if self.weather_data is not None:
+                    if state.weather_data is not None:
                         logger.info("/weather: Fehler - Fallback auf Cache Daten")
 
                     # Fallback 2: Kein Cache vorhanden - Fehler!
@@ -214,49 +346,104 @@ class WeatherDashboard:
                         logger.error("/weather: Fehler - Kein Cache für Fallback verfügbar")
 
                         return jsonify({
-                            "city": self.city,
+                            "city": state.city,
                             "error": "Wetterdaten-Abruf ist fehlgeschlagen"
                         }), 503 #503 = Service unavailable
 
 
 
             # ===== 4) KOORDINATEN HOLEN FÜR MAP (noch keine Generierung) =====
-            logger.info(f"Koordinaten für '{self.city}' werden geholt")
-            lat, lon = self.fetch_coordinates(self.city)
+            logger.info(f"Koordinaten für '{state.city}' werden geholt")
+            lat, lon = self.fetch_coordinates(state.city)
             
 
 
             # ===== 5) RESPONSE BAUEN =====
             response = {        
-                "city": self.city,        
+                "city": state.city,        
                 "lat": lat,
                 "lon": lon,                                    
-                "lastPolled": self.last_polled.isoformat().replace("+00:00", "Z") if self.last_polled else None
+                "lastPolled": state.last_polled.isoformat().replace("+00:00", "Z") if state.last_polled else None
             }
 
-            # Damit History im Frontend nicht crasht, aber zumindest leer übergeben wird. Kann erweitert werden
-            # Frontend erwartet '_history' - Werte im response
-            # Alter Code aber Frontend erwartet den Teil in dem "normalen" Wetter-JSON der Aktualdaten
-            response.update({
-                "currentTemperature_history": [],
-                "humidity_history": [],
-                "pressure_history": [],
-            })
+            # Frontend erwartet '_history' - Werte im response (im "normalen" Wetter-JSON der Aktualdaten)
+            # -> aus der eigenen Beobachtungs-Zeitreihe (letzter Wert pro Stunde, leer solange nichts aufgezeichnet ist)
+            response.update(self.observation_history(state.city, state.weather_data))
             
             # Wetterdaten hinzufügen ins JSON dict
-            if isinstance(self.weather_data, dict):
-                response.update(self.weather_data)
+            if isinstance(state.weather_data, (dict, WeatherRecord)):
+                response.update(as_dict(state.weather_data))
 
             else:                                
                 logger.error("/weather: weather_data ist nicht verfügbar/kein dict")
                 return jsonify({
-                    "city": self.city,
+                    "city": state.city,
                     "error": "Keine Wetterdaten verfügbar"
                 }), 503 # 503 = Service unavailable
 
             return jsonify(response), 200 # 200 = OK        
 
 
+        # Route für mehrere Städte auf einmal (z.B. Wallboard)
+        @self.app.route('/weather/batch')
+        def weather_batch():
+            """
+            Liefert die aktuellen Wetterdaten für mehrere Städte als EIN JSON-Dokument.
+
+            - ?cities=Berlin,London,München   (oder mehrfach ?cities=...&cities=...)
+            - Doppelte Städte (Groß-/Kleinschreibung egal) werden nur einmal abgefragt
+            - Provider wird EINMAL mit der ganzen Liste gefragt (get_weather_for_cities)
+            """
+
+            # ===== 1) STÄDTE EINLESEN =====
+            cities = []
+            seen = set()
+
+            for value in request.args.getlist("cities"):
+                for city in value.split(","):
+                    city = city.strip()
+                    key = city_key(city)
+                    if key and key not in seen:
+                        seen.add(key)
+                        cities.append(city)
+
+            if not cities:
+                return jsonify({"error": "Keine Städte angegeben (?cities=Berlin,London)"}), 400
+
+            if len(cities) > self.batch_max_cities:
+                return jsonify({
+                    "error": f"Zu viele Städte ({len(cities)}), maximal {self.batch_max_cities}"
+                }), 400
+
+            # ===== 2) PROVIDER FRAGEN (Batch, falls vorhanden) =====
+            try:
+                if hasattr(self.provider, "get_weather_for_cities"):
+                    results = self.provider.get_weather_for_cities(cities)
+                else:
+                    results = [self.provider.get_weather_for_city(city) for city in cities]
+
+            except Exception as e:
+                logger.error(f"/weather/batch: Fehler beim Abrufen: {e}")
+                return jsonify({"error": "Wetterdaten-Abruf ist fehlgeschlagen"}), 503
+
+            # ===== 3) RESPONSE BAUEN =====
+            weather = {}
+            not_found = []
+
+            for city, data in zip(cities, results):
+                if data is None:
+                    not_found.append(city)
+                else:
+                    weather[city] = as_dict(data)      # WeatherRecord -> dict erst hier für das JSON
+
+            return jsonify({
+                "requested": len(cities),
+                "found": len(weather),
+                "weather": weather,
+                "notFound": not_found
+            }), 200
+
+
 
 
         # Route für die Vergangenheitsdaten / History
@@ -265,69 +452,40 @@ class WeatherDashboard:
         def history_plot_png():
             """
             Liefert ein Matplotlib-PNG für eine Variable (var).
-            Standard: letzte 2 Tage, UTC.
+            Standard: letzte 2 Tage, UTC, max. HISTORY_MAX_DAYS (lange Reihen werden per 'downsample' reduziert).
             """
 
             # Welche Variable soll geplottet werden?
             var = request.args.get("var", "temperature_2m")
 
-            # Zeitraum in Tagen
-            days = request.args.get("days", "2")
-            
-            try:
-                days = int(days)
-            except Exception:
-                days = 2
+            # Zeitraum in Tagen, begrenzt auf 1...HISTORY_MAX_DAYS Tage
+            days = self.request_days(default=2, maximum=self.history_max_days)
 
-            # Stadt: Aus der Anfrage oder ansonsten self.city nehmen
-            city = request.args.get("city")
-            
-            if city is None or str(city).strip() == "":
-                city = self.city
+            # Optional pro Anfrage: Downsampling-Verfahren (minmax | lttb | none)
+            downsample = request.args.get("downsample", self.plot_downsample).lower()
 
-            if city is None or str(city).strip() == "":
-                return jsonify({"error": "Keine Stadt gesetzt"}), 400
+            if downsample not in DOWNSAMPLE_METHODS:
+                return jsonify({"error": f"Unbekanntes Downsampling: {downsample}"}), 400
 
-            # Datum berechnen
-            end_date = datetime.now(timezone.utc).date() # Julian Test veraltet: datetime.utcnow().date()
-            start_date = end_date - timedelta(days=days)
+            # Stadt: Aus der Anfrage oder ansonsten die Stadt dieses Clients nehmen
+            city = self.request_city()
 
-            # Koordinaten holen
-            lat, lon = self.fetch_coordinates(city)
+            if city is None:
+                return jsonify({"error": "Keine Stadt gesetzt"}), 400
 
-            # DataFrame holen
-            df = fetch_openmeteo_history_dataframe(
-                lat=lat,
-                lon=lon,
-                start_date=start_date.isoformat(),
-                end_date=end_date.isoformat()
-            )
+            # DataFrame holen (gecached, enthält alle Variablen)
+            df = self.history_frame(city, days)
 
             # Plot-Beschriftung je nach 'var' (genau wie im Forecast)
-            if var == "temperature_2m":
-                title = f"Temperatur Vergangenheit: {city}"
-                y_label = "°C"
-            elif var == "relative_humidity_2m":
-                title = f"Luftfeuchte Vergangenheit: {city}"
-                y_label = "%"
-            elif var == "wind_speed_10m":
-                title = f"Windgeschwindigkeit Vergangenheit: {city}"
-                y_label = "km/h"
-            else:
-                title = f"History: {city} ({var})"
-                y_label = var
-
-            # Erstellen des Plots
-            png = build_single_history_plot_png(df, var, title, y_label)
-
-            if png is None:
-                return jsonify({"error": "Keine Plot-Daten für History verfügbar"}), 503
-
-            return send_file(
-                BytesIO(png),
-                mimetype="image/png",
-                as_attachment=False,
-                download_name="history.png"
+            title, y_label = plot_labels("history", var, city)
+
+            # Erstellen des Plots (bzw. aus dem PNG-Cache / 304 Not Modified)
+            return self.send_plot_png(
+                kind="history",
+                cache_key=("history", city, var, days, downsample),
+                df=df,
+                build=partial(build_single_history_plot_png, df, var, title, y_label, downsample=downsample),
+                error_text="Keine Plot-Daten für History verfügbar"
             )
 
         # Route für die Zukunftsdaten / Forecast
@@ -341,65 +499,119 @@ class WeatherDashboard:
             # Welche Variable soll geplottet werden?
             var = request.args.get("var", "temperature_2m")
 
-            # Zeitraum in Tagen
-            days = request.args.get("days", "7")
+            # Zeitraum in Tagen, begrenzt auf 1...14 Tage
+            days = self.request_days(default=7, maximum=FORECAST_MAX_DAYS)
 
-            try:
-                days = int(days)
-            except Exception:
-                days = 7
+            # Stadt: Aus der Anfrage oder ansonsten die Stadt dieses Clients nehmen
+            city = self.request_city()
 
-            # Begrenzen auf 1...14 Tage
-            if days < 1:
-                days = 1
-            if days > 14:
-                days = 14
+            if city is None:
+                return jsonify({"error": "Keine Stadt gesetzt"}), 400
 
-            # Stadt: Aus der Anfrage oder ansonsten self.city nehmen
-            city = request.args.get("city")
+            # DataFrame holen (gecached bis zum nächsten Modelllauf, enthält alle Variablen)
+            df = self.forecast_frame(city, days)
 
-            if city is None or str(city).strip() == "":
-                city = self.city
+            # Plot-Beschriftung je nach 'var' (genau wie bei history)
+            title, y_label = plot_labels("forecast", var, city)
+
+            # Erstellen des Plots (bzw. aus dem PNG-Cache / 304 Not Modified)
+            return self.send_plot_png(
+                kind="forecast",
+                cache_key=("forecast", city, var, days),
+                df=df,
+                build=partial(build_single_forecast_plot_png, df, var, title, y_label),
+                error_text="Keine Plot-Daten für Forecast verfügbar"
+            )
 
-            if city is None or str(city).strip() == "":
+        # Zeitreihen als kompaktes JSON -> der Browser zeichnet selbst (Plotly), kein Rendern auf dem Server
+        @self.app.route('/history.json')
+        def history_json():
+            """
+            Wie /history_plot.png, aber die Daten als Spalten (siehe series_json.py).
+            Zusätzliche Parameter: points (Zielanzahl, Default PLOT_WIDTH_PX), delta (0/1), encoding (json|base64)
+            """
+            days = self.request_days(default=2, maximum=self.history_max_days)
+            city = self.request_city()
+
+            if city is None:
                 return jsonify({"error": "Keine Stadt gesetzt"}), 400
 
-            # Koordinaten holen
-            lat, lon = self.fetch_coordinates(city)
+            return self.send_series_json("history", city, days, self.history_frame(city, days))
 
-            df = fetch_openmeteo_forecast_dataframe(
-                lat=lat,
-                lon=lon,
-                days=days
-            )
+        @self.app.route('/forecast.json')
+        def forecast_json():
+            """
+            Wie /forecast_plot.png, aber die Daten als Spalten (siehe series_json.py).
+            """
+            days = self.request_days(default=7, maximum=FORECAST_MAX_DAYS)
+            city = self.request_city()
 
-            # Plot-Beschriftung je nach 'var' (genau wie bei history)
-            if var == "temperature_2m":
-                title = f"Temperatur Vorhersage: {city}"
-                y_label = "°C"
-            elif var == "relative_humidity_2m":
-                title = f"Luftfeuchte Vorhersage: {city}"
-                y_label = "%"
-            elif var == "wind_speed_10m":
-                title = f"Windgeschwindigkeit Vorhersage: {city}"
-                y_label = "km/h"
-            else:
-                title = f"Forecast: {city} ({var})"
-                y_label = var
+            if city is None:
+                return jsonify({"error": "Keine Stadt gesetzt"}), 400
 
-            # Erstellen des Plots
-            png = build_single_forecast_plot_png(df, var, title, y_label)
+            return self.send_series_json("forecast", city, days, self.forecast_frame(city, days))
 
-            if png is None:
-                return jsonify({"error": "Keine Plot-Daten für Forecast verfügbar"}), 503
-            
-            return send_file(
-                BytesIO(png),
-                mimetype="image/png",
-                as_attachment=False,
-                download_name="forecast.png"
+        # Mehrere Variablen, Vergangenheit + Vorhersage: EIN Open-Meteo-Abruf und EIN Bild bzw. EIN JSON pro Stadt
+        @self.app.route('/timeseries.png')
+        def timeseries_png():
+            """
+            Ein Panel pro Variable (vars=temperature_2m,relative_humidity_2m,...; Default: alle),
+            'past' Tage Vergangenheit (0...92, Default 2) + 'future' Tage Vorhersage (1...14, Default 7),
+            gestrichelte Linie = Abrufzeitpunkt der Daten.
+            """
+            variables = self.request_variables()
+
+            if variables is None:
+                return jsonify({"error": f"Unbekannte Variable (erlaubt: {', '.join(PLOT_LABELS)})"}), 400
+
+            past = self.request_days(default=2, maximum=MAX_PAST_DAYS, name="past", minimum=0)
+            future = self.request_days(default=7, maximum=FORECAST_MAX_DAYS, name="future")
+
+            downsample = request.args.get("downsample", self.plot_downsample).lower()
+
+            if downsample not in DOWNSAMPLE_METHODS:
+                return jsonify({"error": f"Unbekanntes Downsampling: {downsample}"}), 400
+
+            city = self.request_city()
+
+            if city is None:
+                return jsonify({"error": "Keine Stadt gesetzt"}), 400
+
+            df = self.combined_frame(city, past, future)
+
+            title = f"{city}: {past} Tage Vergangenheit + {future} Tage Vorhersage"
+            y_labels = [f"{PLOT_LABELS[var][0]} ({PLOT_LABELS[var][1]})" for var in variables]
+            fetched_at = df.attrs.get("fetched_at") if df is not None else None
+            now = datetime.fromtimestamp(fetched_at, tz=timezone.utc) if fetched_at is not None else None
+
+            return self.send_plot_png(
+                kind="timeseries",
+                cache_key=("timeseries", city, tuple(variables), past, future, downsample),
+                df=df,
+                build=partial(build_multi_panel_plot_png, df, variables, title, y_labels, now=now, downsample=downsample),
+                error_text="Keine Zeitreihen-Daten verfügbar"
             )
 
+        @self.app.route('/timeseries.json')
+        def timeseries_json():
+            """
+            Wie /timeseries.png, aber alle Variablen als EIN JSON (gemeinsame Zeitachse, siehe series_json.py).
+            """
+            variables = self.request_variables()
+
+            if variables is None:
+                return jsonify({"error": f"Unbekannte Variable (erlaubt: {', '.join(PLOT_LABELS)})"}), 400
+
+            past = self.request_days(default=2, maximum=MAX_PAST_DAYS, name="past", minimum=0)
+            future = self.request_days(default=7, maximum=FORECAST_MAX_DAYS, name="future")
+            city = self.request_city()
+
+            if city is None:
+                return jsonify({"error": "Keine Stadt gesetzt"}), 400
+
+            days = {"past": past, "future": future}
+            return self.send_series_json("timeseries", city, days, self.combined_frame(city, past, future), variables=variables)
+
 
     # ========================================
     # SOCKET → erhält (neue) Stadt vom Frontend
@@ -414,6 +626,9 @@ class WeatherDashboard:
 
             # ===== 1) EINGABEN ABFANGEN UND PRÜFEN OB O.K. =====
 
+            # Zustand des sendenden Clients (nur dessen Stadt wird gewechselt)
+            state = self.client_state()
+
             # Prüfen ob Daten da sind, wenn nicht, leeren Dict nutzen
             if data is None:
                 data = {}
@@ -441,8 +656,8 @@ class WeatherDashboard:
                 return
             
             # Prüfen, ob die neue Stadt == der aktuellen Stadt ist
-            if self.city is not None:
-                old_city_str = str(self.city).strip()
+            if state.city is not None:
+                old_city_str = str(state.city).strip()
 
                 if new_city_str.lower() == old_city_str.lower():
                     logger.debug(f"cityInput: Stadt unverändert: '{new_city_str}'")
@@ -451,61 +666,283 @@ class WeatherDashboard:
 
             # ===== 2) NEUE STADT versuchen =====
 
-            logger.info(f"🌍 Versuche Stadtwechsel → '{new_city_str}' (vorher: '{self.city}')")          
+            logger.info(f"🌍 Versuche Stadtwechsel → '{new_city_str}' (vorher: '{state.city}')")          
             
-            # Sofort Wetter versuchen abzuholen
-            updated_data = self.provider.get_weather_for_city(new_city_str) # hier jetzt new_city_str
+            # Sofort Wetter + Koordinaten GLEICHZEITIG abholen (History + Forecast werden danach im Hintergrund vorgewärmt)
+            updated_data, (lat, lon) = self.load_city(new_city_str)
 
             if updated_data is None:
                 logger.warning(f"cityInput: Keine Wetterdaten für Stadt '{new_city_str}' gefunden.") # Hier jetzt New City
 
                 # Frontend benachrichtigen, dass Stadt nicht gefunden wurde #ggf. erweitern, falls Frontend in Zukunft mehr "versteht"
                 error_payload = {
-                    "city": self.city               # Wenn keine neue Stadt (new_city_str) gefunden wieder auf alte zurückfallen                    
+                    "city": state.city               # Wenn keine neue Stadt (new_city_str) gefunden wieder auf alte zurückfallen                    
                 }                    
 
-                self.socketio.emit("update", error_payload)
+                self.socketio.emit("update", error_payload, to=request.sid)     # Nur an den anfragenden Client
                 return
 
             # ===== 3) ERFOLG -> STADT ÜBERNEHMEN =====
 
-            logger.info(f"✅ Stadtwechsel erfolgreich: '{self.city}' → '{new_city_str}'") # Erst hier die Stadt wirklich übernommen, wenn sie auch gefunden wurde
+            logger.info(f"✅ Stadtwechsel erfolgreich: '{state.city}' → '{new_city_str}'") # Erst hier die Stadt wirklich übernommen, wenn sie auch gefunden wurde
+
+            state.city = new_city_str
+            state.weather_data = updated_data
+            state.last_polled = datetime.now(timezone.utc)   
+            self.record_observation(state.city, updated_data)
 
-            self.city = new_city_str
-            self.weather_data = updated_data
-            self.last_polled = datetime.now(timezone.utc)   
+            # Raum wechseln: ab jetzt kommen die Poller-Updates der neuen Stadt
+            self.subscribe(request.sid, state.city)
+
+
+            # ===== 4) FRONTEND BENACHRICHTIGEN =====           
+            
+            #payload zusammenbauen - ggf. erweitern für Frontend wenn es mehr "versteht"
+            # (enthält lat/lon/currentTemperature -> das Dashboard verschiebt damit die Karte, siehe map_view.py)
+            payload = self.build_update_payload(state.city, lat, lon, state.weather_data)
 
+            # Live Update NUR an den anfragenden Client (andere Dashboards behalten ihre Stadt)
+            self.socketio.emit("update", payload, to=request.sid) # J: payload ist das dict mit den Daten
 
-            # ===== 4) KARTE GENERIEREN =====
 
-            # Neue Koordinaten holen
-            lat, lon = self.fetch_coordinates(self.city)
+        @self.socketio.on("connect")
+        def socket_connect(*args):
+            """Neue Verbindung: Raum der aktuellen Stadt des Clients betreten (für Poller-Updates)."""
+            state = self.client_state()
+            if state.city:
+                self.subscribe(request.sid, state.city)
+
+
+        @self.socketio.on("disconnect")
+        def socket_disconnect(*args):
+            """Abo beenden; Verbindung ohne Session-Cookie: Zustand hing an der sid -> freigeben."""
+            self.unsubscribe(request.sid)
+            self.sessions.remove(request.sid)
+
+
+    # ========================================
+    # RÄUME / ABOS PRO STADT
+    # ========================================
+
+    def subscribe(self, sid, city):
+        """Meldet eine Socket-Verbindung für die Updates einer Stadt an (verlässt den alten Raum)."""
+
+        new_key = city_key(city)
+        if new_key == "":
+            return
+
+        client_id = self.client_id()
+
+        with self.subscriptions_lock:
+            old_key = self.sid_rooms.get(sid)
+
+            # Alten Raum verlassen, leere Abos entfernen (Speicher begrenzt)
+            if old_key is not None and old_key != new_key:
+                old_sub = self.subscriptions.get(old_key)
+                if old_sub is not None:
+                    old_sub["sids"].pop(sid, None)
+                    if not old_sub["sids"]:
+                        del self.subscriptions[old_key]
+                leave_room(f"city:{old_key}", sid=sid, namespace="/")
+
+            sub = self.subscriptions.setdefault(new_key, {"city": str(city).strip(), "sids": {}})
+            sub["sids"][sid] = client_id
+            self.sid_rooms[sid] = new_key
+
+        join_room(f"city:{new_key}", sid=sid, namespace="/")
+
+
+    def unsubscribe(self, sid):
+        """Entfernt eine Socket-Verbindung aus ihrem Stadt-Raum (z.B. beim Disconnect)."""
+
+        with self.subscriptions_lock:
+            key = self.sid_rooms.pop(sid, None)
+            if key is None:
+                return
+
+            sub = self.subscriptions.get(key)
+            if sub is not None:
+                sub["sids"].pop(sid, None)
+                if not sub["sids"]:
+                    del self.subscriptions[key]
+
+
+    def build_update_payload(self, city, lat, lon, weather_data):
+        """Baut das 'update'-Event für das Frontend (Stadt, Koordinaten + Wetterdaten)."""
+
+        payload = {
+            "city": city,
+            "lat": lat,
+            "lon": lon
+        }
+
+        # Wetterdaten hinzufügen (WeatherRecord/dict -> erst hier ein dict für das Event)
+        payload.update(as_dict(weather_data))
+
+        # Eigene Historie (inkl. des gerade aufgezeichneten Werts)
+        payload.update(self.observation_history(city, weather_data))
+
+        return payload
+
+
+    # ========================================
+    # EIGENE HISTORIE (Beobachtungen)
+    # ========================================
+
+    def record_observation(self, city, weather_data):
+        """Hängt ein Provider-Ergebnis an die Zeitreihe der Stadt an (Fehler dürfen den Abruf nicht stören)."""
+        try:
+            self.observations.append(city, weather_data)
+        except Exception as e:
+            logger.warning(f"Beobachtung für '{city}' konnte nicht gespeichert werden: {e}")
+
+
+    def observation_history(self, city, weather_data=None):
+        """
+        '*_history'-Listen für das Frontend aus der eigenen Zeitreihe (leer bei Fehlern).
+        Stunden in Ortszeit der Stadt (utcOffset aus weather_data, ohne Angabe UTC).
+        """
+        utc_offset = (weather_data.get("utcOffset") if weather_data is not None else None) or 0
+        try:
+            return self.observations.hourly_history(city, hours=self.history_hours, utc_offset=utc_offset)
+        except Exception as e:
+            logger.warning(f"Historie für '{city}' konnte nicht gelesen werden: {e}")
+            return {"currentTemperature_history": [], "humidity_history": [], "pressure_history": []}
+
+
+    # ========================================
+    # HINTERGRUND-POLLER
+    # ========================================
+
+    def start_poller(self):
+        """Startet den Poller als Socket.IO-Hintergrundtask (nur einmal)."""
+
+        if self.poll_interval <= 0 or self.poller_running:
+            return
+
+        self.poller_running = True
+        self.socketio.start_background_task(self._poll_loop)
+
+        logger.info(f"🔁 Hintergrund-Poller aktiv (alle {self.poll_interval:.0f}s pro abonnierter Stadt)")
+
+
+    def stop_poller(self):
+        """Beendet den Poller nach dem aktuellen Durchlauf."""
+        self.poller_running = False
+
+
+    def _poll_loop(self):
+        """Endlosschleife: warten, dann alle abonnierten Städte einmal abfragen."""
+        while self.poller_running:
+            self.socketio.sleep(self.poll_interval)
+
+            if not self.poller_running:
+                break
 
-            # Karte generieren mit evtl. aktuellem Temperaturwert
             try:
-                current_temp = self.weather_data.get("currentTemperature", "--")
-                generate_map.generate_map(lat, lon, temp=current_temp)
+                self.poll_once()
+            except Exception as e:
+                logger.error(f"Poller: Unerwarteter Fehler: {e}")
 
+
+    def poll_once(self):
+        """
+        Fragt jede Stadt mit mindestens einem Abonnenten GENAU EINMAL ab und
+        sendet ein 'update' an den Raum -> Provider-Aufrufe skalieren mit Städten, nicht mit Clients.
+        """
+
+        # ===== 1) MOMENTAUFNAHME DER ABOS =====
+        with self.subscriptions_lock:
+            snapshot = [
+                (key, sub["city"], list(sub["sids"].values()))
+                for key, sub in self.subscriptions.items()
+                if sub["sids"]
+            ]
+
+        for key, city, client_ids in snapshot:
+
+            # ===== 2) EINMAL PRO STADT ABFRAGEN (Cache umgehen, der Poller IST der Refresh) =====
+            if hasattr(self.provider, "invalidate"):
+                self.provider.invalidate(city)
+
+            try:
+                data = self.provider.get_weather_for_city(city)
             except Exception as e:
-                logger.error(f"Fehler beim Generieren der Karte für Stadt '{self.city}': {e}")
-                
-            
+                logger.error(f"Poller: Fehler beim Abrufen für '{city}': {e}")
+                continue
 
-            # ===== 5) FRONTEND BENACHRICHTIGEN =====           
-            
-            #payload zusammenbauen - ggf. erweitern für Frontend wenn es mehr "versteht"
-            payload = {
-                "city": self.city,
-                "lat": lat,
-                "lon": lon
-            }
+            if data is None:
+                logger.warning(f"Poller: Keine Daten für '{city}'")
+                continue
+
+            now = datetime.now(timezone.utc)
+            self.record_observation(city, data)
 
-            # Wetterdaten hinzufügen
-            for key, value in self.weather_data.items():
-                payload[key] = value
+            # ===== 3) ZUSTÄNDE DER ABONNENTEN (und ggf. Startzustand) AKTUALISIEREN =====
+            for client_id in set(client_ids):
+                state = self.sessions.get(client_id) if client_id else None
+                if state is not None and city_key(state.city) == key:
+                    state.weather_data = data
+                    state.last_polled = now
 
-            # Live Update an Frontend für Aktualisierung
-            self.socketio.emit("update", payload) # J: payload ist das dict mit den Daten
+            if self.city and city_key(self.city) == key:
+                self.weather_data = data
+                self.last_polled = now
+
+            # ===== 4) EIN UPDATE PRO RAUM =====
+            lat, lon = self.fetch_coordinates(city)
+            payload = self.build_update_payload(city, lat, lon, data)
+
+            self.socketio.emit("update", payload, to=f"city:{key}")
+
+            logger.debug(f"Poller: Update für '{city}' an {len(client_ids)} Client(s) gesendet")
+
+
+    # ========================================
+    # CLIENT-ZUSTAND (pro Session / Socket)
+    # ========================================
+
+    def client_id(self):
+        """
+        Liefert die ID des aktuellen Clients.
+        - HTTP: client_id aus dem (signierten) Session-Cookie, wird bei Bedarf angelegt
+        - Socket.IO: client_id aus der beim Connect übernommenen Session, sonst die Socket-sid
+        """
+        if not has_request_context():
+            return None
+
+        client_id = session.get("client_id")
+
+        if client_id:
+            return client_id
+
+        # Socket.IO-Kontext ohne Cookie: Die Verbindung selbst ist der Client
+        sid = getattr(request, "sid", None)
+        if sid is not None:
+            return sid
+
+        # HTTP-Kontext: neue client_id vergeben (wird als Cookie zurückgeschickt)
+        client_id = uuid.uuid4().hex
+        session["client_id"] = client_id
+        return client_id
+
+
+    def client_state(self):
+        """Liefert den ClientState des aktuellen Clients (neu: Startzustand aus initialize())."""
+
+        client_id = self.client_id()
+
+        factory = lambda: ClientState(
+            city=self.city,
+            weather_data=self.weather_data,
+            last_polled=self.last_polled
+        )
+
+        # Außerhalb eines Requests (z.B. Tests/Hintergrund): nicht speichern
+        if client_id is None:
+            return factory()
+
+        return self.sessions.get_or_create(client_id, factory)
 
 
     # ========================================
@@ -535,13 +972,14 @@ class WeatherDashboard:
 
         logger.info(f"Initialisiere Dashboard mit Stadt '{city_clean}'.")
 
-        data = self.provider.get_weather_for_city(city_clean)
+        # Wetter, Koordinaten und Zeitreihen gleichzeitig laden
+        data, (lat, lon) = self.load_city(city_clean)
 
         # Wenn keine Daten abgerufen wurden und nicht Berlin (Default) verwendet wurde
         if data is None and city_clean.lower() != "berlin":
             logger.warning(f"Initialisierung: Keine Daten für '{city_clean}'. Fallback auf Berlin.")
             city_clean = "Berlin"
-            data = self.provider.get_weather_for_city(city_clean)
+            data, (lat, lon) = self.load_city(city_clean)
 
         # Wenn keine Daten abgerufen wurden und selbst "berlin" nicht funktioniert
         if data is None:
@@ -552,14 +990,261 @@ class WeatherDashboard:
         self.city = city_clean
         self.weather_data = data
         self.last_polled = datetime.now(timezone.utc)  
+        self.record_observation(self.city, data)
+
+
+
+    # ========================================
+    # STADT LADEN (asyncio, alles gleichzeitig)
+    # ========================================
+
+    def load_city(self, city):
+        """
+        Lädt, was der Stadtwechsel braucht, GLEICHZEITIG:
+            - aktuelles Wetter (Provider)
+            - Koordinaten (GeocodeStore / Nominatim)
+        -> Dauer ≈ langsamster der beiden Aufrufe statt Summe.
+
+        History + Forecast (Open-Meteo) werden danach im Hintergrund vorgewärmt (prefetch_timeseries),
+        der Stadtwechsel wartet NICHT darauf. Kein Vorwärmen, wenn die Stadt nicht gefunden wurde
+        (kein Wetter oder nur Berlin-Fallback bei den Koordinaten).
+
+        Returns:
+            (weather_data | None, (lat, lon))
+        """
+        return asyncio.run(self.load_city_async(city))
+
+
+    async def load_city_async(self, city):
+        """Async-Variante von load_city (für Aufrufer mit eigener Event-Loop)."""
+
+        weather_data, coordinates = await asyncio.gather(
+            as_async(self.provider).get_weather_for_city_async(city),
+            asyncio.to_thread(self.lookup_coordinates, city)
+        )
+
+        if coordinates is None:
+            return weather_data, DEFAULT_COORDINATES
 
-        # Karte erstellen
-        lat, lon = self.fetch_coordinates(self.city)
+        if weather_data is not None:
+            self.socketio.start_background_task(self.prefetch_timeseries, city, *coordinates)
+
+        return weather_data, coordinates
+
+
+    def prefetch_timeseries(self, city, lat, lon):
+        """History + Forecast der letzten/nächsten PREFETCH_DAYS Tage in den Timeseries-Cache laden (Hintergrund)."""
+
+        start_date, end_date = self.history_range(self.prefetch_days)
+
+        async def both():
+            return await asyncio.gather(
+                self.timeseries_cache.get_history_async(lat, lon, start_date, end_date),
+                self.timeseries_cache.get_forecast_async(lat, lon, self.prefetch_days),
+                return_exceptions=True
+            )
+
+        # Nur vorwärmen: Fehler werden geloggt, die Plot-Routen laden bei Bedarf selbst
+        for result in asyncio.run(both()):
+            if isinstance(result, Exception):
+                logger.warning(f"prefetch: Zeitreihen für '{city}' nicht vorgeladen: {result}")
+
+
+    def request_city(self):
+        """Stadt aus ?city= oder die Stadt dieses Clients (None, wenn keine gesetzt ist)."""
+        city = request.args.get("city")
+
+        if city is None or str(city).strip() == "":
+            city = self.client_state().city
+
+        if city is None or str(city).strip() == "":
+            return None
+
+        return str(city).strip()
+
+
+    @staticmethod
+    def request_days(default, maximum, name="days", minimum=1):
+        """?days= (bzw. ?<name>=) als int, ungültig -> default, begrenzt auf minimum...maximum."""
         try:
-            current_temp = self.weather_data.get("currentTemperature", "--")
-            generate_map.generate_map(lat, lon, temp=current_temp)
-        except Exception as e:
-            logger.error(f"Fehler beim Generieren der Karte für Stadt '{self.city}': {e}")
+            days = int(request.args.get(name, default))
+        except (TypeError, ValueError):
+            days = default
+
+        return max(minimum, min(days, maximum))
+
+
+    @staticmethod
+    def request_variables():
+        """?vars= (kommagetrennt, Default: alle aus PLOT_LABELS) als Liste, None bei unbekannter Variable."""
+        raw = request.args.get("vars", "")
+        variables = list(dict.fromkeys(v.strip() for v in raw.split(",") if v.strip())) or list(PLOT_LABELS)
+
+        if any(var not in PLOT_LABELS for var in variables):
+            return None
+
+        return variables
+
+
+    def history_frame(self, city, days):
+        """History-DataFrame (alle Variablen) der letzten 'days' Tage für eine Stadt."""
+        start_date, end_date = self.history_range(days)
+        lat, lon = self.fetch_coordinates(city)
+        return self.timeseries_cache.get_history(lat=lat, lon=lon, start_date=start_date, end_date=end_date)
+
+
+    def forecast_frame(self, city, days):
+        """Forecast-DataFrame (alle Variablen) der nächsten 'days' Tage für eine Stadt."""
+        lat, lon = self.fetch_coordinates(city)
+        return self.timeseries_cache.get_forecast(lat=lat, lon=lon, days=days)
+
+
+    def combined_frame(self, city, past_days, future_days):
+        """Vergangenheit + Vorhersage (alle Variablen) am Stück aus EINEM Open-Meteo-Abruf."""
+        lat, lon = self.fetch_coordinates(city)
+        return self.timeseries_cache.get_combined(lat=lat, lon=lon, past_days=past_days, future_days=future_days)
+
+
+    @staticmethod
+    def history_range(days):
+        """(start_date, end_date) als ISO-Strings für die letzten 'days' Tage (UTC)."""
+        end_date = datetime.now(timezone.utc).date()
+        start_date = end_date - timedelta(days=days)
+        return start_date.isoformat(), end_date.isoformat()
+
+
+    # ========================================
+    # HELPER → Plot-PNG mit Cache + ETag/304
+    # ========================================
+    def send_plot_png(self, kind, cache_key, df, build, error_text):
+        """
+        Liefert ein Plot-PNG mit ETag + Last-Modified.
+        - Datenversion (df.attrs["fetched_at"] aus dem Timeseries-Cache) ist Teil des Schlüssels
+        - Browser schickt If-None-Match -> 304 ohne Rendern und ohne Bild-Bytes
+        - Bereits gerenderte PNGs kommen aus self.plot_cache (kein Matplotlib-Aufruf)
+        - Gerendert wird im Render-Pool ('build' muss picklebar sein, z.B. functools.partial einer Modul-Funktion),
+          volle Warteschlange / Timeout -> 503 mit Retry-After
+        """
+
+        # ===== 1) DATENVERSION BESTIMMEN =====
+        data_version = df.attrs.get("fetched_at") if df is not None else None
+
+        # Ohne Version (z.B. Fehler beim Laden) nicht cachen, normal rendern
+        if data_version is None:
+            try:
+                png = self.render_pool.render(build)
+            except (RenderPoolBusy, RenderTimeout) as e:
+                return self.render_unavailable(e)
+            if png is None:
+                return jsonify({"error": error_text}), 503
+            return send_file(BytesIO(png), mimetype="image/png", as_attachment=False, download_name=f"{kind}.png")
+
+        full_key = cache_key + (data_version,)
+        etag = hashlib.sha1(repr(full_key).encode("utf-8")).hexdigest()
+        last_modified = datetime.fromtimestamp(data_version, tz=timezone.utc)
+
+        # ===== 2) BROWSER HAT DIESE VERSION SCHON -> 304 =====
+        if request.if_none_match.contains(etag):
+            response = make_response("", 304)
+            response.set_etag(etag)
+            response.last_modified = last_modified
+            response.cache_control.no_cache = True
+            return response
+
+        # ===== 3) PNG AUS CACHE ODER NEU RENDERN =====
+        png = self.plot_cache.get(full_key)
+
+        if png is None:
+            # Gleicher Schlüssel gleichzeitig angefragt -> nur ein Rendering im Pool
+            try:
+                png = self.render_pool.render(build, key=full_key)
+            except (RenderPoolBusy, RenderTimeout) as e:
+                return self.render_unavailable(e)
+
+            if png is None:
+                return jsonify({"error": error_text}), 503
+
+            self.plot_cache.set(full_key, png)
+
+        # ===== 4) SENDEN (conditional=True beantwortet auch If-Modified-Since mit 304) =====
+        response = send_file(
+            BytesIO(png),
+            mimetype="image/png",
+            as_attachment=False,
+            download_name=f"{kind}.png",
+            etag=etag,
+            last_modified=last_modified,
+            conditional=True,
+            max_age=0
+        )
+        response.cache_control.no_cache = True     # Browser darf cachen, muss aber per ETag nachfragen
+        return response
+
+
+    # ========================================
+    # HELPER → Zeitreihe als JSON (Client-Charts) mit ETag/304
+    # ========================================
+    def send_series_json(self, kind, city, days, df, variables=None):
+        """
+        Antwort für /history.json und /forecast.json: Spalten (t0 + Zeit-Offsets, float32-Werte).
+        - Gleiche Datenversion wie bei den PNGs -> ETag, der Browser bekommt bei gleichen Daten ein 304
+        - Kein Matplotlib, kein Render-Pool: nur Zahlen (wenige KB statt ~150 KB PNG)
+        - variables (Liste): mehrere Variablen auf einer Zeitachse (/timeseries.json), sonst ?var=
+        """
+        var = request.args.get("var", "temperature_2m")
+        downsample = request.args.get("downsample", self.plot_downsample).lower()
+        encoding = request.args.get("encoding", "json").lower()
+        delta = request.args.get("delta", "1") not in ("0", "false", "no")
+
+        try:
+            points = max(10, min(int(request.args.get("points", PLOT_WIDTH_PX)), 10000))
+        except (TypeError, ValueError):
+            points = PLOT_WIDTH_PX
+
+        if downsample not in DOWNSAMPLE_METHODS:
+            return jsonify({"error": f"Unbekanntes Downsampling: {downsample}"}), 400
+
+        if encoding not in SERIES_ENCODINGS:
+            return jsonify({"error": f"Unbekannte Kodierung: {encoding}"}), 400
+
+        if variables is None:
+            payload = encode_series(df, var, points, method=downsample, delta=delta, encoding=encoding)
+        else:
+            payload = encode_bundle(df, variables, points, method=downsample, delta=delta, encoding=encoding)
+
+        if payload is None:
+            return jsonify({"error": f"Keine Daten für {kind} verfügbar"}), 503
+
+        # ETag aus Datenversion + Parametern (ohne Version, z.B. ungecacht: normale Antwort)
+        data_version = df.attrs.get("fetched_at")
+
+        if variables is None:
+            title, unit = plot_labels(kind, var, city)
+            payload.update({"kind": kind, "city": city, "days": days, "title": title, "unit": unit})
+        else:
+            labels = {v: {"title": PLOT_LABELS[v][0], "unit": PLOT_LABELS[v][1]} for v in payload["vars"]}
+            payload.update({"kind": kind, "city": city, "days": days, "labels": labels, "now": data_version})
+
+        response = jsonify(payload)
+
+        if data_version is not None:
+            full_key = (kind, city, var if variables is None else tuple(variables), repr(days),
+                        downsample, encoding, delta, points, data_version)
+            response.set_etag(hashlib.sha1(repr(full_key).encode("utf-8")).hexdigest())
+            response.last_modified = datetime.fromtimestamp(data_version, tz=timezone.utc)
+            response.cache_control.no_cache = True
+            response = response.make_conditional(request)
+
+        return response
+
+
+    @staticmethod
+    def render_unavailable(error):
+        """503 + Retry-After, wenn der Render-Pool voll ist oder das Rendern zu lange dauert."""
+        logger.warning(f"Plot nicht gerendert: {error}")
+        response = make_response(jsonify({"error": str(error)}), 503)
+        response.headers["Retry-After"] = str(error.retry_after)
+        return response
 
 
 
@@ -568,54 +1253,71 @@ class WeatherDashboard:
     # ========================================
     def fetch_coordinates(self, city):
         """ 
-        Holt die Koordinaten (lat, lon) für eine Stadt über Geopy (Nominatim).
-        - ungültige Eingaben wie 'None' oder ein leerer String fallen auf Berlin zurück
-        - Bekannte Städte (zuvor aufgerufen) werden aus Cache abgeholt für Laufzeit Optimierung
+        Holt die Koordinaten (lat, lon) für eine Stadt (siehe lookup_coordinates).
+        - ungültige Eingaben, unbekannte Städte oder Fehler fallen auf Berlin zurück
+        """
+        coordinates = self.lookup_coordinates(city)
+        return coordinates if coordinates is not None else DEFAULT_COORDINATES
+
+
+    def lookup_coordinates(self, city):
+        """ 
+        Holt die Koordinaten (lat, lon) für eine Stadt über Geopy (Nominatim), None wenn es keine gibt.
+        - ungültige Eingaben wie 'None' oder ein leerer String -> None
+        - Bekannte Städte (Gazetteer oder zuvor aufgerufen) kommen aus dem persistenten GeocodeStore
+        - Städte, die zuletzt nicht gefunden wurden (negativer Eintrag), fragen Nominatim NICHT erneut
         - Unbekannte Städte werden über Geopy/Nominatim abgeholt
-        - Fehler oder kein Treffer fallen auf Berlin zurück
+        - Fehler oder kein Treffer -> None
         """
 
         # ===== 1) FEHLER ABFANGEN / VALIDATION =====
 
-        # Stadt ist None oder leer, Fallback auf Berlin
+        # Stadt ist None oder leer
         if city is None:
-            logger.warning("fetch_coordinates: Stadt ist None, Fallback auf Berlin.")
-            return 52.5200, 13.4050
+            logger.warning("lookup_coordinates: Stadt ist None.")
+            return None
 
         # Stadt-String trimmen und prüfen ob leer ist 
         city_str = str(city).strip()
         if city_str == "":
-            logger.warning("fetch_coordinates: Stadt ist leer, Fallback auf Berlin.")
-            return 52.5200, 13.4050 # Berlin
+            logger.warning("lookup_coordinates: Stadt ist leer.")
+            return None
 
-        # ===== 2) CACHE PRÜFEN =====
+        # ===== 2) CACHE PRÜFEN (SQLite + Gazetteer) =====
 
-        cached_geo = city_str.lower()
+        cached_geo = self.geo_store.lookup(city_str)
 
-        if cached_geo in self.geo_cache:
-            return self.geo_cache[cached_geo]
+        if cached_geo == NOT_FOUND:
+            logger.debug(f"lookup_coordinates: '{city_str}' ist als 'nicht gefunden' gecached.")
+            return None
+
+        if cached_geo is not None:
+            return cached_geo
 
         # ===== 3) GEOCODING VERSUCHEN =====
         
         try:
-            logger.info(f"fetch_coordinates: Geocoding für Stadt '{city_str}'")
+            logger.info(f"lookup_coordinates: Geocoding für Stadt '{city_str}'")
             
             location = self.geolocator.geocode(city_str)
 
             if location is not None:
                 koordinaten = (location.latitude, location.longitude)
-                self.geo_cache[cached_geo] = koordinaten   # Aktualisieren des Geo-Caches
+                self.geo_store.store(city_str, *koordinaten)   # Aktualisieren des Geo-Caches
                 
                 return koordinaten
             
             else:
-                logger.warning(f"fetch_coordinates: Keine Koordinaten für Stadt '{city_str}' gefunden - Fallback auf Berlin.")
+                logger.warning(f"lookup_coordinates: Keine Koordinaten für Stadt '{city_str}' gefunden.")
+                self.geo_store.store_negative(city_str)
 
         except Exception as e:
-            logger.error(f"fetch_coordinates: Error beim Geocoding von: '{city_str}': {e}")
+            logger.error(f"lookup_coordinates: Error beim Geocoding von: '{city_str}': {e}")
+
+            # Kurze Pause für diese Stadt, damit ein ausgefallener Geocoder nicht weiter "gehämmert" wird
+            self.geo_store.store_negative(city_str, ttl=self.geo_store.error_ttl)
 
-        # ===== 4) FALLBACK AUF BERLIN =====
-        return 52.5200, 13.4050
+        return None
     
 
 
@@ -633,6 +1335,12 @@ class WeatherDashboard:
         # Initialisierung mit Startstadt
         self.initialize(city)
 
+        # Hintergrund-Poller für abonnierte Städte starten
+        self.start_poller()
+
+        # Render-Worker schon jetzt starten (sonst wartet der erste Plot auf Prozessstart + Matplotlib-Import)
+        self.render_pool.warm_up()
+
         # Loggen der Start-Informationen
         logger.info("🚀 Dashboard läuft → http://127.0.0.1:5000")
         logger.info("📡 Websocket aktiv – UI lädt Live-Daten")
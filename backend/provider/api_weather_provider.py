@@ -1,5 +1,5 @@
 ####################################################
-# 🌦 API-WEATHER-PROVIDER – OpenWeatherMap - 1.0.5 #
+# 🌦 API-WEATHER-PROVIDER – OpenWeatherMap - 1.1.0 #
 ####################################################
 
 """
@@ -14,11 +14,13 @@ Ziel:
 # =============== IMPORTS ====================
 
 import os
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 import requests
 from datetime import datetime, timezone
 
-from backend.services import data_normalizer
+from backend.services import data_normalizer, http_client
 
 # Logger für dieses Modul
 logger = logging.getLogger(__name__)
@@ -55,6 +57,10 @@ class APIWeatherProvider:
 
         self.base_url = "https://api.openweathermap.org/data/2.5/weather"
 
+        # ===== 3) PARALLELITÄT FÜR BATCH-ABFRAGEN =====
+        # Begrenzt, damit das API-Rate-Limit nicht gesprengt wird (≤ HTTP-Poolgröße sinnvoll)
+        self.batch_workers = max(1, int(os.getenv("WEATHER_BATCH_WORKERS", "8")))
+
         logger.info("🌐 APIWeatherProvider initialisiert")
 
     
@@ -99,7 +105,7 @@ class APIWeatherProvider:
 
         # ===== 3) API REQUEST =====
         try:
-            response = requests.get(self.base_url, params=params, timeout=10)
+            response = http_client.get_interactive(self.base_url, params=params)   # gemeinsame Session (Keep-Alive, Retry, knappes Zeitbudget fürs Dashboard)
 
         except requests.exceptions.RequestException as e:
             logger.error(f"❌ API-Request fehlgeschlagen: {e}")
@@ -121,26 +127,6 @@ class APIWeatherProvider:
             raw_data = response.json()
             logger.debug(f"RAW-DATA API: {raw_data}")
 
-            # raw_data (JSON Antwort) "flach" machen in ein-Zeilen-dict, damit data_normalizer es versteht
-            flat_raw = {
-                "city": raw_data.get("name"),
-                "temp": raw_data.get("main", {}).get("temp"),
-                "feelsLike": raw_data.get("main", {}).get("feels_like"),
-                "tempMin": raw_data.get("main", {}).get("temp_min"),
-                "tempMax": raw_data.get("main", {}).get("temp_max"),
-                "humidity": raw_data.get("main", {}).get("humidity"),
-                "pressure": raw_data.get("main", {}).get("pressure"),
-                "weatherDescription": (raw_data.get("weather", [{}])[0].get("description")),
-                "wind_speed": raw_data.get("wind", {}).get("speed"),
-                "wind_deg": raw_data.get("wind", {}).get("deg"),
-                "wind_gust": raw_data.get("wind", {}).get("gust"),
-                "visibility": raw_data.get("visibility"),
-                "clouds": raw_data.get("clouds", {}).get("all"),
-                "timezone": raw_data.get("timezone", 0),
-                "sunrise": raw_data.get("sys", {}).get("sunrise"),
-                "sunset": raw_data.get("sys", {}).get("sunset"),
-            }
-
         except Exception as e:
             logger.error(f"❌ Fehler beim Parsen der API-Antwort: {e}")
             return None
@@ -149,13 +135,17 @@ class APIWeatherProvider:
 
         # ===== 6) ROHDATEN NORMALISIEREN =====
         # - raw_data ist das originale OpenWeather JSON.
-        # - flat_data ist "abgeflacht"/"einzeilig gemacht" damit es aussieht wie das CSV Sample.
-        # - Wir normalisieren es (genau wie im CSV provider), damit:
+        # - Der Normalizer liest es direkt über das Schema (weather_schema.OPENWEATHER_SHAPE),
+        #   ohne Umweg über ein "flaches" Zwischen-dict, damit:
         #   - Frontend IMMER das gleiche Datenformat bekommt
         #   - CSV & API identisch nutzbar sind
-         
 
-        normalized_data = data_normalizer.normalize_weather_data(flat_raw)
+        try:
+            normalized_data = data_normalizer.normalize_openweather(raw_data, as_record=True)   # kompakter WeatherRecord
+
+        except Exception as e:
+            logger.error(f"❌ Fehler beim Normalisieren der API-Antwort: {e}")
+            return None
 
         logger.debug(f"NORMALIZED DATA: {normalized_data}") # JULIAN TEST
        
@@ -171,3 +161,36 @@ class APIWeatherProvider:
         # ===== 8) RÜCKGABE
         return normalized_data
 
+
+    def get_weather_for_cities(self, cities):
+        """
+        Batch-Abfrage: mehrere Städte mit begrenzter Parallelität (self.batch_workers).
+
+        Die Group-Endpoints von OpenWeatherMap brauchen City-IDs statt Namen,
+        daher einzelne Requests gleichzeitig über die gemeinsame (gepoolte) HTTP-Session.
+
+        Returns:
+            list[dict | None]: normalisierte Wetterdaten in Eingabe-Reihenfolge (None = Fehler/nicht gefunden)
+        """
+        cities = list(cities)
+
+        if not cities:
+            return []
+
+        workers = min(self.batch_workers, len(cities))
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="owm-batch") as executor:
+            return list(executor.map(self.get_weather_for_city, cities))
+
+
+    # ============================================
+    #   ASYNC-SCHNITTSTELLE (asyncio)
+    # ============================================
+
+    async def get_weather_for_city_async(self, city: str):
+        """
+        Async-Variante von get_weather_for_city.
+        Der Request läuft über die gemeinsame (gepoolte) HTTP-Session in einem Worker-Thread,
+        mehrere Abfragen laufen so gleichzeitig.
+        """
+        return await asyncio.to_thread(self.get_weather_for_city, city)
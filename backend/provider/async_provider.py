@@ -0,0 +1,46 @@
+####################################################
+# 🌦 ASYNC-PROVIDER – 1.0.0                        #
+####################################################
+
+"""
+Asynchrone Provider-Schnittstelle (asyncio).
+
+Protokoll (zusätzlich zum synchronen get_weather_for_city):
+    async get_weather_for_city_async(city)        -> dict | None
+
+Provider, die das Protokoll selbst implementieren (z.B. APIWeatherProvider), werden direkt benutzt.
+Alle anderen (CSVWeatherProvider, CachedWeatherProvider, ...) werden über den
+AsyncProviderAdapter angebunden: der blockierende Aufruf läuft in einem Worker-Thread
+(asyncio.to_thread), mehrere Aufrufe laufen dadurch gleichzeitig.
+
+Die synchronen Methoden bleiben unverändert -> bestehende Aufrufer merken nichts.
+"""
+
+# =============== IMPORTS ====================
+import asyncio
+
+
+# ===== KLASSE ERSTELLEN =====
+class AsyncProviderAdapter:
+    """Macht aus einem synchronen Provider einen asynchronen (gleiche Methodennamen wie das Protokoll)."""
+
+    def __init__(self, provider):
+        self.provider = provider
+
+
+    async def get_weather_for_city_async(self, city):
+        """Führt provider.get_weather_for_city(city) in einem Worker-Thread aus."""
+        return await asyncio.to_thread(self.provider.get_weather_for_city, city)
+
+
+    def get_weather_for_city(self, city):
+        """Synchroner Aufruf bleibt erhalten."""
+        return self.provider.get_weather_for_city(city)
+
+
+# ===== FUNKTIONEN =====
+def as_async(provider):
+    """Liefert den Provider selbst, wenn er das Async-Protokoll kann, sonst einen AsyncProviderAdapter."""
+    if hasattr(provider, "get_weather_for_city_async"):
+        return provider
+    return AsyncProviderAdapter(provider)
@@ -0,0 +1,198 @@
+####################################################
+# 🌦 CACHED-WEATHER-PROVIDER – 1.0.1               #
+####################################################
+
+"""
+Cache-Schicht VOR einem beliebigen Weather-Provider (Decorator-Prinzip).
+
+Ziel:
+- gleiche Schnittstelle wie CSVWeatherProvider / APIWeatherProvider
+- wiederholte Abfragen derselben Stadt sparen API-Quota und Latenz
+- abgelaufene Einträge werden noch kurz ausgeliefert (stale) und im Hintergrund erneuert
+"""
+
+# =============== IMPORTS ====================
+import asyncio
+import logging
+import threading
+import time
+
+from backend.services.data_normalizer import city_key
+from backend.services.ttl_cache import TTLCache, FRESH, STALE, MISS
+
+# Logger für dieses Modul
+logger = logging.getLogger(__name__)
+
+
+# ===== KLASSE ERSTELLEN =====
+class CachedWeatherProvider:
+    """
+    Umhüllt einen Provider (self.provider) und cached dessen Ergebnisse pro Stadt.
+    """
+
+    def __init__(self, provider, ttl=300.0, max_entries=128, stale_ttl=600.0, clock=time.monotonic):
+        """
+        Args:
+            provider:           Provider mit Methode get_weather_for_city(city) -> dict | None
+            ttl (float):        Sekunden, die ein Ergebnis als frisch gilt
+            max_entries (int):  Maximale Anzahl gecachter Städte (LRU)
+            stale_ttl (float):  Sekunden nach Ablauf, in denen noch der alte Wert geliefert wird
+            clock (callable):   Zeitquelle des Caches (für Tests austauschbar)
+        """
+        self.provider = provider
+        self.cache = TTLCache(
+            max_entries=max_entries,
+            ttl=ttl,
+            stale_ttl=stale_ttl,
+            name=f"weather:{type(provider).__name__}",
+            clock=clock
+        )
+
+        # Städte, die gerade im Hintergrund neu geladen werden (kein doppelter Refresh)
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+
+        logger.info(
+            f"🗃️ CachedWeatherProvider aktiv für {type(provider).__name__} "
+            f"(ttl={ttl}s, stale={stale_ttl}s, max={max_entries})"
+        )
+
+
+    # ============================================
+    #   HAUPTFUNKTION – gleiche Schnittstelle
+    # ============================================
+
+    def get_weather_for_city(self, city: str):
+        """
+        Liefert Wetterdaten aus dem Cache oder vom umhüllten Provider.
+
+        Returns:
+            WeatherRecord | dict | None: normalisierte Wetterdaten (Kopie) oder None
+        """
+
+        # ===== 1) FEHLER ABFANGEN =====
+        key = city_key(city)
+
+        if key == "":
+            return self.provider.get_weather_for_city(city)
+
+        # ===== 2) CACHE PRÜFEN =====
+        value, state = self.cache.lookup(key)
+
+        if state == FRESH:
+            logger.debug(f"Cache-Hit für '{key}'")
+            return value.copy()
+
+        if state == STALE:
+            logger.debug(f"Stale-Hit für '{key}' - erneuere im Hintergrund")
+            self._refresh_in_background(city, key)
+            return value.copy()
+
+        # ===== 3) MISS -> PROVIDER FRAGEN =====
+        return self._fetch_and_store(city, key)
+
+
+    def get_weather_for_cities(self, cities):
+        """
+        Batch-Abfrage: Treffer kommen aus dem Cache, nur die fehlenden Städte gehen
+        gesammelt an den umhüllten Provider (dessen get_weather_for_cities, falls vorhanden).
+
+        Returns:
+            list[dict | None]: in Eingabe-Reihenfolge
+        """
+        cities = list(cities)
+        results = [None] * len(cities)
+        missing = []            # (index, city, key)
+
+        # ===== 1) CACHE PRÜFEN =====
+        for index, city in enumerate(cities):
+            key = city_key(city)
+            if key == "":
+                continue
+
+            value, state = self.cache.lookup(key)
+
+            if state == MISS:
+                missing.append((index, city, key))
+                continue
+
+            if state == STALE:
+                self._refresh_in_background(city, key)
+
+            results[index] = value.copy()
+
+        # ===== 2) FEHLENDE STÄDTE GESAMMELT LADEN =====
+        if missing:
+            missing_cities = [city for _, city, _ in missing]
+
+            if hasattr(self.provider, "get_weather_for_cities"):
+                fetched = self.provider.get_weather_for_cities(missing_cities)
+            else:
+                fetched = [self.provider.get_weather_for_city(city) for city in missing_cities]
+
+            for (index, _city, key), data in zip(missing, fetched):
+                if data is not None:
+                    self.cache.set(key, data.copy())
+                results[index] = data
+
+        return results
+
+
+    async def get_weather_for_city_async(self, city: str):
+        """
+        Async-Variante: frische Cache-Treffer kommen sofort zurück,
+        alles andere (Miss / Stale) läuft über get_weather_for_city im Worker-Thread.
+        """
+        key = city_key(city)
+
+        # Frischer Treffer: kein Thread nötig (peek zählt nicht, get_weather_for_city zählt den Hit)
+        if key != "" and self.cache.peek(key) is not None:
+            return self.get_weather_for_city(city)
+
+        return await asyncio.to_thread(self.get_weather_for_city, city)
+
+
+    def invalidate(self, city):
+        """Entfernt eine Stadt aus dem Cache (z.B. um einen Refresh zu erzwingen)."""
+        self.cache.invalidate(city_key(city))
+
+
+    def stats(self) -> dict:
+        """Cache-Zähler (Hits, Misses, Verdrängungen, ...) zum Dimensionieren."""
+        return self.cache.stats()
+
+
+    # ========================================
+    # HELPER
+    # ========================================
+
+    def _fetch_and_store(self, city, key):
+        """Fragt den eigentlichen Provider und legt gültige Ergebnisse im Cache ab."""
+
+        data = self.provider.get_weather_for_city(city)
+
+        # None (Stadt unbekannt / Fehler) wird nicht gecached
+        if data is not None:
+            self.cache.set(key, data.copy())
+
+        return data
+
+
+    def _refresh_in_background(self, city, key):
+        """Startet (höchstens einen) Hintergrund-Refresh pro Stadt."""
+
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def worker():
+            try:
+                self._fetch_and_store(city, key)
+            except Exception as e:
+                logger.error(f"Hintergrund-Refresh für '{city}' fehlgeschlagen: {e}")
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=worker, name=f"refresh-{key}", daemon=True).start()
@@ -3,11 +3,10 @@
 ###############################################
 
 # =============== IMPORTS ====================
-import pandas as pd
 import os               
 import logging
 
-from backend.services import data_normalizer
+from backend.services.csv_store import CSVWeatherStore
 
 # Logger für dieses Modul
 logger = logging.getLogger(__name__)
@@ -16,7 +15,7 @@ logger = logging.getLogger(__name__)
 
 # ===== KLASSE ERSTELLEN =====
 class CSVWeatherProvider:
-    """ Liest Wetterdaten aus einer CSV-Datei, normalisiert sie und stellt sie bereit. """
+    """ Liest Wetterdaten aus einer CSV-Datei (oder Feather/Parquet, siehe columnar_io), normalisiert sie und stellt sie bereit. """
 
     def __init__(self, filename="weather_sample.csv"): 
         """Initialisiert den CSVWeatherProvider mit dem Pfad zur CSV-Datei"""      
@@ -40,33 +39,42 @@ class CSVWeatherProvider:
         else:
             logger.info(f"CSV-Daten geladen aus {self.csv_path}")
 
+        # In-Memory Store: CSV wird nur einmal (bzw. nach Dateiänderung) gelesen und normalisiert
+        self.store = CSVWeatherStore(self.csv_path)
+
 
     def get_weather_for_city(self, city: str):
-        """Liest CSV, filtert nach Stadt und gibt Wetterdaten als Dictionary zurück."""
-
-        # ===== 1) CSV LADEN ===== 
-        try:
-            df = pd.read_csv(self.csv_path) 
-            
-        except Exception as e:
-            logger.error(f"CSV konnte nicht geladen werden: {e}")
+        """Sucht die Stadt im In-Memory Store und gibt die normalisierten Wetterdaten als Dictionary zurück."""
+
+        # ===== 1) FEHLER ABFANGEN =====
+        if city is None or str(city).strip() == "":
+            logger.warning("CSVWeatherProvider: Leerer Stadtname übergeben.")
             return None
 
-        # ===== 2) FILTERN AUF STADT =====
-        df_city = df[df["CITY"].str.lower() == city.lower()]
+        # ===== 2) LOOKUP IM STORE (O(1), bereits normalisiert) =====
+        normalized_data = self.store.get(city)
 
-        if df_city.empty:
+        if normalized_data is None:
             logger.info(f"Keine Wetterdaten für Stadt '{city}' in der CSV-Datei gefunden.") 
             return None
 
-        # ===== 3) ZEILE DES DATENSATZES IN DICT-FORM HOLEN =====
-        row = df_city.iloc[0].to_dict()
-
-        # ===== 4) NORMALISIEREN DER DATEN =====
-        normalized_data = data_normalizer.normalize_weather_data(row)
-
         logger.info(f"Wetterdaten für Stadt '{city}' erfolgreich aus CSV geladen.")
 
-        # ===== 5) RÜCKGABE =====       
+        # ===== 3) RÜCKGABE =====       
         return (normalized_data)
-           
\ No newline at end of file
+           
+
+
+    def get_weather_for_cities(self, cities):
+        """
+        Batch-Abfrage: mehrere Städte aus EINEM Durchgang über den Store.
+
+        Returns:
+            list[dict | None]: normalisierte Wetterdaten in Eingabe-Reihenfolge (None = nicht gefunden)
+        """
+        results = self.store.get_many(cities)
+
+        found = sum(1 for data in results if data is not None)
+        logger.info(f"Batch-Abfrage CSV: {found}/{len(results)} Städte gefunden.")
+
+        return results
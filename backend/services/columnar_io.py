@@ -0,0 +1,335 @@
+##############################################
+#   🌦 COLUMNAR-IO – 1.0.0                   #
+##############################################
+
+"""
+Spaltenbasierte Binärformate für Wetterdaten (Sample-Dateien, CLI-Logs).
+
+CSV muss bei jedem Lesen komplett geparst werden (Text -> Zahlen, alle Spalten).
+Spaltenformate speichern jede Spalte getrennt und typisiert:
+
+    .feather / .arrow   Arrow IPC (unkomprimiert) -> wird per mmap geöffnet, Lesen ist quasi kostenlos,
+                        nur tatsächlich benutzte Spalten/Zeilen werden angefasst
+    .parquet            komprimiert (zstd), kleinste Dateien, Spalten werden gezielt gelesen (column pruning)
+
+Optionale Abhängigkeit: pyarrow (pip install pyarrow). Ohne pyarrow funktioniert alles wie bisher mit CSV,
+nur die Spaltenformate melden einen verständlichen ImportError.
+
+Konvertieren (Streaming in Batches, auch für sehr große Dateien):
+    python -m backend.services.columnar_io convert data/samples/weather_sample.csv data/samples/weather_sample.feather
+    python -m backend.services.columnar_io convert cli/logged.csv cli/logged.parquet --strings
+
+Benchmark (1 Jahr Minutenwerte, CSV vs. Feather vs. Parquet):
+    python -m backend.services.columnar_io bench [ANZAHL_ZEILEN]
+"""
+
+# =============== IMPORTS ====================
+import csv
+import os
+import logging
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:     # optional -> nur CSV verfügbar
+    pa = None
+
+# Logger für dieses Modul
+logger = logging.getLogger(__name__)
+
+
+# Dateiendung -> Format
+COLUMNAR_FORMATS = {
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".parquet": "parquet",
+}
+
+DEFAULT_BATCH_SIZE = 64 * 1024
+
+
+# ===== FUNKTIONEN =====
+def columnar_format(path):
+    """Liefert "feather" / "parquet" für Spaltenformat-Dateien, sonst None (z.B. CSV)."""
+    return COLUMNAR_FORMATS.get(os.path.splitext(str(path))[1].lower())
+
+
+def _file_format(path):
+    """Wie columnar_format, aber "csv" für alle anderen Dateien."""
+    return columnar_format(path) or "csv"
+
+
+def require_pyarrow():
+    """Wirft einen verständlichen ImportError, wenn pyarrow fehlt."""
+    if pa is None:
+        raise ImportError("Für Parquet/Feather wird 'pyarrow' benötigt (pip install pyarrow)")
+
+
+def read_schema_names(path):
+    """Spaltennamen einer Spaltenformat-Datei, ohne Daten zu lesen."""
+    require_pyarrow()
+    if columnar_format(path) == "parquet":
+        return list(pq.read_schema(path).names)
+    with pa.memory_map(path, "r") as source:
+        return list(pa_ipc.open_file(source).schema.names)
+
+
+def _existing_columns(path, columns):
+    """Schränkt die gewünschten Spalten auf die vorhandenen ein (Reihenfolge der Datei)."""
+    if columns is None:
+        return None
+    wanted = set(columns)
+    return [name for name in read_schema_names(path) if name in wanted]
+
+
+def open_table(path, columns=None):
+    """
+    Öffnet eine Feather-/Parquet-Datei als pyarrow.Table.
+
+    Args:
+        columns (iterable | None): nur diese Spalten lesen (fehlende werden ignoriert), None = alle
+
+    Feather wird per mmap geöffnet: die Table zeigt direkt auf die Datei (kein Kopieren, kein Parsen).
+    """
+    require_pyarrow()
+    columns = _existing_columns(path, columns)
+
+    if columnar_format(path) == "parquet":
+        return pq.read_table(path, columns=columns, memory_map=True)
+
+    source = pa.memory_map(path, "r")
+    table = pa_ipc.open_file(source).read_all()
+    return table.select(columns) if columns is not None else table
+
+
+def read_frame(path, columns=None):
+    """Liest eine CSV- oder Spaltenformat-Datei als DataFrame (bei Spaltenformaten nur 'columns')."""
+    if columnar_format(path) is None:
+        wanted = set(columns) if columns is not None else None
+        return pd.read_csv(path, usecols=(lambda name: name in wanted) if wanted is not None else None)
+    return open_table(path, columns).to_pandas()
+
+
+def first_row_per_key(table, column, key_func):
+    """
+    Positionen der jeweils ERSTEN Zeile pro Schlüssel (z.B. Stadt), ohne die Spalte in Python-Objekte zu wandeln.
+
+    Die Spalte wird dictionary-kodiert (wenige verschiedene Werte, viele Zeilen),
+    key_func läuft nur über die verschiedenen Werte.
+
+    Returns:
+        (keys, positions): Schlüssel und Zeilenpositionen in Reihenfolge des ersten Auftretens
+    """
+    encoded = pc.dictionary_encode(table.column(column)).combine_chunks()
+    values = encoded.dictionary.to_pylist()
+
+    # Erste Position pro Code in O(n): rückwärts zuweisen -> die früheste Zeile schreibt zuletzt.
+    # Nullwerte (fehlende Stadt) bekommen -1 und landen im Extra-Slot am Ende.
+    indices = pc.fill_null(encoded.indices, -1).to_numpy()
+    first_positions = np.full(len(values) + 1, -1, dtype=np.int64)
+    first_positions[indices[::-1]] = np.arange(len(indices) - 1, -1, -1)
+    first_positions = first_positions[:-1]
+
+    # Mehrere Rohwerte können denselben Schlüssel haben ("Berlin" / " berlin") -> frühestes Auftreten gewinnt
+    best = {}
+    for value, position in zip(values, first_positions.tolist()):
+        if position < 0:
+            continue
+        key = key_func(value)
+        if key == "":
+            continue
+        if key not in best or position < best[key]:
+            best[key] = position
+
+    ordered = sorted(best.items(), key=lambda item: item[1])
+    return [key for key, _ in ordered], [position for _, position in ordered]
+
+
+def iter_record_batches(path, columns=None, batch_size=DEFAULT_BATCH_SIZE, strings=False):
+    """
+    Liest eine Datei (CSV, Feather, Parquet) in pyarrow.RecordBatches -> konstanter Speicherbedarf.
+    (CSV wird in Blöcken von 1 MB gelesen, batch_size gilt für Feather/Parquet.)
+
+    Args:
+        strings (bool): CSV-Spalten nicht typisieren, sondern als Text lesen (verlustfrei für die CLI)
+    """
+    require_pyarrow()
+    fmt = _file_format(path)
+
+    if fmt == "parquet":
+        parquet = pq.ParquetFile(path, memory_map=True)
+        yield from parquet.iter_batches(batch_size=batch_size, columns=_existing_columns(path, columns))
+        return
+
+    if fmt == "feather":
+        yield from open_table(path, columns).to_batches(max_chunksize=batch_size)
+        return
+
+    convert_options = pa_csv.ConvertOptions(include_columns=list(columns) if columns is not None else None)
+    if strings:
+        with open(path, "r", newline="", encoding="utf-8-sig") as fh:
+            header = next(csv.reader(fh), [])
+        convert_options.column_types = {name: pa.string() for name in header}
+
+    reader = pa_csv.open_csv(
+        path,
+        read_options=pa_csv.ReadOptions(block_size=1 << 20),
+        convert_options=convert_options,
+    )
+    yield from reader
+
+
+def iter_rows(path, columns=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Liefert die Zeilen einer Spaltenformat-Datei als dicts (batchweise, nie die ganze Datei im Speicher)."""
+    for batch in iter_record_batches(path, columns, batch_size):
+        yield from batch.to_pylist()
+
+
+class _CSVSink:
+    """CSV-Ausgabe über das csv-Modul (nur nötige Anführungszeichen, leere Werte statt null) - wie die CLI-Logs."""
+
+    def __init__(self, path, schema):
+        self._fh = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._fh)
+        self._writer.writerow(schema.names)
+
+    def write_batch(self, batch):
+        columns = [column.to_pylist() for column in batch.columns]
+        self._writer.writerows(
+            ["" if value is None else value for value in row] for row in zip(*columns)
+        )
+
+    def close(self):
+        self._fh.close()
+
+
+def _open_sink(path, schema, fmt):
+    """Writer für das Zielformat ("csv" / "feather" / "parquet")."""
+    if fmt == "parquet":
+        return pq.ParquetWriter(path, schema, compression="zstd")
+    if fmt == "feather":
+        # Unkomprimiert -> kann per mmap ohne Entpacken gelesen werden
+        return pa_ipc.new_file(path, schema)
+    return _CSVSink(path, schema)
+
+
+def convert(src, dst, columns=None, strings=False, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Konvertiert zwischen CSV, Feather und Parquet (Format jeweils nach Dateiendung), batchweise.
+
+    Args:
+        columns (iterable | None): nur diese Spalten übernehmen
+        strings (bool):            CSV-Spalten als Text übernehmen (z.B. CLI-Logs, Werte bleiben exakt gleich)
+
+    Returns:
+        int: Anzahl geschriebener Zeilen
+    """
+    require_pyarrow()
+
+    rows = 0
+    writer = None
+    tmp = f"{dst}.tmp"
+
+    try:
+        for batch in iter_record_batches(src, columns, batch_size, strings=strings):
+            if writer is None:
+                writer = _open_sink(tmp, batch.schema, _file_format(dst))
+            writer.write_batch(batch)
+            rows += batch.num_rows
+
+        if writer is None:
+            raise ValueError(f"Keine Daten in {src}")
+
+        writer.close()
+        writer = None
+
+        # Erst nach erfolgreichem Schreiben ersetzen -> nie eine halbe Zieldatei
+        os.replace(tmp, dst)
+
+    finally:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    logger.info(f"{src} -> {dst}: {rows} Zeilen")
+    return rows
+
+
+# ============================================
+#   BENCHMARK: CSV vs. Feather vs. Parquet
+# ============================================
+def _benchmark(n_rows=525_600):
+    """1 Jahr Minutenwerte: ganze CSV parsen vs. Spaltenformat öffnen und nur die Dashboard-Spalten lesen."""
+
+    import tempfile
+    import time
+
+    from backend.services.csv_store import CSVWeatherStore
+    from backend.services.weather_schema import FLAT_SOURCE_KEYS
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    sample_path = os.path.abspath(os.path.join(base_dir, "..", "..", "data", "samples", "weather_sample.csv"))
+
+    sample = pd.read_csv(sample_path)
+    df = sample.sample(n=n_rows, replace=True, random_state=1).reset_index(drop=True)
+    df["timestamp"] = pd.date_range("2025-01-01", periods=n_rows, freq="min").astype("int64") // 10**9
+
+    def timed(func, repeat=3):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {name: os.path.join(tmp, f"year.{name}") for name in ("csv", "feather", "parquet")}
+        df.to_csv(paths["csv"], index=False)
+        convert(paths["csv"], paths["feather"])
+        convert(paths["csv"], paths["parquet"])
+
+        print(f"{n_rows} Zeilen, {len(df.columns)} Spalten")
+        for name, path in paths.items():
+            size = os.path.getsize(path) / 1e6
+            if name == "csv":
+                read_all = timed(lambda: pd.read_csv(path))
+                print(f"  {name:8s} {size:7.1f} MB   pd.read_csv (alle Spalten):        {read_all * 1000:8.1f} ms")
+            else:
+                read_all = timed(lambda: open_table(path, FLAT_SOURCE_KEYS))
+                print(f"  {name:8s} {size:7.1f} MB   öffnen (nur Dashboard-Spalten):    {read_all * 1000:8.1f} ms")
+
+            # Store-Laden: erste Zeile pro Stadt normalisieren (wie CSVWeatherProvider)
+            store_time = timed(lambda: CSVWeatherStore(path).ensure_loaded())
+            print(f"  {'':8s} {'':7s}      CSVWeatherStore laden:              {store_time * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="CSV <-> Feather/Parquet konvertieren")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    convert_parser = sub.add_parser("convert", help="Datei konvertieren (Format nach Dateiendung)")
+    convert_parser.add_argument("src")
+    convert_parser.add_argument("dst")
+    convert_parser.add_argument("--columns", help="Kommaseparierte Spaltenliste (Standard: alle)")
+    convert_parser.add_argument("--strings", action="store_true", help="CSV-Spalten als Text übernehmen")
+
+    bench_parser = sub.add_parser("bench", help="Lese-Benchmark CSV vs. Feather vs. Parquet")
+    bench_parser.add_argument("rows", nargs="?", type=int, default=525_600)
+
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        columns = [c.strip() for c in args.columns.split(",") if c.strip()] if args.columns else None
+        count = convert(args.src, args.dst, columns=columns, strings=args.strings)
+        print(f"{args.src} -> {args.dst}: {count} Zeilen")
+    else:
+        _benchmark(args.rows)
@@ -0,0 +1,271 @@
+##############################################
+#   🌦 CSV-WEATHER-STORE – 1.2.0             #
+##############################################
+
+"""
+In-Memory Store für die CSV-Wetterdaten.
+
+Aufgaben:
+    - CSV-Datei EINMAL laden und jede Zeile direkt normalisieren (data_normalizer)
+    - Index nach Stadtname (casefold) aufbauen -> Lookup in O(1)
+    - Datensätze spaltenweise als WeatherBlock halten (kompakt, keine 30-Key-dicts pro Stadt)
+    - Datei-Signatur (mtime + Größe) merken und bei Änderung automatisch neu laden
+    - Statt CSV auch Feather/Parquet (columnar_io, optional pyarrow): Datei wird per mmap geöffnet,
+      nur die Spalten, die der Normalizer kennt, und nur die erste Zeile pro Stadt werden gelesen
+
+Benchmark (Vergleich mit dem alten Verfahren "pd.read_csv pro Aufruf"):
+    python -m backend.services.csv_store [ANZAHL_ZEILEN]
+"""
+
+# =============== IMPORTS ====================
+import os
+import logging
+import threading
+
+import pandas as pd
+
+from backend.services import columnar_io, data_normalizer
+from backend.services.data_normalizer import city_key
+from backend.services.weather_record import WeatherBlock
+from backend.services.weather_schema import FLAT_SOURCE_KEYS
+
+# Logger für dieses Modul
+logger = logging.getLogger(__name__)
+
+
+# ===== KLASSE ERSTELLEN =====
+class CSVWeatherStore:
+    """
+    Hält alle Datensätze einer CSV-Datei normalisiert im Speicher.
+
+    - Pro Stadt wird (wie bisher im Provider) nur die ERSTE Zeile verwendet
+    - Bei jeder Abfrage wird nur die Datei-Signatur (os.stat) geprüft, nicht die Datei gelesen
+    """
+
+    def __init__(self, csv_path: str):
+        """Initialisiert den Store. Geladen wird erst beim ersten Zugriff (lazy)."""
+
+        self.csv_path = csv_path
+
+        # (Index, Block) wird bei einem Reload als Ganzes ausgetauscht -> Leser sehen nie einen halben Stand
+        self._data = ({}, WeatherBlock())   # ({city_key -> Zeile im Block}, WeatherBlock)
+        self._signature = None      # (mtime_ns, size) der zuletzt geladenen Datei
+        self._missing_logged = False
+        self._lock = threading.Lock()
+
+
+    # ========================================
+    # DATEI-SIGNATUR + LADEN
+    # ========================================
+
+    def _file_signature(self):
+        """Liefert (mtime_ns, size) der CSV-Datei oder None, falls sie nicht existiert."""
+        try:
+            st = os.stat(self.csv_path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+
+    def _read_first_rows(self):
+        """
+        Liest die Datei und liefert (keys, first_rows, total_rows):
+        pro Stadt (wie bisher im Provider) nur die ERSTE Zeile, als DataFrame in Index-Reihenfolge.
+        Gibt None zurück, wenn die Spalte 'CITY' fehlt.
+        """
+        # ----- Feather / Parquet: nur benötigte Spalten, Städte ohne Python-Schleife über alle Zeilen -----
+        if columnar_io.columnar_format(self.csv_path):
+            table = columnar_io.open_table(self.csv_path, columns=FLAT_SOURCE_KEYS)
+            if "CITY" not in table.column_names:
+                return None
+            keys, positions = columnar_io.first_row_per_key(table, "CITY", city_key)
+            return keys, table.take(positions).to_pandas(), table.num_rows
+
+        # ----- CSV -----
+        df = pd.read_csv(self.csv_path)
+        if "CITY" not in df.columns:
+            return None
+
+        # Wie bisher: Erste Zeile pro Stadt gewinnt -> nur diese Zeilen normalisieren
+        keys = []
+        positions = []
+        seen = set()
+
+        for position, raw_city in enumerate(df["CITY"].tolist()):
+            key = city_key(raw_city)
+            if key == "" or key in seen:
+                continue
+            seen.add(key)
+            keys.append(key)
+            positions.append(position)
+
+        return keys, df.iloc[positions], len(df)
+
+
+    def _load(self, signature):
+        """Liest die Datei komplett ein (CSV) bzw. öffnet sie (Feather/Parquet) und baut den Index neu auf."""
+
+        # ===== 1) DATEI LADEN =====
+        try:
+            loaded = self._read_first_rows()
+
+        except Exception as e:
+            logger.error(f"CSV konnte nicht geladen werden: {e}")
+            self._data = ({}, WeatherBlock())
+            self._signature = signature
+            return
+
+        if loaded is None:
+            logger.error(f"CSV-Datei enthält keine Spalte 'CITY': {self.csv_path}")
+            self._data = ({}, WeatherBlock())
+            self._signature = signature
+            return
+
+        keys, first_rows, total_rows = loaded
+
+        # ===== 2) ZEILEN NORMALISIEREN + INDEX AUFBAUEN =====
+
+        # Spaltenweise normalisieren (identisch zu normalize_weather_data pro Zeile, aber vektorisiert)
+        # und direkt als Spalten-Block ablegen (ohne Zwischen-dicts)
+        block = WeatherBlock.from_frame(
+            data_normalizer.normalize_weather_frame(first_rows)
+        )
+
+        index = {key: row for row, key in enumerate(keys)}
+
+        # ===== 3) ÜBERNEHMEN =====
+        self._data = (index, block)
+        self._signature = signature
+
+        logger.info(f"CSV-Store geladen: {len(index)} Städte aus {total_rows} Zeilen ({self.csv_path})")
+
+
+    def ensure_loaded(self):
+        """Lädt die Datei, falls noch nicht geschehen oder wenn sich mtime/Größe geändert haben."""
+
+        signature = self._file_signature()
+
+        if signature is None:
+            # Fehlende Datei nur einmal loggen, nicht bei jeder Abfrage
+            if not self._missing_logged:
+                logger.error(f"CSV-Datei nicht gefunden unter: {self.csv_path}")
+                self._missing_logged = True
+            self._data = ({}, WeatherBlock())
+            self._signature = None
+            return
+
+        self._missing_logged = False
+
+        if signature == self._signature:
+            return
+
+        # Nur ein Thread lädt neu, die anderen warten und nutzen dann das Ergebnis
+        with self._lock:
+            if signature != self._signature:
+                if self._signature is not None:
+                    logger.info(f"CSV-Datei wurde geändert, lade neu: {self.csv_path}")
+                self._load(signature)
+
+
+    # ========================================
+    # ABFRAGEN
+    # ========================================
+
+    def get(self, city):
+        """
+        Liefert die normalisierten Wetterdaten für eine Stadt als WeatherRecord (neues Objekt) oder None.
+        """
+        self.ensure_loaded()
+
+        index, block = self._data
+        row = index.get(city_key(city))
+
+        if row is None:
+            return None
+
+        # Neuer Datensatz pro Aufruf, Aufrufer können den Store nicht versehentlich verändern
+        return block.record(row)
+
+
+    def get_many(self, cities):
+        """
+        Liefert die Daten für mehrere Städte in EINEM Durchgang (eine Dateiprüfung, eine Index-Momentaufnahme).
+        Ergebnis in Eingabe-Reihenfolge, None für unbekannte Städte.
+        """
+        self.ensure_loaded()
+
+        index, block = self._data   # Momentaufnahme, ein Reload tauscht nur die Referenz aus
+
+        result = []
+        for city in cities:
+            row = index.get(city_key(city))
+            result.append(block.record(row) if row is not None else None)
+
+        return result
+
+
+    def cities(self):
+        """Liefert alle bekannten Städte (Index-Schlüssel)."""
+        self.ensure_loaded()
+        return list(self._data[0].keys())
+
+
+    def __len__(self):
+        self.ensure_loaded()
+        return len(self._data[0])
+
+
+# ============================================
+#   BENCHMARK: pd.read_csv pro Aufruf vs. Store
+# ============================================
+def _benchmark(n_rows=100_000, lookups=20):
+    """Vergleicht das alte Verfahren (CSV pro Aufruf lesen + filtern) mit dem Store."""
+
+    import tempfile
+    import time
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    sample_path = os.path.abspath(os.path.join(base_dir, "..", "..", "data", "samples", "weather_sample.csv"))
+
+    # Synthetische Datei mit n_rows eindeutigen Städten aus den Sample-Zeilen bauen
+    sample = pd.read_csv(sample_path)
+    df = sample.sample(n=n_rows, replace=True, random_state=1).reset_index(drop=True)
+    df["CITY"] = [f"Stadt{i}" for i in range(n_rows)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.csv")
+        df.to_csv(path, index=False)
+
+        cities = [f"Stadt{i}" for i in range(0, n_rows, max(1, n_rows // lookups))][:lookups]
+
+        # --- ALT: pro Aufruf read_csv + str.lower()-Scan ---
+        t0 = time.perf_counter()
+        for c in cities:
+            d = pd.read_csv(path)
+            row = d[d["CITY"].str.lower() == c.lower()].iloc[0].to_dict()
+            data_normalizer.normalize_weather_data(row)
+        old_per_call = (time.perf_counter() - t0) / len(cities)
+
+        # --- NEU: Store (einmal laden, dann O(1)) ---
+        store = CSVWeatherStore(path)
+
+        t0 = time.perf_counter()
+        store.ensure_loaded()
+        load_time = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for _ in range(100):
+            for c in cities:
+                store.get(c)
+        new_per_call = (time.perf_counter() - t0) / (100 * len(cities))
+
+    print(f"Zeilen: {n_rows}, Lookups: {len(cities)}")
+    print(f"ALT  read_csv pro Aufruf: {old_per_call * 1000:10.2f} ms / Lookup")
+    print(f"NEU  Store einmal laden:  {load_time * 1000:10.2f} ms (einmalig)")
+    print(f"NEU  Store Lookup:        {new_per_call * 1000:10.4f} ms / Lookup")
+    print(f"Speedup pro Lookup:       {old_per_call / new_per_call:10.0f}x")
+
+
+if __name__ == "__main__":
+    import sys
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -1,22 +1,51 @@
 ##############################################
-#          DATA NORMALIZER - 1.0.4           #
+#          DATA NORMALIZER - 1.4.0           #
 ##############################################
 
 # Normalizer für Wetterdaten. Konvertiert rohe Daten in das vom Dashboard erwartete (immer gleiche) Format. 
 # Fehlt ein Wert -> Definierte Default-Werte verwenden.
 # Alle Rückgaben sind in nativen Python-Datentypen (keine numpy/pandas Typen) & JSON-serialisierbar.
 # Ziel --> Einheitliche Datenstruktur für das Dashboard.
-# Bedingung: Eingabedaten sind "flache" dicts, also Einzeiler, keine verschachtelten Strukturen (Daher wird z.B. im API Provider das JSON auch erstmal in ein 'flat_raw'-dict umgebaut)
+# Felder, Aliase und Defaults stehen deklarativ in weather_schema.py, pro Eingabeform werden EINMAL Getter/Konverter vorberechnet:
+#   - flache dicts (CSV-Zeilen)       -> normalize_weather_data
+#   - OpenWeather JSON (verschachtelt) -> normalize_openweather (kein 'flat_raw'-Zwischen-dict mehr)
+#   - ganze DataFrames                 -> normalize_weather_frame (spaltenweise)
 
 import numbers
 import time
 
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+from backend.services.weather_schema import WEATHER_SCHEMA, TIMEZONE_SOURCE, OPENWEATHER_SHAPE
+from backend.services.weather_record import WeatherRecord
+
+
+# Hilfsfunktion -> Einheitlicher Schlüssel für Städte (Caches, Indizes, Räume)
+def city_key(city) -> str:
+    """Bildet den Schlüssel für eine Stadt (getrimmt + casefold, z.B. 'München ' -> 'münchen')."""
+    if city is None:
+        return ""
+    return str(city).strip().casefold()
+
 # Hilfsfunktion -> int
 def _to_int(value, default=None):
     """Konvertiert value in einen int, falls möglich. Andernfalls wird default zurückgegeben."""
 
     if value is None:
         return default
+
+    # Schneller Pfad für die häufigsten Typen (ohne teuren isinstance-Check gegen numbers.Number)
+    value_type = type(value)
+    if value_type is int:
+        return value
+    if value_type is float:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
     
     # Numeric-Typen (int, float, numpy, pandas,...)
     if isinstance(value, numbers.Number):
@@ -42,6 +71,13 @@ def _to_float(value, default=None):
 
     if value is None:
         return default
+
+    # Schneller Pfad für die häufigsten Typen (ohne teuren isinstance-Check gegen numbers.Number)
+    value_type = type(value)
+    if value_type is float:
+        return value
+    if value_type is int:
+        return float(value)
     
     if isinstance(value, numbers.Number):
         try:
@@ -84,128 +120,244 @@ def _to_bool(value, default=False):
     return default
 
 # Hauptfunktion zur Normalisierung
-def normalize_weather_data(raw: dict) -> dict:
+def normalize_weather_data(raw: dict, as_record: bool = False):
     """
     Nimmt rohe Wetterdaten (z.B. aus CSV oder einer API) und normalisiert:
     - Datentypen (numpy -> Python)
     - fehlende Felder bekommen Defaults
-    - Keys werden auf das vom Dashboard erwartete Schema gebracht
+    - Keys werden auf das vom Dashboard erwartete Schema gebracht (siehe weather_schema.WEATHER_SCHEMA)
+
+    Pro Key-Menge (z.B. CSV-Header) wird EINMAL ein Extraktor gebaut,
+    danach werden nur noch die tatsächlich vorhandenen Aliase gelesen.
+
+    as_record=True liefert einen kompakten WeatherRecord (__slots__) statt eines dicts.
     """
+    cache_key = (tuple(raw.keys()), as_record)
 
-    # Stadtname extrahieren
-    city = _to_str(raw.get("CITY") or raw.get("city"), default="Unbekannt")
+    extractor = _FLAT_EXTRACTORS.get(cache_key)
+    if extractor is None:
+        extractor = _compile_flat_extractor(cache_key)
 
-    # Temperatur
-    temp = _to_float(
-        raw.get("TEMPERATURE") 
-        or raw.get("temp") 
-        or raw.get("currentTemperature"),
-        default=None
-    )
+    return extractor(raw)
 
-    # Min/Max/FeelsLike
-    feels_like = _to_float(raw.get("feelsLike"), default=None)
-    temp_min = _to_float(raw.get("tempMin"), default=None)
-    temp_max = _to_float(raw.get("tempMax"), default=None)
-
-    # Luftfeuchtigkeit, Druck
-    humidity = _to_int(raw.get("humidity"), default=None)
-    pressure = _to_int(raw.get("pressure"), default=None)
-
-    # Wetterbeschreibung
-    weather_desc = _to_str(
-        raw.get("weatherDescription") 
-        or raw.get("description") 
-        or raw.get("weather"),
-        default="--"
-    )
 
-    # Bewölkungsgrad
-    cloud_coverage = _to_int(raw.get("cloudCoverage") or raw.get("clouds"), default=None)
-
-    # Winddaten
-    wind_speed = _to_float(raw.get("windSpeed") or raw.get("wind_speed"), default=None)
-    wind_gust = _to_float(raw.get("windGust") or raw.get("wind_gust"), default=None)
-    wind_dir = _to_int(raw.get("windDirection") or raw.get("wind_deg"), default=None)
-
-    # UV-Index
-    uv_index = _to_float(raw.get("uvIndex") or raw.get("uvi"), default=None)
-
-    # Sichtweite
-    visibility = _to_int(raw.get("visibility"), default=None)
-
-    # Taupunkt & Luftqualität (Air Quality Index)
-    dew_point = _to_float(raw.get("dewPoint"), default=None)
-    aqi = _to_int(raw.get("airQualityIndex") or raw.get("aqi"), default=None)
-
-    # Feinstaubwerte
-    pm10 = _to_float(raw.get("pm10"), default=None)
-    pm2_5 = _to_float(raw.get("pm2_5") or raw.get("pm2.5") or raw.get("pm2_5"), default=None)
-
-    # Gase
-    co = _to_float(raw.get("co"), default=None)
-    no2 = _to_float(raw.get("no2"), default=None)
-    o3 = _to_float(raw.get("o3"), default=None)
-
-    # Sonstige
-    pollen = _to_int(raw.get("pollenCount") or raw.get("pollen"), default=None)
-    pressure_trend = _to_str(raw.get("pressureTrend"), default="--")
-    fog = _to_bool(raw.get("fog"), default=False)
-
-    # Sonnenaufgang/-untergang
-        # Umrechnung, weil API Unix-Zeit gibt
-
-    tz_offset = raw.get("timezone", 0)
-
-    sunrise_ts = raw.get("sunrise")
-    sunset_ts  = raw.get("sunset")
-
-    sunrise = time.strftime("%H:%M", time.gmtime(sunrise_ts + tz_offset)) if sunrise_ts else "08:00"
-    sunset  = time.strftime("%H:%M", time.gmtime(sunset_ts  + tz_offset)) if sunset_ts  else "18:30"
-
-
-    # Niederschlag (inkl. Hilfsfunktion pick() siehe unten)
-    rain1h = _to_float(pick(raw, "rain1h", "rain_1h"), default=None)
-    rain3h = _to_float(pick(raw, "rain3h", "rain_3h"), default=None)
-    snow1h = _to_float(pick(raw, "snow1h", "snow_1h"), default=None)
-    snow3h = _to_float(pick(raw, "snow3h", "snow_3h"), default=None)
-
-    # Dictionairy final zusammenstellen
-    normalized_data = {
-        "city": city,
-        "currentTemperature": temp,
-        "feelsLike": feels_like,
-        "tempMin": temp_min,
-        "tempMax": temp_max,
-        "humidity": humidity,
-        "pressure": pressure,
-        "weatherDescription": weather_desc,
-        "cloudCoverage": cloud_coverage,
-        "rain1h": rain1h,
-        "rain3h": rain3h,
-        "snow1h": snow1h,
-        "snow3h": snow3h,
-        "windSpeed": wind_speed,
-        "windGust": wind_gust,
-        "windDirection": wind_dir,
-        "uvIndex": uv_index,
-        "sunrise": sunrise,
-        "sunset": sunset,
-        "visibility": visibility,
-        "dewPoint": dew_point,
-        "airQualityIndex": aqi,
-        "pm10": pm10,
-        "pm2_5": pm2_5,
-        "co": co,
-        "no2": no2,
-        "o3": o3,
-        "pollenCount": pollen,
-        "pressureTrend": pressure_trend,
-        "fog": fog,
-    }
+def normalize_openweather(raw: dict, as_record: bool = False):
+    """
+    Normalisiert eine OpenWeather Current-Weather-Antwort (JSON) direkt,
+    ohne sie vorher in ein flaches dict umzubauen (OPENWEATHER_SHAPE im Schema).
+    """
+    extractor = _OPENWEATHER_EXTRACTORS.get(as_record)
+
+    if extractor is None:
+        defaults = OPENWEATHER_SHAPE["defaults"]
+        sources = {
+            key: _path_getter(path, defaults.get(key))
+            for key, path in OPENWEATHER_SHAPE["sources"].items()
+        }
+        extractor = compile_extractor(sources, name="extract_openweather", as_record=as_record)
+        _OPENWEATHER_EXTRACTORS[as_record] = extractor
+
+    return extractor(raw)
+
+
+# ========================================
+# SCHEMA -> VORBERECHNETE EXTRAKTOREN
+# ========================================
+
+# Extraktoren für flache dicts: (Key-Tupel, as_record) -> Funktion (klein gehalten, meist 1-2 Einträge)
+_FLAT_EXTRACTORS = {}
+_FLAT_EXTRACTORS_MAX = 64
+
+# Extraktoren für OpenWeather JSON: as_record -> Funktion
+_OPENWEATHER_EXTRACTORS = {}
+
+
+def _compile_flat_extractor(cache_key):
+    """Baut (und merkt sich) den Extraktor für flache dicts mit genau diesen Keys."""
+
+    keys, as_record = cache_key
+
+    # Alle Keys sind vorhanden (Teil des Cache-Schlüssels) -> raw[key] == raw.get(key)
+    sources = {key: itemgetter(key) for key in keys}
+    extractor = compile_extractor(sources, name="extract_flat", as_record=as_record)
+
+    if len(_FLAT_EXTRACTORS) >= _FLAT_EXTRACTORS_MAX:
+        _FLAT_EXTRACTORS.clear()
+    _FLAT_EXTRACTORS[cache_key] = extractor
+
+    return extractor
+
+
+def compile_extractor(sources: dict, name="extract", as_record=False):
+    """
+    Baut aus WEATHER_SCHEMA eine spezialisierte Funktion extract(raw) -> dict.
+
+    Args:
+        sources (dict): Quell-Key -> Getter getter(raw), der den Wert aus 'raw' liest
+                        (nur tatsächlich vorhandene Quellen, fehlende Aliase entfallen komplett)
+        name (str):     Funktionsname (taucht in Tracebacks auf)
+        as_record:      True -> Funktion liefert WeatherRecord statt dict
+
+    Pro Feld wird EINMAL ein (Name, Leser)-Tupel vorberechnet (Getter + Konverter), Felder ganz ohne Quelle
+    stehen direkt als Default fest. Verhalten exakt wie die "or"-/pick()-Ketten der ursprünglichen
+    Einzel-Version: fehlt der letzte Alias einer "or"-Kette, liefert sie am Ende None.
+    """
+
+    get_tz = sources.get(TIMEZONE_SOURCE, _no_timezone)
+
+    constants = []      # (Name, Default) für Felder ohne vorhandene Quelle
+    steps = []          # (Name, Leser read(raw, tz))
+
+    for field in WEATHER_SCHEMA:
+        getter = _field_getter(field, sources)
+
+        if getter is None:
+            constants.append((field.name, field.default))
+        else:
+            steps.append((field.name, _field_reader(field, getter)))
+
+    constants = tuple(constants)
+    steps = tuple(steps)
+
+    if as_record:
+        def extract(raw):
+            tz = get_tz(raw)
+            record = WeatherRecord()
+            for field_name, value in constants:
+                setattr(record, field_name, value)
+            for field_name, read in steps:
+                setattr(record, field_name, read(raw, tz))
+            return record
+    else:
+        # Vorlage in Schema-Reihenfolge (gleiche Key-Reihenfolge wie bisher), Defaults schon eingetragen
+        template = {field.name: field.default for field in WEATHER_SCHEMA}
+
+        def extract(raw):
+            tz = get_tz(raw)
+            result = template.copy()
+            for field_name, read in steps:
+                result[field_name] = read(raw, tz)
+            return result
+
+    extract.__name__ = extract.__qualname__ = name
+    return extract
+
+
+# Hilfsfunktion -> Zeitzone, wenn die Eingabe keine hat
+def _no_timezone(raw):
+    return 0
+
+
+# Hilfsfunktion -> Getter für einen verschachtelten Pfad (z.B. ("weather", 0, "description"))
+def _path_getter(path, default=None):
+    """
+    Liest raw[a][b]... wie 'sub = raw.get(a) or {}' -> sub.get(b).
+    Fehlende / leere Zwischenstufen werden zu {} (bzw. [{}] vor einem Listen-Index).
+    """
+    *steps, last = path
+
+    if not steps:
+        return lambda raw: raw.get(last, default)
+
+    fallbacks = tuple([{}] if isinstance(following, int) else {} for following in path[1:])
+    pairs = tuple(zip(steps, fallbacks))
+
+    def get(raw):
+        value = raw
+        for step, fallback in pairs:
+            value = (value[step] if isinstance(step, int) else value.get(step)) or fallback
+        return value.get(last, default)
+
+    return get
+
+
+# Hilfsfunktion -> Getter für den Rohwert eines Feldes (nur vorhandene Aliase), None = keine Quelle
+def _field_getter(field, sources):
+    getters = tuple(sources[alias] for alias in field.sources if alias in sources)
+
+    if not getters:
+        return None
+
+    if field.mode == "pick":
+        return lambda raw: _pick_value(*[getter(raw) for getter in getters])
+
+    # "or"-Kette: war der letzte Alias nicht vorhanden, lieferte raw.get(...) dort None
+    last_present = field.sources[-1] in sources
+
+    if len(getters) == 1 and last_present:
+        return getters[0]
+
+    def get_or(raw):
+        value = None
+        for getter in getters:
+            value = getter(raw)
+            if value:
+                return value
+        return value if last_present else None
 
-    # Rückgabe des normalisierten Datensatzes für das Dashboard
-    return normalized_data        
+    return get_or
+
+
+# Hilfsfunktion -> Leser read(raw, tz): Getter + Konverter mit schnellem Pfad für den "richtigen" Typ
+def _field_reader(field, getter):
+    default = field.default
+    kind = field.kind
+
+    if kind == "clock":
+        return lambda raw, tz: _clock(getter(raw), tz, default)
+
+    if kind == "str":
+        def read_str(raw, tz):
+            value = getter(raw)
+            return value.strip() if type(value) is str else _to_str(value, default)
+        return read_str
+
+    if kind == "float":
+        def read_float(raw, tz):
+            value = getter(raw)
+            return value if type(value) is float else _to_float(value, default)
+        return read_float
+
+    if kind == "int":
+        def read_int(raw, tz):
+            value = getter(raw)
+            return value if type(value) is int else _to_int(value, default)
+        return read_int
+
+    if kind == "bool":
+        def read_bool(raw, tz):
+            value = getter(raw)
+            return value if type(value) is bool else _to_bool(value, default)
+        return read_bool
+
+    raise ValueError(f"Unbekannter Feldtyp im Schema: {kind}")
+
+
+# Hilfsfunktion -> wie pick(), aber mit bereits gelesenen Werten
+def _pick_value(*values):
+    for v in values:
+        if v is None:
+            continue
+        if isinstance(v, str) and v.strip() == "":
+            continue
+        return v
+    return None
+
+
+# "HH:MM" für jede Minute des Tages (Index = Minuten seit Mitternacht)
+_CLOCK_STRINGS = [f"{minute // 60:02d}:{minute % 60:02d}" for minute in range(24 * 60)]
+
+
+# Hilfsfunktion -> Sonnenaufgang/-untergang: Unix-Zeit + Zeitzone -> "HH:MM" (Umrechnung, weil API Unix-Zeit gibt)
+def _clock(ts, tz_offset, default):
+    if not ts:
+        return default
+
+    # Schneller Pfad für ganze Sekunden (CSV/API): gleiches Ergebnis wie gmtime, ohne strftime
+    if type(ts) is int and type(tz_offset) is int:
+        return _CLOCK_STRINGS[(ts + tz_offset) // 60 % (24 * 60)]
+
+    return time.strftime("%H:%M", time.gmtime(ts + tz_offset))
 
 
 # Hilfsfunktion um auch 0/0.0 zu akzeptieren
@@ -225,3 +377,268 @@ def pick(raw: dict, *keys):
 
             return v
     return None
+
+
+# ========================================
+# SPALTENWEISE NORMALISIERUNG (DataFrame)
+# ========================================
+
+# Gleiche "HH:MM"-Tabelle als NumPy-Array (vektorisierter Index)
+_CLOCK_TABLE = np.array(_CLOCK_STRINGS, dtype=object)
+
+
+def normalize_weather_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Spaltenweise Variante von normalize_weather_data für viele Zeilen auf einmal (NumPy/pandas).
+
+    - gleiche Aliase, Defaults und Sonnenauf-/untergangs-Formatierung
+    - Ergebnis Zeile für Zeile identisch mit normalize_weather_data(row) für row in df.to_dict("records")
+      (Ausnahme: Zeilen, bei denen die Einzelversion abstürzt, z.B. NaN-Zeitstempel -> hier Default)
+    - numerische Spalten (int/float/bool) werden vektorisiert, Text-/Misch-Spalten (object)
+      über die gleichen Einzel-Konverter (_to_float, _to_int, ...)
+
+    Returns:
+        pd.DataFrame mit den Dashboard-Keys als Spalten (gleicher Index wie df).
+        Werte sind native Python-Typen (None statt fehlender Werte) -> frame_to_records liefert dicts.
+    """
+    n = len(df)
+    columns = {}
+
+    for out_key, kind, aliases, mode, default in WEATHER_SCHEMA:
+
+        if kind == "clock":
+            columns[out_key] = _frame_clock(df, aliases[0], default, n)
+            continue
+
+        # ===== 1) ALIAS AUFLÖSEN (von hinten nach vorne, vorderer Alias gewinnt) =====
+        values, valid = None, None
+
+        for position, alias in enumerate(reversed(aliases)):
+            alias_values, alias_valid = _frame_convert(df, alias, kind, n)
+
+            if position == 0:
+                # Letzter Alias: wird genommen, wenn kein vorderer passt (auch wenn "falsy")
+                values, valid = alias_values, alias_valid
+                continue
+
+            chosen = _frame_truthy(df, alias, n) if mode == "or" else _frame_present(df, alias, n)
+            values = np.where(chosen, alias_values, values)
+            valid = np.where(chosen, alias_valid, valid)
+
+        # ===== 2) FEHLENDE WERTE -> DEFAULT (als native Python-Objekte) =====
+        if kind == "bool":
+            result = values.astype(bool)
+            if not valid.all():
+                result = np.where(valid, result, default)
+            columns[out_key] = result.astype(bool)
+        else:
+            result = values.astype(object)
+            result[~valid] = default
+            columns[out_key] = result
+
+    return pd.DataFrame(columns, index=df.index)
+
+
+def frame_to_records(frame: pd.DataFrame) -> list:
+    """Wandelt das Ergebnis von normalize_weather_frame in eine Liste von dicts (wie normalize_weather_data)."""
+    keys = list(frame.columns)
+    columns = [frame[key].tolist() for key in keys]     # tolist() -> native Python-Typen
+    return [dict(zip(keys, row)) for row in zip(*columns)]
+
+
+# Hilfsfunktion -> "truthy"-Maske einer Spalte (wie 'raw.get(alias) or ...')
+def _frame_truthy(df, alias, n):
+    if alias not in df.columns:
+        return np.zeros(n, dtype=bool)              # raw.get(...) -> None
+
+    column = df[alias]
+    if column.dtype.kind in "biuf":
+        return column.to_numpy() != 0               # NaN != 0 -> True (NaN ist "truthy")
+    return column.to_numpy(dtype=object).astype(bool)
+
+
+# Hilfsfunktion -> "vorhanden"-Maske einer Spalte (wie pick(): nicht None, kein leerer String)
+def _frame_present(df, alias, n):
+    if alias not in df.columns:
+        return np.zeros(n, dtype=bool)
+
+    column = df[alias]
+    if column.dtype.kind in "biuf":
+        return np.ones(n, dtype=bool)
+    return np.fromiter(
+        (v is not None and not (isinstance(v, str) and v.strip() == "") for v in column.to_numpy(dtype=object)),
+        dtype=bool,
+        count=n
+    )
+
+
+# Hilfsfunktion -> Spalte konvertieren: (Werte, gültig-Maske), ungültig == Konverter lieferte Default
+def _frame_convert(df, alias, kind, n):
+    if alias not in df.columns:
+        return np.full(n, None, dtype=object), np.zeros(n, dtype=bool)
+
+    column = df[alias]
+    dtype_kind = column.dtype.kind
+
+    # ===== NUMERISCHE SPALTEN -> vektorisiert =====
+    if dtype_kind in "biuf":
+        raw = column.to_numpy()
+
+        if kind == "float":
+            return raw.astype(np.float64), np.ones(n, dtype=bool)
+
+        if kind == "int":
+            if dtype_kind in "biu":
+                return raw.astype(np.int64), np.ones(n, dtype=bool)
+            valid = np.isfinite(raw)                            # int(NaN) -> Default
+            return np.trunc(np.where(valid, raw, 0)).astype(np.int64), valid
+
+        if kind == "bool":
+            return raw != 0, np.ones(n, dtype=bool)
+
+        # kind == "str": str(1.0) etc. wie in Python
+        return np.array([str(v).strip() for v in raw.tolist()], dtype=object), np.ones(n, dtype=bool)
+
+    # ===== TEXT / GEMISCHT -> Einzel-Konverter (identisches Verhalten) =====
+    items = column.to_numpy(dtype=object)
+
+    if kind == "str":
+        valid = np.fromiter((v is not None for v in items), dtype=bool, count=n)
+        return np.array([_to_str(v) for v in items], dtype=object), valid
+
+    if kind == "bool":
+        return np.array([_to_bool(v) for v in items], dtype=bool), np.ones(n, dtype=bool)
+
+    converter = _to_float if kind == "float" else _to_int
+    converted = np.array([converter(v) for v in items], dtype=object)
+    valid = np.fromiter((v is not None for v in converted), dtype=bool, count=n)
+    return converted, valid
+
+
+# Hilfsfunktion -> Unix-Zeit + Zeitzone -> "HH:MM" (wie time.strftime("%H:%M", time.gmtime(...)))
+def _frame_clock(df, alias, default, n):
+    result = np.full(n, default, dtype=object)
+
+    if alias not in df.columns:
+        return result
+
+    ts_column = df[alias]
+
+    if TIMEZONE_SOURCE in df.columns:
+        tz_column = df[TIMEZONE_SOURCE]
+    else:
+        tz_column = pd.Series(np.zeros(n, dtype=np.int64), index=df.index)
+
+    # Vektorisiert, wenn beide Spalten numerisch sind
+    if ts_column.dtype.kind in "biuf" and tz_column.dtype.kind in "biuf":
+        ts = ts_column.to_numpy().astype(np.float64)
+        total = ts + tz_column.to_numpy().astype(np.float64)
+
+        ok = (ts != 0) & np.isfinite(total)                 # 0 -> Default, NaN würde in gmtime abstürzen
+        minutes = (np.floor(total[ok]) // 60 % (24 * 60)).astype(np.int64)
+
+        result[ok] = _CLOCK_TABLE[minutes]
+        return result
+
+    # Sonst Zeile für Zeile wie das Original
+    for i, (ts, tz) in enumerate(zip(ts_column.to_numpy(dtype=object), tz_column.to_numpy(dtype=object))):
+        if not ts:
+            continue
+        try:
+            result[i] = time.strftime("%H:%M", time.gmtime(ts + tz))
+        except (TypeError, ValueError, OverflowError):
+            pass
+
+    return result
+
+
+# ========================================
+# BENCHMARK: Zeile für Zeile vs. spaltenweise
+# ========================================
+
+def _records_equal(a, b):
+    """Vergleich zweier Listen normalisierter dicts (NaN == NaN)."""
+    if len(a) != len(b):
+        return False
+    for left, right in zip(a, b):
+        if left.keys() != right.keys():
+            return False
+        for key in left:
+            x, y = left[key], right[key]
+            if type(x) is not type(y):
+                return False
+            if x != y and not (isinstance(x, float) and x != x and y != y):
+                return False
+    return True
+
+
+def _benchmark(n_rows=500_000):
+    """Normalisiert eine aufgeblähte Sample-CSV einmal pro Zeile und einmal spaltenweise."""
+    import os
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    sample_path = os.path.abspath(os.path.join(base_dir, "..", "..", "data", "samples", "weather_sample.csv"))
+
+    sample = pd.read_csv(sample_path)
+    df = pd.concat([sample] * (n_rows // len(sample) + 1), ignore_index=True).iloc[:n_rows]
+
+    # Ein paar Lücken wie in echten Stationsdaten
+    df.loc[df.index % 7 == 0, "windGust"] = np.nan
+    df.loc[df.index % 11 == 0, "humidity"] = np.nan
+    df.loc[df.index % 13 == 0, "cloudCoverage"] = 0
+
+    start = time.perf_counter()
+    per_row = [normalize_weather_data(row) for row in df.to_dict("records")]
+    per_row_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = frame_to_records(normalize_weather_frame(df))
+    vectorized_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    normalize_weather_frame(df)
+    frame_only_s = time.perf_counter() - start
+
+    print(f"{n_rows} Zeilen:")
+    print(f"  normalize_weather_data (pro Zeile):          {per_row_s:.2f} s")
+    print(f"  normalize_weather_frame + frame_to_records:  {vectorized_s:.2f} s  ({per_row_s / vectorized_s:.1f}x)")
+    print(f"  normalize_weather_frame (nur DataFrame):     {frame_only_s:.2f} s  ({per_row_s / frame_only_s:.1f}x)")
+    print(f"  Ergebnis identisch: {_records_equal(per_row, vectorized)}")
+
+
+def _benchmark_records(n_records=200_000):
+    """Mikro-Benchmark: Datensätze pro Sekunde für CSV-Zeilen (flache dicts) und OpenWeather JSON."""
+    import os
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    sample_path = os.path.abspath(os.path.join(base_dir, "..", "..", "data", "samples", "weather_sample.csv"))
+
+    rows = pd.read_csv(sample_path).to_dict("records")
+    csv_records = [rows[i % len(rows)] for i in range(n_records)]
+
+    openweather = {
+        "name": "Berlin", "timezone": 3600, "visibility": 10000,
+        "main": {"temp": 6.5, "feels_like": 4.1, "temp_min": 5.0, "temp_max": 8.0, "humidity": 81, "pressure": 1012},
+        "weather": [{"description": "leichter Regen"}],
+        "wind": {"speed": 4.12, "deg": 240, "gust": 7.2},
+        "clouds": {"all": 75},
+        "sys": {"sunrise": 1769843400, "sunset": 1769877300},
+    }
+    json_records = [openweather] * n_records
+
+    for label, records, normalize in (
+        ("CSV-Zeile (flaches dict)", csv_records, normalize_weather_data),
+        ("OpenWeather JSON", json_records, normalize_openweather),
+    ):
+        start = time.perf_counter()
+        for record in records:
+            normalize(record)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<26} {n_records / elapsed:>12,.0f} Datensätze/s")
+
+
+if __name__ == "__main__":
+    print("Vorberechnete Extraktoren:")
+    _benchmark_records()
+    print()
+    _benchmark()
@@ -0,0 +1,166 @@
+##################################################
+# DOWNSAMPLING – Zeitreihen für Plots - 1.1.0
+##################################################
+
+"""
+Reduziert lange Zeitreihen auf so viele Punkte, wie der Plot Pixel breit ist.
+
+Ein Jahr History sind ~8.760 Stundenwerte, mehrere Jahre entsprechend mehr – Matplotlib zeichnet
+sonst jeden Punkt (langsam, und die Linie wird ohnehin zu einem Balken).
+
+Zwei Verfahren:
+    - "minmax": pro Bucket (≈ Pixelspalte) Minimum UND Maximum, in zeitlicher Reihenfolge
+                -> Spitzen/Extremwerte bleiben exakt sichtbar, Lücken (NaN) bleiben Lücken (Standard)
+    - "lttb":   Largest-Triangle-Three-Buckets, ein Punkt pro Bucket, der die Form am besten erhält
+                -> glattere Linie, NaN-Werte werden vorher entfernt (Lücken werden überbrückt)
+
+Kurze Reihen (nicht länger als die Pixelbreite) werden unverändert zurückgegeben.
+Mehrere Variablen (downsample_frame_multi) teilen sich eine Zeitachse: Vereinigung der Indizes je Variable.
+"""
+
+# =============== IMPORTS ====================
+import numpy as np
+import pandas as pd
+
+DOWNSAMPLE_METHODS = ("minmax", "lttb", "none")
+
+
+# ===== MIN/MAX-BUCKETS =====
+def minmax_indices(y, buckets):
+    """
+    Indizes der Punkte, die pro Bucket behalten werden (Min + Max, sortiert), inkl. erstem und letztem Punkt.
+    Ein Bucket nur aus NaN liefert seinen ersten Index (NaN) -> die Lücke bleibt im Plot erhalten.
+    """
+    y = np.asarray(y, dtype="float64")
+    n = len(y)
+    buckets = max(1, int(buckets))
+
+    if n <= 2 * buckets:
+        return np.arange(n)
+
+    # Auf ein Vielfaches der Bucket-Größe auffüllen und als (buckets, size) betrachten
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    blocks = padded.reshape(buckets, size)
+
+    nan = np.isnan(blocks)
+    lo = np.argmin(np.where(nan, np.inf, blocks), axis=1)
+    hi = np.argmax(np.where(nan, -np.inf, blocks), axis=1)
+
+    # Bucket komplett NaN -> argmin/argmax = 0 -> erster Index des Buckets (NaN)
+    offsets = np.arange(buckets) * size
+    idx = np.concatenate(([0], offsets + lo, offsets + hi, [n - 1]))
+    idx = np.unique(idx[idx < n])
+
+    return idx
+
+
+# ===== LTTB =====
+def lttb_indices(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets (Steinarsson 2013): Indizes von höchstens 'threshold' Punkten.
+    x muss aufsteigend sein (z.B. Unix-Zeit), NaN-Punkte werden ignoriert.
+    """
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+
+    valid = np.flatnonzero(~np.isnan(y))
+    n = len(valid)
+    threshold = max(3, int(threshold))
+
+    if n <= threshold:
+        return valid
+
+    xv, yv = x[valid], y[valid]
+
+    # Innere Punkte (erster und letzter bleiben fix) in gleich große Buckets, mit NaN aufgefüllt
+    buckets = threshold - 2
+    size = -(-(n - 2) // buckets)
+    buckets = -(-(n - 2) // size)               # keine leeren Buckets am Ende
+    bx = np.full(buckets * size, np.nan)
+    by = np.full(buckets * size, np.nan)
+    bx[:n - 2] = xv[1:-1]
+    by[:n - 2] = yv[1:-1]
+    bx = bx.reshape(buckets, size)
+    by = by.reshape(buckets, size)
+
+    # Mittelwert jedes Buckets = dritter Dreieckspunkt für den Bucket davor (letzter: Endpunkt)
+    mean_x = np.append(np.nanmean(bx, axis=1)[1:], xv[-1])
+    mean_y = np.append(np.nanmean(by, axis=1)[1:], yv[-1])
+
+    # Auffüllung danach mit dem letzten inneren Punkt ersetzen -> argmax ohne NaN-Sonderfall
+    bx[np.isnan(bx)] = xv[-2]
+    by[np.isnan(by)] = yv[-2]
+
+    # Sequentiell: der gewählte Punkt ist die Dreiecksspitze für den nächsten Bucket
+    keep = np.empty(buckets + 2, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+    ax, ay = xv[0], yv[0]
+
+    for i in range(buckets):
+        cx, cy = mean_x[i], mean_y[i]
+        area = np.abs((ax - cx) * (by[i] - ay) - (ax - bx[i]) * (cy - ay))
+        j = int(area.argmax())
+        keep[i + 1] = 1 + i * size + j
+        ax, ay = bx[i, j], by[i, j]
+
+    keep = np.unique(keep)
+
+    return valid[keep]
+
+
+# ===== DATAFRAME =====
+def downsample_indices(df, var, width, method="minmax"):
+    """Zeilen-Indizes, die für 'var' behalten werden (None = alle, d.h. nichts zu reduzieren)."""
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"Unbekanntes Downsampling-Verfahren: {method!r} (erlaubt: {', '.join(DOWNSAMPLE_METHODS)})")
+
+    if method == "none" or len(df) <= width:
+        return None
+
+    y = df[var].to_numpy(dtype="float64", na_value=np.nan)
+
+    if method == "lttb":
+        x = pd.DatetimeIndex(df["time"]).asi8 / 1e9
+        return lttb_indices(x, y, width)
+
+    return minmax_indices(y, width)
+
+
+def downsample_frame(df, var, width, method="minmax"):
+    """
+    Liefert einen DataFrame (time + var) passend zur Plotbreite 'width' (Pixel):
+        minmax -> ein Bucket pro Pixelspalte (höchstens 2 * width Punkte)
+        lttb   -> width Punkte
+    Unverändert, wenn die Reihe schon kurz genug ist oder method == "none".
+    """
+    if df is None or df.empty or var not in df.columns:
+        return df
+
+    idx = downsample_indices(df, var, width, method=method)
+
+    if idx is None:
+        return df
+
+    return df.iloc[idx][["time", var]]
+
+
+def downsample_frame_multi(df, variables, width, method="minmax"):
+    """
+    Wie downsample_frame für mehrere Variablen auf EINER Zeitachse (time + variables):
+    jede Variable behält ihre Extremwerte, die Zeilen sind die Vereinigung aller Indizes.
+    """
+    if df is None or df.empty:
+        return df
+
+    variables = [var for var in variables if var in df.columns]
+    columns = ["time"] + variables
+
+    indices = [downsample_indices(df, var, width, method=method) for var in variables]
+
+    if not variables or any(idx is None for idx in indices):
+        return df[columns]
+
+    return df.iloc[np.unique(np.concatenate(indices))][columns]
@@ -1,18 +1,24 @@
 ##################################################
-# FORECAST-PROVIDER – OpenMeteo - 1.0.0
+# FORECAST-PROVIDER – OpenMeteo - 1.1.0
 ##################################################
-import requests
 import pandas as pd
 import logging
 
+from backend.services import http_client
+
 # Logger konfigurieren
 logger = logging.getLogger(__name__)
 
+# Die Forecast API liefert zusätzlich bis zu 92 vergangene Tage in derselben Antwort
+MAX_PAST_DAYS = 92
+
 # Funktion
-def fetch_openmeteo_forecast_dataframe(lat, lon, days=7):
+def fetch_openmeteo_forecast_dataframe(lat, lon, days=7, past_days=0):
     """
     Holt Forecast-Daten aus der Open-Meteo Forecast API
     und gibt sie als pandas-DataFrame zurück.
+    past_days > 0: dieselbe Anfrage enthält auch die letzten 'past_days' Tage
+    (Vergangenheit + Vorhersage als EINE durchgehende Reihe).
 
     DataFrame-Spalten:
         time, temperature_2m, relative_humidity_2m, wind_speed_10m
@@ -32,6 +38,9 @@ def fetch_openmeteo_forecast_dataframe(lat, lon, days=7):
     elif days > 14:
         days = 14
 
+    # Vergangene Tage begrenzen auf 0-92
+    past_days = max(0, min(int(past_days), MAX_PAST_DAYS))
+
     # ===== 2) ANFRAGE VORBEREITEN =====
     url = "https://api.open-meteo.com/v1/forecast"
 
@@ -43,9 +52,12 @@ def fetch_openmeteo_forecast_dataframe(lat, lon, days=7):
         "timezone": "UTC"
     } 
 
+    if past_days > 0:
+        params["past_days"] = past_days
+
     # ===== 3) ANFRAGE SENDEN =====
     try:
-        resp = requests.get(url, params=params, timeout=10)
+        resp = http_client.get_interactive(url, params=params)   # gemeinsame Session (Keep-Alive, Retry, knappes Zeitbudget fürs Dashboard)
 
         if resp.status_code != 200: # 200 == OK
             logger.info(f"Forecast-Request fehlgeschlagen: status={resp.status_code}")
@@ -0,0 +1,312 @@
+##############################################
+#   🌦 GEOCODE-STORE – 1.0.1                 #
+##############################################
+
+"""
+Persistenter Geocoding-Cache (SQLite) mit Offline-Gazetteer.
+
+Aufgaben:
+    - Stadt -> (lat, lon) dauerhaft speichern (überlebt Neustarts)
+    - Vorbefüllen aus einer mitgelieferten Gazetteer-CSV (city,lat,lon) -> häufige Städte ohne Netzwerk
+    - Negative Treffer (Stadt unbekannt / Geocoder-Fehler) für eine Zeit merken,
+      damit der Geocoder (Nominatim, rate-limited) nicht wiederholt gefragt wird
+    - Größe begrenzen: älteste (zuletzt benutzte) Einträge fliegen raus, Gazetteer-Einträge nie
+"""
+
+# =============== IMPORTS ====================
+import csv
+import os
+import logging
+import sqlite3
+import threading
+import time
+
+from backend.services.data_normalizer import city_key
+
+# Logger für dieses Modul
+logger = logging.getLogger(__name__)
+
+
+# Rückgabewert für "bekannt: Stadt hat keine Koordinaten" (negativer Cache-Eintrag)
+NOT_FOUND = "not_found"
+
+# Standard-Pfade relativ zum Projekt-Root
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+DEFAULT_DB_PATH = os.path.join(_PROJECT_ROOT, "data", "cache", "geocode.sqlite3")
+DEFAULT_GAZETTEER_PATH = os.path.join(_PROJECT_ROOT, "data", "gazetteer", "cities.csv")
+
+
+# ===== KLASSE ERSTELLEN =====
+class GeocodeStore:
+    """
+    SQLite-Tabelle 'geocode':
+        city_key   (PRIMARY KEY, casefold)
+        lat, lon   (NULL bei negativem Eintrag)
+        source     ('gazetteer' | 'geocoder' | 'negative')
+        expires_at (Unix-Zeit, NULL = läuft nie ab)
+        last_used  (Unix-Zeit, für die Verdrängung)
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, gazetteer_path=DEFAULT_GAZETTEER_PATH,
+                 max_entries=10000, negative_ttl=24 * 3600, error_ttl=60, memo_size=1024,
+                 touch_interval=60.0, clock=time.time):
+        """
+        Args:
+            db_path (str):          Pfad der SQLite-Datei (":memory:" für Tests)
+            gazetteer_path (str):   CSV zum Vorbefüllen (None = kein Gazetteer)
+            max_entries (int):      Max. Anzahl Geocoder-/Negativ-Einträge
+            negative_ttl (float):   Sekunden, die "Stadt nicht gefunden" gemerkt wird
+            error_ttl (float):      Sekunden Pause nach einem Geocoder-Fehler (Netzwerk etc.)
+            memo_size (int):        Größe des kleinen In-Process Memos vor der Datenbank
+            touch_interval (float): Memo-Treffer schreiben last_used höchstens alle 'touch_interval' Sekunden
+                                    in die Datenbank (LRU bleibt korrekt, ohne Schreibzugriff pro Treffer)
+            clock (callable):       Zeitquelle (Unix-Sekunden), für Tests austauschbar
+        """
+        self.db_path = db_path
+        self.max_entries = max(1, int(max_entries))
+        self.negative_ttl = negative_ttl
+        self.error_ttl = error_ttl
+        self.memo_size = max(0, int(memo_size))
+        self.touch_interval = max(0.0, float(touch_interval))
+        self.clock = clock
+
+        self._memo = {}                 # city_key -> [(lat, lon), expires_at, last_used in der DB] für positive Treffer
+        self._lock = threading.Lock()
+
+        # Ordner anlegen und Datenbank öffnen (eine Verbindung, durch Lock geschützt)
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._create_schema()
+
+        if gazetteer_path:
+            self.seed_from_gazetteer(gazetteer_path)
+
+
+    # ========================================
+    # SCHEMA + GAZETTEER
+    # ========================================
+
+    def _create_schema(self):
+        """Legt die Tabelle an, falls sie noch nicht existiert."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS geocode (
+                    city_key   TEXT PRIMARY KEY,
+                    lat        REAL,
+                    lon        REAL,
+                    source     TEXT NOT NULL,
+                    expires_at REAL,
+                    last_used  REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_geocode_last_used ON geocode(last_used)")
+
+
+    def seed_from_gazetteer(self, path):
+        """
+        Liest eine CSV (city,lat,lon) und übernimmt alle Städte als dauerhafte Einträge.
+        Gibt die Anzahl gelesener Zeilen zurück.
+        """
+        if not os.path.exists(path):
+            logger.warning(f"Gazetteer nicht gefunden: {path}")
+            return 0
+
+        rows = []
+        now = self.clock()
+
+        try:
+            with open(path, "r", newline="", encoding="utf-8") as fh:
+                for row in csv.DictReader(fh):
+                    key = city_key(row.get("city"))
+                    try:
+                        lat = float(row.get("lat"))
+                        lon = float(row.get("lon"))
+                    except (TypeError, ValueError):
+                        continue
+                    if key:
+                        rows.append((key, lat, lon, "gazetteer", None, now))
+
+        except Exception as e:
+            logger.error(f"Gazetteer konnte nicht gelesen werden: {e}")
+            return 0
+
+        # Gazetteer überschreibt nur negative Einträge / fehlende Städte, nicht echte Geocoder-Treffer
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO geocode (city_key, lat, lon, source, expires_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(city_key) DO UPDATE SET
+                    lat = excluded.lat, lon = excluded.lon,
+                    source = excluded.source, expires_at = NULL
+                WHERE geocode.source != 'geocoder'
+                """,
+                rows
+            )
+
+        logger.info(f"Gazetteer geladen: {len(rows)} Städte aus {path}")
+        return len(rows)
+
+
+    # ========================================
+    # LESEN
+    # ========================================
+
+    def lookup(self, city):
+        """
+        Liefert:
+            (lat, lon)  -> bekannt
+            NOT_FOUND   -> negativer Eintrag noch gültig (Geocoder NICHT fragen)
+            None        -> unbekannt (Geocoder fragen)
+        """
+        key = city_key(city)
+        if key == "":
+            return None
+
+        now = self.clock()
+
+        # ===== 1) MEMO (ohne Datenbankzugriff, außer last_used auffrischen) =====
+        entry = self._memo.get(key)
+
+        if entry is not None:
+            coords, expires_at, touched = entry
+
+            if expires_at is None or expires_at > now:
+                # Meistbenutzte Städte dürfen nicht mit altem last_used als Erste verdrängt werden
+                if now - touched >= self.touch_interval:
+                    with self._lock, self._conn:
+                        self._conn.execute("UPDATE geocode SET last_used = ? WHERE city_key = ?", (now, key))
+                    entry[2] = now
+                return coords
+
+            # Abgelaufen -> wie ohne Memo über die Datenbank (löscht den Eintrag)
+            self._memo.pop(key, None)
+
+        # ===== 2) DATENBANK =====
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT lat, lon, expires_at FROM geocode WHERE city_key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            lat, lon, expires_at = row
+
+            # Abgelaufen -> löschen und wie unbekannt behandeln
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM geocode WHERE city_key = ?", (key,))
+                return None
+
+            self._conn.execute("UPDATE geocode SET last_used = ? WHERE city_key = ?", (now, key))
+
+        if lat is None or lon is None:
+            return NOT_FOUND
+
+        coords = (lat, lon)
+        self._remember(key, coords, expires_at, now)
+        return coords
+
+
+    # ========================================
+    # SCHREIBEN
+    # ========================================
+
+    def store(self, city, lat, lon):
+        """Speichert einen Geocoder-Treffer dauerhaft."""
+        key = city_key(city)
+        if key == "":
+            return
+
+        self._upsert(key, lat, lon, "geocoder", None)
+        self._remember(key, (lat, lon), None, self.clock())
+
+
+    def store_negative(self, city, ttl=None):
+        """Merkt sich, dass die Stadt (vorerst) nicht aufgelöst werden kann."""
+        key = city_key(city)
+        if key == "":
+            return
+
+        ttl = self.negative_ttl if ttl is None else ttl
+        self._memo.pop(key, None)
+        self._upsert(key, None, None, "negative", self.clock() + ttl)
+
+
+    def _upsert(self, key, lat, lon, source, expires_at):
+        """Schreibt einen Eintrag und verdrängt bei Bedarf die ältesten Einträge."""
+        now = self.clock()
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO geocode (city_key, lat, lon, source, expires_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(city_key) DO UPDATE SET
+                    lat = excluded.lat, lon = excluded.lon, source = excluded.source,
+                    expires_at = excluded.expires_at, last_used = excluded.last_used
+                """,
+                (key, lat, lon, source, expires_at, now)
+            )
+            self._evict_locked()
+
+
+    def _evict_locked(self):
+        """Entfernt abgelaufene und (über max_entries) die am längsten unbenutzten Einträge."""
+
+        self._conn.execute(
+            "DELETE FROM geocode WHERE expires_at IS NOT NULL AND expires_at <= ?", (self.clock(),)
+        )
+
+        (count,) = self._conn.execute(
+            "SELECT COUNT(*) FROM geocode WHERE source != 'gazetteer'"
+        ).fetchone()
+
+        overflow = count - self.max_entries
+
+        if overflow > 0:
+            evicted = self._conn.execute(
+                """
+                SELECT city_key FROM geocode WHERE source != 'gazetteer'
+                ORDER BY last_used ASC LIMIT ?
+                """,
+                (overflow,)
+            ).fetchall()
+
+            self._conn.executemany("DELETE FROM geocode WHERE city_key = ?", evicted)
+
+            for (key,) in evicted:
+                self._memo.pop(key, None)
+
+            logger.debug(f"GeocodeStore: {overflow} Einträge verdrängt")
+
+
+    def _remember(self, key, coords, expires_at, touched):
+        """Kleines In-Process Memo (wird bei Überlauf komplett geleert), merkt sich Ablauf + letzten DB-Touch."""
+        if self.memo_size == 0:
+            return
+        if len(self._memo) >= self.memo_size:
+            self._memo.clear()
+        self._memo[key] = [coords, expires_at, touched]
+
+
+    # ========================================
+    # SONSTIGES
+    # ========================================
+
+    def stats(self) -> dict:
+        """Anzahl Einträge pro Quelle (gazetteer / geocoder / negative)."""
+        with self._lock:
+            rows = self._conn.execute("SELECT source, COUNT(*) FROM geocode GROUP BY source").fetchall()
+        return {source: count for source, count in rows}
+
+
+    def close(self):
+        """Schließt die Datenbankverbindung."""
+        with self._lock:
+            self._conn.close()
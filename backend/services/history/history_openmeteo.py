@@ -1,10 +1,11 @@
 ##################################################
 # HISTORY-PROVIDER – OpenMeteo - 1.0.1
 ##################################################
-import requests
 import pandas as pd
 import logging
 
+from backend.services import http_client
+
 # Logger konfigurieren 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +41,7 @@ def fetch_openmeteo_history_dataframe(lat, lon, start_date, end_date):
 
     # ===== 3) ANFRAGE SENDEN =====
     try:
-        resp = requests.get(url, params=params, timeout=10)
+        resp = http_client.get_interactive(url, params=params)   # gemeinsame Session (Keep-Alive, Retry, knappes Zeitbudget fürs Dashboard)
 
         if resp.status_code != 200: # 200 == OK
             logger.info(f"History-Request fehlgeschlagen: status={resp.status_code}")
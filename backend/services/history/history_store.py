@@ -0,0 +1,286 @@
+##################################################
+# HISTORY-STORE – OpenMeteo - 1.0.1
+##################################################
+
+"""
+Lückenbewusster, persistenter Speicher für die stündlichen Open-Meteo History-Daten (SQLite).
+
+Bisher wurde für jeden Zeitraum [heute - days, heute] ALLES neu geladen: 7 -> 14 Tage oder
+am nächsten Tag wiederkommen hieß, die überlappenden Stunden erneut herunterzuladen.
+
+Jetzt:
+    - Stundenwerte werden pro (gerundeter) Position dauerhaft gespeichert
+    - Pro (Position, Tag) wird gemerkt, ob der Tag schon geladen ist und ob er vollständig ist
+      (24 Stunden, keine null-Werte, Tag liegt in der Vergangenheit)
+    - Bei einer Anfrage werden nur die FEHLENDEN Tage geladen, zusammenhängende Lücken
+      als EIN Request (kleine bereits vorhandene Stücke dazwischen werden mitgeladen)
+    - Unvollständige Tage (heute, Archiv liefert noch null) gelten nur recent_ttl Sekunden
+    - Ergebnis ist immer ein lückenloses Stundenraster von start_date 00:00 bis end_date 23:00 (UTC)
+
+Lange Zeiträume (Monate/Jahre) kosten damit genau einen Download pro Tag – einmal.
+"""
+
+# =============== IMPORTS ====================
+import os
+import logging
+import sqlite3
+import threading
+import time
+
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from backend.services.history.history_openmeteo import fetch_openmeteo_history_dataframe
+
+# Logger für dieses Modul
+logger = logging.getLogger(__name__)
+
+
+# Standard-Pfad relativ zum Projekt-Root
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+DEFAULT_DB_PATH = os.path.join(_PROJECT_ROOT, "data", "cache", "history.sqlite3")
+
+# Spalten, die die Archive-API liefert (siehe fetch_openmeteo_history_dataframe)
+HISTORY_COLUMNS = ("temperature_2m", "relative_humidity_2m", "wind_speed_10m")
+
+
+# ===== KLASSE ERSTELLEN =====
+class HistoryStore:
+    """
+    SQLite-Tabellen:
+        history_hourly (lat, lon, ts, <HISTORY_COLUMNS>)   -> Stundenwerte, ts = Unix-Sekunden (UTC)
+        history_days   (lat, lon, day, complete, fetched_at) -> welche Tage schon geladen sind
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, recent_ttl=3600, merge_gap_days=2, fetch=None, clock=time.time):
+        """
+        Args:
+            db_path (str):         Pfad der SQLite-Datei (":memory:" für Tests)
+            recent_ttl (float):    Sekunden, die ein unvollständiger Tag (heute / null-Werte) gültig bleibt
+            merge_gap_days (int):  Lücken, zwischen denen höchstens so viele vorhandene Tage liegen,
+                                   werden in EINEM Request geladen (weniger Roundtrips)
+            fetch (callable):      Download-Funktion (lat, lon, start_date, end_date) -> DataFrame/None
+            clock (callable):      Zeitquelle (Unix-Sekunden) für fetched_at / Ablauf und "heute", für Tests austauschbar
+        """
+        self.db_path = db_path
+        self.recent_ttl = recent_ttl
+        self.merge_gap_days = max(0, int(merge_gap_days))
+        self.fetch = fetch or fetch_openmeteo_history_dataframe
+        self.clock = clock
+
+        self._lock = threading.Lock()           # schützt die Verbindung
+        self._location_locks = {}               # (lat, lon) -> Lock, damit dieselbe Lücke nur einmal geladen wird
+        self._location_locks_lock = threading.Lock()
+
+        self.downloads = 0                      # Anzahl Requests (für Logs / Tests)
+
+        # Ordner anlegen und Datenbank öffnen (eine Verbindung, durch Lock geschützt)
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._create_schema()
+
+
+    # ========================================
+    # SCHEMA
+    # ========================================
+
+    def _create_schema(self):
+        """Legt die Tabellen an, falls sie noch nicht existieren."""
+        columns = ",\n".join(f"{name} REAL" for name in HISTORY_COLUMNS)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS history_hourly (
+                    lat REAL NOT NULL,
+                    lon REAL NOT NULL,
+                    ts  INTEGER NOT NULL,
+                    {columns},
+                    PRIMARY KEY (lat, lon, ts)
+                ) WITHOUT ROWID
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS history_days (
+                    lat        REAL NOT NULL,
+                    lon        REAL NOT NULL,
+                    day        TEXT NOT NULL,
+                    complete   INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (lat, lon, day)
+                ) WITHOUT ROWID
+                """
+            )
+
+
+    # ========================================
+    # ÖFFENTLICHE FUNKTIONEN
+    # ========================================
+
+    def get_range(self, lat, lon, start_date, end_date):
+        """
+        Liefert den History-DataFrame (time + HISTORY_COLUMNS) für [start_date, end_date] (ISO-Strings),
+        lädt vorher nur die fehlenden Tage nach. None, wenn gar keine Daten vorhanden sind.
+        """
+        if lat is None or lon is None:
+            return None
+
+        start = date.fromisoformat(str(start_date))
+        end = date.fromisoformat(str(end_date))
+
+        if end < start:
+            return None
+
+        with self._location_lock(lat, lon):
+            for gap_start, gap_end in self.missing_ranges(lat, lon, start, end):
+                self._download(lat, lon, gap_start, gap_end)
+
+        return self._read(lat, lon, start, end)
+
+
+    def missing_ranges(self, lat, lon, start, end):
+        """
+        Fehlende (oder abgelaufene) Tage in [start, end] als Liste von (von, bis)-Intervallen.
+        Liegen zwischen zwei Lücken höchstens merge_gap_days vorhandene Tage, werden sie zusammengefasst.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT day FROM history_days
+                WHERE lat = ? AND lon = ? AND day BETWEEN ? AND ?
+                  AND (complete = 1 OR fetched_at > ?)
+                """,
+                (lat, lon, start.isoformat(), end.isoformat(), self.clock() - self.recent_ttl)
+            ).fetchall()
+
+        covered = {day for (day,) in rows}
+
+        ranges = []
+        day = start
+
+        while day <= end:
+            if day.isoformat() in covered:
+                day += timedelta(days=1)
+                continue
+
+            # Lücke beginnt
+            gap_start = day
+            while day <= end and day.isoformat() not in covered:
+                day += timedelta(days=1)
+
+            gap_end = day - timedelta(days=1)
+
+            # Nahe an der vorherigen Lücke -> gemeinsam laden
+            if ranges and (gap_start - ranges[-1][1]).days - 1 <= self.merge_gap_days:
+                ranges[-1] = (ranges[-1][0], gap_end)
+            else:
+                ranges.append((gap_start, gap_end))
+
+        return ranges
+
+
+    def stats(self) -> dict:
+        """Anzahl gespeicherter Stunden / Tage und bisherige Downloads."""
+        with self._lock:
+            (hours,) = self._conn.execute("SELECT COUNT(*) FROM history_hourly").fetchone()
+            (days,) = self._conn.execute("SELECT COUNT(*) FROM history_days").fetchone()
+        return {"hours": hours, "days": days, "downloads": self.downloads}
+
+
+    def close(self):
+        """Schließt die Datenbankverbindung."""
+        with self._lock:
+            self._conn.close()
+
+
+    # ========================================
+    # HELPER
+    # ========================================
+
+    def _location_lock(self, lat, lon):
+        with self._location_locks_lock:
+            return self._location_locks.setdefault((lat, lon), threading.Lock())
+
+
+    def _download(self, lat, lon, start, end):
+        """Lädt [start, end] herunter und übernimmt Stundenwerte + Tagesstatus (ein Commit)."""
+
+        self.downloads += 1
+        logger.debug(f"History-Download ({lat}, {lon}): {start} .. {end}")
+
+        df = self.fetch(lat=lat, lon=lon, start_date=start.isoformat(), end_date=end.isoformat())
+
+        # Fehler -> nichts merken, beim nächsten Aufruf erneut versuchen
+        if df is None or df.empty:
+            logger.info(f"History-Download fehlgeschlagen ({lat}, {lon}): {start} .. {end}")
+            return
+
+        ts = pd.to_datetime(df["time"], utc=True).astype("int64") // 10**9
+        values = df.reindex(columns=list(HISTORY_COLUMNS)).astype("float64")
+
+        # NaN -> NULL für SQLite
+        rows = [
+            (lat, lon, int(t), *(None if v != v else v for v in vals))
+            for t, vals in zip(ts.to_numpy(), values.itertuples(index=False, name=None))
+        ]
+
+        # Vollständig = vergangener Tag mit 24 Stunden ohne null-Werte
+        now = self.clock()
+        today = datetime.fromtimestamp(now, timezone.utc).date()
+        day_index = pd.to_datetime(ts, unit="s", utc=True).dt.date
+        complete_hours = values.notna().all(axis=1).groupby(day_index.to_numpy()).sum()
+
+        days = []
+        day = start
+
+        while day <= end:
+            complete = day < today and int(complete_hours.get(day, 0)) == 24
+            days.append((lat, lon, day.isoformat(), int(complete), now))
+            day += timedelta(days=1)
+
+        placeholders = ", ".join("?" * (3 + len(HISTORY_COLUMNS)))
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO history_hourly (lat, lon, ts, {', '.join(HISTORY_COLUMNS)}) "
+                f"VALUES ({placeholders})",
+                rows
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO history_days (lat, lon, day, complete, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                days
+            )
+
+
+    def _read(self, lat, lon, start, end):
+        """Stundenwerte aus SQLite als lückenloses Stundenraster (fehlende Stunden = NaN)."""
+
+        first = int(datetime(start.year, start.month, start.day, tzinfo=timezone.utc).timestamp())
+        last = first + ((end - start).days + 1) * 86400 - 3600
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT ts, {', '.join(HISTORY_COLUMNS)} FROM history_hourly "
+                "WHERE lat = ? AND lon = ? AND ts BETWEEN ? AND ? ORDER BY ts",
+                (lat, lon, first, last)
+            ).fetchall()
+
+        if not rows:
+            return None
+
+        data = np.array(rows, dtype="float64")          # None -> nan
+
+        # Auf das volle Stundenraster verteilen (Position = Stunde seit start 00:00)
+        hours = (last - first) // 3600 + 1
+        grid = np.full((hours, len(HISTORY_COLUMNS)), np.nan)
+        grid[((data[:, 0] - first) // 3600).astype(np.int64)] = data[:, 1:]
+
+        df = pd.DataFrame(grid, columns=list(HISTORY_COLUMNS))
+        df.insert(0, "time", pd.date_range(pd.Timestamp(first, unit="s", tz="UTC"), periods=hours, freq="h"))
+
+        return df
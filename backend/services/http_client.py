@@ -0,0 +1,233 @@
+##############################################
+#   🌦 HTTP-CLIENT – 1.1.0                   #
+##############################################
+
+"""
+Gemeinsamer HTTP-Client für alle ausgehenden API-Aufrufe
+(OpenWeatherMap, Open-Meteo History/Forecast, CLI).
+
+Bisher hat jeder Aufruf ein eigenes requests.get(...) bzw. urlopen(...) benutzt
+-> pro Anfrage neu DNS + TCP + TLS. Jetzt:
+    - EINE requests.Session pro Prozess (Keep-Alive, Verbindungen werden wiederverwendet)
+    - Connection-Pools pro Host mit einstellbarer Größe (HTTP_POOL_CONNECTIONS / HTTP_POOL_MAXSIZE)
+    - Retry mit exponentiellem Backoff bei 429 / 5xx und Verbindungsfehlern
+      (HTTP_RETRIES / HTTP_BACKOFF, 'Retry-After' der API wird beachtet)
+
+Nach ausgeschöpften Retries wird die letzte Antwort normal zurückgegeben,
+die Aufrufer prüfen wie bisher selbst den status_code.
+
+Zwei Profile (getrennte Sessions, da die Retry-Strategie am Adapter hängt):
+    - get(...)              CLI / Batch: HTTP_RETRIES Wiederholungen, 10s Timeout, Retry-After wird beachtet
+                            -> schlimmstenfalls (3+1) x (10s + 10s) + 0s + 1s + 2s Backoff ≈ 83s
+    - get_interactive(...)  Dashboard (ein Request-Handler / Stadtwechsel wartet): knappes Budget,
+                            HTTP_INTERACTIVE_RETRIES (1) Wiederholung, Connect 3.05s / Read 5s,
+                            Retry-After wird NICHT abgewartet
+                            -> schlimmstenfalls (1+1) x (3.05s + 5s) ≈ 16s
+    (Read-Timeout gilt pro Lesevorgang, nicht für die ganze Antwort; siehe worst_case_latency)
+
+Benchmark (lokaler Stub-Server, ohne Internet):
+    python -m backend.services.http_client
+"""
+
+# =============== IMPORTS ====================
+import os
+import logging
+import threading
+
+import requests
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Logger für dieses Modul
+logger = logging.getLogger(__name__)
+
+
+# Standardwerte (per Umgebungsvariable überschreibbar)
+DEFAULT_TIMEOUT = 10
+DEFAULT_USER_AGENT = "WetterApp/1.0"
+
+# Dashboard-Aufrufe: (connect, read) in Sekunden und Wiederholungen
+INTERACTIVE_TIMEOUT = (
+    float(os.getenv("HTTP_INTERACTIVE_CONNECT_TIMEOUT", "3.05")),
+    float(os.getenv("HTTP_INTERACTIVE_READ_TIMEOUT", "5"))
+)
+INTERACTIVE_RETRIES = int(os.getenv("HTTP_INTERACTIVE_RETRIES", "1"))
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Gemeinsame Sessions (lazy angelegt)
+_session = None
+_interactive_session = None
+_session_lock = threading.Lock()
+
+
+# ===== FUNKTIONEN =====
+def build_session(pool_connections=None, pool_maxsize=None, retries=None, backoff_factor=None,
+                  user_agent=DEFAULT_USER_AGENT, respect_retry_after=True):
+    """
+    Baut eine requests.Session mit Connection-Pool und Retry-Strategie.
+
+    Args:
+        pool_connections (int): Anzahl gepoolter Hosts
+        pool_maxsize (int):     Max. offene Verbindungen pro Host (≈ gleichzeitige Threads)
+        retries (int):          Max. Wiederholungen bei 429/5xx/Verbindungsfehlern
+        backoff_factor (float): Basis für den exponentiellen Backoff (0.5 -> 0.5s, 1s, 2s, ...)
+        user_agent (str):       User-Agent Header für alle Anfragen
+        respect_retry_after (bool): 'Retry-After' der API abwarten (kann Minuten dauern -> nicht im Dashboard)
+
+    Returns:
+        requests.Session
+    """
+    pool_connections = int(pool_connections if pool_connections is not None else os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+    pool_maxsize = int(pool_maxsize if pool_maxsize is not None else os.getenv("HTTP_POOL_MAXSIZE", "20"))
+    retries = int(retries if retries is not None else os.getenv("HTTP_RETRIES", "3"))
+    backoff_factor = float(backoff_factor if backoff_factor is not None else os.getenv("HTTP_BACKOFF", "0.5"))
+
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=respect_retry_after,
+        raise_on_status=False           # letzte Antwort zurückgeben, Aufrufer prüfen status_code
+    )
+
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": user_agent})
+
+    logger.debug(
+        f"HTTP-Session erstellt (pools={pool_connections}, maxsize={pool_maxsize}, "
+        f"retries={retries}, backoff={backoff_factor})"
+    )
+
+    return session
+
+
+def get_session():
+    """Liefert die gemeinsame Session des Prozesses (wird beim ersten Aufruf angelegt)."""
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+
+    return _session
+
+
+def get_interactive_session():
+    """Liefert die Session für Dashboard-Aufrufe (wenige Retries, kein Warten auf Retry-After)."""
+    global _interactive_session
+
+    if _interactive_session is None:
+        with _session_lock:
+            if _interactive_session is None:
+                _interactive_session = build_session(retries=INTERACTIVE_RETRIES, respect_retry_after=False)
+
+    return _interactive_session
+
+
+def get(url, params=None, timeout=DEFAULT_TIMEOUT, **kwargs):
+    """GET über die gemeinsame Session (gleiche Signatur wie requests.get)."""
+    return get_session().get(url, params=params, timeout=timeout, **kwargs)
+
+
+def get_interactive(url, params=None, timeout=INTERACTIVE_TIMEOUT, **kwargs):
+    """GET für Aufrufe, auf die ein Dashboard-Request wartet (knappes Zeitbudget, siehe Modul-Docstring)."""
+    return get_interactive_session().get(url, params=params, timeout=timeout, **kwargs)
+
+
+def worst_case_latency(timeout, retries, backoff_factor):
+    """
+    Obergrenze in Sekunden für einen Aufruf, der nie antwortet (ohne Retry-After):
+    (retries + 1) Versuche x (Connect- + Read-Timeout) + Backoff-Pausen (urllib3: 0s, 2b, 4b, ...).
+    """
+    connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+    backoff = sum(backoff_factor * 2 ** (attempt - 1) for attempt in range(2, retries + 1))
+    return (retries + 1) * (connect + read) + backoff
+
+
+def close_session():
+    """Schließt die gemeinsamen Sessions (offene Verbindungen werden freigegeben)."""
+    global _session, _interactive_session
+
+    with _session_lock:
+        for session in (_session, _interactive_session):
+            if session is not None:
+                session.close()
+        _session = None
+        _interactive_session = None
+
+
+# ========================================
+# BENCHMARK
+# ========================================
+
+def _benchmark(requests_count=200):
+    """
+    Vergleicht requests.get (neue Verbindung pro Aufruf) mit der gepoolten Session
+    gegen einen lokalen Stub-Server (HTTP/1.1 mit Keep-Alive).
+    """
+    import json
+    import time
+
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    body = json.dumps({"cod": 200, "name": "Berlin", "main": {"temp": 6.5}}).encode("utf-8")
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # Keep-Alive erlauben
+        disable_nagle_algorithm = True  # Header + Body getrennt geschrieben -> sonst 40ms Delayed-ACK
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/data/2.5/weather"
+
+    def measure(fetch):
+        start = time.perf_counter()
+        for _ in range(requests_count):
+            resp = fetch()
+            resp.json()
+        return (time.perf_counter() - start) / requests_count * 1000
+
+    try:
+        bare_ms = measure(lambda: requests.get(url, params={"q": "Berlin"}, timeout=DEFAULT_TIMEOUT))
+
+        session = build_session()
+        pooled_ms = measure(lambda: session.get(url, params={"q": "Berlin"}, timeout=DEFAULT_TIMEOUT))
+        session.close()
+
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print(f"{requests_count} Anfragen gegen lokalen Stub-Server:")
+    print(f"  requests.get (ohne Pool):  {bare_ms:.3f} ms/Anfrage")
+    print(f"  gemeinsame Session (Pool): {pooled_ms:.3f} ms/Anfrage")
+    print(f"  -> Faktor {bare_ms / pooled_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    _benchmark()
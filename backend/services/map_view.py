@@ -0,0 +1,59 @@
+##############################################
+#   🌦 WETTER-DASHBOARD – KARTE 2.0.0
+##############################################
+
+"""
+Karte ohne Datei-Schreiben.
+
+Bisher hat Folium bei jedem Stadtwechsel eine komplette Leaflet-Seite gebaut und nach
+weather_dashboard/static/map/map.html gespeichert:
+    - ein Schreibzugriff pro Wechsel
+    - eine Datei für alle Clients (gleichzeitige Wechsel überschreiben sich gegenseitig)
+    - ein komplettes Leaflet-HTML pro Wechsel
+
+Jetzt:
+    - /map liefert EINE statische Leaflet-Seite (templates/map.html), der Browser lädt sie einmal
+    - Stadt, Koordinaten und Temperatur kommen als kleines JSON (map_state): beim Laden über /map/state,
+      danach mit jedem 'update'-Event (das Dashboard reicht sie per postMessage an die Karte weiter)
+    - der Browser verschiebt nur noch Ausschnitt + Marker, nichts wird neu geladen
+"""
+
+# Standard-Ausschnitt (Berlin), bis der Client seine Stadt kennt
+DEFAULT_LAT = 52.5200
+DEFAULT_LON = 13.4050
+DEFAULT_ZOOM = 12
+
+# Leaflet direkt vom CDN (Version wie bisher über Folium)
+LEAFLET_VERSION = "1.9.4"
+TILE_URL = "https://tile.openstreetmap.org/{z}/{x}/{y}.png"
+TILE_ATTRIBUTION = '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors'
+
+
+def map_state(city, lat, lon, temp="--"):
+    """
+    Kleines JSON für die Karte (wenige Bytes statt einer ganzen HTML-Seite).
+
+    Parameter:
+        city (str): Anzeigename der Stadt
+        lat (float): Breitengrad (None -> Karte bleibt, wo sie ist)
+        lon (float): Längengrad
+        temp (str/int): Temperatur für den Marker
+    """
+    return {
+        "city": city,
+        "lat": lat,
+        "lon": lon,
+        "temp": "--" if temp is None else temp,
+    }
+
+
+def shell_context():
+    """Platzhalter für templates/map.html (für alle Clients gleich -> Seite ist statisch)."""
+    return {
+        "default_lat": DEFAULT_LAT,
+        "default_lon": DEFAULT_LON,
+        "default_zoom": DEFAULT_ZOOM,
+        "leaflet_version": LEAFLET_VERSION,
+        "tile_url": TILE_URL,
+        "tile_attribution": TILE_ATTRIBUTION,
+    }
@@ -0,0 +1,352 @@
+##############################################
+#   🌦 OBSERVATION-STORE – 1.1.0             #
+##############################################
+
+"""
+Lokale Zeitreihe der beobachteten Wetterdaten (append-only, memory-mapped).
+
+Bisher gab es keine lokale Historie: jedes Provider-Ergebnis war nach dem nächsten Abruf weg,
+die '*_history'-Listen in /weather waren immer leer.
+
+Jetzt wird jedes Provider-Ergebnis pro Stadt in eine eigene Datei angehängt:
+    - feste Satzlänge (NumPy structured dtype): ts (int64, Unix-Sekunden) + float32-Spalten
+    - Datei = 16 Byte Header + Sätze hintereinander, es wird nur angehängt (ein write() pro Satz)
+    - Lesen per np.memmap: Bereichsabfragen sind Slices der gemappten Datei (keine Kopie),
+      Zeitfenster werden per Binärsuche (searchsorted) auf der ts-Spalte gefunden
+    - ein halb geschriebener Satz am Dateiende (Absturz) wird einfach ignoriert
+
+Speicherort: OBSERVATION_DIR (Standard data/cache/observations), eine Datei pro Stadt.
+
+Benchmark (Schreib- und Abfrageraten):
+    python -m backend.services.observation_store [ANZAHL_SAETZE]
+"""
+
+# =============== IMPORTS ====================
+import hashlib
+import os
+import logging
+import re
+import struct
+import threading
+import time
+
+import numpy as np
+
+from backend.services.data_normalizer import city_key
+
+# Logger für dieses Modul
+logger = logging.getLogger(__name__)
+
+
+# Standard-Pfad relativ zum Projekt-Root
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+DEFAULT_DIRECTORY = os.path.join(_PROJECT_ROOT, "data", "cache", "observations")
+
+# Gespeicherte Felder (Dashboard-Keys) -> eine float32-Spalte pro Feld
+OBSERVATION_FIELDS = ("currentTemperature", "humidity", "pressure", "windSpeed")
+
+OBSERVATION_DTYPE = np.dtype([("ts", "<i8")] + [(name, "<f4") for name in OBSERVATION_FIELDS])
+
+# Header: Magic, Format-Version, Satzlänge (Bytes) -> 16 Byte
+_HEADER = struct.Struct("<4sHH8x")
+_MAGIC = b"WOBS"
+_VERSION = 1
+
+
+# ===== KLASSE ERSTELLEN =====
+class ObservationStore:
+    """Append-only Zeitreihen pro Stadt, gelesen als zero-copy NumPy-Views (np.memmap)."""
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, min_interval=60):
+        """
+        Args:
+            directory (str):      Ordner für die Dateien (wird bei Bedarf angelegt)
+            min_interval (float): Mindestabstand in Sekunden zwischen zwei Sätzen einer Stadt
+                                  (gleiche gecachte Daten von vielen Clients -> nur ein Satz)
+        """
+        self.directory = directory
+        self.min_interval = min_interval
+
+        self._maps = {}         # city_key -> (Anzahl Sätze, np.memmap)
+        self._last_ts = {}      # city_key -> ts des letzten Satzes
+        self._lock = threading.Lock()
+
+
+    # ========================================
+    # DATEIEN
+    # ========================================
+
+    def path_for(self, city):
+        """Dateipfad für eine Stadt: lesbarer Teil + Hash (Umlaute/Leerzeichen sicher)."""
+        key = city_key(city)
+        slug = re.sub(r"[^a-z0-9]+", "_", key).strip("_")[:40] or "city"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:10]
+        return os.path.join(self.directory, f"{slug}-{digest}.obs")
+
+
+    def _record_count(self, path):
+        """Anzahl vollständiger Sätze in der Datei (0, wenn sie fehlt)."""
+        try:
+            size = os.stat(path).st_size
+        except FileNotFoundError:
+            return 0
+        return max(0, (size - _HEADER.size) // OBSERVATION_DTYPE.itemsize)
+
+
+    def _check_header(self, path):
+        """Prüft Magic/Version/Satzlänge; eine inkompatible Datei wird beiseitegelegt (.bad)."""
+        with open(path, "rb") as fh:
+            header = fh.read(_HEADER.size)
+
+        if len(header) == _HEADER.size and _HEADER.unpack(header) == (_MAGIC, _VERSION, OBSERVATION_DTYPE.itemsize):
+            return True
+
+        logger.error(f"Observation-Datei mit unbekanntem Format, wird neu angelegt: {path}")
+        os.replace(path, f"{path}.bad")
+        return False
+
+
+    def _drop_partial_record(self, path):
+        """Schneidet einen halb geschriebenen Satz am Dateiende ab (sonst wären alle folgenden Sätze verschoben)."""
+        complete = _HEADER.size + self._record_count(path) * OBSERVATION_DTYPE.itemsize
+        if os.path.getsize(path) != complete:
+            logger.warning(f"Unvollständiger Satz am Ende von {path} wird entfernt")
+            os.truncate(path, complete)
+
+
+    def _series(self, key, path):
+        """
+        Gemappte Sätze einer Stadt. Die Map wird nur neu erstellt, wenn seit dem letzten Mal
+        Sätze dazugekommen sind (Größe aus os.stat).
+        """
+        count = self._record_count(path)
+        cached = self._maps.get(key)
+
+        if cached is not None and cached[0] == count:
+            return cached[1]
+
+        if count == 0:
+            series = np.empty(0, dtype=OBSERVATION_DTYPE)
+        else:
+            series = np.memmap(path, dtype=OBSERVATION_DTYPE, mode="r", offset=_HEADER.size, shape=(count,))
+
+        self._maps[key] = (count, series)
+        return series
+
+
+    # ========================================
+    # SCHREIBEN
+    # ========================================
+
+    def append(self, city, data, ts=None):
+        """
+        Hängt die Felder aus 'data' (dict / WeatherRecord) als einen Satz an.
+        Fehlende/ungültige Werte werden NaN.
+
+        Returns:
+            bool: True, wenn geschrieben wurde (False bei zu kurzem Abstand / nicht neuerem ts)
+        """
+        record = np.zeros(1, dtype=OBSERVATION_DTYPE)
+        record["ts"] = int(time.time() if ts is None else ts)
+        for name in OBSERVATION_FIELDS:
+            record[name] = _to_float32(data.get(name))
+
+        return self.append_many(city, record) == 1
+
+
+    def append_many(self, city, records):
+        """
+        Hängt mehrere Sätze (Array mit OBSERVATION_DTYPE, aufsteigend nach ts) in EINEM write() an.
+        Sätze, die nicht neuer als der letzte gespeicherte Satz + min_interval sind, werden übersprungen.
+
+        Returns:
+            int: Anzahl geschriebener Sätze
+        """
+        key = city_key(city)
+        if key == "":
+            return 0
+
+        records = np.asarray(records, dtype=OBSERVATION_DTYPE)
+        path = self.path_for(city)
+
+        with self._lock:
+            last_ts = self._last_ts.get(key)
+
+            if last_ts is None:
+                # Erster Zugriff in diesem Prozess: letzten ts aus der Datei holen
+                if os.path.exists(path) and self._check_header(path):
+                    self._drop_partial_record(path)
+                    series = self._series(key, path)
+                    last_ts = int(series["ts"][-1]) if len(series) else None
+                else:
+                    self._maps.pop(key, None)
+
+            # Nur streng aufsteigende Zeitstempel mit Mindestabstand (append-only, sortiert für searchsorted)
+            step = max(self.min_interval, 1)
+            timestamps = records["ts"]
+
+            if np.all(np.diff(timestamps) >= step):
+                # Üblicher Fall (Batch schon sortiert): nur gegen den letzten gespeicherten Satz prüfen
+                if last_ts is not None:
+                    records = records[timestamps >= last_ts + step]
+            else:
+                keep = np.ones(len(records), dtype=bool)
+                previous = last_ts
+                for i, ts in enumerate(timestamps.tolist()):
+                    if previous is not None and ts < previous + step:
+                        keep[i] = False
+                    else:
+                        previous = ts
+                records = records[keep]
+
+            if len(records) == 0:
+                return 0
+
+            os.makedirs(self.directory, exist_ok=True)
+
+            with open(path, "ab") as fh:
+                if fh.tell() == 0:
+                    fh.write(_HEADER.pack(_MAGIC, _VERSION, OBSERVATION_DTYPE.itemsize))
+                fh.write(records.tobytes())
+
+            self._last_ts[key] = int(records["ts"][-1])
+
+        return len(records)
+
+
+    # ========================================
+    # LESEN
+    # ========================================
+
+    def query(self, city, start=None, end=None):
+        """
+        Sätze einer Stadt mit start <= ts < end (Unix-Sekunden, None = offen).
+
+        Returns:
+            np.ndarray (OBSERVATION_DTYPE): View auf die gemappte Datei, KEINE Kopie.
+            Spalten wie result["currentTemperature"] sind ebenfalls Views.
+        """
+        key = city_key(city)
+        path = self.path_for(city)
+
+        with self._lock:
+            series = self._series(key, path)
+
+        timestamps = series["ts"]
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, side="left"))
+        hi = len(series) if end is None else int(np.searchsorted(timestamps, end, side="left"))
+
+        return series[lo:hi]
+
+
+    def hourly_history(self, city, hours=24, now=None, utc_offset=0):
+        """
+        Letzte 'hours' Stunden als Listen fürs Frontend (letzter Wert pro Stunde):
+            {"currentTemperature_history": [{"hr": 14, "value": 5.2}, ...], "humidity_history": [...], ...}
+
+        Args:
+            utc_offset (int): Sekunden Abstand der Stadt zu UTC (utcOffset der Wetterdaten)
+                              -> 'hr' und die Stundengrenzen sind Ortszeit, 0 = UTC
+        """
+        now = time.time() if now is None else now
+        window = self.query(city, start=now - hours * 3600)
+
+        history = {f"{name}_history": [] for name in OBSERVATION_FIELDS}
+        if len(window) == 0:
+            return history
+
+        # Letzter Satz jeder (Orts-)Stunde: dort, wo sich die Stunden-Nummer zum nächsten Satz ändert
+        hour_bucket = (window["ts"] + int(utc_offset)) // 3600
+        last_in_hour = np.flatnonzero(np.diff(hour_bucket, append=hour_bucket[-1] + 1))
+        hour_of_day = (hour_bucket[last_in_hour] % 24).tolist()
+
+        for name in OBSERVATION_FIELDS:
+            values = window[name][last_in_hour]
+            history[f"{name}_history"] = [
+                {"hr": hr, "value": round(float(value), 1)}
+                for hr, value in zip(hour_of_day, values.tolist())
+                if value == value       # NaN auslassen
+            ]
+
+        return history
+
+
+    def __len__(self):
+        """Anzahl Städte mit gespeicherten Sätzen."""
+        try:
+            return sum(1 for name in os.listdir(self.directory) if name.endswith(".obs"))
+        except FileNotFoundError:
+            return 0
+
+
+# ===== FUNKTIONEN =====
+def _to_float32(value):
+    """Wert -> float (NaN, wenn leer/ungültig)."""
+    if value is None or isinstance(value, bool):
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+# ========================================
+# BENCHMARK: Schreiben + Bereichsabfragen
+# ========================================
+
+def _benchmark(n_records=1_000_000, n_queries=10_000):
+    """Schreibrate (einzeln + Batch) und Abfragerate (Zeitfenster) auf einer Stadt mit n_records Sätzen."""
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ObservationStore(tmp, min_interval=0)
+        start_ts = 1_700_000_000
+
+        # --- Einzelne Sätze (wie vom Dashboard: ein append pro Provider-Ergebnis) ---
+        n_single = min(n_records, 50_000)
+        data = {"currentTemperature": 5.5, "humidity": 80, "pressure": 1012, "windSpeed": 3.2}
+        t0 = time.perf_counter()
+        for i in range(n_single):
+            store.append("Einzeln", data, ts=start_ts + i * 60)
+        single_rate = n_single / (time.perf_counter() - t0)
+
+        # --- Batch (z.B. Import alter Daten) ---
+        records = np.zeros(n_records, dtype=OBSERVATION_DTYPE)
+        records["ts"] = start_ts + np.arange(n_records, dtype=np.int64) * 60
+        rng = np.random.default_rng(1)
+        for name in OBSERVATION_FIELDS:
+            records[name] = rng.uniform(-10, 35, n_records)
+
+        t0 = time.perf_counter()
+        store.append_many("Batch", records)
+        batch_rate = n_records / (time.perf_counter() - t0)
+
+        # --- Bereichsabfragen (24h-Fenster an zufälligen Stellen) ---
+        starts = start_ts + rng.integers(0, n_records * 60, n_queries)
+        t0 = time.perf_counter()
+        total = 0
+        for start in starts.tolist():
+            window = store.query("Batch", start, start + 24 * 3600)
+            total += len(window)
+        query_rate = n_queries / (time.perf_counter() - t0)
+
+        assert np.shares_memory(window, store.query("Batch")), "Abfrage sollte eine View sein"
+
+        n_history = 1000
+        t0 = time.perf_counter()
+        for _ in range(n_history):
+            store.hourly_history("Batch", now=int(records["ts"][-1]))
+        history_ms = (time.perf_counter() - t0) * 1000 / n_history
+
+        size_mb = os.path.getsize(store.path_for("Batch")) / 1e6
+
+    print(f"Satzgröße: {OBSERVATION_DTYPE.itemsize} B, {n_records} Sätze = {size_mb:.1f} MB")
+    print(f"  append (einzeln):        {single_rate:12,.0f} Sätze/s")
+    print(f"  append_many (Batch):     {batch_rate:12,.0f} Sätze/s")
+    print(f"  query (24h-Fenster):     {query_rate:12,.0f} Abfragen/s  (Ø {total / n_queries:.0f} Sätze, zero-copy)")
+    print(f"  hourly_history (24h):    {history_ms:12.3f} ms/Aufruf")
+
+
+if __name__ == "__main__":
+    import sys
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
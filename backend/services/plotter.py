@@ -1,28 +1,209 @@
 ##################################################
-# PLOTTER - 1.0.1
+# PLOTTER - 1.4.0
 ##################################################
 
 # Imports
-import matplotlib
-matplotlib.use("Agg")  
-import matplotlib.pyplot as plt
+# Objektorientiert (Figure + Agg-Canvas) statt pyplot: kein globaler Zustand,
+# damit können mehrere Plots gleichzeitig im Render-Pool (Threads oder Prozesse) entstehen
+import threading
+
+import numpy as np
+import pandas as pd
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.dates import date2num
+from matplotlib.figure import Figure
+from matplotlib.ticker import MaxNLocator
+from PIL import Image
 
 from io import BytesIO
 
+from backend.services.downsample import downsample_frame, downsample_frame_multi
+
+# Bildgröße (Zoll) und Auflösung -> Breite in Pixeln bestimmt, wie viele Punkte sichtbar sind
+FIGSIZE = (12, 4)
+DPI = 150
+
+# Mehr Punkte als Pixelspalten kann man nicht sehen -> Ziel fürs Downsampling
+PLOT_WIDTH_PX = FIGSIZE[0] * DPI
+
+# Feste Ränder statt tight_layout pro Bild -> Layout wird nur einmal berechnet
+# (links/rechts als Anteil der Breite, oben/unten in Zoll -> gleich bei unterschiedlich hohen Bildern)
+MARGINS = {"left": 0.07, "right": 0.985}
+MARGIN_TOP_IN = 0.4
+MARGIN_BOTTOM_IN = 0.88
+
+# Mehrere Variablen untereinander (gemeinsame Zeitachse): Höhe pro Panel in Zoll
+PANEL_HEIGHT_IN = 2.4
+
+# PNG-Kompression (0-9): 3 ist deutlich schneller als der Standard 6, Bilder ~20 % größer
+PNG_COMPRESS_LEVEL = 3
+
+
+# ===== FIGURE-TEMPLATES =====
+class PlotTemplate:
+    """
+    Fertig aufgebaute Figure für eine Plot-Art + Größe (Achsen, Gitter, Ränder, Datumsachse).
+    'panels' > 1: mehrere Achsen untereinander mit gemeinsamer Zeitachse (eine Variable pro Panel).
+
+    Pro Bild werden nur Linien, Titel, "Jetzt"-Markierung und Achsenbereiche getauscht:
+        - Linien, Titel und Markierung sind "animated" -> sie gehören NICHT zum Hintergrund
+        - Hintergrund (Achsen, Ticks, Gitter, Beschriftung) wird nur neu gezeichnet, wenn sich
+          Achsenbereiche oder y-Beschriftungen ändern, sonst per Blitting wiederverwendet
+          (restore_region + draw_artist für Linien, Titel und Markierung)
+    """
+
+    def __init__(self, figsize=FIGSIZE, dpi=DPI, panels=1):
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+
+        height = self.fig.get_figheight()
+        self.fig.subplots_adjust(top=1 - MARGIN_TOP_IN / height, bottom=MARGIN_BOTTOM_IN / height, hspace=0.12, **MARGINS)
+
+        self.axes = list(self.fig.subplots(panels, 1, sharex=True, squeeze=False)[:, 0])
+        self.ax = self.axes[0]
+
+        self.lines = []
+        self.markers = []
+
+        for ax in self.axes:
+            ax.xaxis_date()
+            ax.grid(True, alpha=0.3)
+            ax.label_outer()    # Datums-Ticks nur am untersten Panel
+            (line,) = ax.plot([], [], linewidth=1.8, animated=True)
+            self.lines.append(line)
+            self.markers.append(ax.axvline(0, color="0.4", linestyle="--", linewidth=1, animated=True, visible=False))
+
+        self.line = self.lines[0]
+        self.axes[-1].set_xlabel("Zeitpunkt")
+        self.ax.title.set_animated(True)
+
+        self._background = None
+        self._background_key = None
+
+        self.renders = 0
+        self.blits = 0
+
+
+    def render_png(self, x, y, title, y_label):
+        """Tauscht Daten + Titel, zeichnet (Blitting wenn möglich) und gibt PNG-Bytes zurück."""
+        return self.render_panels_png(x, [y], title, [y_label])
+
+
+    def render_panels_png(self, x, ys, title, y_labels, marker=None):
+        """
+        Wie render_png, aber eine Reihe pro Panel (gemeinsames x).
+        marker: optionale x-Position (Datumszahl) für eine senkrechte Linie, z.B. "jetzt".
+        """
+
+        # 5 % Rand wie bei Matplotlibs Autoscaling, y zusätzlich auf runde Tickwerte
+        span = float(x[-1] - x[0]) or 1.0
+        xlim = (float(x[0]) - 0.05 * span, float(x[-1]) + 0.05 * span)
+        ylims = tuple(_nice_limits(y) for y in ys)
+        key = (xlim, ylims, tuple(y_labels))
+
+        self.renders += 1
+
+        # ===== 1) HINTERGRUND (nur bei geändertem Achsenbereich / Beschriftung) =====
+        if key != self._background_key:
+            self.ax.set_xlim(*xlim)     # gemeinsame Zeitachse -> gilt für alle Panels
+
+            for ax, ylim, y_label in zip(self.axes, ylims, y_labels):
+                ax.set_ylim(*ylim)
+                ax.set_ylabel(y_label)
+
+            # Wie autofmt_xdate, aber für die Ticks des neuen Bereichs
+            for label in self.axes[-1].get_xticklabels():
+                label.set_rotation(30)
+                label.set_horizontalalignment("right")
+
+            self.canvas.draw()      # zeichnet alles außer den animated-Artists
+            self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+            self._background_key = key
+        else:
+            self.canvas.restore_region(self._background)
+            self.blits += 1
+
+        # ===== 2) NUR LINIEN + MARKIERUNG + TITEL ZEICHNEN =====
+        for ax, line, marker_line, y in zip(self.axes, self.lines, self.markers, ys):
+            line.set_data(x, y)
+            ax.draw_artist(line)
+
+            if marker is not None:
+                marker_line.set_xdata([marker, marker])
+                marker_line.set_visible(True)
+                ax.draw_artist(marker_line)
+
+        self.ax.set_title(title)
+        self.ax.draw_artist(self.ax.title)
+
+        # ===== 3) PNG KODIEREN (direkt aus dem Agg-Puffer, kein zweites Zeichnen wie bei savefig) =====
+        # Hintergrund ist deckend weiß -> RGB reicht (weniger Daten zum Komprimieren)
+        width, height = self.canvas.get_width_height()
+        image = Image.frombuffer("RGBA", (width, height), self.canvas.buffer_rgba(), "raw", "RGBA", 0, 1).convert("RGB")
+
+        buf = BytesIO()
+        image.save(buf, format="png", compress_level=PNG_COMPRESS_LEVEL)
+
+        return buf.getvalue()
+
+
+# Templates pro Thread (Figures sind nicht threadsicher), Schlüssel: (Plot-Art, Größe, DPI, Panels)
+_templates = threading.local()
+
+
+def get_template(kind, figsize=FIGSIZE, dpi=DPI, panels=1):
+    """Liefert (und baut beim ersten Mal) das Template für (kind, figsize, dpi, panels) im aktuellen Thread."""
+    templates = getattr(_templates, "by_key", None)
+
+    if templates is None:
+        templates = _templates.by_key = {}
+
+    key = (kind, tuple(figsize), dpi, panels)
+    template = templates.get(key)
+
+    if template is None:
+        template = templates[key] = PlotTemplate(figsize=figsize, dpi=dpi, panels=panels)
+
+    return template
+
+
+def _nice_limits(y):
+    """y-Bereich auf "runde" Tickwerte erweitern -> gleiche Bereiche für ähnliche Daten (mehr Blitting)."""
+    finite = y[np.isfinite(y)]
+
+    if finite.size == 0:
+        return (0.0, 1.0)
+
+    lo, hi = float(finite.min()), float(finite.max())
+
+    if lo == hi:
+        lo, hi = lo - 1.0, hi + 1.0
+
+    pad = 0.05 * (hi - lo)
+    lo, hi = lo - pad, hi + pad
+
+    ticks = MaxNLocator(nbins=8).tick_values(lo, hi)
+    return (float(ticks[0]), float(ticks[-1]))
+
+
 # FUNKTION: Historische Daten / History oder Forecast
-def build_single_line_plot_png(df, var, title, y_label):
+def build_single_line_plot_png(df, var, title, y_label, downsample="minmax", kind="line"):
     """
     Interne Funktion für beide Plots.
     Baut EINEN Plot (Linie) für history ODER Forecast und gibt PNG zurück.
-    - "Agg" Argument verwenden, damit kein GUI-Backend von MPL verwendet wird
-        sondern nur das Bild gerendert wird.
+    - Agg-Canvas direkt verwenden, damit kein GUI-Backend von MPL verwendet wird
+        sondern nur das Bild gerendert wird (läuft im Render-Pool, siehe render_pool.py).
+    - Figure wird nicht pro Bild neu gebaut, sondern aus einem Template pro 'kind' wiederverwendet
     - Input Parameter
         - df:       Pandas Data-Frame mit den anzuzeigenden Daten
         - var:      Name der Messgröße
         - title:    Plot-Titel
         - y_label:  Y-Achsen Beschriftung
+        - downsample: "minmax" | "lttb" | "none" -> lange Reihen vorher auf PLOT_WIDTH_PX reduzieren
+        - kind:     Plot-Art (eigenes Template pro Art, z.B. "history" / "forecast")
     """
-    
+
     # ===== 1) FEHLER ABFANGEN =====
     if df is None or df.empty:  #DataFrame leer
         return None
@@ -30,40 +211,72 @@ def build_single_line_plot_png(df, var, title, y_label):
     if var not in df.columns:   #var fehlt
         return None
 
-    # ===== 2) PLOT-STRUKTUR AUFBAUEN =====
-    x = df["time"]
-    y = df[var]
+    # ===== 2) DATEN VORBEREITEN =====
+    # Mehrjährige History hat zehntausende Punkte -> auf die Pixelbreite reduzieren (gleiches Bild, schneller)
+    df = downsample_frame(df, var, PLOT_WIDTH_PX, method=downsample)
 
-        # Subplots bilden
-    fig, ax = plt.subplots(figsize=(12, 4))
+    # Zeitachse als Matplotlib-Datumszahlen (UTC)
+    x = _date_numbers(df["time"])
+    y = df[var].to_numpy(dtype="float64", na_value=np.nan)
 
-    # ===== 3) PLOTTEN =====
-    ax.plot(x, y, linewidth=1.8)    
-    ax.set_title(title)
-    ax.set_xlabel("Zeitpunkt")
-    ax.set_ylabel(y_label)
+    # ===== 3) IN DAS TEMPLATE ZEICHNEN + PNG =====
+    return get_template(kind).render_png(x, y, title, y_label)
 
-    # ===== 4) LAYOUT =====
-    fig.autofmt_xdate()
-    ax.grid(True, alpha=0.3)
-    fig.tight_layout()
 
-    # ===== 5) SPEICHERN =====
-    buf = BytesIO()     #In-Memory speichern
-    fig.savefig(buf, format="png", dpi=150)
-    plt.close(fig)
+# FUNKTION: Mehrere Variablen (Vergangenheit + Vorhersage) in EINEM Bild
+def build_multi_panel_plot_png(df, variables, title, y_labels, now=None, downsample="minmax", kind="panels"):
+    """
+    Baut EIN Bild mit einem Panel pro Variable (untereinander, gemeinsame Zeitachse) und gibt PNG zurück.
+    - Input Parameter
+        - df:         Pandas Data-Frame (time + Variablen), z.B. Vergangenheit + Vorhersage am Stück
+        - variables:  Liste der Messgrößen (Reihenfolge = Panels von oben nach unten)
+        - title:      Titel über dem obersten Panel
+        - y_labels:   Y-Achsen Beschriftung pro Variable
+        - now:        Zeitpunkt (Timestamp) für die "Jetzt"-Linie, None = keine
+        - downsample: wie bei build_single_line_plot_png (Vereinigung der Punkte aller Variablen)
+        - kind:       Plot-Art (Template pro Art und Panel-Anzahl)
+    """
 
-    return buf.getvalue()
+    # ===== 1) FEHLER ABFANGEN =====
+    if df is None or df.empty:
+        return None
+
+    panels = [(var, label) for var, label in zip(variables, y_labels) if var in df.columns]
+
+    if not panels:
+        return None
+
+    # ===== 2) DATEN VORBEREITEN =====
+    df = downsample_frame_multi(df, [var for var, _ in panels], PLOT_WIDTH_PX, method=downsample)
+
+    x = _date_numbers(df["time"])
+    ys = [df[var].to_numpy(dtype="float64", na_value=np.nan) for var, _ in panels]
+    marker = float(_date_numbers(pd.Series([pd.Timestamp(now)]))[0]) if now is not None else None
+
+    # ===== 3) IN DAS TEMPLATE ZEICHNEN + PNG =====
+    figsize = (FIGSIZE[0], MARGIN_TOP_IN + MARGIN_BOTTOM_IN + PANEL_HEIGHT_IN * len(panels))
+    template = get_template(kind, figsize=figsize, panels=len(panels))
+
+    return template.render_panels_png(x, ys, title, [label for _, label in panels], marker=marker)
+
+
+def _date_numbers(times):
+    """Zeitstempel -> Matplotlib-Datumszahlen (UTC, ohne Zeitzone)."""
+    times = pd.DatetimeIndex(times)
+    if times.tz is not None:
+        times = times.tz_convert("UTC").tz_localize(None)
+
+    return date2num(times.to_numpy())
 
 
 # FUNKTION: Öffentliche Funktionen für History und Forecast
 
-def build_single_history_plot_png(df, var, title, y_label):
+def build_single_history_plot_png(df, var, title, y_label, downsample="minmax"):
     """
     Baut EINEN History-Plot (Linie) und gibt PNG zurück.
     Anwendung von _build_single_line_plot_png.
     """
-    return build_single_line_plot_png(df, var, title, y_label)
+    return build_single_line_plot_png(df, var, title, y_label, downsample=downsample, kind="history")
 
 
 def build_single_forecast_plot_png(df, var, title, y_label):
@@ -71,7 +284,58 @@ def build_single_forecast_plot_png(df, var, title, y_label):
     Baut EINEN Forecast-Plot (Linie) und gibt PNG zurück.
     Anwendung von _build_single_line_plot_png.
     """
-    return build_single_line_plot_png(df, var, title, y_label)
-    
+    return build_single_line_plot_png(df, var, title, y_label, kind="forecast")
+
+
+# ========================================
+# BENCHMARK
+# ========================================
+
+def _build_png_fresh(df, var, title, y_label):
+    """Bisheriger Weg (nur für den Vergleich): neue Figure, autofmt_xdate, tight_layout, savefig."""
+    fig = Figure(figsize=FIGSIZE)
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    ax.plot(df["time"], df[var], linewidth=1.8)
+    ax.set_title(title)
+    ax.set_xlabel("Zeitpunkt")
+    ax.set_ylabel(y_label)
+    fig.autofmt_xdate()
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=DPI)
+    return buf.getvalue()
+
+
+def _benchmark(rounds=20):
+    """Renderzeit pro Bild: neue Figure vs. Template (neuer Hintergrund) vs. Template (Blitting)."""
+    import time
+
+    hours = 7 * 24
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        "time": pd.date_range("2025-01-01", periods=hours, freq="h", tz="UTC"),
+        "temperature_2m": 5 + 4 * np.sin(np.arange(hours) / 24 * 2 * np.pi) + rng.normal(0, 0.5, hours),
+    })
+
+    def measure(label, render):
+        render(0)
+        start = time.perf_counter()
+        for i in range(rounds):
+            render(i)
+        print(f"{label:<36} {(time.perf_counter() - start) / rounds * 1000:7.1f} ms/Bild")
+
+    measure("vorher: neue Figure + tight_layout", lambda i: _build_png_fresh(df, "temperature_2m", f"Plot {i}", "°C"))
+
+    # Jedes Bild mit anderem Wertebereich -> Hintergrund muss jedes Mal neu gezeichnet werden
+    shifted = [df.assign(temperature_2m=df["temperature_2m"] + 10 * i) for i in range(rounds + 1)]
+    measure("Template, neuer Hintergrund", lambda i: build_single_line_plot_png(shifted[i], "temperature_2m", f"Plot {i}", "°C", kind="bench-cold"))
+
+    # Gleicher Bereich (z.B. Stadt-/Datenwechsel innerhalb derselben Skala) -> Blitting
+    measure("Template, Blitting", lambda i: build_single_line_plot_png(df, "temperature_2m", f"Plot {i}", "°C", kind="bench-blit"))
 
 
+if __name__ == "__main__":
+    import sys
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,268 @@
+##############################################
+#   🌦 RENDER-POOL – 1.0.0                   #
+##############################################
+
+"""
+Worker-Pool für das Rendern der Matplotlib-Plots (außerhalb des Request-Threads).
+
+Bisher lief build_single_line_plot_png direkt im Flask/Socket.IO-Handler: Rendern ist CPU-gebunden
+(GIL), gleichzeitige Plot-Anfragen liefen nacheinander und haben andere Routen ausgebremst.
+
+Jetzt:
+    - Plots werden an einen Pool übergeben, Standard: Prozesse (skaliert mit den CPU-Kernen),
+      alternativ Threads (der Plotter nutzt nur objektorientierte Figure/Agg-Canvases, kein pyplot)
+    - Begrenzte Warteschlange: höchstens workers + max_queue Aufträge gleichzeitig,
+      darüber hinaus wird sofort abgelehnt (RenderPoolBusy -> 503 + Retry-After)
+    - Timeout pro Auftrag (RenderTimeout), der Platz bleibt belegt, bis der Worker fertig ist
+    - Gleiche Aufträge (gleicher Schlüssel) teilen sich EIN Rendering
+    - Abgestürzter Prozess-Pool wird beim nächsten Auftrag neu aufgebaut
+
+Benchmark (Durchsatz bei parallelen Anfragen):
+    python -m backend.services.render_pool [ANZAHL_PLOTS]
+"""
+
+# =============== IMPORTS ====================
+import logging
+import multiprocessing
+import os
+import threading
+
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+# Logger für dieses Modul
+logger = logging.getLogger(__name__)
+
+
+RENDER_MODES = ("process", "thread")
+
+
+class RenderPoolBusy(Exception):
+    """Warteschlange voll -> Anfrage später wiederholen."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Render-Pool ausgelastet, erneut in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class RenderTimeout(Exception):
+    """Auftrag wurde nicht rechtzeitig fertig."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Rendern dauerte zu lange, erneut in {retry_after}s")
+        self.retry_after = retry_after
+
+
+# ===== KLASSE ERSTELLEN =====
+class RenderPool:
+    """Begrenzter Pool für blockierende Render-Funktionen (Modul-Funktionen, picklebar)."""
+
+    def __init__(self, workers=None, max_queue=None, timeout=20.0, mode="process", retry_after=2):
+        """
+        Args:
+            workers (int):      Anzahl Worker (Default: CPU-Kerne)
+            max_queue (int):    Wartende Aufträge zusätzlich zu den laufenden (Default: 2 * workers)
+            timeout (float):    Sekunden, die ein Request höchstens auf sein Bild wartet
+            mode (str):         "process" (skaliert mit Kernen) oder "thread" (kein Prozessstart, GIL)
+            retry_after (int):  Sekunden für den Retry-After-Header bei 503
+        """
+        if mode not in RENDER_MODES:
+            raise ValueError(f"Unbekannter Render-Modus: {mode!r} (erlaubt: {', '.join(RENDER_MODES)})")
+
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        self.max_queue = max(0, int(self.workers * 2 if max_queue is None else max_queue))
+        self.timeout = timeout
+        self.mode = mode
+        self.retry_after = retry_after
+
+        # Plätze = laufende + wartende Aufträge; freigegeben, wenn der Worker WIRKLICH fertig ist
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+
+        self._inflight = {}             # Schlüssel -> Future (gleiche Aufträge teilen sich ein Rendering)
+        self._lock = threading.Lock()
+        self._executor = None
+
+        self._stats = {"submitted": 0, "shared": 0, "rejected": 0, "timeouts": 0, "errors": 0}
+
+
+    # ========================================
+    # ÖFFENTLICHE FUNKTIONEN
+    # ========================================
+
+    def render(self, fn, *args, key=None, timeout=None, **kwargs):
+        """
+        Führt fn(*args, **kwargs) im Pool aus und wartet auf das Ergebnis.
+        Wirft RenderPoolBusy (Warteschlange voll) oder RenderTimeout.
+        """
+        future = self.submit(fn, *args, key=key, **kwargs)
+
+        try:
+            return future.result(timeout=self.timeout if timeout is None else timeout)
+
+        except FutureTimeout:
+            # Noch nicht gestartet -> aus der Warteschlange nehmen (läuft er schon, darf er zu Ende rechnen)
+            future.cancel()
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise RenderTimeout(self.retry_after)
+
+        except CancelledError:
+            # Geteilter Auftrag wurde von einem anderen (abgelaufenen) Request aus der Warteschlange genommen
+            raise RenderTimeout(self.retry_after)
+
+
+    def submit(self, fn, *args, key=None, **kwargs):
+        """Übergibt einen Auftrag und liefert das Future (RenderPoolBusy, wenn kein Platz frei ist)."""
+
+        with self._lock:
+            # Gleicher Auftrag läuft schon -> mitwarten statt doppelt rendern
+            if key is not None and key in self._inflight:
+                self._stats["shared"] += 1
+                return self._inflight[key]
+
+            if not self._slots.acquire(blocking=False):
+                self._stats["rejected"] += 1
+                raise RenderPoolBusy(self.retry_after)
+
+            try:
+                future = self._submit_locked(fn, args, kwargs)
+            except Exception:
+                self._slots.release()
+                raise
+
+            self._stats["submitted"] += 1
+
+            if key is not None:
+                self._inflight[key] = future
+
+        future.add_done_callback(lambda f: self._done(key, f))
+        return future
+
+
+    def warm_up(self):
+        """Startet die Worker vorab (Prozessstart + Imports), damit der erste Plot nicht darauf wartet."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._create_executor()
+            executor = self._executor
+
+        if self.mode == "process":
+            for _ in range(self.workers):
+                executor.submit(_import_plotter)
+
+
+    def stats(self) -> dict:
+        """Zähler + aktuelle Auslastung (für /status)."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["inflight"] = len(self._inflight)
+        stats.update({
+            "mode": self.mode,
+            "workers": self.workers,
+            "maxQueue": self.max_queue,
+            "timeout": self.timeout,
+        })
+        return stats
+
+
+    def shutdown(self, wait=True):
+        """Beendet die Worker (z.B. beim Herunterfahren / in Tests)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+    # ========================================
+    # HELPER
+    # ========================================
+
+    def _submit_locked(self, fn, args, kwargs):
+        """Startet den Executor bei Bedarf (lazy) und baut einen kaputten Prozess-Pool neu auf."""
+
+        if self._executor is None:
+            self._executor = self._create_executor()
+
+        try:
+            return self._executor.submit(fn, *args, **kwargs)
+
+        except BrokenProcessPool:
+            logger.warning("Render-Pool war defekt (Worker abgestürzt) -> wird neu gestartet")
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._create_executor()
+            return self._executor.submit(fn, *args, **kwargs)
+
+
+    def _create_executor(self):
+        if self.mode == "thread":
+            return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="render")
+
+        # "spawn": kein fork() eines Prozesses mit laufenden Server-Threads (und identisch unter Windows)
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+    def _done(self, key, future):
+        """Platz freigeben und Fehler zählen, sobald ein Auftrag wirklich beendet ist."""
+        self._slots.release()
+
+        with self._lock:
+            if key is not None and self._inflight.get(key) is future:
+                del self._inflight[key]
+
+            if not future.cancelled() and future.exception() is not None:
+                self._stats["errors"] += 1
+
+
+def _import_plotter():
+    """Läuft im Worker-Prozess: Matplotlib + Plotter einmal importieren."""
+    from backend.services import plotter     # noqa: F401
+
+
+# ========================================
+# BENCHMARK
+# ========================================
+
+def _benchmark(count=32):
+    """Rendert 'count' Jahres-Plots gleichzeitig: direkt (ein Thread) vs. Thread-Pool vs. Prozess-Pool."""
+    import time
+    import numpy as np
+    import pandas as pd
+
+    from backend.services.plotter import build_single_line_plot_png
+
+    hours = 24 * 365
+    df = pd.DataFrame({
+        "time": pd.date_range("2024-01-01", periods=hours, freq="h", tz="UTC"),
+        "temperature_2m": 10 + 8 * np.sin(np.arange(hours) / 24 / 58) + np.random.default_rng(1).normal(size=hours),
+    })
+
+    def run(label, render):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=count) as clients:
+            list(clients.map(lambda i: render(i), range(count)))
+        elapsed = time.perf_counter() - start
+        print(f"{label:<28} {count / elapsed:6.1f} Plots/s")
+
+    build_single_line_plot_png(df, "temperature_2m", "Warmup", "°C")
+    serial_lock = threading.Lock()
+
+    def serial(i):
+        with serial_lock:       # entspricht dem bisherigen Verhalten (Rendern serialisiert)
+            return build_single_line_plot_png(df, "temperature_2m", f"Plot {i}", "°C")
+
+    run("ohne Pool (serialisiert)", serial)
+
+    for mode in RENDER_MODES:
+        pool = RenderPool(mode=mode, max_queue=count, timeout=120)
+        # Worker starten (Prozesse werden erst bei Bedarf erzeugt)
+        warmup = [pool.submit(build_single_line_plot_png, df, "temperature_2m", "Warmup", "°C") for _ in range(pool.workers)]
+        for future in warmup:
+            future.result()
+        run(f"Pool {mode} ({pool.workers} Worker)",
+            lambda i: pool.render(build_single_line_plot_png, df, "temperature_2m", f"Plot {i}", "°C"))
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    import sys
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 32)
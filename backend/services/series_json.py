@@ -0,0 +1,132 @@
+##################################################
+# SERIES-JSON – Zeitreihen für Client-Charts - 1.1.0
+##################################################
+
+"""
+Kompakte, spaltenweise JSON-Darstellung einer Zeitreihe für /history.json und /forecast.json.
+
+Statt eines 150-dpi-PNGs bekommt der Browser nur die Zahlen und zeichnet selbst (Plotly):
+    {
+      "var": "temperature_2m", "points": 168,
+      "t0": 1735689600,            # Unix-Sekunden des ersten Punkts
+      "delta": true,               # t = Abstände zum VORHERIGEN Punkt (sonst Offsets ab t0)
+      "t": [0, 3600, 3600, ...],   # Sekunden (ganzzahlig)
+      "v": [5.3, 5.1, null, ...],  # Werte (float32-Genauigkeit, null = fehlt)
+      "encoding": "json"
+    }
+
+encoding="base64": "t" als Int32-Array und "v" als Float32-Array (Little Endian, NaN = fehlt),
+jeweils base64-kodiert -> im Browser direkt als Int32Array / Float32Array lesbar.
+
+Lange Reihen werden vorher wie beim PNG auf 'width' Punkte reduziert (downsample.py).
+
+encode_bundle: mehrere Variablen auf EINER Zeitachse (/timeseries.json), "vars" statt "var" und
+"v" als Dict Variable -> Werte (gleiche Kodierung wie oben).
+"""
+
+# =============== IMPORTS ====================
+import base64
+
+import numpy as np
+import pandas as pd
+
+from backend.services.downsample import downsample_frame, downsample_frame_multi
+
+SERIES_ENCODINGS = ("json", "base64")
+
+# Nachkommastellen für die JSON-Werte (Open-Meteo liefert 1 Nachkommastelle, float32 hat ~7 Stellen)
+JSON_DECIMALS = 2
+
+
+def encode_series(df, var, width, method="minmax", delta=True, encoding="json"):
+    """
+    Baut das Payload-Dict (siehe Moduldoku) oder None, wenn keine Daten für 'var' vorhanden sind.
+    """
+    _check_encoding(encoding)
+
+    if df is None or df.empty or var not in df.columns:
+        return None
+
+    df = downsample_frame(df, var, width, method=method)
+
+    payload = {"var": var}
+    payload.update(_encode_time(df, delta, encoding))
+    payload["v"] = _encode_values(df[var], encoding)
+
+    return payload
+
+
+def encode_bundle(df, variables, width, method="minmax", delta=True, encoding="json"):
+    """
+    Mehrere Variablen mit gemeinsamer Zeitachse -> {"vars": [...], "t0", "t", "v": {var: Werte}, ...}
+    oder None, wenn keine der Variablen vorhanden ist.
+    """
+    _check_encoding(encoding)
+
+    if df is None or df.empty:
+        return None
+
+    variables = [var for var in variables if var in df.columns]
+
+    if not variables:
+        return None
+
+    df = downsample_frame_multi(df, variables, width, method=method)
+
+    payload = {"vars": variables}
+    payload.update(_encode_time(df, delta, encoding))
+    payload["v"] = {var: _encode_values(df[var], encoding) for var in variables}
+
+    return payload
+
+
+def decode_series(payload):
+    """Gegenstück zu encode_series (für Tests/Skripte): -> (Unix-Sekunden int64, Werte float32)."""
+    if payload["encoding"] == "base64":
+        t = np.frombuffer(base64.b64decode(payload["t"]), dtype="<i4").astype(np.int64)
+        v = np.frombuffer(base64.b64decode(payload["v"]), dtype="<f4")
+    else:
+        t = np.asarray(payload["t"], dtype=np.int64)
+        v = np.array([np.nan if x is None else x for x in payload["v"]], dtype=np.float32)
+
+    if payload["delta"]:
+        t = np.cumsum(t)
+
+    return payload["t0"] + t, v
+
+
+# ========================================
+# HELPER
+# ========================================
+
+def _check_encoding(encoding):
+    if encoding not in SERIES_ENCODINGS:
+        raise ValueError(f"Unbekannte Kodierung: {encoding!r} (erlaubt: {', '.join(SERIES_ENCODINGS)})")
+
+
+def _encode_time(df, delta, encoding):
+    """Zeitachse: Unix-Sekunden -> t0 + Offsets ab t0 (bzw. Abstände zum vorherigen Punkt)."""
+    seconds = pd.DatetimeIndex(df["time"]).asi8 // 10**9
+    t0 = int(seconds[0])
+    offsets = (seconds - t0).astype(np.int32)
+
+    if delta:
+        offsets = np.diff(offsets, prepend=np.int32(0)).astype(np.int32)
+
+    if encoding == "base64":
+        t = base64.b64encode(offsets.astype("<i4").tobytes()).decode("ascii")
+    else:
+        t = offsets.tolist()
+
+    return {"points": int(len(offsets)), "t0": t0, "delta": bool(delta), "encoding": encoding, "t": t}
+
+
+def _encode_values(series, encoding):
+    """Werte als float32: base64 (NaN = fehlt) oder gerundete JSON-Liste (null = fehlt)."""
+    values = series.to_numpy(dtype="float64", na_value=np.nan).astype(np.float32)
+
+    if encoding == "base64":
+        return base64.b64encode(values.astype("<f4").tobytes()).decode("ascii")
+
+    rounded = np.round(values.astype(np.float64), JSON_DECIMALS)
+    return [None if v != v else v for v in rounded.tolist()]
@@ -0,0 +1,120 @@
+##############################################
+#   🌦 SESSION-STATE – 1.0.1                 #
+##############################################
+
+"""
+Zustand pro Client (Browser-Session bzw. Socket.IO-Verbindung).
+
+Bisher gab es nur EINE Stadt pro Prozess (self.city im WeatherDashboard).
+Jetzt bekommt jeder Client seinen eigenen ClientState:
+    - city           aktuelle Stadt des Clients
+    - weather_data   zuletzt geladene Wetterdaten (dict)
+    - last_polled    Zeitpunkt des letzten erfolgreichen Abrufs
+
+Der Speicher bleibt begrenzt:
+    - max. 'max_sessions' Einträge (älteste / am längsten inaktive fliegen raus, LRU)
+    - Einträge ohne Zugriff seit 'idle_timeout' Sekunden werden verworfen
+"""
+
+# =============== IMPORTS ====================
+import threading
+import time
+
+from collections import OrderedDict
+
+
+# ===== KLASSEN ERSTELLEN =====
+class ClientState:
+    """Zustand eines einzelnen Clients (bewusst klein gehalten, daher __slots__)."""
+
+    __slots__ = ("city", "weather_data", "last_polled", "last_seen")
+
+    def __init__(self, city=None, weather_data=None, last_polled=None):
+        self.city = city                    # Aktuelle Stadt
+        self.weather_data = weather_data    # Wetterdaten für die Stadt als dict
+        self.last_polled = last_polled      # Zeitpunkt der letzten erfolgreichen Abfrage
+        self.last_seen = time.monotonic()   # Letzter Zugriff (für Idle-Timeout)
+
+
+class SessionStore:
+    """Begrenzter, thread-sicherer Speicher client_id -> ClientState."""
+
+    def __init__(self, max_sessions=1000, idle_timeout=3600.0, clock=time.monotonic):
+        """
+        Args:
+            max_sessions (int):     Maximale Anzahl gleichzeitig gehaltener Client-Zustände
+            idle_timeout (float):   Sekunden ohne Zugriff, nach denen ein Zustand verworfen wird
+            clock (callable):       Zeitquelle für last_seen (monoton), für Tests austauschbar
+        """
+        self.max_sessions = max(1, int(max_sessions))
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+
+        self._states = OrderedDict()    # client_id -> ClientState (älteste zuerst)
+        self._lock = threading.Lock()
+
+
+    def get(self, client_id):
+        """Liefert den Zustand (und markiert ihn als benutzt) oder None."""
+        with self._lock:
+            self._prune_locked()
+
+            state = self._states.get(client_id)
+            if state is not None:
+                state.last_seen = self.clock()
+                self._states.move_to_end(client_id)
+            return state
+
+
+    def get_or_create(self, client_id, factory):
+        """Liefert den Zustand oder legt ihn über factory() -> ClientState neu an."""
+        with self._lock:
+            self._prune_locked()
+
+            state = self._states.get(client_id)
+
+            if state is None:
+                state = factory()
+                self._states[client_id] = state
+
+                # Größe begrenzen (am längsten unbenutzte Clients zuerst)
+                while len(self._states) > self.max_sessions:
+                    self._states.popitem(last=False)
+            else:
+                self._states.move_to_end(client_id)
+
+            state.last_seen = self.clock()
+            return state
+
+
+    def remove(self, client_id):
+        """Entfernt den Zustand eines Clients (z.B. beim Disconnect)."""
+        with self._lock:
+            self._states.pop(client_id, None)
+
+
+    def items(self):
+        """Momentaufnahme aller (client_id, ClientState)-Paare."""
+        with self._lock:
+            self._prune_locked()
+            return list(self._states.items())
+
+
+    def _prune_locked(self):
+        """Verwirft Zustände, die länger als idle_timeout nicht benutzt wurden."""
+        if not self.idle_timeout:
+            return
+
+        limit = self.clock() - self.idle_timeout
+
+        # OrderedDict ist nach letztem Zugriff sortiert -> nur vorne prüfen
+        while self._states:
+            client_id, state = next(iter(self._states.items()))
+            if state.last_seen >= limit:
+                break
+            self._states.popitem(last=False)
+
+
+    def __len__(self):
+        with self._lock:
+            return len(self._states)
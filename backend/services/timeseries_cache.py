@@ -0,0 +1,214 @@
+##################################################
+# TIMESERIES-CACHE – OpenMeteo - 1.2.0
+##################################################
+
+"""
+Gemeinsamer Cache für die stündlichen Open-Meteo Zeitreihen (History + Forecast).
+
+- Eine Antwort enthält IMMER alle Variablen (temperature_2m, relative_humidity_2m, wind_speed_10m)
+  -> der DataFrame wird EINMAL gespeichert und bedient jede Variable
+- Schlüssel: gerundete Koordinaten (Default 2 Nachkommastellen ≈ 1 km) + Zeitraum
+- History: Downloads laufen über den HistoryStore (SQLite) -> nur fehlende Tage werden geladen,
+  ein neuer Zeitraum (7 -> 14 Tage, nächster Tag) lädt nur die Differenz
+- History: abgeschlossene Tage in der Vergangenheit ändern sich nicht mehr -> unbegrenzt gültig
+  (nur wenn die Daten vollständig sind, das Archiv liefert die letzten Tage teils noch als null)
+- Forecast: gültig bis zum nächsten Modelllauf (Kadenz in Stunden, UTC-ausgerichtet)
+- Kombiniert (Vergangenheit + Vorhersage): EIN Forecast-Aufruf mit past_days, gültig wie der Forecast
+- Gleichzeitige Anfragen auf denselben Schlüssel lösen nur EINEN Download aus
+- Jeder geladene DataFrame bekommt df.attrs["fetched_at"] (Unix-Zeit) als Datenversion,
+  z.B. für ETags der gerenderten Plots
+"""
+
+# =============== IMPORTS ====================
+import asyncio
+import logging
+import threading
+import time
+
+from datetime import date, datetime, timedelta, timezone
+
+from backend.services.ttl_cache import TTLCache
+from backend.services.history.history_store import HistoryStore
+from backend.services.forecast.forecast_openmeteo import fetch_openmeteo_forecast_dataframe
+
+# Logger konfigurieren
+logger = logging.getLogger(__name__)
+
+
+# ===== KLASSE ERSTELLEN =====
+class OpenMeteoTimeseriesCache:
+    """Cached History- und Forecast-DataFrames pro (Koordinaten, Zeitraum)."""
+
+    def __init__(self, max_entries=64, coord_precision=2, forecast_cadence_hours=3, recent_ttl=3600, history_store=None):
+        """
+        Args:
+            max_entries (int):            Max. Anzahl gecachter DataFrames (LRU)
+            coord_precision (int):        Nachkommastellen für das Runden der Koordinaten
+            forecast_cadence_hours (int): Abstand der Modellläufe in Stunden (0, 3, 6, ... UTC)
+            recent_ttl (float):           TTL für History-Bereiche, die heute/unvollständige Tage enthalten
+            history_store (HistoryStore): Lückenbewusster History-Speicher, Default: SQLite unter data/cache
+        """
+        self.coord_precision = coord_precision
+        self.forecast_cadence_hours = max(1, int(forecast_cadence_hours))
+        self.recent_ttl = recent_ttl
+
+        self.history_store = history_store if history_store is not None else HistoryStore(recent_ttl=recent_ttl)
+
+        self.cache = TTLCache(max_entries=max_entries, ttl=recent_ttl, name="openmeteo-timeseries")
+
+        # Single-Flight: ein Lock pro Schlüssel, damit parallele Anfragen nur einmal laden
+        self._key_locks = {}
+        self._key_locks_lock = threading.Lock()
+
+
+    # ========================================
+    # ÖFFENTLICHE FUNKTIONEN
+    # ========================================
+
+    def get_history(self, lat, lon, start_date, end_date):
+        """
+        Liefert den History-DataFrame (alle Variablen) für [start_date, end_date] (ISO-Strings).
+        """
+        if lat is None or lon is None:
+            return None
+
+        lat_r, lon_r = self._round(lat), self._round(lon)
+        key = ("history", lat_r, lon_r, str(start_date), str(end_date))
+
+        def load():
+            # Nur fehlende Tage werden heruntergeladen, der Rest kommt aus dem HistoryStore
+            df = self.history_store.get_range(lat_r, lon_r, start_date, end_date)
+            return df, self._history_ttl(df, end_date)
+
+        return self._get_or_load(key, load)
+
+
+    def get_forecast(self, lat, lon, days=7):
+        """
+        Liefert den Forecast-DataFrame (alle Variablen) für die nächsten 'days' Tage.
+        """
+        if lat is None or lon is None:
+            return None
+
+        lat_r, lon_r = self._round(lat), self._round(lon)
+        key = ("forecast", lat_r, lon_r, int(days))
+
+        def load():
+            df = fetch_openmeteo_forecast_dataframe(lat=lat_r, lon=lon_r, days=days)
+            return df, self._seconds_until_next_model_run()
+
+        return self._get_or_load(key, load)
+
+
+    def get_combined(self, lat, lon, past_days=2, future_days=7):
+        """
+        Liefert EINE durchgehende Reihe (alle Variablen) von vor 'past_days' bis in 'future_days' Tage
+        (ein einziger Open-Meteo-Aufruf, past_days höchstens MAX_PAST_DAYS).
+        """
+        if lat is None or lon is None:
+            return None
+
+        lat_r, lon_r = self._round(lat), self._round(lon)
+        key = ("combined", lat_r, lon_r, int(past_days), int(future_days))
+
+        def load():
+            df = fetch_openmeteo_forecast_dataframe(lat=lat_r, lon=lon_r, days=future_days, past_days=past_days)
+            return df, self._seconds_until_next_model_run()
+
+        return self._get_or_load(key, load)
+
+
+    async def get_history_async(self, lat, lon, start_date, end_date):
+        """Wie get_history, blockierender Download im Worker-Thread (für asyncio.gather)."""
+        return await asyncio.to_thread(self.get_history, lat, lon, start_date, end_date)
+
+
+    async def get_forecast_async(self, lat, lon, days=7):
+        """Wie get_forecast, blockierender Download im Worker-Thread (für asyncio.gather)."""
+        return await asyncio.to_thread(self.get_forecast, lat, lon, days)
+
+
+    def stats(self) -> dict:
+        """Cache-Zähler (Hits/Misses/...) + Umfang des History-Speichers."""
+        stats = self.cache.stats()
+        stats["history"] = self.history_store.stats()
+        return stats
+
+
+    # ========================================
+    # HELPER
+    # ========================================
+
+    def _round(self, value):
+        return round(float(value), self.coord_precision)
+
+
+    def _get_or_load(self, key, load):
+        """Cache-Lookup mit Single-Flight-Laden bei einem Miss."""
+
+        df = self.cache.get(key)
+        if df is not None:
+            return df
+
+        with self._key_locks_lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            try:
+                # Evtl. hat ein anderer Thread inzwischen geladen
+                df = self.cache.peek(key)
+                if df is not None:
+                    return df
+
+                df, ttl = load()
+
+                # Fehler / leere Antworten nicht cachen
+                if df is not None and not df.empty:
+                    df.attrs["fetched_at"] = time.time()    # Datenversion
+                    self.cache.set(key, df, ttl=ttl)
+                    logger.debug(f"Timeseries gecached: {key} (ttl={ttl})")
+
+                return df
+
+            finally:
+                with self._key_locks_lock:
+                    self._key_locks.pop(key, None)
+
+
+    def _history_ttl(self, df, end_date):
+        """
+        None (= unbegrenzt), wenn der Zeitraum komplett in der Vergangenheit liegt und vollständig ist,
+        sonst recent_ttl.
+        """
+        if df is None or df.empty:
+            return self.recent_ttl
+
+        try:
+            end = date.fromisoformat(str(end_date))
+        except ValueError:
+            return self.recent_ttl
+
+        today = datetime.now(timezone.utc).date()
+
+        if end >= today:
+            return self.recent_ttl
+
+        # Archiv liefert die jüngsten Tage teilweise noch als null -> erst später dauerhaft cachen
+        values = df.drop(columns=["time"], errors="ignore")
+        if values.isna().any().any():
+            return self.recent_ttl
+
+        return None
+
+
+    def _seconds_until_next_model_run(self, now=None):
+        """Sekunden bis zum nächsten Modelllauf (Vielfaches der Kadenz ab 00 UTC)."""
+
+        now = now or datetime.now(timezone.utc)
+        cadence = self.forecast_cadence_hours
+
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        next_run_hour = (now.hour // cadence + 1) * cadence
+        next_run = midnight + timedelta(hours=next_run_hour)
+
+        return max(60.0, (next_run - now).total_seconds())
@@ -0,0 +1,194 @@
+##############################################
+#   🌦 TTL-/LRU-CACHE – 1.0.1                #
+##############################################
+
+"""
+Generischer, thread-sicherer In-Memory Cache.
+
+Eigenschaften:
+    - TTL pro Eintrag (Default-TTL oder beim set() überschreibbar, None = nie ablaufen)
+    - Begrenzte Größe mit LRU-Verdrängung (least recently used fliegt zuerst raus)
+    - Stale-While-Revalidate: Abgelaufene Einträge dürfen noch 'stale_ttl' Sekunden
+      ausgeliefert werden, während der Aufrufer im Hintergrund neu lädt
+    - Zähler für Hits, Misses, Stale-Hits, Verdrängungen und Abläufe (stats())
+"""
+
+# =============== IMPORTS ====================
+import threading
+import time
+
+from collections import OrderedDict
+
+
+# Zustände eines Lookups
+FRESH = "fresh"     # Eintrag gültig
+STALE = "stale"     # Eintrag abgelaufen, aber noch im Stale-Fenster -> ausliefern + neu laden
+MISS = "miss"       # Kein (brauchbarer) Eintrag
+
+# Platzhalter für "Default-TTL des Caches verwenden" (None bedeutet bereits "läuft nie ab")
+DEFAULT_TTL = object()
+
+
+# ===== KLASSE ERSTELLEN =====
+class TTLCache:
+    """LRU-Cache mit Ablaufzeit pro Eintrag und optionalem Stale-Fenster."""
+
+    def __init__(self, max_entries=256, ttl=300.0, stale_ttl=0.0, name="cache", clock=time.monotonic):
+        """
+        Args:
+            max_entries (int):  Maximale Anzahl Einträge (LRU-Verdrängung darüber)
+            ttl (float):        Default-Lebensdauer eines Eintrags in Sekunden (None = unbegrenzt)
+            stale_ttl (float):  Wie lange ein abgelaufener Eintrag noch als 'stale' geliefert werden darf
+            name (str):         Name für Logs/Statistik
+            clock (callable):   Zeitquelle in Sekunden (monoton), für Tests austauschbar
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = ttl
+        self.stale_ttl = max(0.0, float(stale_ttl or 0.0))
+        self.name = name
+        self.clock = clock
+
+        self._data = OrderedDict()      # key -> (value, expires_at | None, stored_at)
+        self._lock = threading.Lock()
+
+        # Zähler
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+
+    # ========================================
+    # LESEN
+    # ========================================
+
+    def lookup(self, key):
+        """
+        Liefert (value, state) mit state in FRESH / STALE / MISS.
+        Bei MISS ist value None.
+        """
+        now = self.clock()
+
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None, MISS
+
+            value, expires_at, _stored_at = entry
+
+            # ===== 1) NOCH GÜLTIG =====
+            if expires_at is None or now < expires_at:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value, FRESH
+
+            # ===== 2) ABGELAUFEN, ABER IM STALE-FENSTER =====
+            if now < expires_at + self.stale_ttl:
+                self._data.move_to_end(key)
+                self.stale_hits += 1
+                return value, STALE
+
+            # ===== 3) ENDGÜLTIG ABGELAUFEN -> ENTFERNEN =====
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None, MISS
+
+
+    def get(self, key, default=None):
+        """Liefert nur frische Werte, sonst default."""
+        value, state = self.lookup(key)
+        return value if state == FRESH else default
+
+
+    def peek(self, key):
+        """Liefert einen frischen Wert oder None, ohne Zähler und LRU-Reihenfolge zu verändern."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at, _stored_at = entry
+            if expires_at is None or self.clock() < expires_at:
+                return value
+            return None
+
+
+    def age(self, key):
+        """Alter eines Eintrags in Sekunden oder None (zählt nicht als Hit/Miss)."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            return self.clock() - entry[2]
+
+
+    # ========================================
+    # SCHREIBEN
+    # ========================================
+
+    def set(self, key, value, ttl=DEFAULT_TTL):
+        """
+        Speichert value unter key.
+
+        Args:
+            ttl: Sekunden bis zum Ablauf. DEFAULT_TTL = self.ttl, None = läuft nie ab.
+        """
+        if ttl is DEFAULT_TTL:
+            ttl = self.ttl
+
+        now = self.clock()
+        expires_at = None if ttl is None else now + float(ttl)
+
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+
+            self._data[key] = (value, expires_at, now)
+
+            # LRU-Verdrängung, falls zu viele Einträge
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+
+    def invalidate(self, key):
+        """Entfernt einen Eintrag (falls vorhanden)."""
+        with self._lock:
+            self._data.pop(key, None)
+
+
+    def clear(self):
+        """Leert den Cache (Zähler bleiben erhalten)."""
+        with self._lock:
+            self._data.clear()
+
+
+    # ========================================
+    # STATISTIK
+    # ========================================
+
+    def stats(self) -> dict:
+        """Zähler als JSON-serialisierbares dict (für /status bzw. zum Dimensionieren)."""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "maxEntries": self.max_entries,
+                "ttl": self.ttl,
+                "staleTtl": self.stale_ttl,
+                "hits": self.hits,
+                "staleHits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hitRate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else None,
+            }
+
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
@@ -0,0 +1,311 @@
+##############################################
+#   🌦 WEATHER-RECORD – 1.0.0                #
+##############################################
+
+"""
+Kompakte Darstellungen normalisierter Wetterdaten.
+
+Bisher war jeder Datensatz ein dict mit 30 String-Keys (~1,2 KB nur für das dict).
+Bei vielen gecachten Datensätzen (CSV-Store, Provider-Caches, Client-Zustände) summiert sich das.
+
+    WeatherRecord   ein Datensatz, Felder als __slots__ (kein dict pro Datensatz)
+                    - verhält sich wie ein (lesbares + beschreibbares) dict: r["city"], r.get(...), r.items(), ...
+                    - zusätzliche Keys außerhalb des Schemas (z.B. "lastUpdated") landen in einem kleinen Extra-dict
+                    - to_dict() erst am Rand (JSON-Antwort, Socket-Event)
+
+    WeatherBlock    viele Datensätze spaltenweise (struct-of-arrays, Modul 'array')
+                    - Zahlen als 8-Byte-Werte statt einzelner Python-Objekte
+                    - None wird über eine Maske pro Spalte gemerkt (NaN bleibt NaN)
+                    - record(i) / to_dict(i) liefern native Python-Typen
+
+Benchmark (tracemalloc, dicts vs. WeatherRecord vs. WeatherBlock):
+    python -m backend.services.weather_record
+"""
+
+# =============== IMPORTS ====================
+from array import array
+from operator import attrgetter
+
+from backend.services.weather_schema import WEATHER_SCHEMA
+
+
+# Feldnamen + Typen in Schema-Reihenfolge
+FIELD_NAMES = tuple(field.name for field in WEATHER_SCHEMA)
+FIELD_KINDS = {field.name: field.kind for field in WEATHER_SCHEMA}
+FIELD_DEFAULTS = {field.name: field.default for field in WEATHER_SCHEMA}
+
+_FIELD_SET = frozenset(FIELD_NAMES)
+_get_all_fields = attrgetter(*FIELD_NAMES)
+
+
+# ===== KLASSEN ERSTELLEN =====
+class WeatherRecord:
+    """Ein normalisierter Datensatz mit festen Feldern (__slots__) und dict-artiger Schnittstelle."""
+
+    __slots__ = FIELD_NAMES + ("_extra",)
+
+    def __init__(self):
+        # Felder werden vom Extraktor (data_normalizer) bzw. from_dict gesetzt
+        self._extra = None
+
+
+    @classmethod
+    def from_dict(cls, data):
+        """Baut einen Datensatz aus einem dict (fehlende Schema-Felder bekommen den Default)."""
+        record = cls()
+        for name in FIELD_NAMES:
+            setattr(record, name, data.get(name, FIELD_DEFAULTS[name]))
+        for key, value in data.items():
+            if key not in _FIELD_SET:
+                record[key] = value
+        return record
+
+
+    # ===== DICT-SCHNITTSTELLE =====
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            return getattr(self, key)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+
+    def __setitem__(self, key, value):
+        if key in _FIELD_SET:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+
+    def __contains__(self, key):
+        return key in _FIELD_SET or (self._extra is not None and key in self._extra)
+
+
+    def __iter__(self):
+        return iter(self.keys())
+
+
+    def __len__(self):
+        return len(FIELD_NAMES) + (len(self._extra) if self._extra else 0)
+
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+    def keys(self):
+        if self._extra:
+            return list(FIELD_NAMES) + list(self._extra)
+        return list(FIELD_NAMES)
+
+
+    def values(self):
+        return list(self.to_dict().values())
+
+
+    def items(self):
+        return self.to_dict().items()
+
+
+    def to_dict(self) -> dict:
+        """Wandelt in ein normales dict (für jsonify / Socket.IO)."""
+        data = dict(zip(FIELD_NAMES, _get_all_fields(self)))
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+
+    def copy(self):
+        """Flache Kopie (wie dict.copy)."""
+        record = WeatherRecord()
+        for name in FIELD_NAMES:
+            setattr(record, name, getattr(self, name))
+        if self._extra:
+            record._extra = dict(self._extra)
+        return record
+
+
+    def __eq__(self, other):
+        if isinstance(other, WeatherRecord):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+
+    def __repr__(self):
+        return f"WeatherRecord({self.to_dict()!r})"
+
+
+class WeatherBlock:
+    """Viele Datensätze spaltenweise (struct-of-arrays)."""
+
+    # array-Typcodes pro Schema-Typ ("str"/"clock" bleiben Listen von Strings)
+    _TYPECODES = {"float": "d", "int": "q", "bool": "b"}
+
+    def __init__(self):
+        self._length = 0
+        self._columns = {}      # Feldname -> array | list
+        self._nulls = {}        # Feldname -> bytearray (1 = None), nur für Zahlenspalten
+
+        for name in FIELD_NAMES:
+            typecode = self._TYPECODES.get(FIELD_KINDS[name])
+            self._columns[name] = array(typecode) if typecode else []
+            if typecode in ("d", "q"):
+                self._nulls[name] = bytearray()
+
+
+    @classmethod
+    def from_records(cls, records):
+        """Baut einen Block aus normalisierten dicts oder WeatherRecords."""
+        block = cls()
+        for record in records:
+            block.append(record)
+        return block
+
+
+    @classmethod
+    def from_frame(cls, frame):
+        """
+        Baut einen Block direkt aus dem Ergebnis von normalize_weather_frame (ohne dicts dazwischen).
+        """
+        import numpy as np
+
+        block = cls()
+        block._length = len(frame)
+
+        for name in FIELD_NAMES:
+            values = frame[name].to_numpy(dtype=object)
+            typecode = cls._TYPECODES.get(FIELD_KINDS[name])
+
+            if typecode is None:
+                block._columns[name] = values.tolist()
+                continue
+
+            if typecode == "b":
+                block._columns[name] = array("b", values.astype(bool).astype(np.int8).tobytes())
+                continue
+
+            nulls = np.equal(values, None)
+            numbers = np.where(nulls, 0, values).astype(np.float64 if typecode == "d" else np.int64)
+
+            column = array(typecode)
+            column.frombytes(numbers.tobytes())
+            block._columns[name] = column
+            block._nulls[name] = bytearray(nulls.astype(np.uint8).tobytes())
+
+        return block
+
+
+    def append(self, record):
+        """Hängt einen Datensatz an (Zusatz-Keys außerhalb des Schemas werden nicht gespeichert)."""
+        for name in FIELD_NAMES:
+            value = record[name]
+            column = self._columns[name]
+            nulls = self._nulls.get(name)
+
+            if nulls is not None:
+                nulls.append(1 if value is None else 0)
+                column.append(0 if value is None else value)
+            elif FIELD_KINDS[name] == "bool":
+                column.append(1 if value else 0)
+            else:
+                column.append(value)
+
+        self._length += 1
+
+
+    def record(self, index) -> WeatherRecord:
+        """Datensatz an Position 'index' als WeatherRecord (native Python-Typen)."""
+        record = WeatherRecord()
+        for name in FIELD_NAMES:
+            setattr(record, name, self._value(name, index))
+        return record
+
+
+    def to_dict(self, index) -> dict:
+        """Datensatz an Position 'index' als dict."""
+        return {name: self._value(name, index) for name in FIELD_NAMES}
+
+
+    def _value(self, name, index):
+        nulls = self._nulls.get(name)
+        if nulls is not None and nulls[index]:
+            return None
+
+        value = self._columns[name][index]
+        if FIELD_KINDS[name] == "bool":
+            return bool(value)
+        return value
+
+
+    def __len__(self):
+        return self._length
+
+
+# ===== FUNKTIONEN =====
+def as_dict(data):
+    """dict für den Rand (jsonify / emit): WeatherRecord -> dict, alles andere unverändert."""
+    if isinstance(data, WeatherRecord):
+        return data.to_dict()
+    return data
+
+
+# ========================================
+# BENCHMARK: Speicherbedarf
+# ========================================
+
+def _benchmark(n_records=100_000):
+    """Vergleicht den Speicherbedarf von n normalisierten Datensätzen in drei Darstellungen."""
+    import os
+    import random
+    import time
+    import tracemalloc
+
+    import pandas as pd
+
+    from backend.services.data_normalizer import normalize_weather_data, normalize_weather_frame
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    sample_path = os.path.abspath(os.path.join(base_dir, "..", "..", "data", "samples", "weather_sample.csv"))
+
+    # Realistisch: jede Zeile hat eigene Messwerte (keine geteilten Float-Objekte)
+    sample = pd.read_csv(sample_path)
+    df = pd.concat([sample] * (n_records // len(sample) + 1), ignore_index=True).iloc[:n_records].copy()
+    rng = random.Random(1)
+    for column in ("TEMPERATURE", "feelsLike", "windSpeed", "windGust", "dewPoint", "co"):
+        df[column] = [rng.uniform(-10, 35) for _ in range(n_records)]
+    rows = df.to_dict("records")
+
+    def measure(build):
+        tracemalloc.start()
+        start = time.perf_counter()
+        data = build()
+        elapsed = time.perf_counter() - start
+        size, _peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return data, size, elapsed
+
+    dicts, dict_bytes, dict_s = measure(lambda: [normalize_weather_data(row) for row in rows])
+    del dicts
+    records, record_bytes, record_s = measure(lambda: [normalize_weather_data(row, as_record=True) for row in rows])
+    del records
+
+    frame = normalize_weather_frame(df)
+    block, block_bytes, block_s = measure(lambda: WeatherBlock.from_frame(frame))
+
+    assert block.to_dict(0) == normalize_weather_data(rows[0])
+
+    print(f"{n_records} normalisierte Datensätze (tracemalloc):")
+    print(f"  list[dict]           {dict_bytes / 1e6:8.1f} MB  ({dict_bytes / n_records:6.0f} B/Datensatz, {dict_s:.2f} s)")
+    print(f"  list[WeatherRecord]  {record_bytes / 1e6:8.1f} MB  ({record_bytes / n_records:6.0f} B/Datensatz, {record_s:.2f} s)")
+    print(f"  WeatherBlock         {block_bytes / 1e6:8.1f} MB  ({block_bytes / n_records:6.0f} B/Datensatz, {block_s:.2f} s)")
+
+
+if __name__ == "__main__":
+    _benchmark()
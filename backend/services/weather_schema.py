@@ -0,0 +1,100 @@
+##############################################
+#          WEATHER SCHEMA - 1.2.0            #
+##############################################
+
+"""
+Deklaratives Schema der normalisierten Wetterdaten (ein Eintrag pro Dashboard-Key).
+
+Jedes Feld beschreibt:
+    name     Ausgabe-Key im Dashboard-Format
+    kind     Konverter: "str" | "float" | "int" | "bool" | "clock" (Unix-Zeit + timezone -> "HH:MM")
+    sources  Quell-Keys (Aliase) in Prioritätsreihenfolge
+    mode     "or"   -> wie raw.get(a) or raw.get(b) ... (erster "truthy" Wert, sonst der LETZTE)
+             "pick" -> wie pick(raw, a, b)              (erster vorhandene, nicht leere Wert, 0 zählt)
+    default  Wert, wenn nichts Brauchbares gefunden wurde
+
+Zusätzlich beschreiben "Shapes", wo die Quell-Keys in einer Eingabe stehen:
+    - flache dicts (CSV-Zeilen, Samples)  -> direkt raw.get(key)
+    - OpenWeather JSON (/data/2.5/weather) -> OPENWEATHER_SHAPE (verschachtelte Pfade)
+
+data_normalizer baut daraus pro Shape EINMAL einen spezialisierten Extraktor (vorberechnete Getter/Konverter).
+"""
+
+# =============== IMPORTS ====================
+from collections import namedtuple
+
+
+# ===== SCHEMA =====
+Field = namedtuple("Field", ["name", "kind", "sources", "mode", "default"])
+
+WEATHER_SCHEMA = (
+    Field("city",               "str",   ("CITY", "city"),                                 "or",   "Unbekannt"),
+    Field("currentTemperature", "float", ("TEMPERATURE", "temp", "currentTemperature"),    "or",   None),
+    Field("feelsLike",          "float", ("feelsLike",),                                   "or",   None),
+    Field("tempMin",            "float", ("tempMin",),                                     "or",   None),
+    Field("tempMax",            "float", ("tempMax",),                                     "or",   None),
+    Field("humidity",           "int",   ("humidity",),                                    "or",   None),
+    Field("pressure",           "int",   ("pressure",),                                    "or",   None),
+    Field("weatherDescription", "str",   ("weatherDescription", "description", "weather"), "or",   "--"),
+    Field("cloudCoverage",      "int",   ("cloudCoverage", "clouds"),                      "or",   None),
+    Field("rain1h",             "float", ("rain1h", "rain_1h"),                            "pick", None),
+    Field("rain3h",             "float", ("rain3h", "rain_3h"),                            "pick", None),
+    Field("snow1h",             "float", ("snow1h", "snow_1h"),                            "pick", None),
+    Field("snow3h",             "float", ("snow3h", "snow_3h"),                            "pick", None),
+    Field("windSpeed",          "float", ("windSpeed", "wind_speed"),                      "or",   None),
+    Field("windGust",           "float", ("windGust", "wind_gust"),                        "or",   None),
+    Field("windDirection",      "int",   ("windDirection", "wind_deg"),                    "or",   None),
+    Field("uvIndex",            "float", ("uvIndex", "uvi"),                               "or",   None),
+    Field("sunrise",            "clock", ("sunrise",),                                     "or",   "08:00"),
+    Field("sunset",             "clock", ("sunset",),                                      "or",   "18:30"),
+    Field("visibility",         "int",   ("visibility",),                                  "or",   None),
+    Field("dewPoint",           "float", ("dewPoint",),                                    "or",   None),
+    Field("airQualityIndex",    "int",   ("airQualityIndex", "aqi"),                       "or",   None),
+    Field("pm10",               "float", ("pm10",),                                        "or",   None),
+    Field("pm2_5",              "float", ("pm2_5", "pm2.5", "pm2_5"),                      "or",   None),
+    Field("co",                 "float", ("co",),                                          "or",   None),
+    Field("no2",                "float", ("no2",),                                         "or",   None),
+    Field("o3",                 "float", ("o3",),                                          "or",   None),
+    Field("pollenCount",        "int",   ("pollenCount", "pollen"),                        "or",   None),
+    Field("pressureTrend",      "str",   ("pressureTrend",),                               "or",   "--"),
+    Field("fog",                "bool",  ("fog",),                                         "or",   False),
+    Field("utcOffset",          "int",   ("timezone",),                                    "or",   0),
+)
+
+# Quell-Key für die Zeitzone (Sekunden Offset zu UTC), gilt für alle "clock"-Felder
+TIMEZONE_SOURCE = "timezone"
+
+# Alle Quell-Keys flacher Eingaben (= Spalten, die aus CSV/Feather/Parquet überhaupt gelesen werden müssen)
+FLAT_SOURCE_KEYS = tuple(dict.fromkeys(
+    [alias for field in WEATHER_SCHEMA for alias in field.sources] + [TIMEZONE_SOURCE]
+))
+
+
+# ===== SHAPES =====
+# OpenWeather Current Weather JSON: Quell-Key -> Pfad im JSON.
+# Zwischenstufen, die fehlen oder leer sind, zählen als {} (bzw. [{}] vor einem Listen-Index),
+# wie 'main = raw.get("main") or {}' -> main.get("temp").
+OPENWEATHER_SHAPE = {
+    "sources": {
+        "city":               ("name",),
+        "temp":               ("main", "temp"),
+        "feelsLike":          ("main", "feels_like"),
+        "tempMin":            ("main", "temp_min"),
+        "tempMax":            ("main", "temp_max"),
+        "humidity":           ("main", "humidity"),
+        "pressure":           ("main", "pressure"),
+        "weatherDescription": ("weather", 0, "description"),
+        "wind_speed":         ("wind", "speed"),
+        "wind_deg":           ("wind", "deg"),
+        "wind_gust":          ("wind", "gust"),
+        "visibility":         ("visibility",),
+        "clouds":             ("clouds", "all"),
+        "timezone":           ("timezone",),
+        "sunrise":            ("sys", "sunrise"),
+        "sunset":             ("sys", "sunset"),
+    },
+    # Wert, wenn der LETZTE Schlüssel des Pfads fehlt (sonst None)
+    "defaults": {
+        "timezone": 0,
+    },
+}
@@ -17,10 +17,22 @@ import io                  # StringIO wird verwendet, um CSV-Text zu lesen wie e
 import sys                 # für sys.argv und Exit-Codes
 import os                  # für Umgebungsvariablen (z. B. OPENWEATHER_API_KEY)
 import json                # für JSON-Dumps bei --format json
-import urllib.request      # für einfache HTTP-Anfragen zur OpenWeather API
-import urllib.parse        # um Query-Parameter URL-encodiert anzuhängen
+import threading           # Lock für den Rate-Limiter (Multi-City-Modus)
+import time                # Zeitmessung für den Rate-Limiter
+from collections import deque                       # Fenster laufender Abrufe (Multi-City-Modus)
+from concurrent.futures import ThreadPoolExecutor   # parallele API-Abrufe (Multi-City-Modus)
 from datetime import datetime, timezone  # für Zeitstempel (UTC)
-from typing import List, Dict, Optional, Any, Sequence  # Typ-Hinweise für bessere Lesbarkeit
+from typing import List, Dict, Optional, Any, Sequence, Iterable, Iterator, Callable  # Typ-Hinweise für bessere Lesbarkeit
+
+# Projekt-Root in sys.path, damit "python cli.py" auch direkt aus dem Ordner cli/ funktioniert
+# (sonst sind "backend" und "cli" nur mit "python -m cli.cli" aus dem Projekt-Root importierbar)
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from backend.services import columnar_io  # Feather/Parquet lesen + konvertieren (optional pyarrow)
+from backend.services import http_client  # gemeinsame HTTP-Session (Keep-Alive, Connection-Pool, Retry bei 429/5xx)
+from cli.log_writer import CSVLogWriter    # gepufferter Log-Writer (Batches, fsync-Policy, Rotation)
 
 # ---------------------------------------------------------------------------
 # Hilfsfunktionen zur Normalisierung und Parsing
@@ -44,41 +56,87 @@ def _normalize_value(v: Any) -> str:
     return str(v).strip()
 
 
-def parse_weather_data(raw: str) -> List[Dict[str, str]]:
+def _strip_bom(lines: Iterable[str]) -> Iterator[str]:
     """
-    Parst Roh-CSV-Text (ganze Datei als String) und gibt eine Liste von Dicts zurück.
+    Entfernt einen möglichen UTF-8 BOM (Byte Order Mark) am Anfang des Zeilenstroms.
+    BOM macht den Header "\ufeffdate" statt "date" - das führt zu fehlenden Spalten.
+    Nur die erste Zeile wird geprüft, der Rest wird unverändert durchgereicht.
+    """
+    it = iter(lines)
+    for first in it:
+        yield first.lstrip("\ufeff")
+        break
+    yield from it
+
+
+def iter_weather_rows(lines: Iterable[str]) -> Iterator[Dict[str, str]]:
+    """
+    Streaming-Variante von parse_weather_data: liest CSV-Zeilen aus einem beliebigen
+    Zeilen-Iterable (offene Datei, sys.stdin, Liste) und liefert Dict für Dict.
     - Header-Namen werden bereinigt (BOM entfernt, getrimmt, lowercased).
     - Werte werden mittels _normalize_value normalisiert.
-    - Rückgabe: List[Dict[str, str]]; jede Dict repräsentiert eine Zeile.
-    """
-    # Entferne einen möglichen UTF-8 BOM (Byte Order Mark) am Anfang der Datei.
-    # BOM macht den Header "\ufeffdate" statt "date" - das führt zu fehlenden Spalten.
-    if raw and raw.startswith("\ufeff"):
-        raw = raw.lstrip("\ufeff")
+    - Es wird immer nur die aktuelle Zeile im Speicher gehalten (konstanter Speicherbedarf).
 
-    # Vereinheitliche Zeilenenden (Windows CRLF -> LF), so ist das Parsing plattformunabhängig.
-    raw = raw.replace("\r\n", "\n").replace("\r", "\n")
+    Zeilenenden: Dateien/stdin im Textmodus (newline=None) liefern bereits einheitliche '\n'
+    (Windows CRLF und altes Mac-CR werden beim Lesen übersetzt) - kein Kopieren des Textes nötig.
+    """
+    reader = csv.reader(_strip_bom(lines))
+
+    # Header-Zeile lesen und bereinigen:
+    # - entferne Whitespaces
+    # - entferne evtl. führendes BOM (falls noch vorhanden)
+    # - mache lowercase, damit Header-Fallunterschiede egal sind
+    header = next(reader, None)
+    if header is None:
+        return
+    keys = [(k or "").strip().lstrip("\ufeff").lower() for k in header]
+    n_keys = len(keys)
 
-    # Verwende csv.DictReader über einen String-Stream (io.StringIO)
-    reader = csv.DictReader(io.StringIO(raw))
-    rows: List[Dict[str, str]] = []
+    for values in reader:
+        # Leere Zeilen überspringen (wie csv.DictReader)
+        if not values:
+            continue
 
-    # Iteriere über alle Zeilen, bereinige Header-Keys und Werte, füge zur Ergebnisliste hinzu.
-    for row in reader:
         normalized: Dict[str, str] = {}
+        for key, val in zip(keys, values):
+            normalized[key] = _normalize_value(val)
+
+        # Zu kurze Zeile: fehlende Spalten wie bei csv.DictReader mit "" (None -> "")
+        for key in keys[len(values):]:
+            normalized[key] = ""
+
+        # Zu lange Zeile: überzählige Werte landen (wie bei DictReader unter restkey=None) unter ""
+        if len(values) > n_keys:
+            normalized[""] = _normalize_value(values[n_keys:])
+
+        yield normalized
+
+
+def iter_columnar_rows(path: str) -> Iterator[Dict[str, str]]:
+    """
+    Liest eine Feather-/Parquet-Datei batchweise und liefert Zeilen im gleichen Format wie iter_weather_rows
+    (Header getrimmt + lowercased, Werte als Strings, fehlende Werte als "").
+    """
+    keys: Dict[str, str] = {}
+    for row in columnar_io.iter_rows(path):
+        out: Dict[str, str] = {}
         for k, v in row.items():
-            # Key-Bereinigung:
-            # - Falls k None ist, ersetze durch leeren String
-            # - entferne Whitespaces
-            # - entferne evtl. führendes BOM (falls noch vorhanden)
-            # - mache lowercase, damit Header-Fallunterschiede egal sind
-            key = (k or "").strip().lstrip("\ufeff").lower()
-            # Value-Normalisierung (z. B. Lists -> String, None -> "")
-            val = _normalize_value(v)
-            normalized[key] = val
-        rows.append(normalized)
+            key = keys.get(k)
+            if key is None:
+                key = keys[k] = (k or "").strip().lower()
+            out[key] = _normalize_value(v)
+        yield out
 
-    return rows
+
+def parse_weather_data(raw: str) -> List[Dict[str, str]]:
+    """
+    Parst Roh-CSV-Text (ganze Datei als String) und gibt eine Liste von Dicts zurück.
+    - Gleiche Regeln wie iter_weather_rows (BOM, Header, Werte).
+    - Rückgabe: List[Dict[str, str]]; jede Dict repräsentiert eine Zeile.
+    Für große Eingaben besser iter_weather_rows mit einer offenen Datei verwenden.
+    """
+    # newline=None: Zeilenenden (CRLF/CR -> LF) werden beim Lesen vereinheitlicht, ohne Kopie von 'raw'
+    return list(iter_weather_rows(io.StringIO(raw, newline=None)))
 
 
 def _pick_first(row: Dict[str, str], candidates: Sequence[str]) -> Optional[str]:
@@ -114,6 +172,28 @@ def _extract_wind_from_row(row: Dict[str, str]) -> Dict[str, str]:
     return {"wind_speed": speed or "", "wind_deg": deg or ""}
 
 
+def normalize_rows(rows: Iterable[Dict[str, str]]) -> Iterator[Dict[str, str]]:
+    """
+    Normalisiert CSV-Zeilen lazy (Zeile für Zeile):
+    - precipitation aus diversen Header-Varianten (rain, snow_1h, ...)
+    - wind_speed / wind_deg aus diversen Header-Varianten (wind, wind_kmh, wind_dir, ...)
+    'city' wird, falls vorhanden, beibehalten (keine automatische Ergänzung).
+    """
+    for row in rows:
+        nr = dict(row)  # mache eine Kopie (vermeide Änderung des Originals)
+        # Precipitation Normalisierung
+        p = _extract_precipitation_from_row(row)
+        if p:
+            nr["precipitation"] = p
+        # Wind Normalisierung
+        w = _extract_wind_from_row(row)
+        if w.get("wind_speed"):
+            nr["wind_speed"] = w["wind_speed"]
+        if w.get("wind_deg"):
+            nr["wind_deg"] = w["wind_deg"]
+        yield nr
+
+
 def _extract_common_from_api(data: Dict[str, Any]) -> Dict[str, str]:
     """
     Extrahiere gängige Felder aus der OpenWeather-API-Antwort.
@@ -289,19 +369,19 @@ def _format_description(desc: str) -> str:
 # Anzeige-Logik: komponiert Ausgabezeilen basierend auf den angeforderten Feldern
 # ---------------------------------------------------------------------------
 
-def display_weather(data: List[Dict[str, str]], fields: Sequence[str]) -> None:
+def display_weather(data: Iterable[Dict[str, str]], fields: Sequence[str]) -> None:
     """
     Drucke Wetterdaten in menschenlesbarer Form:
+    - 'data' darf eine Liste oder ein Generator sein; jede Zeile wird sofort ausgegeben.
     - 'fields' bestimmt die Reihenfolge und Auswahl der angezeigten Felder.
     - Standard-Ausgabeformat, wenn 'date' enthalten ist:
       "DATE [CITY]: rest-of-fields-joined-with —"
     - Wenn kein 'date' aber 'city' vorhanden: "CITY: rest"
     """
-    if not data:
-        print("Keine Wetterdaten zum Anzeigen.")
-        return
+    shown = 0
 
     for r in data:
+        shown += 1
         out_parts: List[str] = []
 
         # Für jedes gewünschte Feld erzeugen wir einen formatierten String-Teil
@@ -376,48 +456,83 @@ def display_weather(data: List[Dict[str, str]], fields: Sequence[str]) -> None:
                 # Keine Date/City: gebe alle non-empty Teile verbunden aus
                 print(" — ".join([p for p in out_parts if p and p != "-"]))
 
+    # Hinweis nur, wenn wirklich keine einzige Zeile kam (erst nach dem Durchlauf bekannt)
+    if not shown:
+        print("Keine Wetterdaten zum Anzeigen.")
+
+
+def write_json_array(data: Iterable[Dict[str, str]], out=None) -> None:
+    """
+    Gibt die Zeilen als JSON-Array aus - Zeile für Zeile, ohne vorher eine Liste zu bauen.
+    Das Ergebnis ist identisch mit json.dumps(list(data), ensure_ascii=False, indent=2).
+    """
+    out = out or sys.stdout
+    first = True
+    for row in data:
+        # Jedes Objekt um eine Ebene (2 Leerzeichen) einrücken, wie json.dumps(..., indent=2) im Array
+        item = json.dumps(row, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+        out.write(("[\n  " if first else ",\n  ") + item)
+        first = False
+    out.write("[]\n" if first else "\n]\n")
+
+
+def write_json_lines(data: Iterable[Dict[str, str]], out=None) -> None:
+    """Gibt die Zeilen als JSON Lines aus (ein kompaktes JSON-Objekt pro Zeile, gut für Pipes/jq)."""
+    out = out or sys.stdout
+    for row in data:
+        out.write(json.dumps(row, ensure_ascii=False) + "\n")
+
 
 # ---------------------------------------------------------------------------
 # Logging in CSV — erweitert um 'city' Spalte
 # ---------------------------------------------------------------------------
 
-def log_to_csv(data: List[Dict[str, str]], path: str) -> None:
+LOG_FIELDNAMES = ["date", "city", "temp", "description", "precipitation", "wind_speed", "wind_deg", "humidity", "pressure", "clouds"]
+
+
+def _log_row(r: Dict[str, str]) -> Dict[str, str]:
+    """Bildet eine Eingabezeile auf die Spalten der Logdatei ab (Werte als Strings)."""
+    return {
+        "date": r.get("date", ""),
+        "city": r.get("city", ""),
+        "temp": r.get("temp", ""),
+        "description": r.get("description", r.get("desc", "")),
+        "precipitation": r.get("precipitation", "") or r.get("rain", "") or r.get("snow", ""),
+        "wind_speed": r.get("wind_speed", "") or r.get("wind", ""),
+        "wind_deg": r.get("wind_deg", "") or r.get("wind_dir", ""),
+        "humidity": r.get("humidity", ""),
+        "pressure": r.get("pressure", ""),
+        "clouds": r.get("clouds", ""),
+    }
+
+
+def iter_logged(data: Iterable[Dict[str, str]], path: str, **writer_options: Any) -> Iterator[Dict[str, str]]:
+    """
+    Schreibt jede Zeile in die Log-CSV und reicht sie danach unverändert weiter.
+    So können Logging und Ausgabe in EINEM Durchlauf über die Eingabe passieren
+    (kein Zwischenspeichern aller Zeilen).
+    - Wenn Datei nicht existiert (oder leer ist), wird Header geschrieben.
+    - Geschrieben wird gepuffert über CSVLogWriter (ein open, Batches statt Einzelzeilen);
+      writer_options: batch_size, flush_interval, fsync, max_bytes, daily, backup_count.
+    - Die Datei wird erst beim ersten Abruf geöffnet und am Ende geschlossen.
+    """
+    with CSVLogWriter(path, LOG_FIELDNAMES, **writer_options) as writer:
+        for row in data:
+            writer.write(_log_row(row))
+            yield row
+
+
+def log_to_csv(data: Iterable[Dict[str, str]], path: str, **writer_options: Any) -> None:
     """
     Hängt die gegebenen Daten an eine CSV an.
     - Feldreihenfolge ist: date, city, temp, description, precipitation, wind_speed, wind_deg, humidity, pressure, clouds
     - Wenn Datei nicht existiert, wird Header geschrieben.
     - Werte werden als Strings geschrieben.
+    - 'data' darf eine Liste oder ein Generator sein (Zeilen werden gepuffert geschrieben).
+    - writer_options werden an CSVLogWriter weitergegeben (Batchgröße, fsync, Rotation).
     """
-    fieldnames = ["date", "city", "temp", "description", "precipitation", "wind_speed", "wind_deg", "humidity", "pressure", "clouds"]
-    rows = []
-    for r in data:
-        rows.append({
-            "date": r.get("date", ""),
-            "city": r.get("city", ""),
-            "temp": r.get("temp", ""),
-            "description": r.get("description", r.get("desc", "")),
-            "precipitation": r.get("precipitation", "") or r.get("rain", "") or r.get("snow", ""),
-            "wind_speed": r.get("wind_speed", "") or r.get("wind", ""),
-            "wind_deg": r.get("wind_deg", "") or r.get("wind_dir", ""),
-            "humidity": r.get("humidity", ""),
-            "pressure": r.get("pressure", ""),
-            "clouds": r.get("clouds", ""),
-        })
-
-    # Prüfe, ob die Datei bereits existiert (damit wir Header nur einmal schreiben)
-    try:
-        with open(path, "r", newline="", encoding="utf-8") as fh:
-            has_header = True
-    except FileNotFoundError:
-        has_header = False
-
-    # Schreibe die Zeilen in Append-Modus; schreibe Header falls nötig.
-    with open(path, "a", newline="", encoding="utf-8") as fh:
-        writer = csv.DictWriter(fh, fieldnames=fieldnames)
-        if not has_header:
-            writer.writeheader()
-        for row in rows:
-            writer.writerow(row)
+    for _ in iter_logged(data, path, **writer_options):
+        pass
 
 
 # ---------------------------------------------------------------------------
@@ -439,21 +554,27 @@ def fetch_openweather_for_city(city: str, api_key: str, units: str = "metric", l
     base = "https://api.openweathermap.org/data/2.5/weather"
     # Query-Parameter (q=city, appid=key, units, lang)
     params = {"q": city, "appid": api_key, "units": units, "lang": lang}
-    # Vollständige URL
-    url = base + "?" + urllib.parse.urlencode(params)
-    # Erstelle Request mit User-Agent, damit manche Server weniger restriktiv antworten
-    req = urllib.request.Request(url, headers={"User-Agent": "WetterApp-CLI/1.0"})
 
-    # HTTP-Request (GET) mit Timeout; decode als UTF-8
-    with urllib.request.urlopen(req, timeout=10) as resp:
-        body = resp.read().decode("utf-8")
-        data = json.loads(body)
+    # HTTP-Request (GET) mit Timeout über die gemeinsame Session:
+    # Verbindungen werden wiederverwendet (kein neuer TLS-Handshake pro Aufruf),
+    # 429/5xx werden mit Backoff wiederholt. User-Agent für die CLI setzen.
+    resp = http_client.get(base, params=params, timeout=10, headers={"User-Agent": "WetterApp-CLI/1.0"})
+
+    # Antwort als JSON lesen; nicht-JSON nur bei echten HTTP-Fehlern (z. B. Proxy-Fehlerseite)
+    try:
+        data = resp.json()
+    except ValueError:
+        resp.raise_for_status()
+        raise
 
     # Falls API einen Fehlercode zurückliefert (cod != 200), werfe RuntimeError mit Message
     if isinstance(data, dict) and data.get("cod") and int(data.get("cod")) != 200:
         msg = data.get("message", "Unbekannter Fehler von OpenWeather")
         raise RuntimeError(f"OpenWeather API Fehler: {msg}")
 
+    # Sonstige HTTP-Fehler ohne 'cod' im JSON (urlopen hat hier früher HTTPError geworfen)
+    resp.raise_for_status()
+
     # Baue die normalisierte Zeile:
     base_row = {}
     # Wenn die API einen kanonischen Stadtnamen zurückgibt (data['name']), verwende ihn
@@ -470,10 +591,149 @@ def fetch_openweather_for_city(city: str, api_key: str, units: str = "metric", l
     return [base_row]
 
 
+# ---------------------------------------------------------------------------
+# Multi-City-Modus: viele Städte in EINEM Prozess, parallel und rate-limitiert
+# ---------------------------------------------------------------------------
+
+class _RateLimiter:
+    """
+    Einfacher, thread-sicherer Rate-Limiter: höchstens 'rate' Aufrufe pro Sekunde.
+    Jeder Aufruf von wait() reserviert den nächsten freien Zeitslot und schläft bis dahin.
+    rate <= 0 bedeutet: keine Begrenzung.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def split_city_list(s: Optional[str]) -> List[str]:
+    """
+    Zerlegt eine kommaseparierte Städteliste ("Berlin,Hamburg,München").
+    Zweibuchstabige Teile werden als Ländercode an die vorherige Stadt gehängt,
+    damit die OpenWeather-Schreibweise "London,GB" erhalten bleibt:
+      "London,GB,Berlin" -> ["London,GB", "Berlin"]
+    """
+    cities: List[str] = []
+    for part in (s or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if cities and len(part) == 2 and part.isalpha():
+            cities[-1] = f"{cities[-1]},{part}"
+        else:
+            cities.append(part)
+    return cities
+
+
+def read_cities_file(path: str) -> List[str]:
+    """
+    Liest eine Städteliste aus einer Datei: eine Stadt pro Zeile (z.B. "Berlin" oder "London,GB").
+    Leere Zeilen und Kommentare (#) werden ignoriert.
+    """
+    cities: List[str] = []
+    with open(path, "r", encoding="utf-8-sig") as fh:
+        for line in fh:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                cities.append(line)
+    return cities
+
+
+def iter_openweather_for_cities(
+    cities: Sequence[str],
+    api_key: str,
+    units: str = "metric",
+    lang: str = "de",
+    workers: int = 8,
+    rate: float = 10.0,
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+) -> Iterator[Dict[str, str]]:
+    """
+    Ruft OpenWeather für viele Städte parallel ab und liefert die Zeilen in EINGABE-Reihenfolge.
+    - workers: maximale Anzahl gleichzeitiger Requests (Thread-Pool)
+    - rate:    maximale Requests pro Sekunde (über alle Threads)
+    - Es laufen nur so viele Abrufe "vor", wie das Fenster (2 * workers) erlaubt,
+      damit auch sehr lange Listen nicht komplett im Speicher landen.
+    - on_error(city, exc): wird für fehlgeschlagene Städte aufgerufen, danach geht es weiter.
+      Ohne on_error wird der Fehler weitergeworfen.
+    """
+    workers = max(1, int(workers))
+    limiter = _RateLimiter(rate)
+
+    def fetch(city: str) -> List[Dict[str, str]]:
+        limiter.wait()
+        return fetch_openweather_for_city(city, api_key, units=units, lang=lang)
+
+    it = iter(cities)
+    pending: deque = deque()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ow-fetch") as pool:
+        try:
+            # Fenster füllen
+            for city in it:
+                pending.append((city, pool.submit(fetch, city)))
+                if len(pending) >= 2 * workers:
+                    break
+
+            while pending:
+                city, future = pending.popleft()
+
+                # Für jede abgeholte Stadt eine neue nachschieben
+                nxt = next(it, None)
+                if nxt is not None:
+                    pending.append((nxt, pool.submit(fetch, nxt)))
+
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    if on_error is None:
+                        raise
+                    on_error(city, e)
+                    continue
+                yield from rows
+        finally:
+            # Abbruch (Fehler weiter hinten in der Pipeline, Strg+C): offene Abrufe verwerfen
+            for _city, future in pending:
+                future.cancel()
+
+
 # ---------------------------------------------------------------------------
 # Feld-Validierung und CLI-Einstiegspunkt
 # ---------------------------------------------------------------------------
 
+class _StreamError(Exception):
+    """Fehler in einer Stufe der Streaming-Pipeline (trägt den Exit-Code dieser Stufe)."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def _guarded(rows: Iterable[Any], code: int, message: str) -> Iterator[Any]:
+    """
+    Reicht eine Pipeline-Stufe durch und übersetzt deren Fehler in einen _StreamError.
+    Fehler aus früheren Stufen sind bereits übersetzt und behalten ihren Exit-Code.
+    """
+    try:
+        yield from rows
+    except _StreamError:
+        raise
+    except Exception as e:
+        raise _StreamError(code, f"{message}: {e}") from e
+
+
 def _validate_and_split_fields(s: Optional[str]) -> List[str]:
     """
     Parst den Wert von --fields (falls gesetzt). Erwartet eine kommaseparierte Liste.
@@ -503,16 +763,31 @@ def main(argv: Optional[List[str]] = None) -> int:
       5  = Parsing-Fehler
       6  = Log-Schreibfehler
       7  = ungültige Kombination (--only-log ohne --log)
+      8  = Teilfehler im Multi-City-Modus (mind. eine Stadt fehlgeschlagen, andere erfolgreich)
+      9  = Konvertierungsfehler (--convert-to)
       130= Abbruch (KeyboardInterrupt)
+
+    CSV-Eingaben werden gestreamt: lesen -> parsen -> normalisieren -> loggen -> ausgeben
+    passiert Zeile für Zeile, der Speicherbedarf hängt nicht von der Dateigröße ab.
     """
     # Wenn main ohne argv aufgerufen wird, verwende die tatsächlichen Kommandozeilenargumente
     argv = argv if argv is not None else sys.argv[1:]
 
     # CLI-Argumente definieren
     parser = argparse.ArgumentParser(description="WetterApp CLI with extended weather parameters")
-    parser.add_argument("--file", "-f", help="Input CSV file. If omitted read from stdin.")
+    parser.add_argument("--file", "-f", help="Input file: CSV, or Feather/Parquet (.feather/.arrow/.parquet, needs pyarrow). If omitted read from stdin.")
+    parser.add_argument("--convert-to", help="Convert --file to this path (format by extension: .csv/.feather/.arrow/.parquet) and exit")
     parser.add_argument("--log", "-l", help="Append parsed data to a CSV file")
-    parser.add_argument("--ow-city", help="Fetch current weather from OpenWeather for CITY")
+    parser.add_argument("--log-batch-size", type=int, default=500, help="Rows buffered before a write to the log (default: 500)")
+    parser.add_argument("--log-flush-interval", type=float, default=5.0, help="Max. seconds between log writes while streaming (default: 5)")
+    parser.add_argument("--log-fsync", choices=["none", "close", "flush"], default="none", help="fsync policy for the log: never, once on close, or after every batch (default: none)")
+    parser.add_argument("--log-max-bytes", type=int, default=0, help="Rotate the log when it would exceed this size in bytes (0 = off)")
+    parser.add_argument("--log-rotate-daily", action="store_true", help="Rotate the log when the day changes (logged.YYYY-MM-DD.csv)")
+    parser.add_argument("--log-backups", type=int, default=5, help="Number of rotated log files to keep (default: 5)")
+    parser.add_argument("--ow-city", help="Fetch current weather from OpenWeather for CITY (or a comma-separated list: Berlin,Hamburg,London,GB)")
+    parser.add_argument("--cities-file", help="File with one city per line (# comments allowed); fetched like --ow-city")
+    parser.add_argument("--ow-workers", type=int, default=8, help="Max. concurrent OpenWeather requests for multiple cities (default: 8)")
+    parser.add_argument("--ow-rate", type=float, default=10.0, help="Max. OpenWeather requests per second, 0 = unlimited (default: 10)")
     parser.add_argument("--ow-key", help="OpenWeather API key (or set OPENWEATHER_API_KEY env var)")
     parser.add_argument("--ow-units", default="metric", choices=["metric", "imperial"], help="Units for OpenWeather (default: metric)")
     parser.add_argument("--ow-lang", default="de", help="Language for OpenWeather description (default: de)")
@@ -520,7 +795,7 @@ def main(argv: Optional[List[str]] = None) -> int:
     # Ausgabe-Steuerung
     parser.add_argument("--quiet", "-q", action="store_true", help="Suppress console output (errors still go to stderr).")
     parser.add_argument("--only-log", action="store_true", help="Do not print to stdout; only write to log (--log required).")
-    parser.add_argument("--format", choices=["text", "json"], default="text", help="Output format: 'text' or 'json'.")
+    parser.add_argument("--format", choices=["text", "json", "jsonl"], default="text", help="Output format: 'text', 'json' (array) or 'jsonl' (one JSON object per line).")
     parser.add_argument("--fields", help="Comma-separated list of fields to display (order matters). Available: date,city,temp,description,precipitation,wind,humidity,pressure,clouds")
 
     # Argumente parsen
@@ -530,85 +805,124 @@ def main(argv: Optional[List[str]] = None) -> int:
         # Felder bestimmen (vom Nutzer gesetzt oder default)
         fields = _validate_and_split_fields(args.fields)
 
+        # Konverter: --file -> --convert-to (CSV <-> Feather/Parquet), keine Anzeige
+        if args.convert_to:
+            if not args.file:
+                print("Fehler: --convert-to verlangt eine Eingabedatei (--file <path>).", file=sys.stderr)
+                return 9
+            try:
+                # CSV-Werte bleiben Text (wie im Log), damit die Umwandlung verlustfrei ist
+                count = columnar_io.convert(args.file, args.convert_to, strings=not columnar_io.columnar_format(args.file))
+            except Exception as e:
+                print(f"Fehler beim Konvertieren: {e}", file=sys.stderr)
+                return 9
+            if not args.quiet:
+                print(f"{count} Zeilen: {args.file} -> {args.convert_to}")
+            return 0
+
+        # Spaltenformate können nicht angehängt werden -> als CSV loggen und später konvertieren
+        if args.log and columnar_io.columnar_format(args.log):
+            print("Fehler beim Schreiben in die Logdatei: Feather/Parquet kann nicht angehängt werden, "
+                  "bitte als CSV loggen und mit --convert-to umwandeln.", file=sys.stderr)
+            return 6
+
         # Datenbeschaffung: OpenWeather API, Datei oder stdin
-        if args.ow_city:
+        input_fh = None
+        failed: List[str] = []
+        cities: List[str] = []
+        if args.ow_city or args.cities_file:
             # API-Key: bevorzugt --ow-key, sonst Umgebungsvariable OPENWEATHER_API_KEY
             key = args.ow_key or os.environ.get("OPENWEATHER_API_KEY")
             if not key:
                 # Key fehlt -> Fehler
                 print("Kein OpenWeather API-Key angegeben (--ow-key oder OPENWEATHER_API_KEY).", file=sys.stderr)
                 return 2
-            try:
-                # API-Aufruf, liefert Liste mit einer Zeile
-                data = fetch_openweather_for_city(args.ow_city, key, units=args.ow_units, lang=args.ow_lang)
-            except Exception as e:
-                # Fehler bei API-Aufruf -> Ausgabe nach stderr und Fehlercode
-                print(f"Fehler beim Abrufen von OpenWeather: {e}", file=sys.stderr)
-                return 3
+
+            # Städte sammeln: --ow-city (Liste) zuerst, danach --cities-file
+            cities = split_city_list(args.ow_city)
+            if args.cities_file:
+                try:
+                    cities += read_cities_file(args.cities_file)
+                except Exception as e:
+                    print(f"Fehler beim Lesen der Datei: {e}", file=sys.stderr)
+                    return 4
+
+            def report_failure(city: str, e: Exception) -> None:
+                # Fehler bei API-Aufruf -> Ausgabe nach stderr, die übrigen Städte laufen weiter
+                failed.append(city)
+                print(f"Fehler beim Abrufen von OpenWeather ({city}): {e}", file=sys.stderr)
+
+            # Parallele Abrufe, Zeilen kommen trotzdem in Eingabe-Reihenfolge (eine Zeile pro Stadt)
+            data = iter_openweather_for_cities(
+                cities, key, units=args.ow_units, lang=args.ow_lang,
+                workers=args.ow_workers, rate=args.ow_rate, on_error=report_failure,
+            )
         else:
-            # CSV-Modus (Datei lesen oder stdin)
-            if args.file:
+            # CSV-Modus (Datei lesen oder stdin) - es wird NICHT die ganze Eingabe eingelesen,
+            # sondern ein Generator aufgebaut, der Zeile für Zeile liest und parst.
+            if args.file and columnar_io.columnar_format(args.file):
+                # Feather/Parquet: batchweise lesen (gleiche Zeilen-dicts wie beim CSV-Parser)
+                rows = _guarded(iter_columnar_rows(args.file), 4, "Fehler beim Lesen der Datei")
+                data = normalize_rows(rows)
+            elif args.file:
                 try:
-                    # Datei im UTF-8 Modus öffnen; falls Datei andere Kodierung hat, kann das Anpassung brauchen
-                    with open(args.file, "r", encoding="utf-8") as fh:
-                        raw = fh.read()
+                    # Datei im UTF-8 Modus öffnen; Textmodus vereinheitlicht die Zeilenenden beim Lesen
+                    input_fh = open(args.file, "r", encoding="utf-8")
                 except Exception as e:
                     print(f"Fehler beim Lesen der Datei: {e}", file=sys.stderr)
                     return 4
-                # CSV parsen (gibt Liste von dicts)
-                parsed = parse_weather_data(raw)
-
-                # Normalisiere Felder (z. B. precipitation aus diversen Header-Varianten)
-                normalized_rows: List[Dict[str, str]] = []
-                for row in parsed:
-                    nr = dict(row)  # mache eine Kopie (vermeide Änderung des Originals)
-                    # Precipitation Normalisierung
-                    p = _extract_precipitation_from_row(row)
-                    if p:
-                        nr["precipitation"] = p
-                    # Wind Normalisierung
-                    w = _extract_wind_from_row(row)
-                    if w.get("wind_speed"):
-                        nr["wind_speed"] = w["wind_speed"]
-                    if w.get("wind_deg"):
-                        nr["wind_deg"] = w["wind_deg"]
-                    # 'city' Spalte wird, falls vorhanden, beibehalten (keine automatische Ergänzung)
-                    normalized_rows.append(nr)
-
-                data = normalized_rows
+                lines = _guarded(input_fh, 4, "Fehler beim Lesen der Datei")
+                # CSV parsen + Felder normalisieren (z. B. precipitation aus diversen Header-Varianten)
+                data = normalize_rows(_guarded(iter_weather_rows(lines), 5, "Fehler beim Parsen der Eingabedaten"))
             else:
                 # Keine Datei: lese von stdin (z. B. via pipe)
-                raw = sys.stdin.read()
-                try:
-                    data = parse_weather_data(raw)
-                except Exception as e:
-                    print(f"Fehler beim Parsen der Eingabedaten: {e}", file=sys.stderr)
-                    return 5
+                lines = _guarded(sys.stdin, 4, "Fehler beim Lesen von stdin")
+                data = _guarded(iter_weather_rows(lines), 5, "Fehler beim Parsen der Eingabedaten")
 
-        # Validierung: only-log ohne log macht keinen Sinn -> Fehler
-        if args.only_log and not args.log:
-            print("Fehler: --only-log verlangt eine Logdatei (--log <path>).", file=sys.stderr)
-            return 7
-
-        # Falls Log gewünscht ist: schreibe immer (auch wenn quiet gesetzt ist)
-        if args.log:
-            try:
-                log_to_csv(data, args.log)
-            except Exception as e:
-                print(f"Fehler beim Schreiben in die Logdatei: {e}", file=sys.stderr)
-                return 6
-
-        # Ausgabe auf stdout: abhängig von quiet / only-log / format
-        if not args.quiet and not args.only_log:
-            if args.format == "json":
-                # JSON-Ausgabe, ensure_ascii=False damit Umlaute korrekt bleiben
-                try:
-                    print(json.dumps(data, ensure_ascii=False, indent=2))
-                except Exception:
-                    print(json.dumps(data, ensure_ascii=False))
+        try:
+            # Validierung: only-log ohne log macht keinen Sinn -> Fehler
+            if args.only_log and not args.log:
+                print("Fehler: --only-log verlangt eine Logdatei (--log <path>).", file=sys.stderr)
+                return 7
+
+            # Falls Log gewünscht ist: schreibe immer (auch wenn quiet gesetzt ist).
+            # Jede Zeile wird geloggt, bevor sie an die Ausgabe weitergereicht wird.
+            if args.log:
+                writer_options = {
+                    "batch_size": args.log_batch_size,
+                    "flush_interval": args.log_flush_interval,
+                    "fsync": args.log_fsync,
+                    "max_bytes": args.log_max_bytes,
+                    "daily": args.log_rotate_daily,
+                    "backup_count": args.log_backups,
+                }
+                data = _guarded(iter_logged(data, args.log, **writer_options), 6, "Fehler beim Schreiben in die Logdatei")
+
+            # Ausgabe auf stdout: abhängig von quiet / only-log / format
+            if not args.quiet and not args.only_log:
+                if args.format == "json":
+                    # JSON-Array, ensure_ascii=False damit Umlaute korrekt bleiben
+                    write_json_array(data)
+                elif args.format == "jsonl":
+                    write_json_lines(data)
+                else:
+                    # Text-Ausgabe: benutze display_weather mit den gewählten Feldern
+                    display_weather(data, fields)
             else:
-                # Text-Ausgabe: benutze display_weather mit den gewählten Feldern
-                display_weather(data, fields)
+                # Keine Ausgabe: Pipeline trotzdem komplett durchlaufen (damit geloggt wird)
+                for _ in data:
+                    pass
+
+        except _StreamError as e:
+            print(e, file=sys.stderr)
+            return e.code
+        finally:
+            if input_fh is not None:
+                input_fh.close()
+
+        # API-Fehler: alle Städte fehlgeschlagen -> 3, nur ein Teil -> 8
+        if failed:
+            return 3 if len(failed) == len(cities) else 8
 
         # Erfolgreich beenden
         return 0
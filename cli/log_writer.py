@@ -0,0 +1,217 @@
+# Gepufferter CSV-Log-Writer für die CLI (cli/log_writer.py)
+#
+# Warum?
+# - Früher hat log_to_csv die Logdatei pro Aufruf ZWEIMAL geöffnet (einmal nur zum Prüfen,
+#   ob sie existiert, dann im Append-Modus) und jede Zeile einzeln geschrieben.
+# - Bei vielen Aufrufen (Cronjob jede Minute, viele Städte) entstehen dadurch sehr viele
+#   kleine Schreibzugriffe auf das (geteilte) Volume.
+#
+# Was macht CSVLogWriter?
+# - Datei wird genau EINMAL geöffnet (Binär-Append), Header-Prüfung über os.stat (Größe 0 / fehlt)
+# - Zeilen werden im Speicher gesammelt und in EINEM write() geschrieben, sobald
+#     * batch_size Zeilen zusammengekommen sind oder
+#     * flush_interval Sekunden seit dem letzten Schreiben vergangen sind oder
+#     * der Writer geschlossen wird
+# - fsync-Policy (wann die Daten wirklich auf die Platte müssen):
+#     "none"  -> nie fsync (Betriebssystem entscheidet; am schnellsten, Standard wie bisher)
+#     "close" -> einmal beim Schließen
+#     "flush" -> nach jedem geschriebenen Batch (am sichersten, am langsamsten)
+# - Rotation, damit Logdateien begrenzt bleiben:
+#     max_bytes > 0  -> bei Überschreiten: logged.csv -> logged.1.csv -> logged.2.csv ...
+#     daily=True     -> neuer Tag: logged.csv -> logged.2025-12-09.csv
+#     backup_count   -> so viele alte Dateien werden behalten (ältere werden gelöscht)
+#
+# Benutzung:
+#     with CSVLogWriter("cli/logged.csv", LOG_FIELDNAMES) as writer:
+#         for row in rows:
+#             writer.write(row)
+
+from __future__ import annotations
+
+import csv
+import glob
+import io
+import os
+import time
+from datetime import date
+from typing import Dict, Optional, Sequence
+
+
+FSYNC_POLICIES = ("none", "close", "flush")
+
+
+class CSVLogWriter:
+    """
+    Hängt Zeilen gepuffert an eine CSV-Datei an (ein open, wenige große writes).
+    Header wird nur geschrieben, wenn die Datei fehlt oder leer ist.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fieldnames: Sequence[str],
+        batch_size: int = 500,
+        flush_interval: float = 5.0,
+        fsync: str = "none",
+        max_bytes: int = 0,
+        daily: bool = False,
+        backup_count: int = 5,
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unbekannte fsync-Policy: {fsync!r} (erlaubt: {', '.join(FSYNC_POLICIES)})")
+
+        self.path = path
+        self.fieldnames = list(fieldnames)
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.max_bytes = max(0, int(max_bytes or 0))
+        self.daily = daily
+        self.backup_count = max(0, int(backup_count))
+
+        # Puffer: Zeilen werden sofort als CSV-Text formatiert (keine dict-Liste im Speicher)
+        self._buffer = io.StringIO(newline="")
+        self._csv = csv.DictWriter(self._buffer, fieldnames=self.fieldnames, extrasaction="ignore")
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+        self._fh = None
+        self._size = 0
+        self._file_day: Optional[date] = None
+        self._open()
+
+
+    # ===== DATEI ÖFFNEN / ROTIEREN =====
+    def _open(self) -> None:
+        """Öffnet die Logdatei im Append-Modus; Größe + Tag kommen aus einem einzigen os.stat."""
+        try:
+            st = os.stat(self.path)
+            self._size = st.st_size
+            self._file_day = date.fromtimestamp(st.st_mtime)
+        except FileNotFoundError:
+            self._size = 0
+            self._file_day = date.today()
+
+        # Binär-Append: ein write() pro Batch, Bytes werden exakt gezählt (für max_bytes)
+        self._fh = open(self.path, "ab")
+
+
+    def _rotation_due(self, incoming: int) -> bool:
+        """Muss vor dem nächsten Batch rotiert werden? (Nie bei leerer Datei.)"""
+        if self._size == 0:
+            return False
+        if self.max_bytes and self._size + incoming > self.max_bytes:
+            return True
+        if self.daily and self._file_day != date.today():
+            return True
+        return False
+
+
+    def _split_path(self):
+        """'cli/logged.csv' -> ('cli/logged', '.csv')"""
+        return os.path.splitext(self.path)
+
+
+    def _rotate(self) -> None:
+        """Schließt die aktuelle Datei, benennt sie um und öffnet eine neue (leere) Datei."""
+        self._close_file()
+        stem, ext = self._split_path()
+
+        if self.daily and self._file_day != date.today():
+            # Tagesrotation: Datei bekommt das Datum ihres letzten Schreibtags
+            target = f"{stem}.{self._file_day.isoformat()}{ext}"
+            n = 1
+            while os.path.exists(target):
+                target = f"{stem}.{self._file_day.isoformat()}.{n}{ext}"
+                n += 1
+            os.replace(self.path, target)
+
+            # Nur die neuesten backup_count Tagesdateien behalten (ISO-Datum sortiert korrekt)
+            dated = sorted(glob.glob(f"{glob.escape(stem)}.????-??-??*{ext}"))
+            for old in dated[:-self.backup_count] if self.backup_count else dated:
+                os.remove(old)
+        else:
+            # Größenrotation: logged.(n-1).csv -> logged.n.csv, ..., logged.csv -> logged.1.csv
+            if self.backup_count:
+                for i in range(self.backup_count - 1, 0, -1):
+                    src = f"{stem}.{i}{ext}"
+                    if os.path.exists(src):
+                        os.replace(src, f"{stem}.{i + 1}{ext}")
+                os.replace(self.path, f"{stem}.1{ext}")
+            else:
+                os.remove(self.path)
+
+        self._open()
+
+
+    # ===== SCHREIBEN =====
+    def write(self, row: Dict[str, str]) -> None:
+        """Puffert eine Zeile; schreibt den Batch, wenn batch_size oder flush_interval erreicht ist."""
+        self._csv.writerow(row)
+        self._pending += 1
+
+        if self._pending >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+
+    def flush(self) -> None:
+        """Schreibt alle gepufferten Zeilen in EINEM write() (inkl. Header bei leerer Datei)."""
+        if self._fh is None:
+            raise ValueError("CSVLogWriter ist bereits geschlossen")
+
+        data = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate(0)
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+        # Nichts zu schreiben (leere Datei bekommt aber trotzdem ihren Header)
+        if not data and self._size:
+            return
+
+        if self._rotation_due(len(data)):
+            self._rotate()
+
+        # Header nur bei neuer/leerer Datei (auch direkt nach einer Rotation)
+        if self._size == 0:
+            header = io.StringIO(newline="")
+            csv.DictWriter(header, fieldnames=self.fieldnames).writeheader()
+            data = header.getvalue().encode("utf-8") + data
+
+        self._fh.write(data)
+        self._fh.flush()
+        self._size += len(data)
+        self._file_day = date.today()
+
+        if self.fsync == "flush":
+            os.fsync(self._fh.fileno())
+
+
+    def _close_file(self) -> None:
+        if self._fh is None:
+            return
+        try:
+            self._fh.flush()
+            if self.fsync != "none":
+                os.fsync(self._fh.fileno())
+        finally:
+            self._fh.close()
+            self._fh = None
+
+
+    def close(self) -> None:
+        """Schreibt den Rest und schließt die Datei (fsync je nach Policy)."""
+        if self._fh is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._close_file()
+
+
+    def __enter__(self) -> "CSVLogWriter":
+        return self
+
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -14,6 +14,10 @@ Diese Tests prüfen:
 3) log_to_csv: Header wird geschrieben + Zeilen werden angehängt
 4) main(): Fehlercode bei falscher Kombination (--only-log ohne --log)
 5) API-Modus: OpenWeather wird “gemockt” (kein echtes Internet nötig)
+6) Streaming: Generator-Pipeline (iter_weather_rows, JSON Lines, Logging ohne Liste)
+7) CSVLogWriter: Header bei leerer Datei, Rotation nach Größe
+8) Multi-City-Modus: parallele Abrufe, Reihenfolge, Teilfehler (Exit-Code 8)
+9) Spaltenformate: CSV -> Parquet/Feather -> Anzeige (nur mit pyarrow)
 
 -------------------------------------------------------------------------------
 So startet man den Tests:
@@ -48,10 +52,13 @@ import pytest
 # cli ist ein Paket (weil cli/__init__.py existiert)
 from cli.cli import (
     parse_weather_data,
+    iter_weather_rows,
     display_weather,
     log_to_csv,
     main,
+    split_city_list,
 )
+from cli.log_writer import CSVLogWriter
 
 # -----------------------------------------------------------------------------
 # 1) Tests für parse_weather_data (CSV Parser)
@@ -301,36 +308,35 @@ def test_main_outputs_json_format(tmp_path: Path, capfd):
 
 
 # -----------------------------------------------------------------------------
-# 5) API-Modus testen OHNE Internet (Mock von urllib.request.urlopen)
+# 5) API-Modus testen OHNE Internet (Mock von http_client.get)
 # -----------------------------------------------------------------------------
 
 class _DummyHTTPResponse:
     """
-    Mini-Helferklasse zum Mocken von urllib.request.urlopen(...)
-    Damit der Code denkt, er bekommt eine echte HTTP-Antwort.
+    Mini-Helferklasse zum Mocken von http_client.get(...)
+    Damit der Code denkt, er bekommt eine echte HTTP-Antwort (wie requests.Response).
     """
 
-    def __init__(self, payload: str):
-        self._payload = payload.encode("utf-8")
+    def __init__(self, payload: str, status_code: int = 200):
+        self._payload = payload
+        self.status_code = status_code
 
-    def read(self) -> bytes:
-        return self._payload
+    def json(self) -> Any:
+        return json.loads(self._payload)
 
-    def __enter__(self):
-        return self
-
-    def __exit__(self, exc_type, exc, tb):
-        return False
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
 
 
 def test_main_api_mode_with_mock(monkeypatch, capfd):
     """
     Test 10: API-Modus soll funktionieren, ohne echtes Internet.
 
-    "patchen" urllib.request.urlopen so,
+    "patchen" http_client.get so,
     dass immer eine Fake-OpenWeather-Antwort zurückkommt.
     """
-    import urllib.request
+    from backend.services import http_client
 
     fake_api_json = {
         "cod": 200,
@@ -342,10 +348,11 @@ def test_main_api_mode_with_mock(monkeypatch, capfd):
         # optional rain/snow (hier bewusst nicht gesetzt)
     }
 
-    def fake_urlopen(req, timeout=10):
+    def fake_get(url, params=None, timeout=10, **kwargs):
+        assert params["q"] == "Berlin"
         return _DummyHTTPResponse(json.dumps(fake_api_json))
 
-    monkeypatch.setattr(urllib.request, "urlopen", fake_urlopen)
+    monkeypatch.setattr(http_client, "get", fake_get)
 
     # API-Key muss existieren, sonst rc=2 → es wird ein Dummy-Key gegeben
     rc = main(["--ow-city", "Berlin", "--ow-key", "DUMMY_KEY"])
@@ -354,3 +361,212 @@ def test_main_api_mode_with_mock(monkeypatch, capfd):
     assert rc == 0
     assert "Berlin" in out
     assert "6" in out or "6.5" in out  # je nach Rundung/Formatierung
+
+
+# -----------------------------------------------------------------------------
+# 6) Streaming-Pipeline (Zeile für Zeile statt ganze Datei im Speicher)
+# -----------------------------------------------------------------------------
+
+def test_iter_weather_rows_is_lazy_and_strips_bom():
+    """
+    Test 11: iter_weather_rows liest nur so viele Zeilen, wie gebraucht werden.
+
+    Die Eingabe ist ein Generator; nach der ersten Datenzeile darf die dritte Zeile
+    noch nicht gelesen worden sein.
+    """
+    consumed = []
+
+    def lines():
+        for line in ["\ufeffDate,Temp\n", "2025-12-09,5\n", "2025-12-10,6\n"]:
+            consumed.append(line)
+            yield line
+
+    rows = iter_weather_rows(lines())
+    first = next(rows)
+
+    assert first == {"date": "2025-12-09", "temp": "5"}
+    assert len(consumed) == 2, "Generator hat mehr Zeilen gelesen als nötig"
+    assert list(rows) == [{"date": "2025-12-10", "temp": "6"}]
+
+
+def test_display_weather_empty_generator_message(capfd):
+    """
+    Test 12: Auch bei einem leeren Generator kommt der Hinweis 'Keine Wetterdaten'.
+    """
+    display_weather(iter([]), ["date", "temp"])
+    out = capfd.readouterr().out
+    assert "Keine Wetterdaten" in out
+
+
+def test_log_to_csv_accepts_generator(tmp_path: Path):
+    """
+    Test 13: log_to_csv schreibt auch Zeilen aus einem Generator (ohne Liste).
+    """
+    log_file = tmp_path / "stream.csv"
+    rows = ({"date": "2025-12-09", "city": f"Stadt{i}", "temp": str(i)} for i in range(3))
+
+    log_to_csv(rows, str(log_file))
+
+    lines = log_file.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 4
+    assert lines[3].startswith("2025-12-09,Stadt2,2,")
+
+
+def test_main_outputs_jsonl_and_logs_in_one_pass(tmp_path: Path, capfd):
+    """
+    Test 14: --format jsonl gibt ein JSON-Objekt pro Zeile aus.
+    Gleichzeitig wird (im selben Durchlauf) in die Logdatei geschrieben;
+    CRLF-Zeilenenden und Header-Varianten (wind, rain) werden normalisiert.
+    """
+    csv_file = tmp_path / "sample.csv"
+    csv_file.write_bytes(
+        "date,city,temp,wind,rain\r\n2025-12-09,Berlin,5,3.5,0.2\r\n2025-12-10,München,6,,\r\n".encode("utf-8")
+    )
+    log_file = tmp_path / "log.csv"
+
+    rc = main(["--file", str(csv_file), "--format", "jsonl", "--log", str(log_file)])
+    out = capfd.readouterr().out
+
+    assert rc == 0
+    rows = [json.loads(line) for line in out.splitlines()]
+    assert [r["city"] for r in rows] == ["Berlin", "München"]
+    assert rows[0]["wind_speed"] == "3.5"
+    assert rows[0]["precipitation"] == "0.2"
+
+    logged = list(csv.DictReader(io.StringIO(log_file.read_text(encoding="utf-8"))))
+    assert [r["city"] for r in logged] == ["Berlin", "München"]
+
+
+# -----------------------------------------------------------------------------
+# 7) CSVLogWriter (gepuffertes Logging)
+# -----------------------------------------------------------------------------
+
+def test_log_writer_writes_header_into_empty_file(tmp_path: Path):
+    """
+    Test 15: Eine vorhandene, aber LEERE Logdatei bekommt trotzdem einen Header
+    (Header-Erkennung über die Dateigröße, nicht nur über die Existenz).
+    """
+    log_file = tmp_path / "empty.csv"
+    log_file.write_text("", encoding="utf-8")
+
+    with CSVLogWriter(str(log_file), ["date", "city"], batch_size=10) as writer:
+        writer.write({"date": "2025-12-09", "city": "Berlin"})
+        # Noch im Puffer: Batch ist nicht voll
+        assert log_file.read_text(encoding="utf-8") == ""
+
+    lines = log_file.read_text(encoding="utf-8").splitlines()
+    assert lines == ["date,city", "2025-12-09,Berlin"]
+
+
+def test_log_to_csv_rotates_by_size(tmp_path: Path):
+    """
+    Test 16: Mit max_bytes wird rotiert (logged.csv -> logged.1.csv ...),
+    jede Datei hat ihren eigenen Header und bleibt unter der Größengrenze.
+    """
+    log_file = tmp_path / "logged.csv"
+    rows = [{"date": "2025-12-09", "city": f"Stadt{i}", "temp": str(i)} for i in range(100)]
+
+    log_to_csv(rows, str(log_file), batch_size=10, max_bytes=1000, backup_count=2)
+
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert files == ["logged.1.csv", "logged.2.csv", "logged.csv"]
+    for name in files:
+        path = tmp_path / name
+        assert path.stat().st_size <= 1000
+        assert path.read_text(encoding="utf-8").startswith("date,city,temp,")
+
+    # Die neueste Zeile steht in der aktuellen Datei
+    assert "Stadt99" in log_file.read_text(encoding="utf-8")
+
+
+# -----------------------------------------------------------------------------
+# 8) Multi-City-Modus (mehrere Städte, parallel, Reihenfolge bleibt erhalten)
+# -----------------------------------------------------------------------------
+
+def _fake_openweather(monkeypatch, delays: dict):
+    """
+    Patcht http_client.get: Antwortzeit pro Stadt aus 'delays',
+    unbekannte Städte bekommen eine OpenWeather-Fehlerantwort (cod 404).
+    """
+    import time
+    from backend.services import http_client
+
+    def fake_get(url, params=None, timeout=10, **kwargs):
+        city = params["q"]
+        time.sleep(delays.get(city, 0))
+        if city not in delays:
+            return _DummyHTTPResponse(json.dumps({"cod": "404", "message": "city not found"}), 404)
+        return _DummyHTTPResponse(json.dumps({"cod": 200, "name": city, "main": {"temp": 5}}))
+
+    monkeypatch.setattr(http_client, "get", fake_get)
+
+
+def test_split_city_list_keeps_country_codes():
+    """
+    Test 17: Kommaliste wird zerlegt, Ländercodes bleiben an der Stadt ("London,GB").
+    """
+    assert split_city_list("Berlin, London,GB ,Hamburg,") == ["Berlin", "London,GB", "Hamburg"]
+
+
+def test_main_multi_city_keeps_order_and_reports_partial_failure(tmp_path: Path, monkeypatch, capfd):
+    """
+    Test 18: Mehrere Städte (Kommaliste + Datei) werden parallel abgerufen.
+    - Ausgabe in Eingabe-Reihenfolge, obwohl die erste Stadt am langsamsten antwortet
+    - eine unbekannte Stadt -> Fehlermeldung auf stderr, Rest läuft weiter, Exit-Code 8
+    """
+    _fake_openweather(monkeypatch, {"Berlin": 0.2, "Hamburg": 0.1, "Köln": 0.0})
+    cities_file = tmp_path / "cities.txt"
+    cities_file.write_text("# Kommentar\nNirgendwo\n\nKöln\n", encoding="utf-8")
+
+    rc = main([
+        "--ow-city", "Berlin,Hamburg", "--cities-file", str(cities_file),
+        "--ow-key", "DUMMY_KEY", "--format", "jsonl", "--ow-rate", "0",
+    ])
+    captured = capfd.readouterr()
+
+    assert rc == 8
+    assert [json.loads(line)["city"] for line in captured.out.splitlines()] == ["Berlin", "Hamburg", "Köln"]
+    assert "Nirgendwo" in captured.err
+
+
+def test_main_multi_city_all_failed_is_api_error(monkeypatch, capfd):
+    """
+    Test 19: Schlagen ALLE Städte fehl, bleibt es beim API-Fehlercode 3.
+    """
+    _fake_openweather(monkeypatch, {})
+
+    rc = main(["--ow-city", "Atlantis,Nirgendwo", "--ow-key", "DUMMY_KEY"])
+    err = capfd.readouterr().err
+
+    assert rc == 3
+    assert "Atlantis" in err and "Nirgendwo" in err
+
+
+# -----------------------------------------------------------------------------
+# 9) Spaltenformate (Feather/Parquet, optional pyarrow)
+# -----------------------------------------------------------------------------
+
+@pytest.mark.parametrize("ext", ["parquet", "feather"])
+def test_main_convert_to_columnar_and_read_back(tmp_path: Path, capfd, ext):
+    """
+    Test 20: --convert-to wandelt die CSV in ein Spaltenformat um,
+    --file liest es wieder ein -> gleiche JSON-Ausgabe wie aus der CSV.
+    """
+    pytest.importorskip("pyarrow")
+
+    csv_file = tmp_path / "sample.csv"
+    csv_file.write_text(
+        "date,city,temp,description\n2025-12-09,Berlin,5,leicht bewölkt\n2025-12-10,Hamburg,,sonnig\n",
+        encoding="utf-8",
+    )
+    columnar_file = tmp_path / f"sample.{ext}"
+
+    assert main(["--file", str(csv_file), "--convert-to", str(columnar_file), "--quiet"]) == 0
+
+    assert main(["--file", str(csv_file), "--format", "json"]) == 0
+    from_csv = json.loads(capfd.readouterr().out)
+
+    assert main(["--file", str(columnar_file), "--format", "json"]) == 0
+    from_columnar = json.loads(capfd.readouterr().out)
+
+    assert from_columnar == from_csv
@@ -0,0 +1,86 @@
+"""
+tests/conftest.py
+-------------------------------------------------------------------------------
+Gemeinsame Hilfen für die Backend-Tests.
+
+- Projekt-Root in sys.path, damit "from backend.services ..." funktioniert
+  (wie in cli/test_parse_weather.py)
+- clock: austauschbare Uhr für TTL/Ablauf-Tests (kein time.sleep nötig)
+- dashboard: WeatherDashboard mit CSV-Provider, ohne Netzwerk (Geocoder-Attrappe,
+  Koordinaten nur aus dem Speicher), Render-Pool im Thread-Modus, Observations im tmp_path
+-------------------------------------------------------------------------------
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+class FakeClock:
+    """Uhr zum Aufrufen (wie time.time / time.monotonic), die nur per advance() weiterläuft."""
+
+    def __init__(self, start=1_000_000.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+# Koordinaten der Städte aus data/samples/weather_sample.csv, die die Tests benutzen
+TEST_COORDINATES = {
+    "Berlin": (52.52, 13.405),
+    "München": (48.137, 11.575),
+    "London": (51.507, -0.128),
+}
+
+
+class OfflineGeolocator:
+    """Ersetzt Nominatim: kennt keine Stadt (-> negativer Eintrag), zählt Aufrufe."""
+
+    def __init__(self):
+        self.calls = []
+
+    def geocode(self, city):
+        self.calls.append(city)
+        return None
+
+
+@pytest.fixture
+def dashboard(tmp_path, monkeypatch):
+    """WeatherDashboard ohne Netzwerk, Observations in tmp_path, Rendern im Thread-Pool."""
+    from backend.dashboard import WeatherDashboard
+    from backend.provider.csv_weather_provider import CSVWeatherProvider
+    from backend.services.geocode_store import GeocodeStore
+
+    monkeypatch.setenv("OBSERVATION_DIR", str(tmp_path / "observations"))
+    monkeypatch.setenv("RENDER_MODE", "thread")
+    monkeypatch.setenv("RENDER_WORKERS", "2")
+
+    geo_store = GeocodeStore(db_path=":memory:", gazetteer_path=None)
+    for city, (lat, lon) in TEST_COORDINATES.items():
+        geo_store.store(city, lat, lon)
+
+    dashboard = WeatherDashboard(provider=CSVWeatherProvider("weather_sample.csv"), geo_store=geo_store)
+    dashboard.geolocator = OfflineGeolocator()
+
+    # Vorwärmen der Zeitreihen würde Open-Meteo aufrufen (Tests dafür: del dashboard.prefetch_timeseries)
+    dashboard.prefetch_timeseries = lambda city, lat, lon: None
+
+    yield dashboard
+
+    dashboard.stop_poller()
+    dashboard.render_pool.shutdown()
+    geo_store.close()
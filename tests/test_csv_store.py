@@ -0,0 +1,78 @@
+"""
+tests/test_csv_store.py
+-------------------------------------------------------------------------------
+Tests für backend/services/csv_store.py (CSV einmal laden, Index nach Stadt).
+
+Diese Tests prüfen:
+1) Lookup ist unabhängig von Groß-/Kleinschreibung und Leerzeichen, erste Zeile pro Stadt gewinnt
+2) Ergebnis entspricht normalize_weather_data der Rohzeile (wie vorher pro Aufruf)
+3) Datei-Änderung (mtime/Größe) -> automatisch neu laden; fehlende Datei -> None
+4) get_many: Eingabe-Reihenfolge, None für unbekannte Städte
+-------------------------------------------------------------------------------
+"""
+
+import os
+
+import pandas as pd
+
+from backend.services import data_normalizer
+from backend.services.csv_store import CSVWeatherStore
+from backend.services.weather_record import as_dict
+
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "data", "samples", "weather_sample.csv")
+
+CSV = (
+    "CITY,TEMPERATURE,humidity,weatherDescription\n"
+    "Berlin,30,20,klar\n"
+    "Köln,12,80,Regen\n"
+    "berlin,-5,99,Schnee\n"
+)
+
+
+def test_lookup_is_case_insensitive_and_first_row_wins(tmp_path):
+    path = tmp_path / "w.csv"
+    path.write_text(CSV, encoding="utf-8")
+    store = CSVWeatherStore(str(path))
+
+    data = as_dict(store.get("  BERLIN "))
+    assert data["currentTemperature"] == 30.0
+    assert data["humidity"] == 20
+    assert len(store) == 2
+    assert store.get("Hamburg") is None
+
+
+def test_records_match_row_wise_normalizer():
+    """Jede Stadt der Beispieldatei: Store-Ergebnis == normalize_weather_data(erste Rohzeile)."""
+    store = CSVWeatherStore(SAMPLE)
+    df = pd.read_csv(SAMPLE)
+
+    for city in df["CITY"].unique():
+        raw = df[df["CITY"] == city].iloc[0].to_dict()
+        assert as_dict(store.get(city)) == as_dict(data_normalizer.normalize_weather_data(raw)), city
+
+
+def test_reload_after_file_change_and_missing_file(tmp_path):
+    path = tmp_path / "w.csv"
+    path.write_text(CSV, encoding="utf-8")
+    store = CSVWeatherStore(str(path))
+    assert as_dict(store.get("Köln"))["currentTemperature"] == 12.0
+
+    path.write_text(CSV.replace("Köln,12", "Köln,17") + "Bonn,1,2,x\n", encoding="utf-8")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))     # mtime sicher verändert
+
+    assert as_dict(store.get("Köln"))["currentTemperature"] == 17.0
+    assert store.get("Bonn") is not None
+
+    path.unlink()
+    assert store.get("Köln") is None
+
+
+def test_get_many_keeps_order(tmp_path):
+    path = tmp_path / "w.csv"
+    path.write_text(CSV, encoding="utf-8")
+    store = CSVWeatherStore(str(path))
+
+    results = store.get_many(["köln", "Nirgendwo", "Berlin"])
+
+    assert [None if r is None else as_dict(r)["city"] for r in results] == ["Köln", None, "Berlin"]
@@ -0,0 +1,134 @@
+"""
+tests/test_data_normalizer.py
+-------------------------------------------------------------------------------
+Tests für die vorberechneten Extraktoren in data_normalizer.py
+(normalize_weather_data für flache dicts, normalize_openweather für OpenWeather JSON).
+
+Diese Tests prüfen:
+1) Ergebnis identisch mit einer schlichten Referenz (raw.get-"or"-Ketten / pick()
+   direkt über WEATHER_SCHEMA), auch für Typen, Key-Reihenfolge und Defaults
+2) OpenWeather: fehlende / leere Unterobjekte (main, weather, sys, ...) wie bisher
+3) as_record=True liefert dieselben Werte als WeatherRecord
+-------------------------------------------------------------------------------
+"""
+
+import math
+import time
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from backend.services.data_normalizer import (
+    normalize_weather_data, normalize_openweather, pick, _to_str, _to_float, _to_int, _to_bool
+)
+from backend.services.weather_record import WeatherRecord
+from backend.services.weather_schema import WEATHER_SCHEMA
+
+SAMPLE_CSV = Path(__file__).resolve().parents[1] / "data" / "samples" / "weather_sample.csv"
+
+CONVERTERS = {"str": _to_str, "float": _to_float, "int": _to_int, "bool": _to_bool}
+
+
+def reference(raw):
+    """Einzel-Version ohne Vorberechnung: jedes Feld wird direkt aus dem Schema gelesen."""
+    tz = raw.get("timezone", 0)
+    result = {}
+
+    for field in WEATHER_SCHEMA:
+        if field.mode == "pick":
+            value = pick(raw, *field.sources)
+        else:
+            value = None
+            for alias in field.sources:
+                value = raw.get(alias)
+                if value:
+                    break
+
+        if field.kind == "clock":
+            result[field.name] = time.strftime("%H:%M", time.gmtime(value + tz)) if value else field.default
+        else:
+            result[field.name] = CONVERTERS[field.kind](value, field.default)
+
+    return result
+
+
+def flatten_openweather(raw):
+    """Das frühere 'flat_raw' aus dem API-Provider (Referenz für normalize_openweather)."""
+    main = raw.get("main") or {}
+    wind = raw.get("wind") or {}
+    sys_ = raw.get("sys") or {}
+    weather = raw.get("weather") or [{}]
+    return {
+        "city": raw.get("name"), "timezone": raw.get("timezone", 0), "visibility": raw.get("visibility"),
+        "temp": main.get("temp"), "feelsLike": main.get("feels_like"), "tempMin": main.get("temp_min"),
+        "tempMax": main.get("temp_max"), "humidity": main.get("humidity"), "pressure": main.get("pressure"),
+        "weatherDescription": weather[0].get("description"), "clouds": (raw.get("clouds") or {}).get("all"),
+        "wind_speed": wind.get("speed"), "wind_deg": wind.get("deg"), "wind_gust": wind.get("gust"),
+        "sunrise": sys_.get("sunrise"), "sunset": sys_.get("sunset"),
+    }
+
+
+def assert_same(actual, expected):
+    assert list(actual) == list(expected)                   # gleiche Key-Reihenfolge
+    for key, value in expected.items():
+        other = actual[key]
+        assert type(other) is type(value), key
+        assert other == value or (isinstance(value, float) and math.isnan(value) and math.isnan(other)), key
+
+
+FLAT_ROWS = pd.read_csv(SAMPLE_CSV).to_dict("records") + [
+    {"city": " x ", "TEMPERATURE": 0, "temp": "5", "fog": "yes", "rain1h": 0, "rain_1h": 3, "pm2.5": "7"},
+    {"CITY": "", "city": None, "humidity": " 70.5 ", "sunrise": 1769843400, "timezone": 3600},
+    {"weather": "Regen", "description": "", "windGust": 0, "wind_gust": 0.0, "aqi": "2"},
+    {},
+]
+
+OPENWEATHER = [
+    {
+        "name": "Berlin", "timezone": 3600, "visibility": 10000,
+        "main": {"temp": 6.5, "feels_like": 4.1, "temp_min": 5.0, "temp_max": 8.0, "humidity": 81, "pressure": 1012},
+        "weather": [{"description": "leichter Regen"}],
+        "wind": {"speed": 4.12, "deg": 240, "gust": 7.2},
+        "clouds": {"all": 75},
+        "sys": {"sunrise": 1769843400, "sunset": 1769877300},
+    },
+    {"name": "Leer", "main": None, "weather": [], "wind": {}, "sys": {"sunrise": 1769843400}},
+    {"main": {"temp": "3"}, "clouds": {"all": 0}, "timezone": 7200},
+    {},
+]
+
+
+@pytest.mark.parametrize("raw", FLAT_ROWS)
+def test_flat_rows_match_reference(raw):
+    assert_same(normalize_weather_data(raw), reference(raw))
+
+
+@pytest.mark.parametrize("raw", OPENWEATHER)
+def test_openweather_matches_reference(raw):
+    assert_same(normalize_openweather(raw), reference(flatten_openweather(raw)))
+
+
+def test_records_hold_the_same_values():
+    for raw in FLAT_ROWS:
+        record = normalize_weather_data(raw, as_record=True)
+        assert isinstance(record, WeatherRecord)
+        assert_same(record.to_dict(), normalize_weather_data(raw))
+
+    for raw in OPENWEATHER:
+        assert_same(normalize_openweather(raw, as_record=True).to_dict(), normalize_openweather(raw))
+
+
+def test_same_keys_reuse_extractor_with_other_values():
+    first = normalize_weather_data({"city": "Berlin", "temp": 3})
+    second = normalize_weather_data({"city": "Köln", "temp": "4,5"})
+
+    assert (first["city"], first["currentTemperature"]) == ("Berlin", 3.0)
+    assert (second["city"], second["currentTemperature"]) == ("Köln", None)
+
+
+def test_timezone_is_kept_as_utc_offset():
+    assert normalize_openweather({"name": "Berlin", "timezone": 3600})["utcOffset"] == 3600
+    assert normalize_weather_data({"city": "Tokio", "timezone": "32400"})["utcOffset"] == 32400
+    assert normalize_weather_data({"city": "Ohne Zeitzone"})["utcOffset"] == 0
@@ -0,0 +1,182 @@
+"""
+tests/test_downsample.py
+-------------------------------------------------------------------------------
+Tests für backend/services/downsample.py
+
+Diese Tests prüfen:
+1) minmax: höchstens ~2 Punkte pro Bucket, Extremwerte und NaN-Lücken bleiben erhalten
+2) lttb: höchstens 'threshold' Punkte, Endpunkte und Spitzen bleiben, NaN wird übersprungen
+3) Kurze Reihen und method="none" bleiben unverändert, unbekannte Verfahren -> ValueError
+4) downsample_frame_multi: gemeinsame Zeitachse aus der Vereinigung der Indizes
+-------------------------------------------------------------------------------
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services.downsample import (
+    downsample_frame,
+    downsample_frame_multi,
+    downsample_indices,
+    lttb_indices,
+    minmax_indices,
+)
+
+
+def hourly_frame(hours, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "time": pd.date_range("2023-01-01", periods=hours, freq="h"),
+        "temperature_2m": np.sin(np.arange(hours) / 24) * 10 + rng.normal(0, 1, hours),
+        "wind_speed_10m": rng.gamma(2.0, 2.0, hours),
+    })
+
+
+# ========================================
+# MINMAX
+# ========================================
+
+def test_minmax_keeps_global_extremes_and_endpoints():
+    y = np.sin(np.linspace(0, 20, 10_000))
+    y[1234] = 50.0
+    y[8765] = -50.0
+
+    idx = minmax_indices(y, 100)
+
+    assert len(idx) <= 2 * 100 + 2
+    assert {0, 1234, 8765, len(y) - 1} <= set(idx.tolist())
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_minmax_keeps_every_bucket_extreme():
+    y = hourly_frame(5000)["temperature_2m"].to_numpy()
+    buckets = 50
+    size = -(-len(y) // buckets)
+
+    kept = set(minmax_indices(y, buckets).tolist())
+
+    for start in range(0, len(y), size):
+        block = y[start:start + size]
+        assert start + int(block.argmin()) in kept
+        assert start + int(block.argmax()) in kept
+
+
+def test_minmax_keeps_nan_gaps():
+    y = np.arange(1000, dtype=float)
+    y[400:600] = np.nan
+
+    idx = minmax_indices(y, 20)
+
+    assert np.isnan(y[idx]).any()
+
+
+def test_minmax_short_series_unchanged():
+    assert minmax_indices(np.arange(10.0), 5).tolist() == list(range(10))
+
+
+# ========================================
+# LTTB
+# ========================================
+
+def test_lttb_respects_threshold_and_keeps_endpoints():
+    x = np.arange(10_000, dtype=float)
+    y = np.sin(x / 100)
+
+    idx = lttb_indices(x, y, 200)
+
+    assert len(idx) <= 200
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_keeps_single_spike():
+    x = np.arange(5000, dtype=float)
+    y = np.zeros(5000)
+    y[2500] = 100.0
+
+    assert 2500 in lttb_indices(x, y, 100)
+
+
+def test_lttb_skips_nan():
+    x = np.arange(3000, dtype=float)
+    y = np.cos(x / 50)
+    y[1000:1500] = np.nan
+
+    idx = lttb_indices(x, y, 100)
+
+    assert not np.isnan(y[idx]).any()
+    assert len(idx) <= 100
+
+
+def test_lttb_short_series_returns_valid_points():
+    y = np.array([1.0, np.nan, 3.0])
+
+    assert lttb_indices(np.arange(3.0), y, 10).tolist() == [0, 2]
+
+
+# ========================================
+# DATAFRAME
+# ========================================
+
+@pytest.mark.parametrize("method", ["minmax", "lttb"])
+def test_downsample_frame_reduces_to_plot_width(method):
+    df = hourly_frame(8760)
+
+    out = downsample_frame(df, "temperature_2m", 500, method=method)
+
+    assert list(out.columns) == ["time", "temperature_2m"]
+    assert len(out) <= 2 * 500 + 2
+    assert out["time"].is_monotonic_increasing
+    assert out["temperature_2m"].max() == df["temperature_2m"].max()
+
+
+@pytest.mark.parametrize("method", ["minmax", "lttb", "none"])
+def test_short_frame_or_none_method_is_untouched(method):
+    df = hourly_frame(100)
+
+    assert downsample_indices(df, "temperature_2m", 500, method=method) is None
+    assert downsample_frame(df, "temperature_2m", 500, method=method) is df
+
+
+def test_none_method_keeps_long_frame():
+    assert downsample_indices(hourly_frame(5000), "temperature_2m", 500, method="none") is None
+
+
+def test_unknown_method_raises():
+    with pytest.raises(ValueError):
+        downsample_indices(hourly_frame(10), "temperature_2m", 5, method="average")
+
+
+def test_empty_or_missing_inputs_pass_through():
+    df = hourly_frame(10)
+
+    assert downsample_frame(None, "temperature_2m", 5) is None
+    assert downsample_frame(df, "unknown", 5) is df
+    assert downsample_frame_multi(None, ["temperature_2m"], 5) is None
+
+
+def test_multi_uses_union_of_indices_on_one_time_axis():
+    df = hourly_frame(8760)
+    variables = ["temperature_2m", "wind_speed_10m"]
+
+    out = downsample_frame_multi(df, variables + ["unknown"], 300)
+
+    expected = np.union1d(
+        downsample_indices(df, "temperature_2m", 300),
+        downsample_indices(df, "wind_speed_10m", 300),
+    )
+    assert list(out.columns) == ["time"] + variables
+    assert out.index.tolist() == expected.tolist()
+    for var in variables:
+        assert out[var].max() == df[var].max()
+        assert out[var].min() == df[var].min()
+
+
+def test_multi_short_frame_only_selects_columns():
+    df = hourly_frame(50)
+
+    out = downsample_frame_multi(df, ["wind_speed_10m"], 300)
+
+    assert list(out.columns) == ["time", "wind_speed_10m"]
+    assert len(out) == 50
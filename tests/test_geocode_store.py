@@ -0,0 +1,72 @@
+"""
+tests/test_geocode_store.py
+-------------------------------------------------------------------------------
+Tests für backend/services/geocode_store.py (SQLite ":memory:", ohne Gazetteer).
+
+Diese Tests prüfen:
+1) Treffer aus dem Memo frischen last_used in der Datenbank auf (gedrosselt)
+   -> meistbenutzte Städte werden NICHT zuerst verdrängt
+2) Abgelaufene Einträge werden auch aus dem Memo nicht mehr geliefert
+3) Negative Einträge (NOT_FOUND) laufen nach der TTL ab
+-------------------------------------------------------------------------------
+"""
+
+from backend.services.geocode_store import GeocodeStore, NOT_FOUND
+
+
+def make_store(clock, **kwargs):
+    return GeocodeStore(db_path=":memory:", gazetteer_path=None, clock=clock, **kwargs)
+
+
+def last_used(store, key):
+    (value,) = store._conn.execute("SELECT last_used FROM geocode WHERE city_key = ?", (key,)).fetchone()
+    return value
+
+
+def test_memo_hits_refresh_last_used_and_protect_from_eviction(clock):
+    """
+    Berlin wird ständig benutzt (nur Memo-Treffer), London nie wieder.
+    Erwartung: last_used von Berlin wandert mit, beim Überlauf fliegt London raus.
+    """
+    store = make_store(clock, max_entries=2, touch_interval=60)
+
+    store.store("Berlin", 52.52, 13.40)
+    clock.advance(1)
+    store.store("London", 51.50, -0.12)
+
+    clock.advance(30)
+    assert store.lookup("Berlin") == (52.52, 13.40)
+    assert last_used(store, "berlin") == clock.now - 31     # gedrosselt: noch kein Schreibzugriff
+
+    clock.advance(60)
+    assert store.lookup("Berlin") == (52.52, 13.40)
+    assert last_used(store, "berlin") == clock.now
+
+    store.store("Paris", 48.85, 2.35)                       # Überlauf -> ältester Eintrag raus
+
+    assert store.lookup("London") is None
+    assert store.lookup("Berlin") == (52.52, 13.40)
+
+
+def test_memo_respects_expiry(clock):
+    """Ein Eintrag mit Ablaufzeit wird nach Ablauf weder aus dem Memo noch aus der DB geliefert."""
+    store = make_store(clock)
+
+    store._upsert("hamburg", 53.55, 9.99, "geocoder", clock.now + 100)
+    assert store.lookup("Hamburg") == (53.55, 9.99)         # landet im Memo (mit Ablaufzeit)
+
+    clock.advance(101)
+    assert store.lookup("Hamburg") is None
+    assert "hamburg" not in store._memo
+
+
+def test_negative_entry_expires(clock):
+    """NOT_FOUND gilt nur für negative_ttl Sekunden, ein negativer Eintrag verdrängt das Memo."""
+    store = make_store(clock, negative_ttl=10)
+
+    store.store("Atlantis", 1.0, 2.0)
+    store.store_negative("Atlantis")
+    assert store.lookup("Atlantis") == NOT_FOUND
+
+    clock.advance(11)
+    assert store.lookup("Atlantis") is None
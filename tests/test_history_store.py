@@ -0,0 +1,220 @@
+"""
+tests/test_history_store.py
+-------------------------------------------------------------------------------
+Tests für backend/services/history/history_store.py (SQLite in ":memory:",
+Download durch eine Attrappe ersetzt, Uhr über die clock-Fixture).
+
+Diese Tests prüfen:
+1) Erneute / erweiterte Anfragen laden nur die fehlenden Tage (die Differenz)
+2) Lücken mit höchstens merge_gap_days vorhandenen Tagen dazwischen -> EIN Download
+3) Teilweise / null-Tage und "heute" gelten nur recent_ttl lang als vorhanden
+4) Fehlgeschlagene Downloads werden nicht gemerkt, Ergebnis auf vollem Stundenraster
+-------------------------------------------------------------------------------
+"""
+
+from datetime import date, datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services.history.history_store import HISTORY_COLUMNS, HistoryStore
+
+LAT, LON = 52.52, 13.405
+
+# "Jetzt" für alle Tests: 01.03.2024 12:00 UTC -> Tage bis 29.02. liegen in der Vergangenheit
+NOW = datetime(2024, 3, 1, 12, tzinfo=timezone.utc).timestamp()
+
+
+class StubFetch:
+    """Ersetzt fetch_openmeteo_history_dataframe: Stundenwerte für [start, end], Aufrufe werden protokolliert."""
+
+    def __init__(self, null_days=(), fail=False):
+        self.null_days = set(null_days)
+        self.fail = fail
+        self.calls = []
+
+    def __call__(self, lat, lon, start_date, end_date):
+        self.calls.append((start_date, end_date))
+        if self.fail:
+            return None
+
+        times = pd.date_range(start_date, f"{end_date} 23:00", freq="h", tz="UTC")
+        temperature = np.arange(len(times), dtype=float)
+        temperature[times.strftime("%Y-%m-%d").isin(self.null_days)] = np.nan
+
+        return pd.DataFrame({
+            "time": times,
+            "temperature_2m": temperature,
+            "relative_humidity_2m": 50.0,
+            "wind_speed_10m": 3.0,
+        })
+
+
+@pytest.fixture
+def fetch():
+    return StubFetch()
+
+
+@pytest.fixture
+def store(fetch, clock):
+    clock.now = NOW
+    history_store = HistoryStore(":memory:", recent_ttl=3600, merge_gap_days=2, fetch=fetch, clock=clock)
+    yield history_store
+    history_store.close()
+
+
+# ========================================
+# NUR DIE DIFFERENZ LADEN
+# ========================================
+
+def test_repeated_request_is_served_from_store(store, fetch):
+    first = store.get_range(LAT, LON, "2024-01-01", "2024-01-07")
+    second = store.get_range(LAT, LON, "2024-01-01", "2024-01-07")
+
+    assert fetch.calls == [("2024-01-01", "2024-01-07")]
+    assert store.stats() == {"hours": 7 * 24, "days": 7, "downloads": 1}
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_widened_range_downloads_only_the_difference(store, fetch):
+    store.get_range(LAT, LON, "2024-01-08", "2024-01-14")
+    fetch.calls.clear()
+
+    df = store.get_range(LAT, LON, "2024-01-01", "2024-01-21")
+
+    assert fetch.calls == [("2024-01-01", "2024-01-07"), ("2024-01-15", "2024-01-21")]
+    assert len(df) == 21 * 24
+    assert df["temperature_2m"].notna().all()
+
+
+def test_locations_are_stored_separately(store, fetch):
+    store.get_range(LAT, LON, "2024-01-01", "2024-01-02")
+    store.get_range(48.137, 11.575, "2024-01-01", "2024-01-02")
+
+    assert len(fetch.calls) == 2
+
+
+# ========================================
+# LÜCKEN ZUSAMMENFASSEN
+# ========================================
+
+def test_gaps_separated_by_few_present_days_are_merged(store):
+    # vorhanden: 03.–04.01. (2 Tage <= merge_gap_days) -> beide Lücken in einem Request
+    store.get_range(LAT, LON, "2024-01-03", "2024-01-04")
+
+    assert store.missing_ranges(LAT, LON, date(2024, 1, 1), date(2024, 1, 6)) == [
+        (date(2024, 1, 1), date(2024, 1, 6))
+    ]
+
+
+def test_gaps_separated_by_many_present_days_stay_separate(store):
+    # vorhanden: 03.–05.01. (3 Tage > merge_gap_days) -> zwei Requests
+    store.get_range(LAT, LON, "2024-01-03", "2024-01-05")
+
+    assert store.missing_ranges(LAT, LON, date(2024, 1, 1), date(2024, 1, 7)) == [
+        (date(2024, 1, 1), date(2024, 1, 2)),
+        (date(2024, 1, 6), date(2024, 1, 7)),
+    ]
+
+
+def test_merged_gap_is_fetched_in_one_download(store, fetch):
+    store.get_range(LAT, LON, "2024-01-03", "2024-01-04")
+    fetch.calls.clear()
+
+    store.get_range(LAT, LON, "2024-01-01", "2024-01-06")
+
+    assert fetch.calls == [("2024-01-01", "2024-01-06")]
+
+
+def test_merge_gap_zero_never_refetches_present_days(fetch, clock):
+    clock.now = NOW
+    store = HistoryStore(":memory:", merge_gap_days=0, fetch=fetch, clock=clock)
+    store.get_range(LAT, LON, "2024-01-03", "2024-01-03")
+
+    assert store.missing_ranges(LAT, LON, date(2024, 1, 1), date(2024, 1, 5)) == [
+        (date(2024, 1, 1), date(2024, 1, 2)),
+        (date(2024, 1, 4), date(2024, 1, 5)),
+    ]
+    store.close()
+
+
+# ========================================
+# TEILWEISE TAGE / RECENT_TTL
+# ========================================
+
+def test_day_with_null_values_expires_after_recent_ttl(fetch, clock):
+    clock.now = NOW
+    fetch.null_days = {"2024-01-02"}
+    store = HistoryStore(":memory:", recent_ttl=3600, merge_gap_days=0, fetch=fetch, clock=clock)
+
+    store.get_range(LAT, LON, "2024-01-01", "2024-01-03")
+    clock.advance(3599)
+    store.get_range(LAT, LON, "2024-01-01", "2024-01-03")
+    assert len(fetch.calls) == 1
+
+    # nur der unvollständige Tag wird neu geladen, die vollständigen Nachbartage bleiben
+    clock.advance(2)
+    fetch.null_days = set()
+    df = store.get_range(LAT, LON, "2024-01-01", "2024-01-03")
+
+    assert fetch.calls[1:] == [("2024-01-02", "2024-01-02")]
+    assert df["temperature_2m"].notna().all()
+
+    # jetzt vollständig -> kein Ablauf mehr
+    clock.advance(10 * 3600)
+    store.get_range(LAT, LON, "2024-01-01", "2024-01-03")
+    assert len(fetch.calls) == 2
+    store.close()
+
+
+def test_today_is_never_complete(store, fetch, clock):
+    store.get_range(LAT, LON, "2024-02-29", "2024-03-01")
+    clock.advance(3601)
+    store.get_range(LAT, LON, "2024-02-29", "2024-03-01")
+
+    assert fetch.calls == [("2024-02-29", "2024-03-01"), ("2024-03-01", "2024-03-01")]
+
+
+def test_missing_hours_make_a_day_incomplete(store, clock):
+    def fetch_short_day(lat, lon, start_date, end_date):
+        return StubFetch()(lat, lon, start_date, end_date).iloc[:-1]
+
+    store.fetch = fetch_short_day
+    store.get_range(LAT, LON, "2024-01-01", "2024-01-01")
+    clock.advance(3601)
+
+    assert store.missing_ranges(LAT, LON, date(2024, 1, 1), date(2024, 1, 1)) == [
+        (date(2024, 1, 1), date(2024, 1, 1))
+    ]
+
+
+# ========================================
+# FEHLER / ERGEBNIS
+# ========================================
+
+def test_failed_download_is_not_recorded(store, fetch):
+    fetch.fail = True
+
+    assert store.get_range(LAT, LON, "2024-01-01", "2024-01-02") is None
+    assert store.stats() == {"hours": 0, "days": 0, "downloads": 1}
+
+    fetch.fail = False
+    df = store.get_range(LAT, LON, "2024-01-01", "2024-01-02")
+
+    assert fetch.calls == [("2024-01-01", "2024-01-02")] * 2
+    assert len(df) == 48
+
+
+def test_result_is_on_full_hourly_grid(store):
+    df = store.get_range(LAT, LON, "2024-01-01", "2024-01-02")
+
+    assert list(df.columns) == ["time", *HISTORY_COLUMNS]
+    assert df["time"].is_monotonic_increasing
+    assert df["time"].diff().dropna().eq(pd.Timedelta(hours=1)).all()
+    assert df["temperature_2m"].tolist() == [float(i) for i in range(48)]
+
+
+def test_missing_coordinates_return_none(store, fetch):
+    assert store.get_range(None, LON, "2024-01-01", "2024-01-02") is None
+    assert fetch.calls == []
@@ -0,0 +1,75 @@
+"""
+tests/test_http_client.py
+-------------------------------------------------------------------------------
+Tests für backend/services/http_client.py und den Start der CLI.
+
+Diese Tests prüfen:
+1) Dashboard-Aufrufe (get_interactive) haben ein knappes Zeitbudget:
+   wenige Retries, kurzer Connect-Timeout, kein Warten auf Retry-After
+2) worst_case_latency rechnet die dokumentierten Obergrenzen nach
+3) "python cli.py" funktioniert auch direkt aus dem Ordner cli/ (Importpfad)
+-------------------------------------------------------------------------------
+"""
+
+import subprocess
+import sys
+
+from pathlib import Path
+
+import pytest
+
+from backend.services import http_client
+
+CLI_DIR = Path(__file__).resolve().parents[1] / "cli"
+
+
+@pytest.fixture(autouse=True)
+def fresh_sessions():
+    http_client.close_session()
+    yield
+    http_client.close_session()
+
+
+def retry_of(session):
+    return session.get_adapter("https://api.open-meteo.com").max_retries
+
+
+def test_interactive_session_has_tight_retry_budget():
+    interactive = retry_of(http_client.get_interactive_session())
+    default = retry_of(http_client.get_session())
+
+    assert interactive.total == http_client.INTERACTIVE_RETRIES == 1
+    assert interactive.respect_retry_after_header is False
+    assert default.respect_retry_after_header is True
+    assert http_client.get_interactive_session() is not http_client.get_session()
+
+
+def test_get_interactive_uses_short_timeouts(monkeypatch):
+    seen = {}
+
+    def fake_get(url, params=None, timeout=None, **kwargs):
+        seen.update(url=url, params=params, timeout=timeout)
+        return "response"
+
+    monkeypatch.setattr(http_client.get_interactive_session(), "get", fake_get)
+
+    assert http_client.get_interactive("https://example.org", params={"q": "Berlin"}) == "response"
+    assert seen["timeout"] == http_client.INTERACTIVE_TIMEOUT == (3.05, 5.0)
+
+
+def test_worst_case_latency_matches_documentation():
+    # CLI/Batch: 4 Versuche x (10s + 10s) + Backoff 0s, 1s, 2s
+    assert http_client.worst_case_latency(http_client.DEFAULT_TIMEOUT, 3, 0.5) == 83.0
+    # Dashboard: 2 Versuche x (3.05s + 5s), kein Backoff vor dem ersten Retry
+    assert http_client.worst_case_latency(http_client.INTERACTIVE_TIMEOUT, 1, 0.5) == pytest.approx(16.1)
+    assert http_client.worst_case_latency(http_client.INTERACTIVE_TIMEOUT, 1, 0.5) < 20
+
+
+def test_cli_runs_from_its_own_folder():
+    result = subprocess.run(
+        [sys.executable, "cli.py", "--file", "sample.csv", "--format", "jsonl"],
+        cwd=CLI_DIR, capture_output=True, text=True, timeout=60
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert '"city": "Berlin"' in result.stdout
@@ -0,0 +1,125 @@
+"""
+tests/test_load_city.py
+-------------------------------------------------------------------------------
+Tests für WeatherDashboard.load_city (Stadtwechsel mit asyncio).
+
+Diese Tests prüfen:
+1) Wetter (Provider) und Koordinaten (Geocoding) werden GLEICHZEITIG geladen
+2) Der Stadtwechsel wartet NICHT auf das Vorwärmen von History + Forecast
+3) Kein Vorwärmen für unbekannte Städte (Berlin-Fallback) oder ohne Wetterdaten
+4) Fehler beim Vorwärmen werden nur geloggt
+-------------------------------------------------------------------------------
+"""
+
+import threading
+import time
+
+from backend.dashboard import DEFAULT_COORDINATES
+
+
+class SlowProvider:
+    def __init__(self, provider, delay):
+        self.provider = provider
+        self.delay = delay
+
+    def get_weather_for_city(self, city):
+        time.sleep(self.delay)
+        return self.provider.get_weather_for_city(city)
+
+
+class BlockingTimeseries:
+    """Ersetzt die Timeseries-Methoden: blockiert bis release, merkt sich die Aufrufe."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = []
+        self.release = threading.Event()
+        self.finished = threading.Event()
+
+    def history(self, lat, lon, start_date, end_date):
+        return self._call("history", lat, lon)
+
+    def forecast(self, lat, lon, days=7):
+        return self._call("forecast", lat, lon)
+
+    def _call(self, kind, lat, lon):
+        self.calls.append((kind, lat, lon))
+        self.release.wait(timeout=5)
+        if len(self.calls) == 2:
+            self.finished.set()
+        if self.error is not None:
+            raise self.error
+        return None
+
+
+def enable_prefetch(dashboard, error=None):
+    """Echtes prefetch_timeseries (statt der Attrappe aus conftest) gegen blockierende Downloads."""
+    del dashboard.prefetch_timeseries
+    stub = BlockingTimeseries(error)
+    dashboard.timeseries_cache.get_history = stub.history
+    dashboard.timeseries_cache.get_forecast = stub.forecast
+    return stub
+
+
+def test_weather_and_coordinates_load_concurrently(dashboard):
+    dashboard.provider = SlowProvider(dashboard.provider, delay=0.3)
+    lookup = dashboard.lookup_coordinates
+    dashboard.lookup_coordinates = lambda city: (time.sleep(0.3), lookup(city))[1]
+
+    start = time.perf_counter()
+    data, coordinates = dashboard.load_city("London")
+    elapsed = time.perf_counter() - start
+
+    assert data["city"] == "London"
+    assert coordinates == (51.507, -0.128)
+    assert elapsed < 0.55                               # ≈ max(0.3, 0.3) statt 0.6
+
+
+def test_city_switch_does_not_wait_for_prefetch(dashboard):
+    stub = enable_prefetch(dashboard)
+
+    start = time.perf_counter()
+    data, coordinates = dashboard.load_city("München")
+    elapsed = time.perf_counter() - start
+
+    assert data is not None and coordinates == (48.137, 11.575)
+    assert elapsed < 1.0 and not stub.finished.is_set()
+
+    stub.release.set()
+    assert stub.finished.wait(timeout=5)
+    assert sorted(stub.calls) == [("forecast", 48.137, 11.575), ("history", 48.137, 11.575)]
+
+
+def test_unknown_city_falls_back_to_berlin_without_prefetch(dashboard):
+    stub = enable_prefetch(dashboard)
+    stub.release.set()
+
+    data, coordinates = dashboard.load_city("Atlantis")
+
+    assert data is None
+    assert coordinates == DEFAULT_COORDINATES
+    assert dashboard.geolocator.calls == ["Atlantis"]
+    time.sleep(0.1)
+    assert stub.calls == []
+
+
+def test_no_prefetch_without_weather_data(dashboard):
+    stub = enable_prefetch(dashboard)
+    stub.release.set()
+    dashboard.geo_store.store("Paris", 48.857, 2.352)   # Koordinaten bekannt, aber nicht in der CSV
+
+    data, coordinates = dashboard.load_city("Paris")
+
+    assert data is None and coordinates == (48.857, 2.352)
+    time.sleep(0.1)
+    assert stub.calls == []
+
+
+def test_prefetch_errors_are_only_logged(dashboard, caplog):
+    stub = enable_prefetch(dashboard, error=RuntimeError("Open-Meteo down"))
+    stub.release.set()
+
+    dashboard.prefetch_timeseries("Berlin", 52.52, 13.405)
+
+    assert len(stub.calls) == 2
+    assert "nicht vorgeladen" in caplog.text
@@ -0,0 +1,108 @@
+"""
+tests/test_map_view.py
+-------------------------------------------------------------------------------
+Tests für backend/services/map_view.py und die Routen /map + /map/state.
+
+Diese Tests prüfen:
+1) /map: EINE statische Leaflet-Seite für alle Clients, ETag -> 304
+2) /map/state: Stadt, Koordinaten und Temperatur des anfragenden Clients, 400 ohne Stadt
+3) Stadtwechsel per Socket.IO: 'update' enthält lat/lon/Temperatur, /map/state folgt,
+   es wird keine Karten-Datei geschrieben
+-------------------------------------------------------------------------------
+"""
+
+from pathlib import Path
+
+from backend.services.map_view import LEAFLET_VERSION, TILE_URL, map_state, shell_context
+
+STATIC_MAP_FILE = Path(__file__).resolve().parents[1] / "weather_dashboard" / "static" / "map" / "map.html"
+
+
+def connect(dashboard):
+    """(HTTP-Client, Socket.IO-Client) mit gemeinsamem Session-Cookie = ein Browser."""
+    http = dashboard.app.test_client()
+    http.get("/weather")                                # vergibt die client_id (Cookie)
+    socket = dashboard.socketio.test_client(dashboard.app, flask_test_client=http)
+    return http, socket
+
+
+# ========================================
+# MAP_VIEW
+# ========================================
+
+def test_map_state_defaults_missing_temperature():
+    assert map_state("Berlin", 52.52, 13.405, None) == {"city": "Berlin", "lat": 52.52, "lon": 13.405, "temp": "--"}
+    assert map_state("Berlin", 52.52, 13.405, 21)["temp"] == 21
+
+
+def test_shell_context_is_client_independent():
+    assert shell_context() == shell_context()
+    assert shell_context()["leaflet_version"] == LEAFLET_VERSION
+
+
+# ========================================
+# /map
+# ========================================
+
+def test_map_page_is_static_leaflet_shell(dashboard):
+    client = dashboard.app.test_client()
+
+    response = client.get("/map")
+    html = response.get_data(as_text=True)
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/html"
+    assert f"leaflet@{LEAFLET_VERSION}" in html
+    assert TILE_URL in html
+    assert "/map/state" in html
+
+
+def test_map_page_is_same_for_all_clients_and_answers_304(dashboard):
+    dashboard.initialize("Berlin")
+    http_a, socket_a = connect(dashboard)
+    http_b, _socket_b = connect(dashboard)
+    socket_a.emit("cityInput", {"city": "London"})
+
+    page_a = http_a.get("/map")
+    page_b = http_b.get("/map")
+    again = http_a.get("/map", headers={"If-None-Match": page_a.headers["ETag"]})
+
+    assert page_a.data == page_b.data
+    assert page_a.headers["ETag"] == page_b.headers["ETag"]
+    assert again.status_code == 304
+    assert again.data == b""
+
+
+# ========================================
+# /map/state
+# ========================================
+
+def test_map_state_without_city_answers_400(dashboard):
+    response = dashboard.app.test_client().get("/map/state")
+
+    assert response.status_code == 400
+    assert response.get_json()["city"] is None
+
+
+def test_map_state_returns_client_city(dashboard):
+    dashboard.initialize("Berlin")
+
+    payload = dashboard.app.test_client().get("/map/state").get_json()
+
+    assert (payload["city"], payload["lat"], payload["lon"]) == ("Berlin", *dashboard.fetch_coordinates("Berlin"))
+    assert payload["lat"] is not None and payload["lon"] is not None
+    assert payload["temp"] == dashboard.weather_data.get("currentTemperature", "--")
+
+
+def test_city_switch_updates_map_state_without_writing_a_file(dashboard):
+    dashboard.initialize("Berlin")
+    http, socket = connect(dashboard)
+
+    socket.emit("cityInput", {"city": "München"})
+    update = [event for event in socket.get_received() if event["name"] == "update"][-1]["args"][0]
+    state = http.get("/map/state").get_json()
+
+    # Das Dashboard reicht genau diese Felder per postMessage an die Karte weiter
+    assert (update["city"], update["lat"], update["lon"]) == ("München", *dashboard.fetch_coordinates("München"))
+    assert (state["city"], state["lat"], state["lon"]) == ("München", *dashboard.fetch_coordinates("München"))
+    assert not STATIC_MAP_FILE.exists()
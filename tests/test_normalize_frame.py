@@ -0,0 +1,100 @@
+"""
+tests/test_normalize_frame.py
+-------------------------------------------------------------------------------
+Tests für data_normalizer.normalize_weather_frame (spaltenweise Normalisierung).
+
+Diese Tests prüfen:
+1) Ergebnis Zeile für Zeile identisch mit normalize_weather_data (Sample-CSV mit Lücken)
+2) Alias-Regeln: "or" (erster truthy Wert, sonst der letzte) und "pick" (0 zählt)
+3) Text-/Misch-Spalten, fehlende Spalten und Sonnenauf-/untergang mit Zeitzone
+-------------------------------------------------------------------------------
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from backend.services.data_normalizer import (
+    normalize_weather_data, normalize_weather_frame, frame_to_records, _records_equal
+)
+
+SAMPLE_CSV = Path(__file__).resolve().parents[1] / "data" / "samples" / "weather_sample.csv"
+
+
+def per_row(df):
+    return [normalize_weather_data(row) for row in df.to_dict("records")]
+
+
+def assert_equivalent(df):
+    expected = per_row(df)
+    actual = frame_to_records(normalize_weather_frame(df))
+    assert _records_equal(expected, actual), (expected, actual)
+    return actual
+
+
+def test_sample_csv_with_gaps_matches_per_row():
+    sample = pd.read_csv(SAMPLE_CSV)
+    df = pd.concat([sample] * 5, ignore_index=True)
+    df.loc[df.index % 3 == 0, "windGust"] = np.nan
+    df.loc[df.index % 4 == 0, "humidity"] = np.nan
+    df.loc[df.index % 5 == 0, "cloudCoverage"] = 0
+
+    assert_equivalent(df)
+
+
+def test_or_and_pick_alias_rules():
+    df = pd.DataFrame({
+        "CITY": ["Berlin", "", None],
+        "city": ["x", "Köln", None],
+        "TEMPERATURE": [0.0, 12.5, np.nan],
+        "temp": [7.0, 1.0, 3.0],
+        "rain1h": [0.0, np.nan, 0.4],
+        "rain_1h": [9.0, 9.0, 9.0],
+    })
+
+    records = assert_equivalent(df)
+
+    assert [r["city"] for r in records] == ["Berlin", "Köln", "Unbekannt"]
+    assert records[0]["currentTemperature"] == 7.0          # 0.0 ist nicht truthy -> nächster Alias
+    assert records[0]["rain1h"] == 0.0                      # pick: 0 zählt
+    assert records[2]["rain1h"] == 0.4
+
+
+def test_text_columns_and_missing_values():
+    df = pd.DataFrame({
+        "city": ["  München ", "Hamburg", "Bonn", "Ulm"],
+        "humidity": ["81", " 70.9 ", "", "feucht"],
+        "pressure": [1012, None, "1000", 990.7],
+        "fog": ["yes", "0", None, 1],
+        "weather": [None, "Regen", " ", "Sonnig"],
+    })
+
+    records = assert_equivalent(df)
+
+    assert records[0]["city"] == "München"
+    assert [r["humidity"] for r in records] == [81, 70, None, None]
+    assert [r["fog"] for r in records] == [True, False, False, True]
+    assert records[0]["windSpeed"] is None and records[0]["pressureTrend"] == "--"
+
+
+def test_sunrise_with_timezone_and_defaults():
+    df = pd.DataFrame({
+        "city": ["Berlin", "Tokio", "Nirgendwo"],
+        "sunrise": [1769843400, 1769843400, 0],
+        "sunset": [1769877300, 1769877300, 0],
+        "timezone": [3600, 32400, 0],
+    })
+
+    records = assert_equivalent(df)
+
+    assert (records[0]["sunrise"], records[0]["sunset"]) == ("08:10", "17:35")
+    assert records[1]["sunrise"] == "16:10"
+    assert (records[2]["sunrise"], records[2]["sunset"]) == ("08:00", "18:30")
+
+
+def test_empty_frame_keeps_schema_columns():
+    frame = normalize_weather_frame(pd.DataFrame({"city": []}))
+
+    assert len(frame) == 0
+    assert "currentTemperature" in frame.columns and "fog" in frame.columns
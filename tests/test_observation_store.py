@@ -0,0 +1,147 @@
+"""
+tests/test_observation_store.py
+-------------------------------------------------------------------------------
+Tests für backend/services/observation_store.py (append-only mmap-Zeitreihe pro Stadt).
+
+Diese Tests prüfen:
+1) append: Mindestabstand, nur aufsteigende Zeitstempel, ungültige Werte -> NaN
+2) Ein halb geschriebener Satz am Dateiende wird abgeschnitten, eine fremde Datei beiseitegelegt
+3) query: Zeitfenster start <= ts < end als View auf die Datei (keine Kopie)
+4) hourly_history: letzter Wert pro Stunde, Stunden in Ortszeit (utc_offset)
+-------------------------------------------------------------------------------
+"""
+
+import math
+import os
+
+import numpy as np
+import pytest
+
+from backend.services.observation_store import ObservationStore, OBSERVATION_DTYPE
+
+T0 = 1_700_000_000 - 1_700_000_000 % 86400      # 00:00 UTC
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ObservationStore(directory=str(tmp_path), min_interval=60)
+
+
+def reading(temperature, humidity=80):
+    return {"currentTemperature": temperature, "humidity": humidity, "pressure": 1012, "windSpeed": 3.5}
+
+
+# ========================================
+# SCHREIBEN
+# ========================================
+
+def test_append_respects_min_interval_and_order(store):
+    assert store.append("Berlin", reading(1.0), ts=T0)
+    assert not store.append("Berlin", reading(2.0), ts=T0 + 30)        # zu kurzer Abstand
+    assert not store.append("Berlin", reading(3.0), ts=T0 - 600)       # älter als der letzte Satz
+    assert store.append("berlin ", reading(4.0), ts=T0 + 60)           # gleicher city_key
+
+    series = store.query("Berlin")
+    assert series["ts"].tolist() == [T0, T0 + 60]
+    assert series["currentTemperature"].tolist() == [1.0, 4.0]
+    assert len(store) == 1
+
+
+def test_invalid_values_are_stored_as_nan(store):
+    store.append("Köln", {"currentTemperature": "n/a", "humidity": None, "pressure": True}, ts=T0)
+
+    (record,) = store.query("Köln")
+    assert all(math.isnan(record[name]) for name in ("currentTemperature", "humidity", "pressure", "windSpeed"))
+
+
+def test_append_many_skips_out_of_order_records(store):
+    records = np.zeros(4, dtype=OBSERVATION_DTYPE)
+    records["ts"] = [T0, T0 + 3600, T0 + 1800, T0 + 7200]
+    records["currentTemperature"] = [1, 2, 3, 4]
+
+    assert store.append_many("Bonn", records) == 3
+    assert store.query("Bonn")["currentTemperature"].tolist() == [1.0, 2.0, 4.0]
+
+
+def test_partial_record_at_end_is_truncated(tmp_path, store):
+    store.append("Ulm", reading(1.0), ts=T0)
+    store.append("Ulm", reading(2.0), ts=T0 + 60)
+
+    path = store.path_for("Ulm")
+    with open(path, "ab") as fh:
+        fh.write(b"\x01" * (OBSERVATION_DTYPE.itemsize // 2))          # Absturz mitten im Satz
+
+    reopened = ObservationStore(directory=str(tmp_path), min_interval=60)
+    assert len(reopened.query("Ulm")) == 2                              # Lesen ignoriert den Rest
+
+    assert reopened.append("Ulm", reading(3.0), ts=T0 + 120)
+    assert reopened.query("Ulm")["currentTemperature"].tolist() == [1.0, 2.0, 3.0]
+    assert (os.path.getsize(path) - 16) % OBSERVATION_DTYPE.itemsize == 0
+
+
+def test_foreign_file_is_moved_aside(tmp_path, store):
+    path = store.path_for("Rom")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as fh:
+        fh.write(b"kein Observation-Format")
+
+    assert store.append("Rom", reading(20.0), ts=T0)
+    assert os.path.exists(f"{path}.bad")
+    assert store.query("Rom")["currentTemperature"].tolist() == [20.0]
+
+
+# ========================================
+# LESEN
+# ========================================
+
+def test_query_windows_are_half_open_views(store):
+    for i in range(10):
+        store.append("Wien", reading(float(i)), ts=T0 + i * 600)
+
+    window = store.query("Wien", start=T0 + 1200, end=T0 + 3000)
+
+    assert window["ts"].tolist() == [T0 + 1200, T0 + 1800, T0 + 2400]
+    assert np.shares_memory(window, store.query("Wien"))
+    assert len(store.query("Wien", start=T0 + 6000)) == 0
+    assert len(store.query("Wien", end=T0)) == 0
+    assert len(store.query("Unbekannt")) == 0
+
+
+def test_hourly_history_keeps_last_value_per_hour(store):
+    store.append("Paris", reading(1.0), ts=T0 + 10 * 3600 + 60)
+    store.append("Paris", reading(2.0), ts=T0 + 10 * 3600 + 3000)      # letzter Wert 10 Uhr
+    store.append("Paris", reading(3.0, humidity=None), ts=T0 + 11 * 3600 + 60)
+
+    history = store.hourly_history("Paris", hours=24, now=T0 + 12 * 3600)
+
+    assert history["currentTemperature_history"] == [{"hr": 10, "value": 2.0}, {"hr": 11, "value": 3.0}]
+    assert history["humidity_history"] == [{"hr": 10, "value": 80.0}]  # NaN ausgelassen
+    assert store.hourly_history("Paris", hours=1, now=T0 + 12 * 3600)["currentTemperature_history"] == [
+        {"hr": 11, "value": 3.0}
+    ]
+
+
+def test_hourly_history_uses_local_hours(store):
+    store.append("Tokio", reading(1.0), ts=T0 + 23 * 3600 + 60)        # 23:01 UTC
+    store.append("Tokio", reading(2.0), ts=T0 + 23 * 3600 + 2400)      # 23:40 UTC
+
+    now = T0 + 24 * 3600
+    utc = store.hourly_history("Tokio", now=now)["currentTemperature_history"]
+    tokyo = store.hourly_history("Tokio", now=now, utc_offset=9 * 3600)["currentTemperature_history"]
+    india = store.hourly_history("Tokio", now=now, utc_offset=5 * 3600 + 1800)["currentTemperature_history"]
+
+    assert utc == [{"hr": 23, "value": 2.0}]
+    assert tokyo == [{"hr": 8, "value": 2.0}]
+    # +5:30: 04:31 und 05:10 Ortszeit liegen in verschiedenen Stunden
+    assert india == [{"hr": 4, "value": 1.0}, {"hr": 5, "value": 2.0}]
+
+
+def test_dashboard_history_follows_city_offset(dashboard):
+    weather = dashboard.provider.get_weather_for_city("Berlin")
+    dashboard.observations.append("Berlin", reading(5.0), ts=T0 + 3600)
+    dashboard.observations.hourly_history = lambda city, hours, utc_offset: {"utc_offset": utc_offset}
+
+    assert dashboard.observation_history("Berlin", weather) == {"utc_offset": 0}     # CSV ohne Zeitzone
+    weather["utcOffset"] = 3600
+    assert dashboard.observation_history("Berlin", weather) == {"utc_offset": 3600}
+    assert dashboard.observation_history("Berlin") == {"utc_offset": 0}
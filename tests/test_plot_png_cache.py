@@ -0,0 +1,128 @@
+"""
+tests/test_plot_png_cache.py
+-------------------------------------------------------------------------------
+Tests für WeatherDashboard.send_plot_png (/history_plot.png, /forecast_plot.png):
+PNG-Cache mit Datenversion im Schlüssel, ETag / Last-Modified und 304.
+
+Diese Tests prüfen:
+1) Gleiche Daten -> PNG kommt aus dem Cache (nur EIN Rendering), gleicher ETag
+2) If-None-Match mit passendem ETag -> 304 ohne Bild-Bytes und ohne Rendern
+3) Neue Datenversion (fetched_at) -> neuer ETag, neu gerendert
+4) Daten ohne Version / ohne Daten -> kein Cache, 503 bei leerem Plot
+-------------------------------------------------------------------------------
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def hourly_frame(hours=48, fetched_at=1_700_000_000.0):
+    df = pd.DataFrame({
+        "time": pd.date_range("2024-01-01", periods=hours, freq="h", tz="UTC"),
+        "temperature_2m": np.linspace(-2.0, 8.0, hours),
+        "relative_humidity_2m": 70.0,
+        "wind_speed_10m": 12.0,
+    })
+    if fetched_at is not None:
+        df.attrs["fetched_at"] = fetched_at
+    return df
+
+
+@pytest.fixture
+def renders(dashboard, monkeypatch):
+    """Zählt die Aufrufe des Render-Pools (gerendert wird trotzdem echt)."""
+    calls = []
+    render = dashboard.render_pool.render
+
+    def counting_render(fn, *args, **kwargs):
+        calls.append(kwargs.get("key"))
+        return render(fn, *args, **kwargs)
+
+    monkeypatch.setattr(dashboard.render_pool, "render", counting_render)
+    return calls
+
+
+def test_second_request_is_served_from_png_cache(dashboard, renders):
+    dashboard.timeseries_cache.get_history = lambda **kwargs: hourly_frame()
+    client = dashboard.app.test_client()
+
+    first = client.get("/history_plot.png?city=Berlin&days=2")
+    second = client.get("/history_plot.png?city=Berlin&days=2")
+
+    assert first.status_code == second.status_code == 200
+    assert first.mimetype == "image/png"
+    assert first.data[:8] == b"\x89PNG\r\n\x1a\n"
+    assert second.data == first.data
+    assert first.headers["ETag"] == second.headers["ETag"]
+    assert "no-cache" in first.headers["Cache-Control"]
+    assert first.headers["Last-Modified"]
+    assert len(renders) == 1
+
+
+def test_matching_etag_returns_304_without_rendering(dashboard, renders):
+    dashboard.timeseries_cache.get_forecast = lambda **kwargs: hourly_frame()
+    client = dashboard.app.test_client()
+
+    etag = client.get("/forecast_plot.png?city=Berlin&var=wind_speed_10m").headers["ETag"]
+    dashboard.plot_cache.clear()        # 304 darf nicht vom PNG-Cache abhängen
+
+    response = client.get("/forecast_plot.png?city=Berlin&var=wind_speed_10m", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+    assert len(renders) == 1
+
+
+def test_new_data_version_changes_etag_and_rerenders(dashboard, renders):
+    frames = iter([hourly_frame(fetched_at=1_700_000_000.0), hourly_frame(fetched_at=1_700_003_600.0)])
+    dashboard.timeseries_cache.get_history = lambda **kwargs: next(frames)
+    client = dashboard.app.test_client()
+
+    old = client.get("/history_plot.png?city=Berlin")
+    new = client.get("/history_plot.png?city=Berlin", headers={"If-None-Match": old.headers["ETag"]})
+
+    assert new.status_code == 200
+    assert new.headers["ETag"] != old.headers["ETag"]
+    assert len(renders) == 2
+
+
+def test_other_variable_or_range_is_a_separate_entry(dashboard, renders):
+    dashboard.timeseries_cache.get_history = lambda **kwargs: hourly_frame()
+    client = dashboard.app.test_client()
+
+    etags = {
+        client.get(url).headers["ETag"]
+        for url in (
+            "/history_plot.png?city=Berlin&var=temperature_2m&days=2",
+            "/history_plot.png?city=Berlin&var=relative_humidity_2m&days=2",
+            "/history_plot.png?city=Berlin&var=temperature_2m&days=3",
+        )
+    }
+
+    assert len(etags) == 3
+    assert len(renders) == 3
+
+
+def test_unversioned_data_is_not_cached(dashboard, renders):
+    dashboard.timeseries_cache.get_history = lambda **kwargs: hourly_frame(fetched_at=None)
+    client = dashboard.app.test_client()
+
+    response = client.get("/history_plot.png?city=Berlin")
+    client.get("/history_plot.png?city=Berlin")
+
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+    assert len(renders) == 2
+    assert len(dashboard.plot_cache) == 0
+
+
+def test_missing_data_returns_503(dashboard, renders):
+    dashboard.timeseries_cache.get_history = lambda **kwargs: None
+    client = dashboard.app.test_client()
+
+    response = client.get("/history_plot.png?city=Berlin")
+
+    assert response.status_code == 503
+    assert response.get_json() == {"error": "Keine Plot-Daten für History verfügbar"}
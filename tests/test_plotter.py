@@ -0,0 +1,175 @@
+"""
+tests/test_plotter.py
+-------------------------------------------------------------------------------
+Tests für backend/services/plotter.py (Figure-Templates + Blitting).
+
+Diese Tests prüfen:
+1) Gültiges PNG in der erwarteten Größe, None bei fehlenden Daten / Variablen
+2) Template wird pro (Art, Größe, Panels) und Thread wiederverwendet
+3) Gleicher Achsenbereich -> Blitting, Bild identisch zu frisch gezeichnetem Template
+4) Mehrere Panels: Höhe pro Panel, unbekannte Variablen werden übersprungen
+-------------------------------------------------------------------------------
+"""
+
+import threading
+
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from PIL import Image
+
+from backend.services import plotter
+from backend.services.plotter import (
+    DPI,
+    FIGSIZE,
+    PLOT_WIDTH_PX,
+    PlotTemplate,
+    build_multi_panel_plot_png,
+    build_single_line_plot_png,
+    get_template,
+)
+
+
+def hourly_frame(hours=48, offset=0.0):
+    return pd.DataFrame({
+        "time": pd.date_range("2024-01-01", periods=hours, freq="h", tz="UTC"),
+        "temperature_2m": np.sin(np.arange(hours) / 24 * 2 * np.pi) * 5 + offset,
+        "wind_speed_10m": np.linspace(0.0, 20.0, hours),
+    })
+
+
+def image(png):
+    return Image.open(BytesIO(png))
+
+
+# ========================================
+# EINZELNER PLOT
+# ========================================
+
+def test_single_plot_is_png_of_figure_size():
+    png = build_single_line_plot_png(hourly_frame(), "temperature_2m", "Berlin", "°C", kind="test-size")
+
+    assert png.startswith(b"\x89PNG")
+    assert image(png).size == (PLOT_WIDTH_PX, FIGSIZE[1] * DPI)
+
+
+@pytest.mark.parametrize("df, var", [
+    (None, "temperature_2m"),
+    (pd.DataFrame(), "temperature_2m"),
+    (hourly_frame(), "unknown"),
+])
+def test_missing_data_returns_none(df, var):
+    assert build_single_line_plot_png(df, var, "Berlin", "°C", kind="test-none") is None
+
+
+def test_long_series_is_plotted_after_downsampling():
+    df = hourly_frame(hours=24 * 365 * 3)
+
+    for method in ("minmax", "lttb", "none"):
+        png = build_single_line_plot_png(df, "temperature_2m", "Berlin", "°C", downsample=method, kind="test-long")
+        assert image(png).size[0] == PLOT_WIDTH_PX
+
+
+# ========================================
+# TEMPLATES + BLITTING
+# ========================================
+
+def test_template_is_reused_per_kind():
+    first = get_template("test-reuse")
+
+    assert get_template("test-reuse") is first
+    assert get_template("test-reuse-other") is not first
+    assert get_template("test-reuse", panels=2) is not first
+
+
+def test_templates_are_per_thread():
+    main = get_template("test-thread")
+    other = []
+
+    worker = threading.Thread(target=lambda: other.append(get_template("test-thread")))
+    worker.start()
+    worker.join()
+
+    assert other[0] is not main
+
+
+def test_same_axis_range_is_blitted_and_matches_fresh_render():
+    df = hourly_frame()
+    template = get_template("test-blit")
+
+    build_single_line_plot_png(df, "temperature_2m", "Berlin", "°C", kind="test-blit")
+    blitted = build_single_line_plot_png(df, "temperature_2m", "München", "°C", kind="test-blit")
+
+    assert (template.renders, template.blits) == (2, 1)
+
+    # Frisches Template mit denselben Daten -> exakt gleiches Bild (kein Rest vom vorigen Titel)
+    x = plotter._date_numbers(df["time"])
+    fresh = PlotTemplate().render_png(x, df["temperature_2m"].to_numpy(), "München", "°C")
+
+    assert np.array_equal(np.asarray(image(blitted)), np.asarray(image(fresh)))
+
+
+def test_changed_range_or_label_redraws_background():
+    template = get_template("test-redraw")
+
+    build_single_line_plot_png(hourly_frame(), "temperature_2m", "Berlin", "°C", kind="test-redraw")
+    build_single_line_plot_png(hourly_frame(offset=100.0), "temperature_2m", "Berlin", "°C", kind="test-redraw")
+    build_single_line_plot_png(hourly_frame(offset=100.0), "temperature_2m", "Berlin", "K", kind="test-redraw")
+
+    assert (template.renders, template.blits) == (3, 0)
+
+
+def test_nice_limits():
+    assert plotter._nice_limits(np.array([np.nan, np.nan])) == (0.0, 1.0)
+
+    lo, hi = plotter._nice_limits(np.array([3.0, 3.0]))
+    assert lo < 3.0 < hi
+
+    lo, hi = plotter._nice_limits(np.array([0.3, 9.7, np.nan]))
+    assert lo <= 0.3 and hi >= 9.7
+
+
+# ========================================
+# MEHRERE PANELS
+# ========================================
+
+def test_multi_panel_height_grows_with_panels():
+    df = hourly_frame()
+
+    one = build_multi_panel_plot_png(df, ["temperature_2m"], "Berlin", ["°C"], kind="test-panels")
+    two = build_multi_panel_plot_png(df, ["temperature_2m", "wind_speed_10m"], "Berlin", ["°C", "km/h"], kind="test-panels")
+
+    panel_px = plotter.PANEL_HEIGHT_IN * DPI
+    assert image(one).size[0] == image(two).size[0] == PLOT_WIDTH_PX
+    assert image(two).size[1] - image(one).size[1] == pytest.approx(panel_px, abs=1)
+
+
+def test_multi_panel_skips_unknown_variables():
+    df = hourly_frame()
+
+    png = build_multi_panel_plot_png(
+        df, ["temperature_2m", "unknown"], "Berlin", ["°C", "?"], now=pd.Timestamp("2024-01-02", tz="UTC"), kind="test-skip"
+    )
+    single = build_multi_panel_plot_png(df, ["temperature_2m"], "Berlin", ["°C"], kind="test-skip")
+
+    assert image(png).size == image(single).size
+    assert build_multi_panel_plot_png(df, ["unknown"], "Berlin", ["?"], kind="test-skip") is None
+    assert build_multi_panel_plot_png(None, ["temperature_2m"], "Berlin", ["°C"], kind="test-skip") is None
+
+
+def test_now_marker_changes_image_without_redrawing_background():
+    df = hourly_frame()
+    variables, labels = ["temperature_2m", "wind_speed_10m"], ["°C", "km/h"]
+
+    without = build_multi_panel_plot_png(df, variables, "Berlin", labels, kind="test-marker")
+    with_now = build_multi_panel_plot_png(
+        df, variables, "Berlin", labels, now=pd.Timestamp("2024-01-02", tz="UTC"), kind="test-marker"
+    )
+
+    height = plotter.MARGIN_TOP_IN + plotter.MARGIN_BOTTOM_IN + 2 * plotter.PANEL_HEIGHT_IN
+    template = get_template("test-marker", figsize=(FIGSIZE[0], height), panels=2)
+    assert template.blits == 1
+    assert without != with_now
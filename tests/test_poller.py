@@ -0,0 +1,95 @@
+"""
+tests/test_poller.py
+-------------------------------------------------------------------------------
+Tests für den Hintergrund-Poller im Dashboard (poll_once, Räume pro Stadt).
+
+Diese Tests prüfen:
+1) Jede abonnierte Stadt wird pro Durchlauf GENAU EINMAL abgefragt,
+   egal wie viele Clients sie anzeigen
+2) Das Update geht an alle Clients im Raum der Stadt, nicht an andere Städte
+3) Fehler / None für eine Stadt halten die übrigen Städte nicht auf
+-------------------------------------------------------------------------------
+"""
+
+
+class CountingProvider:
+    """Umhüllt den CSV-Provider und zählt Abfragen pro Stadt, optional mit Fehlern."""
+
+    def __init__(self, provider, failing=()):
+        self.provider = provider
+        self.failing = set(failing)
+        self.calls = []
+
+    def get_weather_for_city(self, city):
+        self.calls.append(city)
+        if city in self.failing:
+            raise RuntimeError("Provider down")
+        return self.provider.get_weather_for_city(city)
+
+
+def join(dashboard, city):
+    """Neuer Browser, der per Socket.IO auf 'city' wechselt."""
+    http = dashboard.app.test_client()
+    http.get("/weather")
+    socket = dashboard.socketio.test_client(dashboard.app, flask_test_client=http)
+    socket.emit("cityInput", {"city": city})
+    socket.get_received()                               # Antwort auf den Stadtwechsel verwerfen
+    return socket
+
+
+def updates(socket):
+    return [event["args"][0] for event in socket.get_received() if event["name"] == "update"]
+
+
+def test_poll_once_fetches_each_city_once_and_fans_out(dashboard):
+    dashboard.initialize("Berlin")
+    london = [join(dashboard, "London") for _ in range(3)]
+    munich = join(dashboard, "München")
+
+    provider = CountingProvider(dashboard.provider)
+    dashboard.provider = provider
+    dashboard.poll_once()
+
+    assert sorted(provider.calls) == ["London", "München"]
+    for socket in london:
+        (payload,) = updates(socket)
+        assert payload["city"] == "London"
+        assert (payload["lat"], payload["lon"]) == (51.507, -0.128)
+    assert [payload["city"] for payload in updates(munich)] == ["München"]
+
+
+def test_failing_city_does_not_block_others(dashboard):
+    dashboard.initialize("Berlin")
+    london = join(dashboard, "London")
+    munich = join(dashboard, "München")
+
+    dashboard.provider = CountingProvider(dashboard.provider, failing={"London"})
+    dashboard.poll_once()
+
+    assert updates(london) == []
+    assert [payload["city"] for payload in updates(munich)] == ["München"]
+
+
+def test_poll_updates_subscriber_state(dashboard):
+    dashboard.initialize("Berlin")
+    join(dashboard, "London")
+    (client_id,) = {client_id for _, sub in dashboard.subscriptions.items() for client_id in sub["sids"].values()}
+    state = dashboard.sessions.get(client_id)
+    state.weather_data = None
+    state.last_polled = None
+
+    dashboard.poll_once()
+
+    assert state.weather_data is not None
+    assert state.last_polled is not None
+
+
+def test_disconnected_clients_are_not_polled(dashboard):
+    dashboard.initialize("Berlin")
+    join(dashboard, "London").disconnect()
+
+    provider = CountingProvider(dashboard.provider)
+    dashboard.provider = provider
+    dashboard.poll_once()
+
+    assert provider.calls == []
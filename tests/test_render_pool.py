@@ -0,0 +1,245 @@
+"""
+tests/test_render_pool.py
+-------------------------------------------------------------------------------
+Tests für backend/services/render_pool.py (Thread-Modus, blockierende Attrappe
+statt Matplotlib, per threading.Event gesteuert).
+
+Diese Tests prüfen:
+1) Volle Warteschlange -> RenderPoolBusy, im Dashboard 503 + Retry-After
+2) Timeout -> RenderTimeout, ein noch wartender Auftrag wird abgebrochen (cancel)
+3) Gleicher Schlüssel -> EIN Future / EIN Rendering für alle Anfragen
+4) Plätze werden erst frei, wenn der Worker wirklich fertig ist (auch nach Timeout / Fehler)
+-------------------------------------------------------------------------------
+"""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services.render_pool import RenderPool, RenderPoolBusy, RenderTimeout
+
+
+class BlockingJob:
+    """Render-Attrappe: blockiert, bis release gesetzt ist, zählt Aufrufe."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, value="png"):
+        with self._lock:
+            self.calls += 1
+        self.started.set()
+        if not self.release.wait(timeout=5):
+            raise RuntimeError("BlockingJob wurde nie freigegeben")
+        return value
+
+
+def wait_until(condition, timeout=5):
+    """Done-Callbacks laufen im Worker-Thread, evtl. kurz nach future.result() -> kurz darauf warten."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Bedingung nicht erfüllt"
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def pool():
+    render_pool = RenderPool(workers=1, max_queue=1, timeout=5, mode="thread", retry_after=7)
+    yield render_pool
+    render_pool.shutdown()
+
+
+# ========================================
+# WARTESCHLANGE VOLL -> BUSY
+# ========================================
+
+def test_full_queue_rejects_with_retry_after(pool):
+    job = BlockingJob()
+    running = pool.submit(job)
+    waiting = pool.submit(job)
+
+    with pytest.raises(RenderPoolBusy) as excinfo:
+        pool.submit(job)
+
+    assert excinfo.value.retry_after == 7
+    assert pool.stats()["rejected"] == 1
+
+    job.release.set()
+    assert running.result(timeout=5) == "png"
+    assert waiting.result(timeout=5) == "png"
+
+
+def test_dashboard_answers_503_when_pool_is_busy(dashboard):
+    df = pd.DataFrame({
+        "time": pd.date_range("2024-01-01", periods=48, freq="h", tz="UTC"),
+        "temperature_2m": np.linspace(-2.0, 8.0, 48),
+    })
+    df.attrs["fetched_at"] = 1_700_000_000.0
+    dashboard.timeseries_cache.get_history = lambda **kwargs: df
+
+    dashboard.render_pool.shutdown()
+    dashboard.render_pool = RenderPool(workers=1, max_queue=0, timeout=5, mode="thread", retry_after=3)
+
+    job = BlockingJob()
+    dashboard.render_pool.submit(job)
+    job.started.wait(timeout=5)
+
+    response = dashboard.app.test_client().get("/history_plot.png?city=Berlin")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+    assert "error" in response.get_json()
+
+    job.release.set()
+
+
+# ========================================
+# TIMEOUT -> CANCEL
+# ========================================
+
+def test_timeout_raises_and_cancels_queued_job(pool):
+    job = BlockingJob()
+    running = pool.submit(job)
+    job.started.wait(timeout=5)
+
+    queued = BlockingJob()
+    with pytest.raises(RenderTimeout) as excinfo:
+        pool.render(queued, timeout=0.05)
+
+    # Der wartende Auftrag wurde aus der Warteschlange genommen und nie gestartet
+    assert excinfo.value.retry_after == 7
+    assert queued.calls == 0
+    assert pool.stats()["timeouts"] == 1
+
+    job.release.set()
+    running.result(timeout=5)
+    assert queued.calls == 0
+
+
+def test_timeout_of_running_job_lets_it_finish(pool):
+    job = BlockingJob()
+    running = pool.submit(job, key="plot")
+    job.started.wait(timeout=5)
+
+    with pytest.raises(RenderTimeout):
+        pool.render(job, key="plot", timeout=0.05)
+
+    # Läuft schon -> darf zu Ende rechnen, weitere Anfragen warten auf dasselbe Ergebnis
+    assert not running.cancelled()
+    shared = pool.submit(job, key="plot")
+
+    job.release.set()
+    assert shared.result(timeout=5) == "png"
+    assert job.calls == 1
+
+
+# ========================================
+# GLEICHER SCHLÜSSEL -> GETEILTES FUTURE
+# ========================================
+
+def test_same_key_shares_one_future(pool):
+    job = BlockingJob()
+
+    first = pool.submit(job, "a", key=("history", "Berlin"))
+    second = pool.submit(job, "b", key=("history", "Berlin"))
+
+    assert first is second
+    assert pool.stats()["shared"] == 1
+    assert pool.stats()["inflight"] == 1
+
+    job.release.set()
+    assert second.result(timeout=5) == "a"
+    assert job.calls == 1
+
+
+def test_concurrent_renders_with_same_key_render_once(pool):
+    job = BlockingJob()
+    results = []
+
+    def request():
+        results.append(pool.render(job, key="same"))
+
+    threads = [threading.Thread(target=request) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+
+    job.started.wait(timeout=5)
+    wait_until(lambda: pool.stats()["shared"] == 3)
+    job.release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert results == ["png"] * 4
+    assert job.calls == 1
+    # Gleicher Schlüssel belegt nur EINEN Platz -> mehr Anfragen als Plätze ohne Busy
+    assert pool.stats()["rejected"] == 0
+
+
+def test_shared_key_is_forgotten_after_completion(pool):
+    job = BlockingJob()
+    job.release.set()
+
+    first = pool.render(job, key="plot")
+    wait_until(lambda: pool.stats()["inflight"] == 0)
+    second = pool.render(job, key="plot")
+
+    assert first == second == "png"
+    assert job.calls == 2
+
+
+# ========================================
+# PLÄTZE FREIGEBEN
+# ========================================
+
+def test_slots_are_released_after_completion(pool):
+    job = BlockingJob()
+    job.release.set()
+
+    for _ in range(10):
+        assert pool.render(job) == "png"
+
+    assert pool.stats()["rejected"] == 0
+
+
+def test_slot_stays_taken_until_timed_out_job_finishes(pool):
+    job = BlockingJob()
+    pool.submit(job, key="plot")
+    job.started.wait(timeout=5)
+
+    with pytest.raises(RenderTimeout):
+        pool.render(job, key="plot", timeout=0.05)
+
+    # Läuft noch -> belegt weiter seinen Platz: ein wartender passt noch, dann voll
+    waiting = pool.submit(BlockingJob())
+    with pytest.raises(RenderPoolBusy):
+        pool.submit(BlockingJob())
+
+    waiting.cancel()
+    job.release.set()
+
+    finished = BlockingJob()
+    finished.release.set()
+    assert pool.render(finished) == "png"
+
+
+def test_failed_job_releases_slot_and_counts_error(pool):
+    def broken():
+        raise ValueError("kaputt")
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            pool.render(broken)
+
+    wait_until(lambda: pool.stats()["errors"] == 3)
+    assert pool.stats()["rejected"] == 0
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        RenderPool(mode="fiber")
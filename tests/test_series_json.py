@@ -0,0 +1,167 @@
+"""
+tests/test_series_json.py
+-------------------------------------------------------------------------------
+Tests für backend/services/series_json.py und die Routen /history.json + /forecast.json
+(Timeseries-Cache durch Attrappen ersetzt, kein Netzwerk).
+
+Diese Tests prüfen:
+1) encode_series: t0 + Abstände/Offsets, float32-Werte, null/NaN für fehlende Werte
+2) json und base64 ergeben nach decode_series dieselbe Reihe, lange Reihen werden reduziert
+3) Routen: Payload mit Titel/Einheit, ETag -> 304, neue Datenversion -> neuer ETag
+4) Fehler: unbekannte Kodierung / Downsampling -> 400, keine Daten -> 503
+-------------------------------------------------------------------------------
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services.series_json import decode_series, encode_series
+
+
+def hourly_frame(hours=48, fetched_at=1_700_000_000.0):
+    df = pd.DataFrame({
+        "time": pd.date_range("2024-01-01", periods=hours, freq="h", tz="UTC"),
+        "temperature_2m": np.linspace(-2.0, 8.0, hours),
+        "relative_humidity_2m": 70.0,
+        "wind_speed_10m": 12.0,
+    })
+    if fetched_at is not None:
+        df.attrs["fetched_at"] = fetched_at
+    return df
+
+
+T0 = int(pd.Timestamp("2024-01-01", tz="UTC").timestamp())
+
+
+# ========================================
+# ENCODE_SERIES
+# ========================================
+
+def test_json_encoding_with_deltas():
+    df = hourly_frame(hours=3)
+    df.loc[1, "temperature_2m"] = np.nan
+
+    payload = encode_series(df, "temperature_2m", 100)
+
+    assert payload == {
+        "var": "temperature_2m", "points": 3, "t0": T0, "delta": True, "encoding": "json",
+        "t": [0, 3600, 3600], "v": [-2.0, None, 8.0],
+    }
+
+
+def test_offsets_without_delta():
+    payload = encode_series(hourly_frame(hours=3), "temperature_2m", 100, delta=False)
+
+    assert payload["t"] == [0, 3600, 7200]
+    assert payload["delta"] is False
+
+
+def test_json_values_are_rounded():
+    df = hourly_frame(hours=2)
+    df["temperature_2m"] = [1.23456, 2.0]
+
+    assert encode_series(df, "temperature_2m", 100)["v"] == [1.23, 2.0]
+
+
+@pytest.mark.parametrize("delta", [True, False])
+def test_base64_and_json_decode_to_same_series(delta):
+    df = hourly_frame(hours=500)
+    df.loc[10:20, "temperature_2m"] = np.nan
+
+    t_json, v_json = decode_series(encode_series(df, "temperature_2m", 1000, delta=delta, encoding="json"))
+    t_b64, v_b64 = decode_series(encode_series(df, "temperature_2m", 1000, delta=delta, encoding="base64"))
+
+    expected_t = pd.DatetimeIndex(df["time"]).asi8 // 10**9
+    assert t_json.tolist() == t_b64.tolist() == expected_t.tolist()
+    np.testing.assert_allclose(v_json, v_b64, atol=0.01)
+    assert np.isnan(v_b64[10:21]).all()
+
+
+def test_long_series_is_downsampled():
+    payload = encode_series(hourly_frame(hours=24 * 365), "temperature_2m", 200)
+
+    assert payload["points"] <= 2 * 200 + 2
+    assert len(payload["t"]) == len(payload["v"]) == payload["points"]
+
+
+def test_missing_data_or_unknown_encoding():
+    assert encode_series(None, "temperature_2m", 100) is None
+    assert encode_series(hourly_frame(), "unknown", 100) is None
+
+    with pytest.raises(ValueError):
+        encode_series(hourly_frame(), "temperature_2m", 100, encoding="msgpack")
+
+
+# ========================================
+# ROUTEN /history.json + /forecast.json
+# ========================================
+
+@pytest.mark.parametrize("route, stub", [("/history.json", "get_history"), ("/forecast.json", "get_forecast")])
+def test_route_payload_contains_labels(dashboard, route, stub):
+    setattr(dashboard.timeseries_cache, stub, lambda **kwargs: hourly_frame())
+    client = dashboard.app.test_client()
+
+    response = client.get(f"{route}?city=Berlin&var=wind_speed_10m&days=2")
+    payload = response.get_json()
+
+    assert response.status_code == 200
+    assert payload["var"] == "wind_speed_10m"
+    assert payload["city"] == "Berlin"
+    assert payload["days"] == 2
+    assert payload["points"] == 48
+    assert {"title", "unit", "kind", "t0", "t", "v"} <= set(payload)
+
+
+def test_same_data_version_answers_304(dashboard):
+    dashboard.timeseries_cache.get_history = lambda **kwargs: hourly_frame()
+    client = dashboard.app.test_client()
+
+    first = client.get("/history.json?city=Berlin")
+    again = client.get("/history.json?city=Berlin", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert first.status_code == 200
+    assert again.status_code == 304
+    assert again.data == b""
+
+
+def test_new_data_version_or_parameters_change_etag(dashboard):
+    frames = iter([hourly_frame(fetched_at=1.0), hourly_frame(fetched_at=2.0), hourly_frame(fetched_at=2.0)])
+    dashboard.timeseries_cache.get_history = lambda **kwargs: next(frames)
+    client = dashboard.app.test_client()
+
+    old = client.get("/history.json?city=Berlin")
+    new = client.get("/history.json?city=Berlin", headers={"If-None-Match": old.headers["ETag"]})
+    base64 = client.get("/history.json?city=Berlin&encoding=base64")
+
+    assert new.status_code == 200
+    assert len({old.headers["ETag"], new.headers["ETag"], base64.headers["ETag"]}) == 3
+
+
+def test_data_without_version_has_no_etag(dashboard):
+    dashboard.timeseries_cache.get_history = lambda **kwargs: hourly_frame(fetched_at=None)
+
+    response = dashboard.app.test_client().get("/history.json?city=Berlin")
+
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+
+
+@pytest.mark.parametrize("query", ["encoding=msgpack", "downsample=average"])
+def test_unknown_options_answer_400(dashboard, query):
+    dashboard.timeseries_cache.get_history = lambda **kwargs: hourly_frame()
+
+    response = dashboard.app.test_client().get(f"/history.json?city=Berlin&{query}")
+
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_no_data_answers_503(dashboard):
+    dashboard.timeseries_cache.get_forecast = lambda **kwargs: None
+    client = dashboard.app.test_client()
+
+    assert client.get("/forecast.json?city=Berlin").status_code == 503
+
+    dashboard.timeseries_cache.get_forecast = lambda **kwargs: hourly_frame()
+    assert client.get("/forecast.json?city=Berlin&var=unknown").status_code == 503
@@ -0,0 +1,105 @@
+"""
+tests/test_session_state.py
+-------------------------------------------------------------------------------
+Tests für backend/services/session_state.py und den Zustand pro Client im Dashboard.
+
+Diese Tests prüfen:
+1) SessionStore begrenzt die Anzahl (LRU) und verwirft inaktive Clients (idle_timeout)
+2) Jeder Browser (Session-Cookie) behält seine eigene Stadt:
+   ein Stadtwechsel per Socket.IO ändert NUR den Zustand des sendenden Clients
+3) Unbekannte Städte lassen die bisherige Stadt des Clients unverändert
+-------------------------------------------------------------------------------
+"""
+
+from backend.services.session_state import SessionStore, ClientState
+
+
+# ========================================
+# SessionStore
+# ========================================
+
+def test_store_evicts_least_recently_used_client(clock):
+    store = SessionStore(max_sessions=2, idle_timeout=None, clock=clock)
+    store.get_or_create("a", lambda: ClientState(city="Berlin"))
+    store.get_or_create("b", lambda: ClientState(city="London"))
+
+    store.get("a")                                      # a zuletzt benutzt
+    store.get_or_create("c", lambda: ClientState(city="München"))
+
+    assert store.get("b") is None
+    assert [client_id for client_id, _ in store.items()] == ["a", "c"]
+
+
+def test_get_or_create_keeps_existing_state(clock):
+    store = SessionStore(clock=clock)
+    first = store.get_or_create("a", lambda: ClientState(city="Berlin"))
+    first.city = "London"
+
+    second = store.get_or_create("a", lambda: ClientState(city="Berlin"))
+
+    assert second is first and second.city == "London"
+    assert len(store) == 1
+
+
+def test_idle_clients_are_dropped(clock):
+    store = SessionStore(idle_timeout=60, clock=clock)
+    store.get_or_create("idle", ClientState)
+    store.get_or_create("active", ClientState)
+
+    clock.advance(45)
+    store.get("active")                                 # Zugriff frischt last_seen auf
+    clock.advance(30)
+
+    assert store.get("idle") is None
+    assert store.get("active") is not None
+    assert len(store) == 1
+
+
+# ========================================
+# Dashboard: Zustand pro Client
+# ========================================
+
+def connect(dashboard):
+    """(HTTP-Client, Socket.IO-Client) mit gemeinsamem Session-Cookie = ein Browser."""
+    http = dashboard.app.test_client()
+    http.get("/weather")                                # vergibt die client_id (Cookie)
+    socket = dashboard.socketio.test_client(dashboard.app, flask_test_client=http)
+    return http, socket
+
+
+def test_city_switch_only_changes_the_sending_client(dashboard):
+    dashboard.initialize("Berlin")
+    http_a, socket_a = connect(dashboard)
+    http_b, _socket_b = connect(dashboard)
+
+    socket_a.emit("cityInput", {"city": "London"})
+    updates = [event for event in socket_a.get_received() if event["name"] == "update"]
+
+    assert updates and updates[-1]["args"][0]["city"] == "London"
+    assert http_a.get("/weather").get_json()["city"] == "London"
+    assert http_b.get("/weather").get_json()["city"] == "Berlin"
+    assert dashboard.city == "Berlin"                   # Startzustand für neue Clients bleibt
+    assert len(dashboard.sessions) == 2
+
+
+def test_unknown_city_keeps_previous_city(dashboard):
+    dashboard.initialize("Berlin")
+    http, socket = connect(dashboard)
+
+    socket.emit("cityInput", {"city": "Atlantis"})
+    updates = [event for event in socket.get_received() if event["name"] == "update"]
+
+    assert updates[-1]["args"][0] == {"city": "Berlin"}
+    assert http.get("/weather").get_json()["city"] == "Berlin"
+
+
+def test_disconnect_leaves_city_room(dashboard):
+    dashboard.initialize("Berlin")
+    _http, socket = connect(dashboard)
+    socket.emit("cityInput", {"city": "London"})
+
+    assert "london" in dashboard.subscriptions
+
+    socket.disconnect()
+
+    assert dashboard.subscriptions == {} and dashboard.sid_rooms == {}
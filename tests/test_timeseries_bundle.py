@@ -0,0 +1,175 @@
+"""
+tests/test_timeseries_bundle.py
+-------------------------------------------------------------------------------
+Tests für Vergangenheit + Vorhersage in EINEM Abruf: encode_bundle,
+OpenMeteoTimeseriesCache.get_combined und die Routen /timeseries.png + /timeseries.json.
+
+Diese Tests prüfen:
+1) encode_bundle: gemeinsame Zeitachse, "v" pro Variable, unbekannte Variablen fallen weg
+2) get_combined: EIN Download pro (Ort, past, future), danach aus dem Cache
+3) Routen: genau EIN get_combined-Aufruf, vars-Prüfung (400), past/future-Grenzen
+4) ETag -> 304 für PNG und JSON
+-------------------------------------------------------------------------------
+"""
+
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from PIL import Image
+
+from backend.dashboard import FORECAST_MAX_DAYS, PLOT_LABELS
+from backend.services import timeseries_cache as timeseries_module
+from backend.services.series_json import decode_series, encode_bundle
+from backend.services.timeseries_cache import OpenMeteoTimeseriesCache
+
+
+def hourly_frame(hours=72, fetched_at=1_700_000_000.0):
+    df = pd.DataFrame({
+        "time": pd.date_range("2024-01-01", periods=hours, freq="h", tz="UTC"),
+        "temperature_2m": np.linspace(-2.0, 8.0, hours),
+        "relative_humidity_2m": np.linspace(90.0, 60.0, hours),
+        "wind_speed_10m": 12.0,
+    })
+    if fetched_at is not None:
+        df.attrs["fetched_at"] = fetched_at
+    return df
+
+
+@pytest.fixture
+def combined_calls(dashboard):
+    """Ersetzt get_combined durch eine Attrappe und protokolliert die Aufrufe."""
+    calls = []
+
+    def get_combined(**kwargs):
+        calls.append(kwargs)
+        return hourly_frame()
+
+    dashboard.timeseries_cache.get_combined = get_combined
+    return calls
+
+
+# ========================================
+# ENCODE_BUNDLE
+# ========================================
+
+def test_bundle_shares_one_time_axis():
+    df = hourly_frame()
+
+    payload = encode_bundle(df, ["temperature_2m", "wind_speed_10m", "unknown"], 1000)
+
+    assert payload["vars"] == ["temperature_2m", "wind_speed_10m"]
+    assert set(payload["v"]) == {"temperature_2m", "wind_speed_10m"}
+    assert all(len(values) == payload["points"] == 72 for values in payload["v"].values())
+
+
+def test_bundle_base64_matches_single_series():
+    df = hourly_frame(hours=24 * 90)
+    payload = encode_bundle(df, ["temperature_2m", "relative_humidity_2m"], 300, encoding="base64")
+
+    for var in payload["vars"]:
+        t, v = decode_series({**payload, "v": payload["v"][var]})
+        expected = df.set_index(pd.DatetimeIndex(df["time"]).asi8 // 10**9)[var].loc[t]
+        np.testing.assert_allclose(v, expected.to_numpy(), rtol=1e-6)
+
+
+def test_bundle_without_known_variables_is_none():
+    assert encode_bundle(hourly_frame(), ["unknown"], 100) is None
+    assert encode_bundle(None, ["temperature_2m"], 100) is None
+
+
+# ========================================
+# GET_COMBINED (EIN DOWNLOAD)
+# ========================================
+
+def test_get_combined_downloads_once_per_key(monkeypatch):
+    downloads = []
+
+    def fake_fetch(lat, lon, days, past_days):
+        downloads.append((lat, lon, days, past_days))
+        return hourly_frame(fetched_at=None)
+
+    monkeypatch.setattr(timeseries_module, "fetch_openmeteo_forecast_dataframe", fake_fetch)
+    cache = OpenMeteoTimeseriesCache(history_store=object())
+
+    first = cache.get_combined(52.52001, 13.40499, past_days=2, future_days=7)
+    second = cache.get_combined(52.52, 13.405, past_days=2, future_days=7)
+    cache.get_combined(52.52, 13.405, past_days=3, future_days=7)
+
+    assert len(downloads) == 2
+    assert downloads[0][2:] == (7, 2)
+    assert first.attrs["fetched_at"] == second.attrs["fetched_at"]
+    assert cache.get_combined(None, 13.405) is None
+
+
+# ========================================
+# ROUTEN
+# ========================================
+
+def test_timeseries_json_uses_one_combined_call(dashboard, combined_calls):
+    response = dashboard.app.test_client().get("/timeseries.json?city=Berlin&past=3&future=5")
+    payload = response.get_json()
+
+    assert response.status_code == 200
+    assert combined_calls == [{"lat": 52.52, "lon": 13.405, "past_days": 3, "future_days": 5}]
+    assert payload["vars"] == list(PLOT_LABELS)
+    assert payload["days"] == {"past": 3, "future": 5}
+    assert payload["now"] == 1_700_000_000.0
+    assert set(payload["labels"]) == set(PLOT_LABELS)
+
+
+def test_timeseries_png_uses_one_combined_call(dashboard, combined_calls):
+    response = dashboard.app.test_client().get("/timeseries.png?city=Berlin&vars=temperature_2m,wind_speed_10m")
+
+    assert response.status_code == 200
+    assert response.mimetype == "image/png"
+    assert len(combined_calls) == 1
+
+    # Zwei Panels -> höher als ein einzelner Plot
+    width, height = Image.open(BytesIO(response.data)).size
+    assert height > width / 3
+
+
+@pytest.mark.parametrize("route", ["/timeseries.png", "/timeseries.json"])
+def test_unknown_variable_answers_400_without_download(dashboard, combined_calls, route):
+    response = dashboard.app.test_client().get(f"{route}?city=Berlin&vars=temperature_2m,snow")
+
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+    assert combined_calls == []
+
+
+def test_vars_are_deduplicated_in_request_order(dashboard, combined_calls):
+    response = dashboard.app.test_client().get(
+        "/timeseries.json?city=Berlin&vars=wind_speed_10m, temperature_2m,wind_speed_10m"
+    )
+
+    assert response.get_json()["vars"] == ["wind_speed_10m", "temperature_2m"]
+
+
+def test_past_and_future_are_clamped(dashboard, combined_calls):
+    client = dashboard.app.test_client()
+
+    client.get("/timeseries.json?city=Berlin&past=0&future=999")
+
+    assert combined_calls[0]["past_days"] == 0
+    assert combined_calls[0]["future_days"] == FORECAST_MAX_DAYS
+
+
+@pytest.mark.parametrize("route", ["/timeseries.png", "/timeseries.json"])
+def test_same_data_version_answers_304(dashboard, combined_calls, route):
+    client = dashboard.app.test_client()
+
+    first = client.get(f"{route}?city=Berlin")
+    again = client.get(f"{route}?city=Berlin", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert first.status_code == 200
+    assert again.status_code == 304
+    assert again.data == b""
+
+
+def test_missing_city_answers_400(dashboard, combined_calls):
+    assert dashboard.app.test_client().get("/timeseries.json").status_code == 400
+    assert combined_calls == []
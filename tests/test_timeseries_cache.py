@@ -0,0 +1,166 @@
+"""
+tests/test_timeseries_cache.py
+-------------------------------------------------------------------------------
+Tests für backend/services/timeseries_cache.py (ohne Netzwerk: History-Store und
+Forecast-Download werden durch Attrappen ersetzt).
+
+Diese Tests prüfen:
+1) Single-Flight: gleichzeitige Anfragen auf denselben Schlüssel laden nur EINMAL
+2) History-TTL: abgeschlossene, vollständige Vergangenheit unbegrenzt, sonst recent_ttl
+3) Forecast-TTL: gültig bis zum nächsten Modelllauf (Kadenz, UTC)
+4) df.attrs["fetched_at"] als Datenversion, leere Antworten werden nicht gecached
+-------------------------------------------------------------------------------
+"""
+
+import threading
+
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from backend.services import timeseries_cache as timeseries_module
+from backend.services.timeseries_cache import OpenMeteoTimeseriesCache
+
+
+def hourly_frame(start, hours, with_nan=False):
+    times = pd.date_range(start, periods=hours, freq="h")
+    temperature = np.arange(hours, dtype=float)
+    if with_nan:
+        temperature[-1] = np.nan
+    return pd.DataFrame({
+        "time": times,
+        "temperature_2m": temperature,
+        "relative_humidity_2m": 50.0,
+        "wind_speed_10m": 3.0,
+    })
+
+
+class StubHistoryStore:
+    """Ersetzt den HistoryStore: liefert einen festen DataFrame, optional blockierend."""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.calls = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def get_range(self, lat, lon, start_date, end_date):
+        self.calls.append((lat, lon, start_date, end_date))
+        self.started.set()
+        self.release.wait(timeout=5)
+        return None if self.frame is None else self.frame.copy()
+
+    def stats(self):
+        return {}
+
+
+def expires_at(cache, key):
+    return cache.cache._data[key][1]
+
+
+def past(days):
+    return (datetime.now(timezone.utc).date() - timedelta(days=days)).isoformat()
+
+
+# ========================================
+# SINGLE-FLIGHT
+# ========================================
+
+def test_concurrent_requests_share_one_download():
+    store = StubHistoryStore(hourly_frame("2024-01-01", 48))
+    cache = OpenMeteoTimeseriesCache(history_store=store)
+
+    store.release.clear()
+    results = []
+
+    def request():
+        results.append(cache.get_history(52.52001, 13.40499, "2024-01-01", "2024-01-02"))
+
+    threads = [threading.Thread(target=request) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+
+    assert store.started.wait(timeout=5)
+    store.release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(store.calls) == 1
+    assert store.calls[0][:2] == (52.52, 13.4)          # gerundete Koordinaten
+    assert len(results) == 4 and all(df is results[0] for df in results)
+    assert cache._key_locks == {}                       # Locks werden wieder aufgeräumt
+
+
+# ========================================
+# HISTORY-TTL
+# ========================================
+
+def test_complete_past_history_never_expires():
+    store = StubHistoryStore(hourly_frame("2024-01-01", 48))
+    cache = OpenMeteoTimeseriesCache(history_store=store, recent_ttl=600)
+
+    cache.get_history(52.52, 13.40, past(10), past(9))
+    cache.get_history(52.52, 13.40, past(10), past(9))
+
+    assert len(store.calls) == 1
+    assert expires_at(cache, ("history", 52.52, 13.4, past(10), past(9))) is None
+
+
+def test_history_with_nulls_or_today_uses_recent_ttl():
+    today = datetime.now(timezone.utc).date().isoformat()
+    cache = OpenMeteoTimeseriesCache(history_store=StubHistoryStore(None), recent_ttl=600)
+
+    assert cache._history_ttl(hourly_frame("2024-01-01", 24, with_nan=True), past(5)) == 600
+    assert cache._history_ttl(hourly_frame("2024-01-01", 24), today) == 600
+    assert cache._history_ttl(hourly_frame("2024-01-01", 24), "kein-datum") == 600
+    assert cache._history_ttl(hourly_frame("2024-01-01", 24), past(1)) is None
+
+
+def test_empty_or_failed_history_is_not_cached():
+    store = StubHistoryStore(None)
+    cache = OpenMeteoTimeseriesCache(history_store=store)
+
+    assert cache.get_history(52.52, 13.40, past(3), past(2)) is None
+    assert cache.get_history(52.52, 13.40, past(3), past(2)) is None
+    assert len(store.calls) == 2
+    assert len(cache.cache) == 0
+    assert cache.get_history(None, 13.40, past(3), past(2)) is None
+
+
+# ========================================
+# FORECAST-TTL
+# ========================================
+
+def test_forecast_ttl_runs_until_next_model_run():
+    cache = OpenMeteoTimeseriesCache(history_store=StubHistoryStore(None), forecast_cadence_hours=3)
+
+    def at(hour, minute=0):
+        return datetime(2024, 5, 1, hour, minute, tzinfo=timezone.utc)
+
+    assert cache._seconds_until_next_model_run(at(4, 30)) == 90 * 60       # -> 06:00
+    assert cache._seconds_until_next_model_run(at(6, 0)) == 3 * 3600       # -> 09:00
+    assert cache._seconds_until_next_model_run(at(22, 15)) == 105 * 60     # -> 00:00 am Folgetag
+    assert cache._seconds_until_next_model_run(at(5, 59)) == 60          # Mindestens 60 s
+
+
+def test_forecast_is_cached_with_version(monkeypatch):
+    calls = []
+
+    def fake_fetch(lat, lon, days, past_days=0):
+        calls.append((lat, lon, days, past_days))
+        return hourly_frame("2024-05-01", 24 * days)
+
+    monkeypatch.setattr(timeseries_module, "fetch_openmeteo_forecast_dataframe", fake_fetch)
+    cache = OpenMeteoTimeseriesCache(history_store=StubHistoryStore(None))
+
+    first = cache.get_forecast(48.137, 11.575, days=2)
+    second = cache.get_forecast(48.1371, 11.5749, days=2)       # gleicher gerundeter Schlüssel
+    combined = cache.get_combined(48.137, 11.575, past_days=1, future_days=2)
+
+    assert first is second
+    assert isinstance(first.attrs["fetched_at"], float)
+    assert calls == [(48.14, 11.57, 2, 0), (48.14, 11.57, 2, 1)]
+    assert combined is not first
+    assert expires_at(cache, ("forecast", 48.14, 11.57, 2)) is not None
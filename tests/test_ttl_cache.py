@@ -0,0 +1,187 @@
+"""
+tests/test_ttl_cache.py
+-------------------------------------------------------------------------------
+Tests für backend/services/ttl_cache.py und backend/provider/cached_weather_provider.py
+(mit austauschbarer Uhr, ohne time.sleep).
+
+Diese Tests prüfen:
+1) TTL-Ablauf: FRESH -> STALE (im Stale-Fenster) -> MISS, ttl=None läuft nie ab
+2) LRU-Verdrängung: der am längsten nicht benutzte Eintrag fliegt zuerst raus
+3) Stale-while-revalidate: abgelaufene Werte kommen sofort, EIN Refresh im Hintergrund
+4) Fehler-Fallback: None wird nicht gecached, ein fehlgeschlagener Refresh
+   lässt den alten Wert stehen
+-------------------------------------------------------------------------------
+"""
+
+import threading
+
+from backend.provider.cached_weather_provider import CachedWeatherProvider
+from backend.services.ttl_cache import TTLCache, FRESH, STALE, MISS
+
+
+class StubProvider:
+    """Provider-Attrappe: zählt Aufrufe, Antworten/Fehler pro Stadt einstellbar."""
+
+    def __init__(self, responses):
+        self.responses = responses          # city -> dict | None | Exception
+        self.calls = []
+        self.release = threading.Event()    # blockiert Aufrufe, bis gesetzt
+        self.release.set()
+        self.done = threading.Event()
+
+    def get_weather_for_city(self, city):
+        self.calls.append(city)
+        self.release.wait(timeout=5)
+        try:
+            response = self.responses.get(city)
+            if isinstance(response, Exception):
+                raise response
+            return None if response is None else dict(response)
+        finally:
+            self.done.set()
+
+
+def wait_for_refresh(cached, stub):
+    """Wartet, bis der Hintergrund-Refresh fertig ist (Provider aufgerufen + Slot frei)."""
+    assert stub.done.wait(timeout=5)
+    for _ in range(500):
+        with cached._refresh_lock:
+            if not cached._refreshing:
+                return
+        threading.Event().wait(0.01)
+    raise AssertionError("Hintergrund-Refresh wurde nicht beendet")
+
+
+# ========================================
+# TTLCache
+# ========================================
+
+def test_entries_expire_after_ttl_and_stale_window(clock):
+    cache = TTLCache(ttl=10, stale_ttl=5, clock=clock)
+    cache.set("berlin", 1)
+
+    clock.advance(9.9)
+    assert cache.lookup("berlin") == (1, FRESH)
+
+    clock.advance(0.1)
+    assert cache.lookup("berlin") == (1, STALE)
+    assert cache.get("berlin") is None          # get liefert nur frische Werte
+
+    clock.advance(5)
+    assert cache.lookup("berlin") == (None, MISS)
+    assert len(cache) == 0
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["staleHits"], stats["misses"], stats["expirations"]) == (1, 2, 1, 1)
+
+
+def test_entries_without_ttl_never_expire(clock):
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.set("forever", "x", ttl=None)
+    cache.set("default", "y")
+
+    clock.advance(1_000_000)
+    assert cache.lookup("forever") == ("x", FRESH)
+    assert cache.lookup("default") == (None, MISS)
+    assert cache.age("forever") == 1_000_000
+
+
+def test_lru_evicts_least_recently_used(clock):
+    cache = TTLCache(max_entries=2, ttl=60, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.lookup("a")                           # a ist jetzt jünger als b
+    cache.set("c", 3)
+
+    assert cache.peek("b") is None
+    assert cache.peek("a") == 1 and cache.peek("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_peek_does_not_touch_lru_order(clock):
+    cache = TTLCache(max_entries=2, ttl=60, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.peek("a")                             # kein move_to_end
+    cache.set("c", 3)
+
+    assert cache.peek("a") is None
+    assert cache.stats()["hits"] == 0
+
+
+# ========================================
+# CachedWeatherProvider
+# ========================================
+
+def test_fresh_hits_return_copies_without_provider_call(clock):
+    stub = StubProvider({"Berlin": {"city": "Berlin", "temperature": 20}})
+    cached = CachedWeatherProvider(stub, ttl=60, stale_ttl=0, clock=clock)
+
+    first = cached.get_weather_for_city("Berlin")
+    first["temperature"] = -99                  # darf den Cache nicht verändern
+    second = cached.get_weather_for_city(" berlin ")
+
+    assert second["temperature"] == 20
+    assert stub.calls == ["Berlin"]
+
+
+def test_stale_value_is_served_and_refreshed_once_in_background(clock):
+    stub = StubProvider({"Berlin": {"temperature": 20}})
+    cached = CachedWeatherProvider(stub, ttl=60, stale_ttl=600, clock=clock)
+    cached.get_weather_for_city("Berlin")
+
+    stub.responses["Berlin"] = {"temperature": 25}
+    stub.release.clear()                        # Refresh hängt, bis wir ihn freigeben
+    stub.done.clear()
+    clock.advance(61)
+
+    # Beide Abfragen bekommen sofort den alten Wert, aber nur EIN Refresh startet
+    assert cached.get_weather_for_city("Berlin")["temperature"] == 20
+    assert cached.get_weather_for_city("Berlin")["temperature"] == 20
+
+    stub.release.set()
+    wait_for_refresh(cached, stub)
+
+    assert stub.calls == ["Berlin", "Berlin"]
+    assert cached.get_weather_for_city("Berlin")["temperature"] == 25
+    assert cached.cache.lookup("berlin")[1] == FRESH
+
+
+def test_none_results_are_not_cached(clock):
+    stub = StubProvider({"Atlantis": None})
+    cached = CachedWeatherProvider(stub, ttl=60, clock=clock)
+
+    assert cached.get_weather_for_city("Atlantis") is None
+    assert cached.get_weather_for_city("Atlantis") is None
+    assert stub.calls == ["Atlantis", "Atlantis"]
+    assert len(cached.cache) == 0
+
+
+def test_failed_refresh_keeps_stale_value(clock):
+    stub = StubProvider({"Berlin": {"temperature": 20}})
+    cached = CachedWeatherProvider(stub, ttl=60, stale_ttl=600, clock=clock)
+    cached.get_weather_for_city("Berlin")
+
+    stub.responses["Berlin"] = RuntimeError("API down")
+    stub.done.clear()
+    clock.advance(61)
+
+    assert cached.get_weather_for_city("Berlin")["temperature"] == 20
+    wait_for_refresh(cached, stub)
+
+    # Alter Wert bleibt im Stale-Fenster erhalten, nächster Zugriff versucht es erneut
+    value, state = cached.cache.lookup("berlin")
+    assert (value["temperature"], state) == (20, STALE)
+
+
+def test_batch_only_fetches_missing_cities(clock):
+    stub = StubProvider({"Berlin": {"temperature": 20}, "Paris": {"temperature": 18}})
+    cached = CachedWeatherProvider(stub, ttl=60, clock=clock)
+    cached.get_weather_for_city("Berlin")
+
+    results = cached.get_weather_for_cities(["Paris", "Berlin", "Atlantis"])
+
+    assert [r and r["temperature"] for r in results] == [18, 20, None]
+    assert stub.calls == ["Berlin", "Paris", "Atlantis"]
@@ -0,0 +1,110 @@
+"""
+tests/test_weather_batch.py
+-------------------------------------------------------------------------------
+Tests für die Batch-Abfrage mehrerer Städte:
+/weather/batch, CSVWeatherProvider.get_weather_for_cities und
+APIWeatherProvider.get_weather_for_cities (ohne Netzwerk).
+
+Diese Tests prüfen:
+1) Doppelte Städte (Groß-/Kleinschreibung egal) werden nur einmal abgefragt,
+   der Provider bekommt EINE Liste, Reihenfolge bleibt erhalten
+2) Unbekannte Städte landen in notFound, Fehler im Provider -> 503
+3) Leere / zu lange Listen -> 400
+4) Der API-Provider fragt parallel, aber höchstens batch_workers gleichzeitig
+-------------------------------------------------------------------------------
+"""
+
+import threading
+import time
+
+from backend.provider.api_weather_provider import APIWeatherProvider
+
+
+class RecordingProvider:
+    """Umhüllt den CSV-Provider und merkt sich die Batch-Aufrufe."""
+
+    def __init__(self, provider, error=None):
+        self.provider = provider
+        self.error = error
+        self.batches = []
+
+    def get_weather_for_city(self, city):
+        return self.provider.get_weather_for_city(city)
+
+    def get_weather_for_cities(self, cities):
+        self.batches.append(list(cities))
+        if self.error is not None:
+            raise self.error
+        return self.provider.get_weather_for_cities(cities)
+
+
+def test_batch_dedupes_and_asks_provider_once(dashboard):
+    provider = RecordingProvider(dashboard.provider)
+    dashboard.provider = provider
+    client = dashboard.app.test_client()
+
+    response = client.get("/weather/batch?cities=London, berlin ,Atlantis&cities=BERLIN,München")
+    body = response.get_json()
+
+    assert response.status_code == 200
+    assert provider.batches == [["London", "berlin", "Atlantis", "München"]]
+    assert body["requested"] == 4 and body["found"] == 3
+    assert set(body["weather"]) == {"London", "berlin", "München"}
+    assert body["weather"]["berlin"]["city"] == "Berlin"
+    assert body["notFound"] == ["Atlantis"]
+
+
+def test_batch_matches_single_city_lookups(dashboard):
+    cities = ["Berlin", "Köln", "Shanghai"]
+    batch = dashboard.provider.get_weather_for_cities(cities)
+
+    assert batch == [dashboard.provider.get_weather_for_city(city) for city in cities]
+
+
+def test_batch_rejects_empty_and_oversized_requests(dashboard):
+    dashboard.batch_max_cities = 2
+    client = dashboard.app.test_client()
+
+    assert client.get("/weather/batch").status_code == 400
+    assert client.get("/weather/batch?cities= , ").status_code == 400
+    assert client.get("/weather/batch?cities=Berlin,London,Köln").status_code == 400
+    assert client.get("/weather/batch?cities=Berlin,London,berlin").status_code == 200
+
+
+def test_batch_provider_error_returns_503(dashboard):
+    dashboard.provider = RecordingProvider(dashboard.provider, error=RuntimeError("down"))
+
+    response = dashboard.app.test_client().get("/weather/batch?cities=Berlin")
+
+    assert response.status_code == 503
+
+
+def test_api_provider_batch_keeps_order_and_limits_concurrency(monkeypatch):
+    monkeypatch.setenv("WEATHER_BATCH_WORKERS", "3")
+    provider = APIWeatherProvider(api_key="DUMMY")
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_single(city):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return None if city == "Atlantis" else {"city": city}
+
+    monkeypatch.setattr(provider, "get_weather_for_city", fake_single)
+    cities = ["Berlin", "Atlantis", "London", "Paris", "Rom", "Wien"]
+
+    start = time.perf_counter()
+    results = provider.get_weather_for_cities(cities)
+    elapsed = time.perf_counter() - start
+
+    assert results == [None if city == "Atlantis" else {"city": city} for city in cities]
+    assert peak == 3
+    assert elapsed < 0.25                               # 2 Runden à 0.05s statt 6 nacheinander
+    assert provider.get_weather_for_cities([]) == []
@@ -0,0 +1,125 @@
+"""
+tests/test_weather_record.py
+-------------------------------------------------------------------------------
+Tests für backend/services/weather_record.py (WeatherRecord, WeatherBlock, as_dict).
+
+Diese Tests prüfen:
+1) WeatherRecord verhält sich wie ein dict: Lesen, Schreiben, Zusatz-Keys, copy, ==
+2) WeatherBlock speichert Datensätze verlustfrei (None bleibt None, NaN bleibt NaN,
+   bool bleibt bool), egal ob per append oder from_frame aufgebaut
+3) as_dict wandelt nur WeatherRecords um
+-------------------------------------------------------------------------------
+"""
+
+import json
+import math
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services.data_normalizer import normalize_weather_data, normalize_weather_frame
+from backend.services.weather_record import WeatherRecord, WeatherBlock, FIELD_NAMES, as_dict
+
+SAMPLE_CSV = Path(__file__).resolve().parents[1] / "data" / "samples" / "weather_sample.csv"
+
+
+@pytest.fixture
+def rows():
+    df = pd.read_csv(SAMPLE_CSV)
+    df.loc[0, "humidity"] = np.nan          # int-Feld -> None
+    df.loc[1, "windGust"] = np.nan          # float-Feld -> NaN bleibt NaN ("or"-Kette)
+    return df
+
+
+def same(a, b):
+    return all(
+        x == y or (isinstance(x, float) and math.isnan(x) and math.isnan(y))
+        for x, y in zip(a.values(), b.values())
+    ) and list(a) == list(b)
+
+
+# ========================================
+# WeatherRecord
+# ========================================
+
+def test_record_behaves_like_a_dict():
+    record = normalize_weather_data({"city": "Berlin", "temp": 4.5}, as_record=True)
+
+    assert record["city"] == "Berlin" and record.get("currentTemperature") == 4.5
+    assert record.get("unbekannt", "x") == "x"
+    with pytest.raises(KeyError):
+        record["unbekannt"]
+
+    record["lastUpdated"] = "12:00"                 # Zusatz-Key außerhalb des Schemas
+    record["humidity"] = 55
+
+    assert "lastUpdated" in record and len(record) == len(FIELD_NAMES) + 1
+    assert list(record)[-1] == "lastUpdated"
+    assert record.to_dict()["humidity"] == 55
+    assert json.loads(json.dumps(record.to_dict()))["lastUpdated"] == "12:00"
+
+
+def test_record_copy_is_independent_and_equal():
+    record = WeatherRecord.from_dict({"city": "Köln", "extra": 1})
+    copy = record.copy()
+
+    assert copy == record and copy == record.to_dict()
+    copy["city"] = "Bonn"
+    copy["extra"] = 2
+
+    assert record["city"] == "Köln" and record["extra"] == 1
+    assert copy != record
+
+
+def test_from_dict_fills_defaults():
+    record = WeatherRecord.from_dict({"city": "Ulm"})
+
+    assert record["weatherDescription"] == "--"
+    assert record["sunrise"] == "08:00"
+    assert record["fog"] is False
+    assert record["currentTemperature"] is None
+
+
+def test_as_dict_only_converts_records():
+    data = {"city": "Berlin"}
+    assert as_dict(data) is data
+    assert as_dict(None) is None
+    assert type(as_dict(WeatherRecord.from_dict(data))) is dict
+
+
+# ========================================
+# WeatherBlock
+# ========================================
+
+def test_block_roundtrip_via_append(rows):
+    expected = [normalize_weather_data(row) for row in rows.to_dict("records")]
+    block = WeatherBlock.from_records(expected)
+
+    assert len(block) == len(expected)
+    for index, data in enumerate(expected):
+        assert same(block.to_dict(index), data)
+        assert same(block.record(index).to_dict(), data)
+
+    assert block.to_dict(0)["humidity"] is None
+    assert math.isnan(block.to_dict(1)["windGust"])
+    assert all(type(block.to_dict(i)["fog"]) is bool for i in range(len(block)))
+
+
+def test_block_from_frame_matches_append(rows):
+    expected = [normalize_weather_data(row) for row in rows.to_dict("records")]
+    block = WeatherBlock.from_frame(normalize_weather_frame(rows))
+
+    for index, data in enumerate(expected):
+        assert same(block.to_dict(index), data)
+        assert type(block.to_dict(index)["humidity"]) is type(data["humidity"])
+
+
+def test_block_ignores_extra_keys():
+    record = WeatherRecord.from_dict({"city": "Ulm", "lastUpdated": "12:00"})
+    block = WeatherBlock.from_records([record])
+
+    assert "lastUpdated" not in block.to_dict(0)
+    assert block.record(0)["city"] == "Ulm"